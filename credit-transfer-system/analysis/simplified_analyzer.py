@@ -18,11 +18,28 @@ from extraction.unified_extractor import UnifiedSkillExtractor
 from mapping.cluster_matcher import ClusterSkillMatcher
 from utils.prompt_manager import PromptManager
 from mapping.unified_scorer import UnifiedScorer, MatchScore
+from utils.quality_monitor import monitored
 from models.enums import SkillLevel
 
 
 logger = logging.getLogger(__name__)
 
+# Threshold tiers stored in the 'tier' field of pair match arrays
+MATCH_TIER_UNMAPPED = 0
+MATCH_TIER_PARTIAL = 1
+MATCH_TIER_DIRECT = 2
+
+# One row per (VET skill, Uni skill) pair; indices point into the skill lists
+PAIR_MATCH_DTYPE = np.dtype([
+    ('vet_idx', np.int64),
+    ('uni_idx', np.int64),
+    ('similarity', np.float64),
+    ('level_compatibility', np.float64),
+    ('context_similarity', np.float64),
+    ('combined_score', np.float64),
+    ('tier', np.int8),
+])
+
 
 class SimplifiedAnalyzer:
     """Simplified analyzer with cleaner logic and progressive analysis"""
@@ -42,7 +59,8 @@ class SimplifiedAnalyzer:
                 base_extractor, 
                 num_runs=self.config.get("ensemble_runs".upper(), 3),
                 embeddings=embeddings,  # Pass the embedding model
-                similarity_threshold=self.config.get("ensemble_similarity_threshold".upper(), 0.9)
+                similarity_threshold=self.config.get("ensemble_similarity_threshold".upper(), 0.9),
+                max_workers=self.config.get("ensemble_max_workers".upper(), None)
             )
             # Use the ensemble extractor
             self.extractor = ensemble_extractor
@@ -52,6 +70,7 @@ class SimplifiedAnalyzer:
         self.matcher = ClusterSkillMatcher(embeddings, config)
         self.prompt_manager = PromptManager()
         self.unified_scorer = UnifiedScorer()
+        self.skill_store = None
         
         # Simple thresholds
         self.thresholds = {
@@ -335,11 +354,24 @@ class SimplifiedAnalyzer:
         
         logger.info("=" * 60)
         
+    def _get_skill_store(self):
+        """Get the per-unit skill store, creating it on first use"""
+        if self.skill_store is None:
+            from reporting.skill_store import SkillStore
+            self.skill_store = SkillStore(self.config.get("SKILL_STORE_DIR", "output/skills/store"),
+                                          format=self.config.get("SKILL_STORE_FORMAT", "binary"))
+        return self.skill_store
+        
+    @monitored("skill_store.load")
     def load_pre_extracted_skills_selective(self, 
                                        vet_qual: VETQualification, 
                                        uni_qual: UniQualification) -> Tuple[bool, Dict]:
         """
-        Try to load pre-extracted skills from disk, tracking which units/courses have cached skills
+        Try to load pre-extracted skills from the skill store, tracking which units/courses have cached skills
+        
+        Only units/courses whose source text hash matches the stored entry are loaded.
+        Items that were never stored fall back to the newest legacy per-qualification
+        JSON export, and anything found there is migrated into the store.
         
         Returns:
             Tuple of (all_skills_loaded, load_status_dict)
@@ -348,110 +380,27 @@ class SimplifiedAnalyzer:
         load_status = {'vet': {}, 'uni': {}}
         
         try:
-            from reporting.skill_export import SkillExportManager
-            skill_export = SkillExportManager(output_dir="output/skills")
-            
-            # Look for most recent skill files
-            vet_dir = Path("output/skills/vet")
-            uni_dir = Path("output/skills/uni")
+            store = self._get_skill_store()
             
-            # Track overall success
-            all_vet_loaded = False
-            all_uni_loaded = False
-            
-            # Load VET skills
-            if vet_dir.exists():
-                # Find matching VET skills file
-                vet_files = list(vet_dir.glob(f"{vet_qual.code}_skills_*.json"))
-                if vet_files:
-                    # Get most recent file
-                    latest_vet = max(vet_files, key=lambda p: p.stat().st_mtime)
-                    logger.info(f"Loading pre-extracted VET skills from {latest_vet}")
-                    
-                    try:
-                        # Load the skills
-                        loaded_vet_qual = skill_export.import_vet_skills(str(latest_vet))
-                        
-                        # Map loaded skills back to original qualification units
-                        loaded_units_map = {unit.code: unit for unit in loaded_vet_qual.units}
-                        
-                        for unit in vet_qual.units:
-                            if unit.code in loaded_units_map:
-                                loaded_unit = loaded_units_map[unit.code]
-                                if loaded_unit.extracted_skills:
-                                    unit.extracted_skills = loaded_unit.extracted_skills
-                                    load_status['vet'][unit.code] = True
-                                    logger.info(f"Loaded {len(unit.extracted_skills)} skills for VET unit {unit.code}")
-                                else:
-                                    load_status['vet'][unit.code] = False
-                                    logger.warning(f"No skills found in cache for VET unit {unit.code}")
-                            else:
-                                load_status['vet'][unit.code] = False
-                                logger.warning(f"VET unit {unit.code} not found in cached file")
-                        
-                        # Check if all VET units have skills
-                        all_vet_loaded = all(load_status['vet'].get(unit.code, False) 
-                                            for unit in vet_qual.units)
-                        
-                    except Exception as e:
-                        logger.error(f"Error loading VET skills from cache: {e}")
-                        # Mark all as not loaded
-                        for unit in vet_qual.units:
-                            load_status['vet'][unit.code] = False
-                else:
-                    logger.info(f"No cached VET skills file found for {vet_qual.code}")
-                    for unit in vet_qual.units:
-                        load_status['vet'][unit.code] = False
-            else:
-                for unit in vet_qual.units:
-                    load_status['vet'][unit.code] = False
-            
-            # Load University skills
-            if uni_dir.exists():
-                # Find matching University skills file
-                uni_files = list(uni_dir.glob(f"{uni_qual.code}_skills_*.json"))
-                if uni_files:
-                    # Get most recent file
-                    latest_uni = max(uni_files, key=lambda p: p.stat().st_mtime)
-                    logger.info(f"Loading pre-extracted University skills from {latest_uni}")
-                    
-                    try:
-                        # Load the skills
-                        loaded_uni_qual = skill_export.import_uni_skills(str(latest_uni))
-                        
-                        # Map loaded skills back to original qualification courses
-                        loaded_courses_map = {course.code: course for course in loaded_uni_qual.courses}
-                        
-                        for course in uni_qual.courses:
-                            if course.code in loaded_courses_map:
-                                loaded_course = loaded_courses_map[course.code]
-                                if loaded_course.extracted_skills:
-                                    course.extracted_skills = loaded_course.extracted_skills
-                                    load_status['uni'][course.code] = True
-                                    logger.info(f"Loaded {len(course.extracted_skills)} skills for Uni course {course.code} (y:{getattr(course, 'year', 'N/A')})")
-                                else:
-                                    load_status['uni'][course.code] = False
-                                    logger.warning(f"No skills found in cache for Uni course {course.code}")
-                            else:
-                                load_status['uni'][course.code] = False
-                                logger.warning(f"Uni course {course.code} not found in cached file")
-                        
-                        # Check if all Uni courses have skills
-                        all_uni_loaded = all(load_status['uni'].get(course.code, False) 
-                                        for course in uni_qual.courses)
-                        
-                    except Exception as e:
-                        logger.error(f"Error loading University skills from cache: {e}")
-                        # Mark all as not loaded
-                        for course in uni_qual.courses:
-                            load_status['uni'][course.code] = False
-                else:
-                    logger.info(f"No cached University skills file found for {uni_qual.code}")
-                    for course in uni_qual.courses:
-                        load_status['uni'][course.code] = False
-            else:
-                for course in uni_qual.courses:
-                    load_status['uni'][course.code] = False
+            for kind, qual_code, items in (('vet', vet_qual.code, vet_qual.units),
+                                           ('uni', uni_qual.code, uni_qual.courses)):
+                cached = store.load_skills(kind, items)
+                
+                # Items never seen by the store may still live in an old full export
+                legacy_items = [
+                    item for item in items
+                    if item.code not in cached and not store.has_entry(kind, item.code)
+                ]
+                if legacy_items:
+                    cached.update(self._load_legacy_skill_export(kind, qual_code, legacy_items, store))
+                
+                for item in items:
+                    if cached.get(item.code):
+                        item.extracted_skills = cached[item.code]
+                        load_status[kind][item.code] = True
+                        logger.debug(f"Loaded {len(item.extracted_skills)} cached skills for {kind} {item.code}")
+                    else:
+                        load_status[kind][item.code] = False
             
             # Log summary
             vet_cached = sum(1 for v in load_status['vet'].values() if v)
@@ -462,7 +411,8 @@ class SimplifiedAnalyzer:
                     f"Uni: {uni_cached}/{len(uni_qual.courses)} courses have cached skills")
             
             # Return true only if ALL units/courses have skills loaded
-            return (all_vet_loaded and all_uni_loaded), load_status
+            all_loaded = all(load_status['vet'].values()) and all(load_status['uni'].values())
+            return all_loaded, load_status
             
         except Exception as e:
             logger.warning(f"Could not load pre-extracted skills: {e}")
@@ -472,13 +422,26 @@ class SimplifiedAnalyzer:
             for course in uni_qual.courses:
                 load_status['uni'][course.code] = False
             return False, load_status
+    
+    def _load_legacy_skill_export(self, kind: str, qual_code: str, items: List, store) -> Dict[str, List[Skill]]:
+        """
+        Load skills for items from the newest 'output/skills/<kind>/<code>_skills_*.json' export
+        and migrate them into the skill store
+        """
+        return store.import_legacy_export(kind, qual_code, items, export_dir="output/skills")
         
+    @monitored("skill_store.save")
     def _save_newly_extracted_skills(self,
                                 vet_qual: Optional[VETQualification],
                                 uni_qual: Optional[UniQualification],
                                 partial_load_status: Dict):
         """
-        Save newly extracted skills to cache, merging with existing cached skills
+        Append newly extracted skills to the skill store
+        
+        Only units/courses that were not loaded from cache are written; existing
+        entries are left untouched. The full per-qualification JSON export is still
+        re-written for tools that read it when a qualification has newly extracted
+        skills, unless EXPORT_SKILLS_JSON is disabled.
         
         Args:
             vet_qual: VET qualification with some newly extracted skills
@@ -486,30 +449,41 @@ class SimplifiedAnalyzer:
             partial_load_status: Dict indicating which units/courses already had cached skills
         """
         try:
-            from reporting.skill_export import SkillExportManager
-            skill_export = SkillExportManager(output_dir="output/skills")
+            store = self._get_skill_store()
+            
+            newly_extracted_vet = []
+            newly_extracted_uni = []
             
             # Save VET skills if any were newly extracted
             if vet_qual:
                 newly_extracted_vet = [
-                    unit.code for unit in vet_qual.units 
+                    unit for unit in vet_qual.units 
                     if unit.extracted_skills and not partial_load_status['vet'].get(unit.code, False)
                 ]
                 
                 if newly_extracted_vet:
                     logger.info(f"Saving newly extracted skills for {len(newly_extracted_vet)} VET units")
-                    filepath = skill_export.export_vet_skills(vet_qual, format="json")
-                    logger.info(f"Saved VET skills to {filepath}")
+                    store.save_skills('vet', newly_extracted_vet)
             
             # Save University skills if any were newly extracted
             if uni_qual:
                 newly_extracted_uni = [
-                    course.code for course in uni_qual.courses 
+                    course for course in uni_qual.courses 
                     if course.extracted_skills and not partial_load_status['uni'].get(course.code, False)
                 ]
                 
                 if newly_extracted_uni:
                     logger.info(f"Saving newly extracted skills for {len(newly_extracted_uni)} Uni courses")
+                    store.save_skills('uni', newly_extracted_uni)
+            
+            # Re-export a qualification only when it has new skills; unchanged ones keep their export
+            if self.config.get("EXPORT_SKILLS_JSON", True):
+                from reporting.skill_export import SkillExportManager
+                skill_export = SkillExportManager(output_dir="output/skills")
+                if newly_extracted_vet:
+                    filepath = skill_export.export_vet_skills(vet_qual, format="json")
+                    logger.info(f"Saved VET skills to {filepath}")
+                if newly_extracted_uni:
                     filepath = skill_export.export_uni_skills(uni_qual, format="json")
                     logger.info(f"Saved University skills to {filepath}")
                     
@@ -530,6 +504,7 @@ class SimplifiedAnalyzer:
                 logger.warning(f"Course {course.code} has no credit_points specified, defaulting to 0")
                 course.credit_points = 0
     
+    @monitored("analyze")
     def analyze(self, 
         vet_qual: VETQualification,
         uni_qual: UniQualification,
@@ -637,6 +612,7 @@ class SimplifiedAnalyzer:
         else:
             return "balanced"
     
+    @monitored("analysis.quick")
     def _quick_analysis(self, vet_qual, uni_qual) -> List[CreditTransferRecommendation]:
         """Quick analysis using embeddings only"""
         logger.info("Performing quick analysis")
@@ -744,7 +720,7 @@ class SimplifiedAnalyzer:
                 continue
                 
             # Extract results from vectorized computation
-            all_skill_matches = match_result['all_matches']
+            best_pairs = match_result['best_pairs']
             uni_skill_coverage = match_result['uni_coverage']
             vet_skill_coverage = match_result['vet_coverage']
             best_skill_matches_uni = match_result['best_uni_matches']
@@ -803,9 +779,7 @@ class SimplifiedAnalyzer:
                         "direct_matches": len(direct_matches),
                         "partial_matches": len(partial_matches),
                         "unmapped_count": len(unmapped_matches),
-                        "one_to_many_mappings": sum(1 for matches in [m for m in best_skill_matches] 
-                                                if len([m2 for m2 in best_skill_matches 
-                                                        if m2['vet_skill'] == m2['vet_skill']]) > 1)
+                        "one_to_many_mappings": self._count_one_to_many(best_pairs)
                     },
                     "skill_match_details": {
                         'mapped': direct_matches + partial_matches,
@@ -834,7 +808,7 @@ class SimplifiedAnalyzer:
             return None
             
         # Extract results from vectorized computation
-        all_skill_matches = match_result['all_matches']
+        best_pairs = match_result['best_pairs']
         uni_skill_coverage = match_result['uni_coverage']
         vet_skill_coverage = match_result['vet_coverage']
         best_skill_matches_uni = match_result['best_uni_matches']
@@ -893,9 +867,7 @@ class SimplifiedAnalyzer:
                 "direct_matches": len(direct_matches),
                 "partial_matches": len(partial_matches),
                 "unmapped_count": len(unmapped_matches),
-                "one_to_many_mappings": sum(1 for matches in [m for m in best_skill_matches] 
-                                        if len([m2 for m2 in best_skill_matches 
-                                                if m2['vet_skill'] == m2['vet_skill']]) > 1)
+                "one_to_many_mappings": self._count_one_to_many(best_pairs)
             },
             "skill_match_details": {
                 'mapped': direct_matches + partial_matches,
@@ -907,10 +879,13 @@ class SimplifiedAnalyzer:
         
         return best_match
     
+    @monitored("matching.vectorized")
     def _calculate_vectorized_skill_matches(self, vet_skills: List, uni_skills: List) -> Dict:
         """
         Vectorized computation of skill matches using batch embeddings
-        Returns complete match matrix and coverage information
+        
+        Pair scores stay in numpy arrays; match dicts are only materialized for
+        the best VET match of each university skill, which is what gets reported.
         """
         if not self.embeddings or not vet_skills or not uni_skills:
             return None
@@ -960,60 +935,114 @@ class SimplifiedAnalyzer:
             context_compat_matrix * context_weight
         )
         
-        # Process results to maintain one-to-many support
-        all_skill_matches = []
+        # Threshold tier for every pair (0 = unmapped, 1 = partial, 2 = direct)
+        tier_matrix = np.where(
+            combined_scores >= self.direct_threshold, MATCH_TIER_DIRECT,
+            np.where(combined_scores >= self.partial_threshold, MATCH_TIER_PARTIAL, MATCH_TIER_UNMAPPED)
+        ).astype(np.int8)
+        
+        # Candidate pairs above the partial threshold, kept as a structured array
+        candidate_vet_idx, candidate_uni_idx = np.nonzero(tier_matrix > MATCH_TIER_UNMAPPED)
+        candidate_pairs = self._build_pair_match_array(
+            candidate_vet_idx, candidate_uni_idx, similarity_matrix,
+            level_compat_matrix, context_compat_matrix, combined_scores, tier_matrix
+        )
+        
+        # Best VET skill per column. The last row reaching the maximum wins,
+        # matching the ">=" tie-breaking of the original pairwise loop.
+        n_vet, n_uni = combined_scores.shape
+        uni_positions = np.arange(n_uni)
+        best_vet_idx = n_vet - 1 - np.argmax(combined_scores[::-1], axis=0)
+        best_uni_scores = combined_scores[best_vet_idx, uni_positions]
+        best_vet_scores = combined_scores.max(axis=1)
+        
+        # Coverage is keyed by skill name, so duplicate names share their best score
         vet_skill_coverage = {}
+        for vet_skill, score in zip(vet_skills, best_vet_scores):
+            vet_skill_coverage[vet_skill.name] = max(vet_skill_coverage.get(vet_skill.name, 0), score)
+        
         uni_skill_coverage = {}
-        best_uni_matches = {}
+        best_pair_by_name = {}
+        for j, uni_skill in enumerate(uni_skills):
+            score = best_uni_scores[j]
+            uni_skill_coverage[uni_skill.name] = max(uni_skill_coverage.get(uni_skill.name, 0), score)
+            # Skills whose best score is negative never beat the zero baseline
+            if score < 0:
+                continue
+            candidate = (score, best_vet_idx[j], j)
+            previous = best_pair_by_name.get(uni_skill.name)
+            if previous is None or candidate >= previous:
+                best_pair_by_name[uni_skill.name] = candidate
+        
+        best_rows = np.array([pair[1] for pair in best_pair_by_name.values()], dtype=np.int64)
+        best_cols = np.array([pair[2] for pair in best_pair_by_name.values()], dtype=np.int64)
+        best_pairs = self._build_pair_match_array(
+            best_rows, best_cols, similarity_matrix,
+            level_compat_matrix, context_compat_matrix, combined_scores, tier_matrix
+        )
         
-        # Find best matches for each skill (vectorized approach)
-        # threshold = self.config.get("PARTIAL_THRESHOLD", 0.5)
-        
-        # For each VET skill, find all matching UNI skills above threshold
-        for i, vet_skill in enumerate(vet_skills):
-            # matches_for_vet = []
-            for j, uni_skill in enumerate(uni_skills):
-                score = combined_scores[i, j]
-                # if score >= threshold:
-                match_type, reasoning = self._classify_match_vectorized(
-                    similarity_matrix[i, j],
-                    level_compat_matrix[i, j],
-                    context_compat_matrix[i, j],
-                    score
-                )
-                
-                match_result = {
-                    "vet_skill": vet_skill,
-                    "uni_skill": uni_skill,
-                    "match_type": match_type,
-                    "similarity": float(similarity_matrix[i, j]),
-                    "level_compatibility": float(level_compat_matrix[i, j]),
-                    "context_similarity": float(context_compat_matrix[i, j]),
-                    "combined_score": float(score),
-                    "reasoning": reasoning
-                }
-                
-                # matches_for_vet.append(match_result)
-                all_skill_matches.append(match_result)
-                
-                # Update coverage tracking
-                vet_skill_coverage[vet_skill.name] = max(
-                    vet_skill_coverage.get(vet_skill.name, 0), score
-                )
-                uni_skill_coverage[uni_skill.name] = max(
-                    uni_skill_coverage.get(uni_skill.name, 0), score
-                )
-                if score >= uni_skill_coverage.get(uni_skill.name, 0):
-                    best_uni_matches[uni_skill.name] = match_result
+        # Materialize dicts only for the reported matches
+        best_uni_matches = {}
+        for uni_name, pair in zip(best_pair_by_name.keys(), best_pairs):
+            best_uni_matches[uni_name] = self._materialize_pair_match(
+                pair, vet_skills, uni_skills
+            )
                     
         return {
-                    'all_matches': all_skill_matches,
+                    'candidate_pairs': candidate_pairs,
+                    'best_pairs': best_pairs,
                     'vet_coverage': vet_skill_coverage,
                     'uni_coverage': uni_skill_coverage,
                     'best_uni_matches': best_uni_matches,
                     'similarity_matrix': similarity_matrix,
                     'combined_scores': combined_scores
                 }
+    
+    @staticmethod
+    def _build_pair_match_array(vet_idx: np.ndarray,
+                                uni_idx: np.ndarray,
+                                similarity_matrix: np.ndarray,
+                                level_compat_matrix: np.ndarray,
+                                context_compat_matrix: np.ndarray,
+                                combined_scores: np.ndarray,
+                                tier_matrix: np.ndarray) -> np.ndarray:
+        """Gather the scores of the given (vet, uni) index pairs into a structured array"""
+        pairs = np.empty(len(vet_idx), dtype=PAIR_MATCH_DTYPE)
+        pairs['vet_idx'] = vet_idx
+        pairs['uni_idx'] = uni_idx
+        pairs['similarity'] = similarity_matrix[vet_idx, uni_idx]
+        pairs['level_compatibility'] = level_compat_matrix[vet_idx, uni_idx]
+        pairs['context_similarity'] = context_compat_matrix[vet_idx, uni_idx]
+        pairs['combined_score'] = combined_scores[vet_idx, uni_idx]
+        pairs['tier'] = tier_matrix[vet_idx, uni_idx]
+        return pairs
+    
+    def _materialize_pair_match(self, pair: np.void, vet_skills: List, uni_skills: List) -> Dict:
+        """Build the match dict for a single row of a pair match array"""
+        match_type, reasoning = self._classify_match_vectorized(
+            pair['similarity'],
+            pair['level_compatibility'],
+            pair['context_similarity'],
+            pair['combined_score']
+        )
+        return {
+            "vet_skill": vet_skills[pair['vet_idx']],
+            "uni_skill": uni_skills[pair['uni_idx']],
+            "match_type": match_type,
+            "similarity": float(pair['similarity']),
+            "level_compatibility": float(pair['level_compatibility']),
+            "context_similarity": float(pair['context_similarity']),
+            "combined_score": float(pair['combined_score']),
+            "reasoning": reasoning
+        }
+    
+    @staticmethod
+    def _count_one_to_many(pairs: np.ndarray) -> int:
+        """Count reported matches whose VET skill also covers another university skill"""
+        if len(pairs) == 0:
+            return 0
+        vet_counts = np.bincount(pairs['vet_idx'])
+        return int(np.sum(vet_counts[pairs['vet_idx']] > 1))
         
     def _compute_level_compatibility_matrix(self, vet_levels: np.ndarray, uni_levels: np.ndarray) -> np.ndarray:
         """
@@ -1028,41 +1057,27 @@ class SimplifiedAnalyzer:
         vet_indices = np.clip(vet_levels - 1, 0, 6).astype(int)
         uni_indices = np.clip(uni_levels - 1, 0, 6).astype(int)
         
-        # Create result matrix using advanced indexing
-        n_vet = len(vet_indices)
-        n_uni = len(uni_indices)
-        result = np.zeros((n_vet, n_uni))
-        
-        for i, v_idx in enumerate(vet_indices):
-            result[i, :] = base_matrix[v_idx, uni_indices]
-        
-        return result
+        return base_matrix[np.ix_(vet_indices, uni_indices)]
 
     def _compute_context_compatibility_matrix(self, vet_contexts: List[str], uni_contexts: List[str]) -> np.ndarray:
         """
         Compute context compatibility matrix in vectorized manner
         """
-        context_similarity_lookup = {
-            ('practical', 'practical'): 1.0,
-            ('practical', 'hybrid'): 0.7,
-            ('practical', 'theoretical'): 0.3,
-            ('theoretical', 'theoretical'): 1.0,
-            ('theoretical', 'hybrid'): 0.7,
-            ('theoretical', 'practical'): 0.3,
-            ('hybrid', 'practical'): 0.7,
-            ('hybrid', 'theoretical'): 0.7,
-            ('hybrid', 'hybrid'): 1.0,
-        }
-        
-        n_vet = len(vet_contexts)
-        n_uni = len(uni_contexts)
-        result = np.zeros((n_vet, n_uni))
-        
-        for i, v_ctx in enumerate(vet_contexts):
-            for j, u_ctx in enumerate(uni_contexts):
-                result[i, j] = context_similarity_lookup.get((v_ctx, u_ctx), 0.5)
-        
-        return result
+        context_order = ['practical', 'theoretical', 'hybrid']
+        # Rows/columns follow context_order; index 3 is any unknown context (0.5)
+        context_lookup = np.array([
+            [1.0, 0.3, 0.7, 0.5],
+            [0.3, 1.0, 0.7, 0.5],
+            [0.7, 0.7, 1.0, 0.5],
+            [0.5, 0.5, 0.5, 0.5],
+        ])
+        context_codes = {ctx: code for code, ctx in enumerate(context_order)}
+        unknown_code = len(context_order)
+        
+        vet_codes = np.array([context_codes.get(ctx, unknown_code) for ctx in vet_contexts], dtype=int)
+        uni_codes = np.array([context_codes.get(ctx, unknown_code) for ctx in uni_contexts], dtype=int)
+        
+        return context_lookup[np.ix_(vet_codes, uni_codes)]
 
     def _classify_match_vectorized(self, semantic_sim: float, level_compat: float, 
                                 context_compat: float, combined_score: float) -> Tuple[str, str]:
@@ -1174,6 +1189,7 @@ class SimplifiedAnalyzer:
         # Return original if no enhancement possible
         return direct_result
     
+    @monitored("analysis.balanced")
     def _balanced_analysis(self, vet_qual, uni_qual) -> List[CreditTransferRecommendation]:
         """Balanced analysis with AI refinement"""
         logger.info("Performing balanced analysis")
@@ -1201,6 +1217,7 @@ class SimplifiedAnalyzer:
         
         return refined_recs
     
+    @monitored("analysis.deep")
     def _deep_analysis(self, vet_qual, uni_qual) -> List[CreditTransferRecommendation]:
         """Deep analysis with full features"""
         logger.info("Performing deep analysis")
@@ -1313,6 +1330,7 @@ class SimplifiedAnalyzer:
             rec.metadata["skill_match_details"] = match_result["skill_match_details"]
         return rec
     
+    @monitored("analysis.refine_with_ai")
     def _refine_with_ai(self, recommendation: CreditTransferRecommendation) -> float:
         """Use AI to refine alignment score"""
         
@@ -0,0 +1,448 @@
+"""
+Long-lived local analysis service that keeps models and caches warm
+The GenAI and embedding interfaces, the analyzer (skill store, extraction and
+embedding caches) and the report generator are created once and reused by
+every request, so an assessment only pays for the analysis itself. Requests
+arrive over HTTP on localhost and are queued for a single worker thread (the
+models are not shared between threads); once `max_queue` jobs are waiting or
+running, new requests are rejected with 503 and a Retry-After header rather
+than piling up. main_simple.py delegates to a running service.
+
+Endpoints:
+    GET  /health          status, backend and queue depth
+    POST /analyze         one job, answered when its analysis has finished
+    POST /batch-analyze   {"jobs": [...]}, admitted all-or-nothing
+
+A job is {"vet_file": path | "vet": {...}, "uni_file": path | "uni": {...},
+"output": path, "report_dir": path, "depth": "quick", "use_cached_skills": true,
+"clear_cache": false}; "vet"/"uni" take the same JSON as the qualification files
+and "report_dir" is where the report package goes (default: the service's
+"output" directory). Paths are resolved by the service, which shares the file
+system with its localhost clients, so clients send absolute paths.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib import error as urlerror, request as urlrequest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEPTHS = ("quick", "balanced", "deep", "auto")
+
+
+class ServiceBusy(RuntimeError):
+    """Raised when the service queue cannot take more jobs"""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def default_service_url() -> str:
+    """Service URL from ANALYSIS_SERVICE_URL, else the default localhost port"""
+    return os.getenv("ANALYSIS_SERVICE_URL", f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+
+
+def summarize_recommendations(recommendations, top: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Recommendations as plain dicts, best alignment first"""
+    ranked = sorted(recommendations, key=lambda rec: rec.alignment_score, reverse=True)
+    return [
+        {
+            "vet_units": rec.get_vet_unit_codes(),
+            "uni_course": rec.uni_course.code,
+            "score": rec.alignment_score,
+            "type": rec.recommendation.value,
+            "confidence": rec.confidence,
+        }
+        for rec in ranked[:top]
+    ]
+
+
+def write_analysis_outputs(analyzer, report_gen, recommendations, vet_qual, uni_qual,
+                           output: str, backend_info: str, profile: str, depth: str,
+                           analysis_time: float) -> Dict[str, str]:
+    """
+    Write the recommendations JSON, the HTML report and the report package
+    Returns the written files by type.
+    """
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    analyzer.export_results(recommendations, str(output_path))
+
+    # Generate enhanced HTML report with the analysis configuration after the title
+    html_path = output_path.with_suffix('.html')
+    html_content = report_gen.generate_html_report(recommendations, vet_qual, uni_qual)
+    backend_box = f"""
+        <div class='summary-box'>
+            <h3>Analysis Configuration</h3>
+            <p><strong>Backend:</strong> {backend_info}</p>
+            <p><strong>Profile:</strong> {profile}</p>
+            <p><strong>Depth:</strong> {depth}</p>
+            <p><strong>Processing Time:</strong> {analysis_time:.2f} seconds</p>
+        </div>
+        """
+    html_content = html_content.replace(
+        "<h1>Credit Transfer Analysis Report</h1>",
+        f"<h1>Credit Transfer Analysis Report</h1>\n{backend_box}"
+    )
+    with open(html_path, 'w') as f:
+        f.write(html_content)
+    logger.info(f"HTML report saved to {html_path}")
+
+    # Complete report package including extracted skills
+    files = {"recommendations": str(output_path), "html_report": str(html_path)}
+    files.update(report_gen.generate_complete_report_package(recommendations, vet_qual, uni_qual))
+    return files
+
+
+class AnalysisService:
+    """Warm models, analyzer and report generator behind a bounded job queue"""
+
+    def __init__(self, config, profile: str = "", max_queue: Optional[int] = None,
+                 request_timeout: Optional[float] = None):
+        """
+        Args:
+            config: SimpleConfig used to create the interfaces and the analyzer
+            profile: Profile name reported in results
+            max_queue: Jobs allowed to wait or run at once (default SERVICE_MAX_QUEUE or 8)
+            request_timeout: Seconds a request waits for its job (default SERVICE_REQUEST_TIMEOUT or 1800)
+        """
+        self.config = config
+        self.profile = profile
+        self.max_queue = max_queue or config.get("SERVICE_MAX_QUEUE", 8)
+        self.request_timeout = request_timeout or config.get("SERVICE_REQUEST_TIMEOUT", 1800)
+
+        self.genai = None
+        self.embeddings = None
+        self.analyzer = None
+        self.report_gen = None
+        # Report generators for the report directories requested by jobs
+        self._report_gens = {}
+
+        # Admission is bounded by _pending (queued + running); the queue itself is not
+        self._queue = queue.Queue()
+        self._admission_lock = threading.Lock()
+        self._pending = 0
+        self._worker = None
+
+        self.started_at = None
+        self.stats = {"completed": 0, "failed": 0, "rejected": 0}
+        self._recent_seconds = []
+
+    # ========== LIFECYCLE ==========
+
+    def start(self, warm_up: bool = True) -> "AnalysisService":
+        """Create the interfaces and the analyzer, optionally load the models, and start the worker"""
+        from interfaces.model_factory import ModelFactory
+        from analysis.simplified_analyzer import SimplifiedAnalyzer
+        from reporting.report_generator import ReportGenerator
+
+        logger.info("Initializing AI interfaces...")
+        self.genai = ModelFactory.create_genai_interface(self.config)
+        if self.genai is None:
+            logger.warning("No GenAI interface available - using fallback extraction")
+        self.embeddings = ModelFactory.create_embedding_interface(self.config)
+        if self.embeddings is None:
+            logger.warning("No embedding interface available - using simple matching")
+
+        self.analyzer = SimplifiedAnalyzer(genai=self.genai, embeddings=self.embeddings,
+                                           config=self.config.to_dict())
+        self.report_gen = ReportGenerator()
+
+        if warm_up:
+            self._warm_up()
+
+        self.started_at = time.time()
+        self._worker = threading.Thread(target=self._run_worker, name="analysis-worker", daemon=True)
+        self._worker.start()
+        return self
+
+    def _warm_up(self):
+        """Load lazily initialized models now so the first request does not pay for it"""
+        start = time.perf_counter()
+        if self.embeddings is not None:
+            self.embeddings.encode(["warm up"])
+        if self.genai is not None and hasattr(self.genai, "_initialize_model"):
+            self.genai._initialize_model()
+        logger.info(f"Models warmed up in {time.perf_counter() - start:.2f} seconds")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Finish the queued jobs and stop the worker"""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
+
+    # ========== QUEUE ==========
+
+    def submit(self, jobs: List[Dict[str, Any]]) -> List[Future]:
+        """
+        Queue jobs, all or none
+        Raises ValueError for an invalid job and ServiceBusy when the queue is full.
+        """
+        jobs = [self._validate_job(job) for job in jobs]
+        with self._admission_lock:
+            if self._pending + len(jobs) > self.max_queue:
+                self.stats["rejected"] += 1
+                raise ServiceBusy(
+                    f"Queue full ({self._pending}/{self.max_queue} jobs pending, {len(jobs)} requested)",
+                    retry_after=self._retry_after())
+            self._pending += len(jobs)
+
+        futures = []
+        for job in jobs:
+            future = Future()
+            self._queue.put((job, future, time.perf_counter()))
+            futures.append(future)
+        return futures
+
+    def _retry_after(self) -> float:
+        """Expected seconds until a slot frees up, from recent job durations"""
+        if not self._recent_seconds:
+            return 1.0
+        return max(1.0, sum(self._recent_seconds) / len(self._recent_seconds))
+
+    def _run_worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            job, future, enqueued = item
+            if not future.set_running_or_notify_cancel():
+                self._finish(None)
+                continue
+            queue_seconds = time.perf_counter() - enqueued
+            start = time.perf_counter()
+            try:
+                result = self.run_job(job)
+                result["queue_seconds"] = round(queue_seconds, 3)
+                self.stats["completed"] += 1
+                future.set_result(result)
+            except Exception as e:
+                logger.error(f"Analysis job failed: {e}", exc_info=True)
+                self.stats["failed"] += 1
+                future.set_exception(e)
+            self._finish(time.perf_counter() - start)
+
+    def _finish(self, seconds: Optional[float]):
+        with self._admission_lock:
+            self._pending -= 1
+            if seconds is not None:
+                self._recent_seconds = (self._recent_seconds + [seconds])[-10:]
+
+    # ========== JOBS ==========
+
+    @staticmethod
+    def _validate_job(job: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(job, dict):
+            raise ValueError("A job must be a JSON object")
+        for kind in ("vet", "uni"):
+            if not job.get(f"{kind}_file") and not isinstance(job.get(kind), dict):
+                raise ValueError(f"Job needs '{kind}_file' or an inline '{kind}' qualification")
+        depth = job.get("depth", "quick")
+        if depth not in DEPTHS:
+            raise ValueError(f"Unknown depth '{depth}', expected one of {', '.join(DEPTHS)}")
+        return {**job, "depth": depth}
+
+    def run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one analysis on the warm analyzer and write its reports"""
+        from utils.qualification_io import load_vet_data, load_uni_data, parse_vet_data, parse_uni_data
+
+        vet_qual = load_vet_data(job["vet_file"]) if job.get("vet_file") else parse_vet_data(job["vet"])
+        uni_qual = load_uni_data(job["uni_file"]) if job.get("uni_file") else parse_uni_data(job["uni"])
+        logger.info(f"Analyzing {vet_qual.code} ({len(vet_qual.units)} units) -> "
+                    f"{uni_qual.code} ({len(uni_qual.courses)} courses)")
+
+        if job.get("clear_cache"):
+            for component in (self.analyzer.extractor, self.embeddings):
+                if hasattr(component, "clear_cache"):
+                    component.clear_cache()
+
+        start = time.perf_counter()
+        recommendations = self.analyzer.analyze(
+            vet_qual,
+            uni_qual,
+            depth=job["depth"],
+            use_cached_skills=job.get("use_cached_skills", True)
+        )
+        analysis_time = time.perf_counter() - start
+
+        files = write_analysis_outputs(
+            self.analyzer, self._report_generator(job.get("report_dir")), recommendations, vet_qual, uni_qual,
+            output=job.get("output") or "output/recommendations.json",
+            backend_info=self.config.get_model_info(), profile=self.profile,
+            depth=job["depth"], analysis_time=analysis_time
+        )
+        return {
+            "vet": vet_qual.code,
+            "uni": uni_qual.code,
+            "backend": self.config.get_model_info(),
+            "profile": self.profile,
+            "depth": job["depth"],
+            "analysis_seconds": round(analysis_time, 3),
+            "recommendation_count": len(recommendations),
+            "recommendations": summarize_recommendations(recommendations),
+            "files": files,
+        }
+
+    def _report_generator(self, report_dir: Optional[str]):
+        """Report generator writing under `report_dir` (default: the service's own)"""
+        if not report_dir:
+            return self.report_gen
+        if report_dir not in self._report_gens:
+            from reporting.report_generator import ReportGenerator
+            self._report_gens[report_dir] = ReportGenerator(output_dir=report_dir)
+        return self._report_gens[report_dir]
+
+    def status(self) -> Dict[str, Any]:
+        with self._admission_lock:
+            pending = self._pending
+        return {
+            "status": "ok",
+            "backend": self.config.get_model_info(),
+            "embedding": self.config.get_embedding_info(),
+            "profile": self.profile,
+            "pending": pending,
+            "max_queue": self.max_queue,
+            "uptime_seconds": round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+            **self.stats,
+        }
+
+
+class _ServiceRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints of AnalysisService; the service is attached to the server"""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> AnalysisService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._send_json(200, self.service.status())
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        if path not in ("/analyze", "/batch-analyze"):
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        try:
+            payload = self._read_json()
+            if path == "/analyze":
+                jobs = [payload]
+            else:
+                jobs = payload.get("jobs") if isinstance(payload, dict) else None
+                if not isinstance(jobs, list) or not jobs:
+                    raise ValueError("Expected {\"jobs\": [...]} with at least one job")
+            futures = self.service.submit(jobs)
+        except ServiceBusy as e:
+            self._send_json(503, {"error": str(e), "retry_after": e.retry_after},
+                            headers={"Retry-After": str(int(e.retry_after + 0.999))})
+            return
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError as well
+            self._send_json(400, {"error": str(e)})
+            return
+
+        deadline = time.monotonic() + self.service.request_timeout
+        results = []
+        for future in futures:
+            try:
+                results.append((200, {"result": future.result(timeout=max(0.0, deadline - time.monotonic()))}))
+            except FutureTimeoutError:
+                results.append((504, {"error": f"Timed out after {self.service.request_timeout}s; the job keeps running"}))
+            except Exception as e:
+                results.append((500, {"error": f"{type(e).__name__}: {e}"}))
+
+        if path == "/batch-analyze":
+            self._send_json(200, {"results": [payload for _, payload in results]})
+        else:
+            self._send_json(*results[0])
+
+
+def serve(service: AnalysisService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Serve a started AnalysisService over HTTP until interrupted"""
+    server = ThreadingHTTPServer((host, port), _ServiceRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    logger.info(f"Analysis service listening on http://{host}:{server.server_port} "
+                f"(backend: {service.config.get_model_info()}, max queue: {service.max_queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down analysis service...")
+    finally:
+        server.server_close()
+        service.stop()
+
+
+class AnalysisServiceClient:
+    """Client for a running AnalysisService"""
+
+    def __init__(self, url: Optional[str] = None, timeout: Optional[float] = None):
+        self.url = (url or default_service_url()).rstrip("/")
+        self.timeout = timeout
+
+    def health(self, timeout: float = 0.5) -> Optional[Dict[str, Any]]:
+        """Service status, or None when no service is listening"""
+        try:
+            with urlrequest.urlopen(f"{self.url}/health", timeout=timeout) as response:
+                return json.loads(response.read())
+        except (urlerror.URLError, OSError, ValueError):
+            return None
+
+    def analyze(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        return self._post("/analyze", job)["result"]
+
+    def batch_analyze(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One {"result": ...} or {"error": ...} entry per job"""
+        return self._post("/batch-analyze", {"jobs": jobs})["results"]
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        req = urlrequest.Request(
+            f"{self.url}{path}",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            with urlrequest.urlopen(req, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urlerror.HTTPError as e:
+            try:
+                body = json.loads(e.read())
+            except ValueError:
+                body = {}
+            if e.code == 503:
+                raise ServiceBusy(body.get("error", "Service busy"), retry_after=body.get("retry_after", 1.0))
+            raise RuntimeError(f"Analysis service returned {e.code}: {body.get('error', e.reason)}")
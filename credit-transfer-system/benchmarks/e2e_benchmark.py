@@ -0,0 +1,257 @@
+"""
+End-to-end benchmark for the credit transfer pipeline
+Runs skill extraction, matching and report generation on a synthetic
+workload built from the sample VET/University files, with the offline
+"fake" LLM backend and "hashing" embeddings standing in for the models, so
+results are reproducible on a CPU without network access. Each stage records wall
+time and memory; the QualityMonitor span tree is included for a finer
+breakdown. Compare a run against an earlier one with --baseline.
+
+Usage:
+    python benchmarks/e2e_benchmark.py
+    python benchmarks/e2e_benchmark.py --units 200 --courses 60 --strategies direct
+    python benchmarks/e2e_benchmark.py --llm-profile vllm --output bench.json
+    python benchmarks/e2e_benchmark.py --output new.json --baseline bench.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config_profiles import ConfigProfiles
+from interfaces.fake_interfaces import PROFILES as LLM_PROFILES
+from interfaces.model_factory import ModelFactory
+from utils.quality_monitor import QualityMonitor, peak_rss_bytes
+from benchmarks.synthetic import SAMPLE_VET, SAMPLE_UNI, load_samples, make_qualifications, make_skill_pool
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (0 where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+@contextmanager
+def measure(results: dict, name: str, trace_memory: bool):
+    """Record wall time and memory of the enclosed stage under results[name]"""
+    rss_before = current_rss_bytes()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage = {
+            "seconds": time.perf_counter() - start,
+            "rss_growth_mb": (current_rss_bytes() - rss_before) / 2**20,
+            "peak_rss_mb": peak_rss_bytes() / 2**20,
+        }
+        if trace_memory:
+            stage["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        results[name] = stage
+
+
+def make_config(args, strategy: str):
+    return ConfigProfiles.create_config(
+        profile_name=args.profile,
+        backend="fake",
+        embedding="hashing",
+        overrides={
+            "rate_limit_delay": 0,
+            "matching_strategy": strategy,
+            "ensemble_runs": 0,
+            "edge_cases_enabled": False,
+            "embedding_dim": args.embedding_dim,
+            "fake_profile": args.llm_profile,
+            "fake_latency": args.llm_latency,
+            "fake_tokens_per_second": args.llm_tokens_per_second,
+            "fake_seed": args.seed,
+        },
+    )
+
+
+def run_once(args) -> dict:
+    """One pass over all stages; returns per-stage measurements"""
+    # Imported here so module import cost is not attributed to the first stage
+    from analysis.simplified_analyzer import SimplifiedAnalyzer
+    from reporting.report_generator import ReportGenerator
+
+    config = make_config(args, args.strategies[0])
+    embeddings = ModelFactory.create_embedding_interface(config)
+    genai = ModelFactory.create_genai_interface(config)
+    # Extract from a shared pool so VET and University skills overlap as real extractions do
+    vet_sample, uni_sample = load_samples(args.vet_sample, args.uni_sample)
+    genai.vocabulary = make_skill_pool(vet_sample, uni_sample, args.skill_pool, args.seed)
+    genai.skills_per_item = args.skills_per_item
+
+    stages = {}
+    monitor = QualityMonitor(log_dir="quality_logs").activate()
+    try:
+        vet, uni = make_qualifications(args.units, args.courses, args.skills_per_item, args.skill_pool,
+                                       with_skills=False, seed=args.seed,
+                                       vet_path=args.vet_sample, uni_path=args.uni_sample)
+
+        # Cold run: extract every unit/course, store the skills, then match
+        first, *others = args.strategies
+        analyzer = SimplifiedAnalyzer(genai=genai, embeddings=embeddings, config=config.to_dict())
+        with measure(stages, f"cold_analysis.{first}", args.trace_memory):
+            recommendations = analyzer.analyze(vet, uni, depth="quick", use_cached_skills=True)
+
+        # Warm runs: skills come from the store
+        for strategy in [first] + others:
+            analyzer = SimplifiedAnalyzer(genai=genai, embeddings=embeddings,
+                                          config=make_config(args, strategy).to_dict())
+            with measure(stages, f"warm_analysis.{strategy}", args.trace_memory):
+                recommendations = analyzer.analyze(vet, uni, depth="quick", use_cached_skills=True)
+            stages[f"warm_analysis.{strategy}"]["recommendations"] = len(recommendations)
+
+        # Two-stage cluster matcher over the whole skill sets
+        if args.clustering:
+            vet_skills = [s for unit in vet.units for s in unit.extracted_skills]
+            uni_skills = [s for course in uni.courses for s in course.extracted_skills]
+            with measure(stages, "clustering", args.trace_memory):
+                matches = analyzer.matcher.match_skills(vet_skills, uni_skills)
+            stages["clustering"]["matches"] = len(matches["matches"])
+
+        with measure(stages, "report", args.trace_memory):
+            ReportGenerator(output_dir="reports").generate_complete_report_package(recommendations, vet, uni)
+    finally:
+        monitor.deactivate()
+
+    stages["_llm_calls"] = genai.calls
+    stages["_spans"] = [r for r in monitor.to_records() if r["type"] == "span"]
+    return stages
+
+
+def summarize(runs: list) -> dict:
+    """Median seconds and max memory per stage across repeats"""
+    summary = {}
+    for name in runs[0]:
+        if name.startswith("_"):
+            continue
+        seconds = sorted(run[name]["seconds"] for run in runs)
+        summary[name] = {
+            "seconds": seconds[len(seconds) // 2],
+            "min_seconds": seconds[0],
+            **{key: max(run[name].get(key, 0) for run in runs)
+               for key in ("rss_growth_mb", "peak_rss_mb", "traced_peak_mb", "recommendations", "matches")
+               if key in runs[0][name]},
+        }
+    return summary
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_comparison(summary: dict, baseline_path: Path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["stages"]
+    print(f"\nComparison with {baseline_path}:")
+    for name, stage in summary.items():
+        if name not in baseline:
+            print(f"  {name:<32} (new stage)")
+            continue
+        before, after = baseline[name]["seconds"], stage["seconds"]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"  {name:<32} {before:8.3f}s -> {after:8.3f}s  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--units", type=int, default=60, help="Number of VET units")
+    parser.add_argument("--courses", type=int, default=20, help="Number of University courses")
+    parser.add_argument("--skills-per-item", type=int, default=12)
+    parser.add_argument("--skill-pool", type=int, default=400, help="Distinct skill names to draw from")
+    parser.add_argument("--strategies", nargs="+", default=["direct", "direct_one_vs_all"],
+                        choices=["direct", "direct_one_vs_all"], help="Quick-analysis matching strategies")
+    parser.add_argument("--no-clustering", dest="clustering", action="store_false",
+                        help="Skip the cluster matcher stage")
+    parser.add_argument("--profile", default="fast", choices=list(ConfigProfiles.PROFILES))
+    parser.add_argument("--embedding-dim", type=int, default=384)
+    parser.add_argument("--llm-profile", default="instant", choices=list(LLM_PROFILES),
+                        help="Simulated LLM backend profile")
+    parser.add_argument("--llm-latency", type=float, help="Override the profile's seconds per LLM call")
+    parser.add_argument("--llm-tokens-per-second", type=float,
+                        help="Override the profile's decoding speed")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--trace-memory", action="store_true", help="Record tracemalloc peaks (slower)")
+    parser.add_argument("--vet-sample", type=Path, default=SAMPLE_VET)
+    parser.add_argument("--uni-sample", type=Path, default=SAMPLE_UNI)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Save results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Earlier --output file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    for path in ("vet_sample", "uni_sample", "output", "baseline"):
+        if getattr(args, path):
+            setattr(args, path, getattr(args, path).resolve())
+
+    print(f"Workload: {args.units} units x {args.courses} courses, {args.skills_per_item} skills each, "
+          f"strategies {', '.join(args.strategies)}, LLM profile {args.llm_profile}")
+
+    runs = []
+    cwd = os.getcwd()
+    for i in range(args.repeat):
+        # Caches, the skill store and reports are written relative to the working directory
+        with tempfile.TemporaryDirectory(prefix="ct_bench_") as workdir:
+            os.chdir(workdir)
+            try:
+                runs.append(run_once(args))
+            finally:
+                os.chdir(cwd)
+        print(f"Run {i + 1}/{args.repeat}: " + ", ".join(
+            f"{name} {stage['seconds']:.2f}s" for name, stage in runs[-1].items() if not name.startswith("_")))
+
+    summary = summarize(runs)
+    print()
+    for name, stage in summary.items():
+        memory = f"peak RSS {stage['peak_rss_mb']:.0f} MB, +{stage['rss_growth_mb']:.1f} MB"
+        if "traced_peak_mb" in stage:
+            memory += f", traced peak {stage['traced_peak_mb']:.1f} MB"
+        print(f"  {name:<32} {stage['seconds']:8.3f}s  ({memory})")
+    print(f"  LLM calls per run: {runs[-1]['_llm_calls']}")
+
+    if args.baseline:
+        print_comparison(summary, args.baseline)
+
+    if args.output:
+        result = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(),
+                "git_commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+            },
+            "stages": summary,
+            "spans": runs[-1]["_spans"],
+        }
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Import-time budget check for the CLI entry points and core modules
+Imports each module in a fresh interpreter with `python -X importtime` and
+fails (exit status 1) when its cumulative import time exceeds the budget or
+when it pulls in a heavy dependency (torch, vLLM, OpenAI, sentence-transformers,
+FAISS, plotting libraries) that should only load once a stage needs a model.
+The heavy packages do not have to be installed: the check inspects which
+modules were imported, not whether they import successfully.
+
+Usage:
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --budget 0.5 --repeat 5
+    python benchmarks/import_budget.py --modules main_simple mapping.cluster_matcher
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules on the startup path of main_simple.py, cache-hit analyses and report regeneration
+DEFAULT_MODULES = [
+    "main_simple",
+    "analysis_service",
+    "analysis.simplified_analyzer",
+    "reporting.report_generator",
+    "interfaces.model_factory",
+    "interfaces.embedding_interface",
+    "interfaces.genai_interface",
+    "interfaces.vllm_genai_interface_batch",
+    "mapping.cluster_matcher",
+    "mapping.clustering_algo",
+]
+
+# Maximum cumulative import time per module, in seconds
+DEFAULT_BUDGET = 0.5
+
+# Top-level packages that must only be imported lazily
+HEAVY_PACKAGES = [
+    "torch", "vllm", "openai", "sentence_transformers", "transformers", "huggingface_hub",
+    "faiss", "matplotlib", "seaborn", "psutil", "sklearn",
+]
+
+# Stage modules that are imported on demand and may load some heavy packages;
+# only the heavy-import check applies to them, not the time budget
+STAGE_MODULES = {
+    "mapping.clustering_algo": {"sklearn"},
+}
+
+PROBE = (
+    "import json, sys; import {module}; "
+    "print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}})))"
+)
+
+
+def import_profile(module: str) -> dict:
+    """Cumulative import time of `module` and the top-level packages it loaded"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()
+        return {"error": error[-1] if error else f"exit status {proc.returncode}"}
+
+    seconds = None
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nesting shown by indentation
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == module and name.startswith(" " + module):
+            seconds = int(cumulative) / 1e6
+    return {"seconds": seconds, "packages": json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="Maximum cumulative import time per module in seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="Imports per module; the fastest is reported")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for module in args.modules:
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        if "error" in runs[0]:
+            failures.append(f"{module}: import failed ({runs[0]['error']})")
+            results[module] = runs[0]
+            print(f"  {module:<40} FAILED   {runs[0]['error']}")
+            continue
+
+        seconds = min(run["seconds"] for run in runs)
+        heavy = sorted(set(HEAVY_PACKAGES) & set(runs[0]["packages"]) - STAGE_MODULES.get(module, set()))
+        results[module] = {"seconds": round(seconds, 4), "heavy_imports": heavy}
+
+        status = "ok" if module not in STAGE_MODULES else "ok (stage)"
+        if seconds > args.budget and module not in STAGE_MODULES:
+            status = "SLOW"
+            failures.append(f"{module}: {seconds:.3f}s exceeds the {args.budget:.3f}s budget")
+        if heavy:
+            status = "HEAVY"
+            failures.append(f"{module}: imports {', '.join(heavy)} at module level")
+        print(f"  {module:<40} {seconds:7.3f}s  {status}" + (f"  ({', '.join(heavy)})" if heavy else ""))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"budget_seconds": args.budget, "modules": results}, f, indent=2)
+
+    if failures:
+        print("\nImport budget exceeded:")
+        for failure in failures:
+            print(f"  • {failure}")
+        sys.exit(1)
+    print(f"\nAll {len(args.modules)} modules import within {args.budget:.2f}s without heavy dependencies")
+
+
+if __name__ == "__main__":
+    main()
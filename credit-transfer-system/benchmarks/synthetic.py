@@ -0,0 +1,138 @@
+"""
+Synthetic workloads for benchmarks
+Qualifications of any size are generated from the vocabulary of the sample
+VET/University files; the models are replaced by the offline backends in
+interfaces/fake_interfaces.py so runs are reproducible on a CPU.
+"""
+import json
+import re
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from models.base_models import Skill, VETQualification, UniQualification, UnitOfCompetency, UniCourse
+from models.enums import SkillCategory, SkillLevel, SkillContext, StudyLevel
+
+# Samples live in the repository-level data directory
+SAMPLE_DIR = Path(__file__).resolve().parents[2] / "data"
+SAMPLE_VET = SAMPLE_DIR / "sample_vet.json"
+SAMPLE_UNI = SAMPLE_DIR / "sample_uni.json"
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z\-]{3,}")
+_STOPWORDS = {
+    "with", "their", "from", "this", "that", "using", "into", "through", "students", "will",
+    "including", "must", "various", "such", "both", "across", "within", "while", "learn",
+}
+
+
+def load_samples(vet_path: Path = SAMPLE_VET, uni_path: Path = SAMPLE_UNI) -> Tuple[dict, dict]:
+    with open(vet_path) as f:
+        vet = json.load(f)
+    with open(uni_path) as f:
+        uni = json.load(f)
+    return vet, uni
+
+
+def _sample_text(vet: dict, uni: dict) -> Tuple[List[str], List[str]]:
+    """Learning outcomes and descriptive text of all sample units and courses"""
+    items = vet.get("units", []) + uni.get("courses", [])
+    outcomes = [o for item in items for o in item.get("learning_outcomes", [])]
+    text = [item.get("description", "") for item in items]
+    text += [t for item in items for t in item.get("topics", [])]
+    text += [item.get("assessment_requirements", "") or item.get("assessment", "") for item in items]
+    return outcomes, text + outcomes
+
+
+def make_skill_pool(vet: dict, uni: dict, size: int, seed: int) -> List[str]:
+    """Skill names of the form '<verb> <noun> <noun>' drawn from the sample vocabulary"""
+    rng = np.random.default_rng(seed)
+    outcomes, text = _sample_text(vet, uni)
+    verbs = sorted({o.split()[0].lower() for o in outcomes if o.split()})
+    nouns = sorted({w.lower() for t in text for w in _WORD.findall(t)} - _STOPWORDS - set(verbs))
+
+    pool = set()
+    while len(pool) < size:
+        pool.add(f"{rng.choice(verbs)} {rng.choice(nouns)} {rng.choice(nouns)}")
+    return sorted(pool)
+
+
+def _make_skills(rng: np.random.Generator, pool: List[str], outcomes: List[str], n: int, code: str) -> List[Skill]:
+    names = rng.choice(len(pool), size=min(n, len(pool)), replace=False)
+    categories = list(SkillCategory)
+    contexts = list(SkillContext)
+    return [
+        Skill(
+            name=pool[i],
+            category=categories[rng.integers(len(categories))],
+            level=SkillLevel(int(rng.integers(1, 6))),
+            context=contexts[rng.integers(len(contexts))],
+            code=code,
+            description=f"Applies {pool[i]} in workplace tasks",
+            confidence=round(float(rng.uniform(0.7, 1.0)), 2),
+            evidence=outcomes[rng.integers(len(outcomes))],
+        )
+        for i in names
+    ]
+
+
+def make_qualifications(n_units: int,
+                        n_courses: int,
+                        skills_per_item: int = 12,
+                        skill_pool_size: int = 400,
+                        with_skills: bool = True,
+                        seed: int = 42,
+                        vet_path: Path = SAMPLE_VET,
+                        uni_path: Path = SAMPLE_UNI) -> Tuple[VETQualification, UniQualification]:
+    """
+    Build a VET and a University qualification of the requested size
+
+    Units and courses cycle through the sample items with shuffled learning
+    outcomes; skills are drawn from a shared pool so that VET and University
+    skills overlap the way real extractions do.
+    """
+    vet_sample, uni_sample = load_samples(vet_path, uni_path)
+    rng = np.random.default_rng(seed)
+    pool = make_skill_pool(vet_sample, uni_sample, skill_pool_size, seed)
+    outcomes, _ = _sample_text(vet_sample, uni_sample)
+
+    vet = VETQualification(code=vet_sample["code"], name=vet_sample["name"], level=vet_sample["level"])
+    for i in range(n_units):
+        template = vet_sample["units"][i % len(vet_sample["units"])]
+        code = f"{template['code']}{i:04d}"
+        unit = UnitOfCompetency(
+            code=code,
+            name=f"{template['name']} {i}",
+            description=template.get("description", ""),
+            study_level=StudyLevel.get_study_level("vet", vet_sample["level"]).value,
+            learning_outcomes=list(rng.choice(outcomes, size=min(6, len(outcomes)), replace=False)),
+            assessment_requirements=template.get("assessment_requirements", ""),
+            nominal_hours=template.get("nominal_hours") or 0,
+            prerequisites=template.get("prerequisites", []),
+        )
+        if with_skills:
+            unit.extracted_skills = _make_skills(rng, pool, outcomes, skills_per_item, code)
+        vet.units.append(unit)
+
+    uni = UniQualification(code=uni_sample["code"], name=uni_sample["name"])
+    for i in range(n_courses):
+        template = uni_sample["courses"][i % len(uni_sample["courses"])]
+        code = f"{template['code']}{i:04d}"
+        year = int(template.get("year", 1) or 1)
+        course = UniCourse(
+            code=code,
+            name=f"{template['name']} {i}",
+            description=template.get("description", ""),
+            study_level=StudyLevel.get_study_level("uni", template["name"], year).value,
+            learning_outcomes=list(rng.choice(outcomes, size=min(6, len(outcomes)), replace=False)),
+            prerequisites=template.get("prerequisites", []),
+            credit_points=template.get("credit_points", 0),
+            topics=template.get("topics", []),
+            assessment=template.get("assessment", ""),
+            year=year,
+        )
+        if with_skills:
+            course.extracted_skills = _make_skills(rng, pool, outcomes, skills_per_item, code)
+        uni.courses.append(course)
+
+    return vet, uni
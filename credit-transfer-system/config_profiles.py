@@ -161,6 +161,14 @@ class ConfigProfiles:
             "external_model_dir": os.getenv("EXTERNAL_MODEL_DIR", "/Volumes/jsa_external_prod/external_vols/scratch/Scratch/Ehsan/Models"),
             "tensor_parallel_size": 1,
             "gpu_memory_utilization": 0.9
+        },
+        "fake": {
+            "type": "fake",
+            "model_name": "fake-llm",
+            "deployment": "fake-llm",
+            "fake_profile": os.getenv("FAKE_LLM_PROFILE", "instant"),  # instant, azure, vllm or flaky
+            "fake_seed": int(os.getenv("FAKE_LLM_SEED", "0")),
+            "rate_limit_delay": 0.0
         }
     }
     
@@ -189,6 +197,13 @@ class ConfigProfiles:
             "embedding_dim": 1024,
             "embedding_batch_size": 24,
             "trust_remote_code": False
+        },
+        "hashing": {
+            "embedding_model": "hashing",
+            "embedding_dim": 384,
+            "embedding_batch_size": 256,
+            "embedding_device": "cpu",
+            "trust_remote_code": False
         }
     }
     
@@ -254,7 +269,7 @@ class ConfigProfiles:
         
         Args:
             profile_name: Name of the profile to use
-            backend: Override backend selection ('openai', 'vllm', or 'auto')
+            backend: Override backend selection ('openai', 'vllm', 'fake' or 'auto')
             embedding: Override embedding model selection
             overrides: Additional configuration overrides
         """
@@ -265,9 +280,9 @@ class ConfigProfiles:
         if backend is None:
             backend = profile.get("backend_type", "auto")
         
-        # Determine embedding
+        # Determine embedding; the offline backend pairs with offline embeddings
         if embedding is None:
-            embedding = profile.get("default_embedding", "jina")
+            embedding = "hashing" if backend == "fake" else profile.get("default_embedding", "jina")
         
         # Get configurations
         model_config = cls.get_model_config(backend)
@@ -351,6 +366,8 @@ class SimpleConfig:
             return f"Azure OpenAI ({getattr(self, 'DEPLOYMENT', 'unknown')})"
         elif self.IS_VLLM:
             return f"vLLM ({getattr(self, 'MODEL_NAME', 'unknown')})"
+        elif self.BACKEND_TYPE == 'fake':
+            return f"Fake LLM (profile {getattr(self, 'FAKE_PROFILE', 'instant')})"
         else:
             return "No AI backend"
     
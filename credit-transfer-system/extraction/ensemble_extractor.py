@@ -2,13 +2,16 @@
 Ensemble skill extractor that runs multiple extractions and takes consensus
 """
 
+import copy
 import logging
-from typing import List, Dict, Any, Union
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Union, Optional
 import numpy as np
 
 from models.base_models import Skill
 from models.enums import SkillLevel, SkillContext, SkillCategory
+from utils.quality_monitor import monitored
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +19,8 @@ logger = logging.getLogger(__name__)
 class EnsembleSkillExtractor:
     """Extract skills using ensemble method for consistency"""
     
-    def __init__(self, base_extractor, num_runs: int = 3, embeddings=None, similarity_threshold: float = 0.9):
+    def __init__(self, base_extractor, num_runs: int = 3, embeddings=None, similarity_threshold: float = 0.9,
+                 max_workers: Optional[int] = None):
         """
         Initialize ensemble extractor
         
@@ -25,155 +29,170 @@ class EnsembleSkillExtractor:
             num_runs: Number of extraction runs to perform
             embeddings: Embedding interface for similarity calculation
             similarity_threshold: Threshold for considering skills as same (default 0.9)
+            max_workers: Number of runs issued concurrently (default: all runs at once)
         """
         self.base_extractor = base_extractor
         self.num_runs = num_runs
         self.embeddings = embeddings
         self.similarity_threshold = similarity_threshold
-        
-        # Store skill embeddings to avoid re-computing
-        self.skill_embeddings_cache = {}
+        self.max_workers = max_workers or num_runs
     
-    def _get_skill_embedding(self, skill_name: str):
-        """Get embedding for a skill name, using cache"""
-        if skill_name not in self.skill_embeddings_cache:
-            if self.embeddings:
-                # Get embedding - ensure it returns a 1D array
-                embeddings = self.embeddings.encode([skill_name])
-                # embeddings should be shape (1, embedding_dim), we want just the vector
-                if embeddings.ndim == 2:
-                    embedding = embeddings[0]  # Get the first (and only) row
-                else:
-                    embedding = embeddings
-                self.skill_embeddings_cache[skill_name] = embedding
-            else:
-                # Fallback if no embeddings available
-                return None
-        return self.skill_embeddings_cache[skill_name]
+    def _embed_skill_names(self, names: List[str]) -> Optional[Dict[str, np.ndarray]]:
+        """Embed all distinct skill names in a single batch call"""
+        if not self.embeddings or not names:
+            return None
+        
+        unique_names = list(dict.fromkeys(names))
+        embeddings = self.embeddings.encode(unique_names, show_progress=False)
+        embeddings = np.asarray(embeddings)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        
+        return {name: embeddings[i] for i, name in enumerate(unique_names)}
     
-    def _find_similar_skill_group(self, skill_name: str, skill_groups: Dict[str, Dict]) -> str:
+    def _group_similar_skills(self, skill_names: List[str],
+                              name_embeddings: Optional[Dict[str, np.ndarray]]) -> List[int]:
         """
-        Find if a skill belongs to an existing group based on embedding similarity
+        Assign each skill to a group by clustering the similarity matrix
+        
+        Skills are visited in run order; each joins the first existing group whose
+        representative (its first member) is at least `similarity_threshold` similar,
+        otherwise it starts a new group.
         
-        Args:
-            skill_name: Name of the skill to check
-            skill_groups: Dictionary of existing skill groups
-            
         Returns:
-            Key of the matching group, or None if no match found
+            Group index for each skill name
         """
-        if not self.embeddings:
+        if name_embeddings is None:
             # Fallback to exact matching if no embeddings
-            skill_key = skill_name.lower().strip()
-            return skill_key if skill_key in skill_groups else None
+            group_of_key = {}
+            assignments = []
+            for name in skill_names:
+                key = name.lower().strip()
+                if key not in group_of_key:
+                    group_of_key[key] = len(group_of_key)
+                assignments.append(group_of_key[key])
+            return assignments
         
-        # Get embedding for current skill
-        skill_embedding = self._get_skill_embedding(skill_name)
-        if skill_embedding is None:
-            return None
+        matrix = np.vstack([name_embeddings[name] for name in skill_names])
+        similarity_matrix = self.embeddings.similarity(matrix, matrix)
         
-        # Check similarity with existing groups
-        for group_key, group_info in skill_groups.items():
-            # Get representative embedding for the group
-            representative_embedding = group_info.get('embedding')
-            if representative_embedding is not None:
-                # Both embeddings should be 1D arrays at this point
-                # Reshape them for similarity calculation
-                skill_emb_2d = skill_embedding.reshape(1, -1)
-                rep_emb_2d = representative_embedding.reshape(1, -1)
-                
-                # Calculate cosine similarity
-                similarity = self.embeddings.similarity(skill_emb_2d, rep_emb_2d)[0, 0]
-                
-                if similarity >= self.similarity_threshold:
-                    logger.debug(f"Skill '{skill_name}' matched to group '{group_key}' with similarity {similarity:.3f}")
-                    return group_key
+        assignments = []
+        representatives = []  # row index of each group's first member
+        for i in range(len(skill_names)):
+            if representatives:
+                matches = np.flatnonzero(similarity_matrix[i, representatives] >= self.similarity_threshold)
+                if len(matches):
+                    assignments.append(int(matches[0]))
+                    continue
+            representatives.append(i)
+            assignments.append(len(representatives) - 1)
         
-        return None
+        return assignments
+    
+    def _run_extraction(self, item, item_type: str) -> tuple:
+        """
+        Single extraction run on private copies of the items
+        
+        Returns:
+            Tuple of (the run's item copies, extraction result)
+        """
+        # The base extractor writes extracted_skills/study_level back onto the
+        # items, so concurrent runs must not share the same objects
+        if isinstance(item, list):
+            run_items = [copy.copy(i) for i in item]
+        else:
+            run_items = copy.copy(item)
+        return run_items, self.base_extractor.extract_skills(run_items, item_type)
+    
+    @staticmethod
+    def _apply_to_items(items: List, run_items: List[List], consensus: Dict[str, List[Skill]]):
+        """
+        Write consensus skills and study levels back onto the caller's items
+        
+        Each run may infer a study level; the most common one across runs is
+        kept, ties going to the earliest run.
+        """
+        for idx, item in enumerate(items):
+            code = getattr(item, 'code', None)
+            if hasattr(item, 'extracted_skills') and code in consensus:
+                item.extracted_skills = consensus[code]
+            if hasattr(item, 'study_level'):
+                levels = [run[idx].study_level for run in run_items if run[idx].study_level]
+                if levels:
+                    item.study_level = Counter(levels).most_common(1)[0][0]
     
     def extract_with_consensus(self, item, item_type: str = "auto") -> Union[List[Skill], Dict[str, List[Skill]]]:
         """
         Extract skills multiple times and take consensus using embedding similarity
-        """
-        all_runs = []
-        is_dict_result = False
         
-        # Perform multiple extraction runs
-        for run in range(self.num_runs):
-            logger.info(f"Ensemble extraction run {run + 1}/{self.num_runs}")
-            
-            # Extract skills
-            result = self.base_extractor.extract_skills(item, item_type)
-            
-            # Check if result is a dictionary (multiple items) or list (single item)
-            if isinstance(result, dict):
-                is_dict_result = True
-                all_runs.append(result)
-            else:
-                # Single item result - should be a list of Skill objects
-                all_runs.append(result)
+        Runs are issued concurrently; with the vLLM batch interface their
+        requests are coalesced into shared generate calls.
+        """
+        logger.info(f"Ensemble extraction: issuing {self.num_runs} runs ({self.max_workers} concurrent)")
         
-        # Clear embedding cache after extraction
-        self.skill_embeddings_cache = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._run_extraction, item, item_type) for _ in range(self.num_runs)]
+            run_items, all_runs = zip(*(future.result() for future in futures))
+        all_runs = list(all_runs)
         
         # Process based on result type
-        if is_dict_result:
+        if any(isinstance(result, dict) for result in all_runs):
             # Handle dictionary results (multiple items)
-            return self._process_dict_consensus(all_runs)
+            consensus = self._process_dict_consensus(all_runs)
+            if isinstance(item, list):
+                self._apply_to_items(item, run_items, consensus)
+            return consensus
         else:
             # Handle list results (single item)
-            return self._process_list_consensus(all_runs)
+            consensus = self._process_list_consensus(all_runs)
+            self._apply_to_items([item], [[run] for run in run_items], {getattr(item, 'code', None): consensus})
+            return consensus
     
-    def _process_list_consensus(self, all_runs: List[List[Skill]]) -> List[Skill]:
-        """Process consensus for list of skills using embedding similarity"""
-        
-        # Dictionary to store skill groups
-        # Each group has: representative_name, embedding, skills, frequency
-        skill_groups = {}
+    def _build_consensus(self, runs: List[List[Skill]],
+                         name_embeddings: Optional[Dict[str, np.ndarray]]) -> tuple:
+        """
+        Group the skills of all runs and keep groups found in a majority of runs
         
-        # Process each run
-        for run_idx, skills_list in enumerate(all_runs):
+        Returns:
+            Tuple of (consensus skills, number of groups)
+        """
+        skills = []
+        run_indices = []
+        for run_idx, skills_list in enumerate(runs):
             for skill in skills_list:
-                if not isinstance(skill, Skill):
-                    continue
-                
-                skill_name = skill.name.strip()
-                
-                # Find if this skill belongs to an existing group
-                matching_group_key = self._find_similar_skill_group(skill_name, skill_groups)
-                
-                if matching_group_key:
-                    # Add to existing group
-                    skill_groups[matching_group_key]['skills'].append(skill)
-                    skill_groups[matching_group_key]['frequency'] += 1
-                    skill_groups[matching_group_key]['run_appearances'].add(run_idx)
-                    
-                    # Update representative if this skill has higher confidence
-                    if skill.confidence > skill_groups[matching_group_key]['best_skill'].confidence:
-                        skill_groups[matching_group_key]['best_skill'] = skill
-                else:
-                    # Create new group
-                    group_key = skill_name.lower().strip()
-                    skill_groups[group_key] = {
-                        'representative_name': skill_name,
-                        'embedding': self._get_skill_embedding(skill_name) if self.embeddings else None,
-                        'skills': [skill],
-                        'frequency': 1,
-                        'best_skill': skill,
-                        'run_appearances': {run_idx}
-                    }
+                if isinstance(skill, Skill):
+                    skills.append(skill)
+                    run_indices.append(run_idx)
+        
+        if not skills:
+            return [], 0
+        
+        assignments = self._group_similar_skills([s.name.strip() for s in skills], name_embeddings)
+        
+        # Each group tracks its highest-confidence skill and the runs it appeared in
+        groups = {}
+        for skill, run_idx, group_idx in zip(skills, run_indices, assignments):
+            group = groups.get(group_idx)
+            if group is None:
+                groups[group_idx] = {
+                    'representative_name': skill.name.strip(),
+                    'best_skill': skill,
+                    'run_appearances': {run_idx}
+                }
+            else:
+                group['run_appearances'].add(run_idx)
+                if skill.confidence > group['best_skill'].confidence:
+                    group['best_skill'] = skill
         
-        # Build consensus skill set
         consensus_skills = []
         threshold = self.num_runs / 2  # Skill group must appear in majority of runs
         
-        for group_key, group_info in skill_groups.items():
-            # Check if skill appeared in enough runs
-            appearances = len(group_info['run_appearances'])
+        for group in groups.values():
+            appearances = len(group['run_appearances'])
             
             if appearances >= threshold:
                 # Use the best skill from the group
-                best_skill = group_info['best_skill']
+                best_skill = group['best_skill']
                 
                 # Adjust confidence based on consensus
                 consensus_confidence = appearances / self.num_runs
@@ -181,13 +200,22 @@ class EnsembleSkillExtractor:
                 
                 consensus_skills.append(best_skill)
                 
-                logger.debug(f"Skill group '{group_info['representative_name']}' included with {appearances}/{self.num_runs} appearances")
-        
-        logger.info(f"Consensus extraction: {len(consensus_skills)} skills from {len(skill_groups)} unique groups")
+                logger.debug(f"Skill group '{group['representative_name']}' included with {appearances}/{self.num_runs} appearances")
         
         # Sort by confidence and name for consistency
         consensus_skills.sort(key=lambda s: (-s.confidence, s.name.lower()))
         
+        return consensus_skills, len(groups)
+    
+    def _process_list_consensus(self, all_runs: List[List[Skill]]) -> List[Skill]:
+        """Process consensus for list of skills using embedding similarity"""
+        names = [s.name.strip() for run in all_runs for s in run if isinstance(s, Skill)]
+        name_embeddings = self._embed_skill_names(names)
+        
+        consensus_skills, num_groups = self._build_consensus(all_runs, name_embeddings)
+        
+        logger.info(f"Consensus extraction: {len(consensus_skills)} skills from {num_groups} unique groups")
+        
         return consensus_skills
     
     def _process_dict_consensus(self, all_runs: List[Dict[str, List[Skill]]]) -> Dict[str, List[Skill]]:
@@ -196,78 +224,33 @@ class EnsembleSkillExtractor:
         consensus_results = {}
         
         # Get all item codes
-        all_codes = set()
+        all_codes = []
         for run_result in all_runs:
-            all_codes.update(run_result.keys())
+            all_codes.extend(code for code in run_result.keys() if code not in all_codes)
+        
+        # Embed every skill name from every run and item in one call
+        names = [
+            s.name.strip()
+            for run_result in all_runs
+            for skills_list in run_result.values()
+            for s in skills_list if isinstance(s, Skill)
+        ]
+        name_embeddings = self._embed_skill_names(names)
         
         # Process each item code separately
         for code in all_codes:
-            # Dictionary to store skill groups for this code
-            skill_groups = {}
-            
-            # Collect skills for this code across all runs
-            for run_idx, run_result in enumerate(all_runs):
-                if code in run_result:
-                    skills_list = run_result[code]
-                    
-                    for skill in skills_list:
-                        if not isinstance(skill, Skill):
-                            continue
-                        
-                        skill_name = skill.name.strip()
-                        
-                        # Find if this skill belongs to an existing group
-                        matching_group_key = self._find_similar_skill_group(skill_name, skill_groups)
-                        
-                        if matching_group_key:
-                            # Add to existing group
-                            skill_groups[matching_group_key]['skills'].append(skill)
-                            skill_groups[matching_group_key]['frequency'] += 1
-                            skill_groups[matching_group_key]['run_appearances'].add(run_idx)
-                            
-                            # Update representative if this skill has higher confidence
-                            if skill.confidence > skill_groups[matching_group_key]['best_skill'].confidence:
-                                skill_groups[matching_group_key]['best_skill'] = skill
-                        else:
-                            # Create new group
-                            group_key = skill_name.lower().strip()
-                            skill_groups[group_key] = {
-                                'representative_name': skill_name,
-                                'embedding': self._get_skill_embedding(skill_name) if self.embeddings else None,
-                                'skills': [skill],
-                                'frequency': 1,
-                                'best_skill': skill,
-                                'run_appearances': {run_idx}
-                            }
-            
-            # Build consensus for this item
-            consensus_skills = []
-            threshold = self.num_runs / 2
-            
-            for group_key, group_info in skill_groups.items():
-                appearances = len(group_info['run_appearances'])
-                
-                if appearances >= threshold:
-                    # Use the best skill from the group
-                    best_skill = group_info['best_skill']
-                    
-                    # Adjust confidence based on consensus
-                    consensus_confidence = appearances / self.num_runs
-                    best_skill.confidence = min(1.0, best_skill.confidence * consensus_confidence)
-                    
-                    consensus_skills.append(best_skill)
-            
-            # Sort for consistency
-            consensus_skills.sort(key=lambda s: (-s.confidence, s.name.lower()))
+            runs_for_code = [run_result.get(code, []) for run_result in all_runs]
+            consensus_skills, num_groups = self._build_consensus(runs_for_code, name_embeddings)
             
             consensus_results[code] = consensus_skills
             
-            logger.info(f"Consensus for {code}: {len(consensus_skills)} skills from {len(skill_groups)} groups")
+            logger.info(f"Consensus for {code}: {len(consensus_skills)} skills from {num_groups} groups")
         
         return consensus_results
     
+    @monitored("extraction.ensemble")
     def extract_skills(self, items: Union[List, Any], item_type: str = "auto") -> Union[List[Skill], Dict[str, List[Skill]]]:
         """
         Wrapper method to match the base extractor interface
         """
-        return self.extract_with_consensus(items, item_type)
\ No newline at end of file
+        return self.extract_with_consensus(items, item_type)
@@ -6,11 +6,14 @@ import hashlib
 import json
 import pickle
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 from utils.prompt_manager import PromptManager
+from utils.quality_monitor import monitored
 from models.base_models import Skill, UnitOfCompetency, UniCourse
 from models.enums import SkillLevel, SkillContext, SkillCategory, StudyLevel
 
@@ -35,10 +38,14 @@ class UnifiedSkillExtractor:
         # Rate limiting for OpenAI
         self.last_request_time = 0
         self.rate_limit_delay = config.get("RATE_LIMIT_DELAY", 1.0) if self.is_openai else 0
+        self._rate_limit_lock = threading.Lock()
         
-        # Study level cache
+        # Study level cache, keyed by text hash
         self.study_level_cache = {}
         
+        # SFIA level votes, keyed by (text hash, skill name)
+        self.level_vote_cache = {}
+        
         self.prompt_manager = PromptManager()
         
         logger.info(f"Initialized UnifiedSkillExtractor with backend: {self.backend_type}")
@@ -71,15 +78,17 @@ class UnifiedSkillExtractor:
         if not self.is_openai:
             return
         
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        # Serialize concurrent callers so requests stay spaced by the delay
+        with self._rate_limit_lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_request_time
+            
+            if time_since_last < self.rate_limit_delay:
+                sleep_time = self.rate_limit_delay - time_since_last
+                logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
+                time.sleep(sleep_time)
+            
+            self.last_request_time = time.time()
     
     def _call_genai(self, prompt: str, system_prompt: str = None) -> str:
         """Call GenAI with appropriate method for backend - DETERMINISTIC"""
@@ -107,6 +116,35 @@ class UnifiedSkillExtractor:
             logger.error(f"GenAI call failed: {e}")
             return "[]"
     
+    def _generate_many(self, system_prompt: str, user_prompts: List[str], max_tokens: int = 2048) -> List[str]:
+        """
+        Issue independent prompts together
+        
+        vLLM receives them as one batch; other backends get bounded concurrent
+        calls (MAX_CONCURRENT_REQUESTS), still subject to the rate limit.
+        """
+        if not user_prompts:
+            return []
+        
+        if self.is_vllm and hasattr(self.genai, '_generate_batch'):
+            return self.genai._generate_batch(system_prompt, user_prompts, max_tokens=max_tokens)
+        
+        max_workers = max(1, self.config.get("MAX_CONCURRENT_REQUESTS", 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda prompt: self._call_genai(prompt, system_prompt), user_prompts))
+    
+    def _output_budget(self, task: str, n_items: int = 1) -> int:
+        """Output token budget for a vLLM request, sized to the expected response"""
+        if hasattr(self.genai, 'output_budget'):
+            return self.genai.output_budget(task, n_items)
+        return 2048
+    
+    def _text_hash(self, *parts) -> str:
+        """Memoization key for inference results on a given text"""
+        key = "_".join(str(p) for p in parts) + f"_{self.backend_type}"
+        return hashlib.md5(key.encode()).hexdigest()
+    
+    @monitored("extraction.extract_skills")
     def extract_skills(self, 
                    items: Union[List, Any],
                    item_type: str = "auto") -> Union[List[Skill], Dict[str, List[Skill]]]:
@@ -131,19 +169,40 @@ class UnifiedSkillExtractor:
         for item in items:
             texts_to_process.append(self._get_item_text(item))
             items_to_process.append(item)
-            
-            # Get or infer study level
-            # study_level = self._get_or_infer_study_level(item, item_type)
-            study_levels_to_process.append(item.study_level)
+        
+        # Get or infer study levels (inference is batched across all items)
+        if self.config.get("INFER_STUDY_LEVELS", False):
+            study_levels_to_process = self._get_or_infer_study_levels(items_to_process, item_type)
+        else:
+            study_levels_to_process = [item.study_level for item in items_to_process]
         
         # Process items
         if texts_to_process:
+            # Level ensembles run once for all items instead of per item
+            level_runs = self.config.get("level_determination_runs".upper(), 1)
+            batch_levels = bool(self.genai) and level_runs > 1
+            
             # Individual processing with study levels
             extracted_skills = []
             for text, study_level, it in zip(texts_to_process, study_levels_to_process, items_to_process):
-                skills = self._single_extract(text, item_type, study_level, item=it, university_year=it.year if hasattr(it, 'year') else None)
+                skills = self._single_extract(text, item_type, study_level, item=it,
+                                              university_year=it.year if hasattr(it, 'year') else None,
+                                              finalize=not batch_levels)
                 extracted_skills.append(skills)
             
+            if batch_levels:
+                entries = [
+                    (skills, text, item_type, study_level)
+                    for skills, text, study_level in zip(extracted_skills, texts_to_process, study_levels_to_process)
+                    if skills
+                ]
+                try:
+                    self._determine_skill_levels_batch(entries, level_runs)
+                except Exception as e:
+                    logger.error(f"Failed to determine skill levels with ensemble: {e}")
+                
+                extracted_skills = [self._finalize_skills(skills, item_type) for skills in extracted_skills]
+            
             # Store results
             for item, skills, study_level in zip(items_to_process, extracted_skills, study_levels_to_process):
                 item_code = self._get_item_code(item)
@@ -163,35 +222,42 @@ class UnifiedSkillExtractor:
     
     def _get_or_infer_study_level(self, item, item_type: str) -> str:
         """Get study level from item or infer it"""
+        return self._get_or_infer_study_levels([item], item_type)[0]
+    
+    def _get_or_infer_study_levels(self, items: List, item_type: str) -> List[str]:
+        """Get study levels from items, inferring missing ones in one batch"""
+        study_levels = [item.study_level for item in items]
         
-        # For University courses, use existing study level or infer
-        if item_type == "University Course" and hasattr(item, 'study_level'):
-            if item.study_level and item.study_level.lower() != "unknown":
-                return item.study_level
-        
-        # For VET or missing study levels, infer from text
-        text = self._get_item_text(item)
-        
-        # First try simple keyword-based inference
-        # inferred_level = StudyLevel.infer_from_text(text)
+        # For University courses, use existing study level; VET or missing levels are inferred
+        to_infer = [
+            idx for idx, item in enumerate(items)
+            if not (item_type == "University Course" and item.study_level and item.study_level.lower() != "unknown")
+        ]
         
         # If we have AI available and need more precision, use it
-        if self.genai:
-            ai_level = self._infer_study_level_with_ai(text, item_type, self.config.get("study_level_ensemble_runs".upper(), 3))
-            if ai_level:
-                inferred_level = ai_level
-        
-        # Convert enum to string if needed
-        if hasattr(inferred_level, 'value'):
-            inferred_level = inferred_level.value
-        
-        logger.info(f"Inferred study level for {self._get_item_code(item)}: {inferred_level}")
+        if to_infer and self.genai:
+            inferred = self._infer_study_levels_batch(
+                [self._get_item_text(items[idx]) for idx in to_infer],
+                item_type,
+                self.config.get("study_level_ensemble_runs".upper(), 3)
+            )
+            for idx, ai_level in zip(to_infer, inferred):
+                if ai_level:
+                    # Convert enum to string if needed
+                    study_levels[idx] = ai_level.value if hasattr(ai_level, 'value') else ai_level
+                    logger.info(f"Inferred study level for {self._get_item_code(items[idx])}: {study_levels[idx]}")
         
-        return inferred_level
+        return study_levels
     
 
-    def _single_extract(self, text: str, item_type: str, study_level: str = None, item = None, university_year: int = None) -> List[Skill]:
-        """Extract skills from single text with deterministic ordering"""
+    def _single_extract(self, text: str, item_type: str, study_level: str = None, item = None, university_year: int = None,
+                        finalize: bool = True) -> List[Skill]:
+        """
+        Extract skills from single text with deterministic ordering
+        
+        With finalize=False the skills are returned after description generation;
+        the caller is then responsible for level determination and _finalize_skills.
+        """
         
         if not self.genai:
             logger.error("No GenAI interface available for extraction")
@@ -279,7 +345,8 @@ class UnifiedSkillExtractor:
                                     backend_type=self.backend_type
                                 )
                                 user_prompts.append(user_prompt)
-                            responses = self.genai._generate_batch(system_prompt, user_prompts)
+                            responses = self.genai._generate_batch(system_prompt, user_prompts,
+                                                                   max_tokens=self._output_budget("skill_description"))
                             descriptions_data = self._parse_json_response(responses)
                         
                         # Map descriptions back to skills
@@ -304,6 +371,9 @@ class UnifiedSkillExtractor:
                     except Exception as e:
                         logger.warning(f"Failed to generate skill descriptions: {e}")
 
+                if not finalize:
+                    return skills
+                
                 # Add new ensemble level determination
                 if skills and self.genai and self.config.get("level_determination_runs".upper(), 1) > 1:
                     try:
@@ -311,58 +381,8 @@ class UnifiedSkillExtractor:
                         skills = self._determine_skill_levels_ensemble(skills, text, item_type, study_level, self.config.get("level_determination_runs".upper(), 3))
                     except Exception as e:
                         logger.error(f"Failed to determine skill levels with ensemble: {e}")
-                        
-                # Generate keywords for extracted skills
-                if self.genai and skills:
-                    try:
-                        logger.info("Generating keywords for extracted skills...")
-                        
-                        counter_2 = 0
-                        loop_2 = True
-                        # Extract keywords using AI
-                        while loop_2:
-                            loop_2 = False
-                            keyword_map = self._extract_keywords_for_skills(skills, item_type)
-                            if len(keyword_map) == 0 and counter_2 <= 3:
-                                loop_1 = True
-                                counter_2 += 1
-                                logger.info(f"keyword gen trying {counter_2} out of 3 ... ") 
-
-                        
-                        # Update skill objects with keywords
-                        for skill in skills:
-                            skill_name_lower = skill.name.lower().strip()
-                            if skill_name_lower in keyword_map:
-                                skill.keywords = keyword_map[skill_name_lower]
-                                logger.debug(f"Added {len(skill.keywords)} keywords for skill '{skill.name}'")
-                            else:
-                                # Use fallback keyword generation
-                                skill.keywords = self._generate_fallback_keywords(
-                                    skill.name,
-                                    skill.evidence,
-                                    skill.category.value
-                                )
-                                logger.info(f"Generated {len(skill.keywords)} fallback keywords for skill '{skill.name}'")
-                        
-                        logger.info(f"Generated keywords for {len(skills)} skills")
-                        
-                    except Exception as e:
-                        logger.warning(f"Failed to generate skill keywords: {e}")
-                        # Fallback: generate basic keywords for all skills
-                        for skill in skills:
-                            if not skill.keywords:
-                                skill.keywords = self._generate_fallback_keywords(
-                                    skill.name,
-                                    skill.evidence,
-                                    skill.category.value
-                                )
-                
-                # Limit to configured maximum
-                max_skills = self.config.get("MAX_SKILLS_PER_UNIT", 100)
-                if len(skills) > max_skills:
-                    skills = skills[:max_skills]
                 
-                return skills
+                return self._finalize_skills(skills, item_type)
                 
             except Exception as e:
                 logger.error(f"Error in skill extraction: {e}")
@@ -372,6 +392,52 @@ class UnifiedSkillExtractor:
                     loop_1 = True
         return []
         # return self._fallback_extraction(text, study_level)
+    
+    def _finalize_skills(self, skills: List[Skill], item_type: str) -> List[Skill]:
+        """Generate keywords for extracted skills and apply the per-unit limit"""
+        # Generate keywords for extracted skills
+        if self.genai and skills:
+            try:
+                logger.info("Generating keywords for extracted skills...")
+                
+                # Extract keywords using AI
+                keyword_map = self._extract_keywords_for_skills(skills, item_type)
+                
+                # Update skill objects with keywords
+                for skill in skills:
+                    skill_name_lower = skill.name.lower().strip()
+                    if skill_name_lower in keyword_map:
+                        skill.keywords = keyword_map[skill_name_lower]
+                        logger.debug(f"Added {len(skill.keywords)} keywords for skill '{skill.name}'")
+                    else:
+                        # Use fallback keyword generation
+                        skill.keywords = self._generate_fallback_keywords(
+                            skill.name,
+                            skill.evidence,
+                            skill.category.value
+                        )
+                        logger.info(f"Generated {len(skill.keywords)} fallback keywords for skill '{skill.name}'")
+                
+                logger.info(f"Generated keywords for {len(skills)} skills")
+                
+            except Exception as e:
+                logger.warning(f"Failed to generate skill keywords: {e}")
+                # Fallback: generate basic keywords for all skills
+                for skill in skills:
+                    if not skill.keywords:
+                        skill.keywords = self._generate_fallback_keywords(
+                            skill.name,
+                            skill.evidence,
+                            skill.category.value
+                        )
+        
+        # Limit to configured maximum
+        max_skills = self.config.get("MAX_SKILLS_PER_UNIT", 100)
+        if len(skills) > max_skills:
+            skills = skills[:max_skills]
+        
+        return skills
+    
     def _determine_skill_levels_ensemble(self, skills: List[Skill], 
                                     text: str, 
                                     item_type: str, 
@@ -390,30 +456,90 @@ class UnifiedSkillExtractor:
         Returns:
             Skills with consensus-based levels
         """
-        logger.info(f"Determining SFIA levels for {len(skills)} skills using {num_runs} runs")
+        self._determine_skill_levels_batch([(skills, text, item_type, study_level)], num_runs)
+        return skills
+    
+    @monitored("extraction.skill_levels")
+    def _determine_skill_levels_batch(self, entries: List[tuple], num_runs: int = 3):
+        """
+        Determine SFIA levels for the skills of many items with one batched request set
         
-        # Store level determinations for each skill across runs
-        skill_level_votes = {skill.name: [] for skill in skills}
+        Prompts for every item, skill and run are issued together; votes are
+        memoized per (text, skill) so repeated items are not re-asked.
         
+        Args:
+            entries: (skills, text, item_type, study_level) tuples, one per item
+            num_runs: Number of runs for consensus
+        """
+        entry_votes = []
+        pending = []
+        for idx, (skills, text, item_type, study_level) in enumerate(entries):
+            text_key = self._text_hash(text, item_type, study_level, num_runs)
+            skill_level_votes = {}
+            missing = []
+            for skill in skills:
+                cached = self.level_vote_cache.get((text_key, skill.name))
+                if cached is not None:
+                    skill_level_votes[skill.name] = list(cached)
+                else:
+                    skill_level_votes[skill.name] = []
+                    missing.append(skill)
+            entry_votes.append((text_key, skill_level_votes))
+            if missing:
+                pending.append((idx, missing))
+        
+        # Build the prompts for every run up front
+        system_prompt = None
+        user_prompts = []
+        prompt_owners = []
         for run in range(num_runs):
-            # Get level determinations for this run
-            level_assignments = self._get_sfia_level_assignments(
-                skills, text, item_type, study_level, run_seed=run
-            )
+            for idx, missing in pending:
+                _, text, item_type, study_level = entries[idx]
+                # OpenAI rates all skills of an item in one prompt, vLLM one skill per prompt
+                skill_groups = [missing] if self.is_openai else [[skill] for skill in missing]
+                for group in skill_groups:
+                    system_prompt, user_prompt = self.prompt_manager.get_sfia_level_determination_prompt(
+                        skills=group,
+                        context_text=text,
+                        item_type=item_type,
+                        study_level=study_level,
+                        backend_type=self.backend_type
+                    )
+                    user_prompts.append(user_prompt)
+                    prompt_owners.append(idx)
+        
+        if user_prompts:
+            logger.info(f"Determining SFIA levels for {sum(len(m) for _, m in pending)} skills "
+                        f"across {len(pending)} items using {num_runs} runs ({len(user_prompts)} prompts)")
+            responses = self._generate_many(system_prompt, user_prompts,
+                                            max_tokens=self._output_budget("level_assignment"))
+            
+            # Responses are in run order, so votes accumulate per run as before
+            for idx, response in zip(prompt_owners, responses):
+                skill_level_votes = entry_votes[idx][1]
+                for skill_name, level in self._parse_level_assignment_response(response).items():
+                    if skill_name in skill_level_votes:
+                        skill_level_votes[skill_name].append(level)
             
-            # Store the votes
-            for skill_name, level in level_assignments.items():
-                if skill_name in skill_level_votes:
-                    skill_level_votes[skill_name].append(level)
+            for idx, missing in pending:
+                text_key, skill_level_votes = entry_votes[idx]
+                for skill in missing:
+                    if skill_level_votes[skill.name]:
+                        self.level_vote_cache[(text_key, skill.name)] = list(skill_level_votes[skill.name])
+        
+        for (skills, _, _, _), (_, skill_level_votes) in zip(entries, entry_votes):
+            self._apply_level_consensus(skills, skill_level_votes)
+    
+    def _apply_level_consensus(self, skills: List[Skill], skill_level_votes: Dict[str, List[int]]):
+        """Set each skill's level to the majority vote and record agreement"""
+        from collections import Counter
         
-        # Determine consensus level for each skill
         for skill in skills:
             if skill.name in skill_level_votes and skill_level_votes[skill.name]:
                 # Get consensus (majority vote or median)
                 votes = skill_level_votes[skill.name]
                 
                 # Method 1: Majority vote
-                from collections import Counter
                 level_counts = Counter(votes)
                 consensus_level = level_counts.most_common(1)[0][0]
                 
@@ -430,8 +556,6 @@ class UnifiedSkillExtractor:
                 
                 logger.debug(f"Skill '{skill.name}': consensus level {consensus_level} "
                             f"(agreement: {agreement_score:.2f})")
-        
-        return skills
     
     def _get_sfia_level_assignments(self, skills: List[Skill], 
                                 text: str, 
@@ -450,15 +574,8 @@ class UnifiedSkillExtractor:
             backend_type=self.backend_type
         )
         
-        # Add slight variation for ensemble (temperature or prompt variation)
         if self.backend_type == "openai":
-            # Use slight temperature variation for ensemble
-            temperature = 0.0 # 0.0, 0.1, 0.2 for 3 runs
-            response = self._call_genai(
-                system_prompt, user_prompt, 
-                temperature=temperature, 
-                top_p=1.0
-            )
+            response = self._call_genai(user_prompt, system_prompt)
         else:
             user_prompts = []
             for skill in skills:
@@ -470,7 +587,8 @@ class UnifiedSkillExtractor:
                     backend_type=self.backend_type
                 )
                 user_prompts.append(user_prompt)
-            response = self.genai._generate_batch(system_prompt, user_prompts)
+            response = self.genai._generate_batch(system_prompt, user_prompts,
+                                                  max_tokens=self._output_budget("level_assignment"))
         
         # Parse response
         level_assignments = self._parse_level_assignment_response(response)
@@ -525,7 +643,8 @@ class UnifiedSkillExtractor:
                         backend_type=self.backend_type
                     )
                     user_prompts.append(user_prompt)
-                response = self.genai._generate_batch(system_prompt, user_prompts)
+                response = self.genai._generate_batch(system_prompt, user_prompts,
+                                                      max_tokens=self._output_budget("skill_keywords"))
                 keywords_data = self._parse_keyword_response(response)
             
             # Map keywords back to skills
@@ -569,51 +688,82 @@ class UnifiedSkillExtractor:
     
     def _infer_study_level_with_ai(self, text: str, item_type: str, num_runs: int = 3) -> Optional[str]:
         """Use AI to infer study level from text"""
+        return self._infer_study_levels_batch([text], item_type, num_runs)[0]
+    
+    def _infer_study_levels_batch(self, texts: List[str], item_type: str, num_runs: int = 3) -> List[Optional[str]]:
+        """
+        Infer study levels for many texts, issuing every run for every text together
         
+        Results are cached by text hash in study_level_cache.
+        """
+        results = [None] * len(texts)
         if not self.genai:
-            return None
+            return results
         
-        logger.info(f"Inferring study level using {num_runs}-run ensemble approach")
-        # Get standardized prompt from PromptManager
-        system_prompt, user_prompt = self.prompt_manager.get_study_level_inference_prompt(
-            text=text,
-            item_type=item_type,
-            backend_type=self.backend_type
-        )
+        # Group identical texts and reuse cached consensus
+        pending = {}
+        for idx, text in enumerate(texts):
+            text_key = self._text_hash(text, item_type, num_runs)
+            if text_key in self.study_level_cache:
+                results[idx] = self.study_level_cache[text_key]
+            else:
+                pending.setdefault(text_key, (text, []))[1].append(idx)
+        
+        if not pending:
+            return results
+        
+        logger.info(f"Inferring study level for {len(pending)} items using {num_runs}-run ensemble approach")
+        
+        system_prompt = None
+        user_prompts = []
+        prompt_owners = []
+        for run in range(num_runs):
+            for text_key, (text, _) in pending.items():
+                # Get standardized prompt from PromptManager
+                system_prompt, user_prompt = self.prompt_manager.get_study_level_inference_prompt(
+                    text=text,
+                    item_type=item_type,
+                    backend_type=self.backend_type
+                )
+                user_prompts.append(user_prompt)
+                prompt_owners.append(text_key)
         
-        level_votes = []
-        level_confidences = [0 for _ in range(num_runs)]  # Placeholder for confidence if needed
-    
         try:
-            for run in range(num_runs):
-                response = self._call_genai(user_prompt, system_prompt)
-                response = response.strip().lower()
-                
-                if 'intro' in response:
-                    level_votes.append(StudyLevel.INTRODUCTORY.value)
-                elif 'adv' in response:
-                    level_votes.append(StudyLevel.ADVANCED.value)
-                else:
-                    level_votes.append(StudyLevel.INTERMEDIATE.value)
+            responses = self._generate_many(system_prompt, user_prompts,
+                                            max_tokens=self._output_budget("study_level"))
+        except Exception as e:
+            logger.warning(f"Failed to infer study level with AI: {e}")
+            return results
+        
+        level_votes = {text_key: [] for text_key in pending}
+        try:
+            for text_key, response in zip(prompt_owners, responses):
+                level = StudyLevel.from_complexity(item_type, str(response).strip())
+                level_votes[text_key].append(level.value)
+        except Exception as e:
+            logger.warning(f"Failed to infer study level with AI: {e}")
+            return results
+        
+        from collections import Counter
+        for text_key, (_, indices) in pending.items():
+            votes = level_votes[text_key]
+            if not votes:
+                continue
             
-            consensus_level = self._calculate_study_level_consensus(
-                level_votes, 
-                level_confidences
-            )
+            level_confidences = [0 for _ in votes]  # Placeholder for confidence if needed
+            # Consensus compares normalised votes; keep the canonical StudyLevel value
+            consensus_level = StudyLevel.from_string(
+                self._calculate_study_level_consensus(votes, level_confidences)).value
             
             # Log consensus details
-            from collections import Counter
-            import numpy as np
-            vote_counts = Counter(level_votes)
             logger.debug(f"Study level consensus: {consensus_level} "
-                    f"(votes: {dict(vote_counts)}, "
-                    f"avg confidence: {np.mean(level_confidences):.2f})")
+                    f"(votes: {dict(Counter(votes))})")
             
-            return consensus_level
-                
-        except Exception as e:
-            logger.warning(f"Failed to infer study level with AI: {e}")
-            return None
+            self.study_level_cache[text_key] = consensus_level
+            for idx in indices:
+                results[idx] = consensus_level
+        
+        return results
     
     def _calculate_study_level_consensus(self,
                                     votes: List[str],
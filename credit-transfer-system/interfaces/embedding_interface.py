@@ -2,25 +2,40 @@
 Interface for local embedding model integration with multi-GPU support
 """
 
+import importlib.util
 import logging
 import random
+import threading
 import numpy as np
-import torch
 from typing import List, Optional, Union, Dict
 import shutil
 from pathlib import Path
-from huggingface_hub import snapshot_download
 from config import Config
+from utils.quality_monitor import monitored, count, observe
 
 logger = logging.getLogger(__name__)
 
-# Import sentence-transformers
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    logger.error("sentence-transformers not installed. Please install it for embedding support.")
+# Lazy imports: torch and sentence-transformers are only needed once the model loads
+torch = None
+SentenceTransformer = None
+snapshot_download = None
+
+
+def _load_dependencies():
+    """Lazy load dependencies"""
+    global torch, SentenceTransformer, snapshot_download
+    if torch is None:
+        import torch as _torch
+        torch = _torch
+    if SentenceTransformer is None:
+        try:
+            from sentence_transformers import SentenceTransformer as _ST
+        except ImportError:
+            raise ImportError("sentence-transformers is required for embeddings. Install with: pip install sentence-transformers")
+        SentenceTransformer = _ST
+    if snapshot_download is None:
+        from huggingface_hub import snapshot_download as _download
+        snapshot_download = _download
 
 
 class EmbeddingInterface:
@@ -31,7 +46,8 @@ class EmbeddingInterface:
                  model_cache_dir: str = "/home/ehsan/.cache/huggingface/hub",
                  external_model_dir: str = "/Volumes/jsa_external_prod/external_vols/scratch/Scratch/Ehsan/Models",
                  device: str = "cuda",
-                 batch_size: int = 32):
+                 batch_size: int = 32,
+                 lazy_load: bool = True):
         """
         Initialize embedding interface with local model
         
@@ -41,8 +57,9 @@ class EmbeddingInterface:
             external_model_dir: Directory containing pre-downloaded models
             device: Device to run model on (cuda, cuda:0, cuda:1, cpu)
             batch_size: Default batch size for encoding
+            lazy_load: Defer loading torch and the model until the first encode call
         """
-        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        if importlib.util.find_spec("sentence_transformers") is None:
             raise ImportError("sentence-transformers is required for embeddings. Install with: pip install sentence-transformers")
         
         self.MODELS = Config.EMBEDDING_MODELS
@@ -60,14 +77,11 @@ class EmbeddingInterface:
             else:
                 # Default to cuda:0
                 self.device_id = 0
-            # Set CUDA device for this model
-            torch.cuda.set_device(self.device_id)
-            self.device = torch.device(f"cuda:{self.device_id}")
         else:
             self.device_id = None
-            self.device = torch.device("cpu")
+        self.device = None
         
-        logger.info(f"Embedding interface will use device: {self.device}")
+        logger.info(f"Embedding interface will use device: {self.device_str}")
         
         # Get model configuration
         if model_name not in self.MODELS:
@@ -86,13 +100,29 @@ class EmbeddingInterface:
         
         # Initialize the model
         self.model = None
-        self._initialize_model()
+        self._model_lock = threading.Lock()
+        if not lazy_load:
+            self._initialize_model()
         
         # Initialize cache
         self.cache = {}
         
     def _initialize_model(self):
-        """Initialize the SentenceTransformer model with proper device handling"""
+        """Initialize the model once; safe to call from several threads"""
+        with self._model_lock:
+            if self.model is not None:
+                return
+            _load_dependencies()
+            if self.device_id is not None:
+                # Set CUDA device for this model
+                torch.cuda.set_device(self.device_id)
+                self.device = torch.device(f"cuda:{self.device_id}")
+            else:
+                self.device = torch.device("cpu")
+            self._load_model()
+    
+    def _load_model(self):
+        """Load the SentenceTransformer model with proper device handling"""
         try:
             snapshot_location = self._get_snapshot_location()
             logger.info(f"Loading embedding model from: {snapshot_location}")
@@ -197,6 +227,7 @@ class EmbeddingInterface:
         
         return snapshot_location
     
+    @monitored("embedding.encode")
     def encode(self, texts: Union[str, List[str]], 
                batch_size: Optional[int] = None,
                show_progress: bool = False,
@@ -224,12 +255,17 @@ class EmbeddingInterface:
         
         # Use cache for single texts
         if len(texts) == 1 and texts[0] in self.cache and not convert_to_tensor:
+            count("embedding_cache_hits")
             return self.cache[texts[0]]
         
+        observe("embedding_batch_size", len(texts))
+        
         # Set batch size
         if batch_size is None:
             batch_size = self.default_batch_size
         
+        self._initialize_model()
+        
         # Ensure we're in the right CUDA context
         with torch.cuda.device(self.device_id) if self.device_id is not None else torch.cuda.device(0):
             # Double-check model is on correct device
@@ -339,7 +375,7 @@ class EmbeddingInterface:
         """Save embeddings to file"""
         import json
         
-        if torch.is_tensor(embeddings):
+        if not isinstance(embeddings, np.ndarray) and hasattr(embeddings, 'cpu'):
             embeddings = embeddings.cpu().numpy()
         
         data = {
@@ -0,0 +1,508 @@
+"""
+Offline stand-ins for the embedding and GenAI interfaces
+HashingEmbeddingInterface projects hashed words and character trigrams into a
+fixed number of signed dimensions; FakeGenAIInterface answers every
+PromptManager prompt with schema-valid JSON derived from a hash of the prompt,
+with configurable latency, failure and throughput profiles. Neither needs a
+GPU, a model download or network access, so the whole pipeline can be
+profiled and load-tested on a CPU. Select them with backend "fake" and
+embedding "hashing" (see ConfigProfiles).
+skill_taxonomy_pipeline has its own copy (src/interfaces/fake_interfaces.py):
+the projects are installed and run separately and share no package, and each
+FakeGenAIInterface follows its own project's interface and prompts. The hashing
+scheme and PROFILES are the same in both; change them together.
+"""
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from models.enums import SkillCategory, SkillContext
+from utils.converters import JSONExtraction
+from utils.quality_monitor import monitored, count, observe, span
+
+logger = logging.getLogger(__name__)
+
+
+class HashingEmbeddingInterface:
+    """Deterministic CPU embedding backend with the EmbeddingInterface API"""
+
+    def __init__(self,
+                 model_name: str = "hashing",
+                 embedding_dim: int = 384,
+                 batch_size: int = 64,
+                 seed: int = 0):
+        """
+        Initialize hashing embeddings
+
+        Args:
+            model_name: Name reported in logs and saved embeddings
+            embedding_dim: Number of hashed dimensions
+            batch_size: Default batch size (kept for API compatibility)
+            seed: Hash seed; different seeds give unrelated vector spaces
+        """
+        self.model_name = model_name
+        self.embedding_dim = embedding_dim
+        self.default_batch_size = batch_size
+        self.seed = seed
+        self.device_str = "cpu"
+        self.device = "cpu"
+        self.cache = {}
+        logger.info(f"Hashing embedding interface ready (dim={embedding_dim}, seed={seed})")
+
+    def _vector(self, text: str) -> np.ndarray:
+        """Signed feature hashing of words and character trigrams"""
+        vector = np.zeros(self.embedding_dim, dtype=np.float32)
+        text = text.lower()
+        features = text.split() + [text[i:i + 3] for i in range(max(0, len(text) - 2))]
+        for feature in features:
+            h = zlib.crc32(feature.encode(), self.seed)
+            vector[h % self.embedding_dim] += 1.0 if h & 0x80000000 else -1.0
+        return vector
+
+    @monitored("embedding.encode")
+    def encode(self, texts: Union[str, List[str]],
+               batch_size: Optional[int] = None,
+               show_progress: bool = False,
+               convert_to_tensor: bool = False,
+               normalize_embeddings: bool = True) -> np.ndarray:
+        """
+        Generate embeddings for texts
+
+        Same signature as EmbeddingInterface.encode; convert_to_tensor is
+        ignored and numpy arrays are always returned.
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+
+        if not texts:
+            return np.array([])
+
+        if len(texts) == 1 and texts[0] in self.cache:
+            count("embedding_cache_hits")
+            return self.cache[texts[0]]
+
+        observe("embedding_batch_size", len(texts))
+
+        embeddings = np.stack([self._vector(str(text)) for text in texts])
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10
+
+        if len(texts) == 1:
+            self.cache[texts[0]] = embeddings[0]
+
+        return embeddings
+
+    def encode_batch(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Encode multiple texts in batches (convenience method)"""
+        return self.encode(texts, batch_size=batch_size)
+
+    def similarity(self, embeddings1: np.ndarray, embeddings2: np.ndarray) -> np.ndarray:
+        """Calculate cosine similarity between embeddings"""
+        embeddings1 = np.atleast_2d(np.asarray(embeddings1))
+        embeddings2 = np.atleast_2d(np.asarray(embeddings2))
+        if embeddings1.shape[1] != embeddings2.shape[1]:
+            raise ValueError(f"Embedding dimensions don't match: {embeddings1.shape[1]} vs {embeddings2.shape[1]}")
+        norm1 = embeddings1 / (np.linalg.norm(embeddings1, axis=1, keepdims=True) + 1e-10)
+        norm2 = embeddings2 / (np.linalg.norm(embeddings2, axis=1, keepdims=True) + 1e-10)
+        return np.dot(norm1, norm2.T)
+
+    def similarity_score(self, text1: str, text2: str) -> float:
+        """Calculate similarity score between two texts"""
+        embeddings = self.encode([text1, text2])
+        return float(self.similarity(embeddings[0:1], embeddings[1:2])[0, 0])
+
+    def find_most_similar(self, query: str, candidates: List[str], top_k: int = 5) -> List[tuple]:
+        """Find most similar texts from candidates"""
+        if not candidates:
+            return []
+        embeddings = self.encode([query] + candidates)
+        scores = self.similarity(embeddings[0:1], embeddings[1:])[0]
+        top_indices = np.argsort(scores)[-top_k:][::-1]
+        return [(candidates[idx], float(scores[idx])) for idx in top_indices]
+
+    def save_embeddings(self, embeddings: np.ndarray, texts: List[str], filepath: str):
+        """Save embeddings to file"""
+        data = {
+            "embeddings": np.asarray(embeddings).tolist(),
+            "texts": texts,
+            "model": self.model_name,
+            "dimension": self.embedding_dim,
+            "device": self.device_str
+        }
+        with open(filepath, 'w') as f:
+            json.dump(data, f)
+        logger.info(f"Saved {len(texts)} embeddings to {filepath}")
+
+    def load_embeddings(self, filepath: str) -> tuple:
+        """Load embeddings from file"""
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        logger.info(f"Loaded {len(data['texts'])} embeddings from {filepath}")
+        return np.array(data["embeddings"]), data["texts"]
+
+    def clear_cache(self):
+        """Clear the embedding cache"""
+        self.cache.clear()
+
+    def is_available(self) -> bool:
+        return True
+
+
+class FakeBackendError(RuntimeError):
+    """Simulated LLM backend failure (timeouts, 429s, engine errors)"""
+
+
+# Simulated backend behaviour; selected with FAKE_PROFILE, individual keys can be overridden
+#   mode:             "openai" (one request per call) or "vllm" (batched generate calls)
+#   latency, jitter:  fixed seconds per request/batch, plus uniform random extra
+#   tokens_per_second: decoding speed per sequence (0 = instant)
+#   max_concurrency:  requests served at once in openai mode (0 = unlimited)
+#   batch_size:       prompts decoded together in vllm mode
+#   failure_rate:     probability a request/batch raises FakeBackendError
+#   malformed_rate:   probability a response is cut off mid-JSON
+PROFILES = {
+    "instant": {},
+    "azure": {"latency": 0.6, "jitter": 0.4, "tokens_per_second": 80, "max_concurrency": 8,
+              "failure_rate": 0.005},
+    "vllm": {"mode": "vllm", "latency": 0.05, "tokens_per_second": 150, "batch_size": 64},
+    "flaky": {"latency": 0.05, "jitter": 0.1, "tokens_per_second": 200, "failure_rate": 0.1,
+              "malformed_rate": 0.1},
+}
+
+PROFILE_DEFAULTS = {
+    "mode": "openai",
+    "latency": 0.0,
+    "jitter": 0.0,
+    "tokens_per_second": 0,
+    "max_concurrency": 0,
+    "batch_size": 32,
+    "failure_rate": 0.0,
+    "malformed_rate": 0.0,
+}
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z\-]{3,}")
+_STOPWORDS = {
+    "with", "their", "from", "this", "that", "using", "into", "through", "students", "will",
+    "including", "must", "various", "such", "both", "across", "within", "while", "learn",
+    "unit", "course", "describes", "skills", "knowledge", "required", "work", "workplace",
+}
+
+
+class FakeGenAIInterface:
+    """
+    Scriptable, deterministic LLM backend
+
+    Prompts are recognized by their PromptManager system prompt and answered
+    with JSON in the expected schema; content is drawn from a random
+    generator seeded by a hash of the prompt, so the same prompt always gets
+    the same answer. Responses for any prompt can be replaced with
+    register(). Timing and failures follow the selected profile.
+
+    In "openai" mode the interface exposes a `client` attribute and serves
+    generate_response calls independently (up to max_concurrency at once);
+    in "vllm" mode it exposes `llm` and _generate_batch decodes batch_size
+    prompts per simulated generate call. Extractors pick their code path
+    from these attributes, as they do for the real backends.
+    """
+
+    def __init__(self,
+                 profile: str = "instant",
+                 model_name: str = "fake-llm",
+                 vocabulary: Optional[List[str]] = None,
+                 skills_per_item: int = 12,
+                 seed: int = 0,
+                 **settings):
+        """
+        Initialize the fake backend
+
+        Args:
+            profile: Key in PROFILES
+            model_name: Reported as deployment/model name (part of cache keys)
+            vocabulary: Skill names to extract from; defaults to phrases of the prompt text
+            skills_per_item: Skills returned per extraction
+            seed: Seed for response content and simulated faults
+            **settings: Overrides for any PROFILE_DEFAULTS key
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown fake LLM profile '{profile}'. Available: {list(PROFILES)}")
+        unknown = set(settings) - set(PROFILE_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown fake LLM settings: {sorted(unknown)}")
+
+        self.profile = profile
+        self.settings = {**PROFILE_DEFAULTS, **PROFILES[profile],
+                         **{k: v for k, v in settings.items() if v is not None}}
+        self.mode = self.settings["mode"]
+        self.batch_size = self.settings["batch_size"]
+        self.model_name = model_name
+        self.deployment = model_name
+        self.vocabulary = vocabulary
+        self.skills_per_item = skills_per_item
+        self.seed = seed
+
+        if self.mode == "openai":
+            self.client = None
+        elif self.mode == "vllm":
+            self.llm = None
+        else:
+            raise ValueError(f"Unknown fake LLM mode '{self.mode}', expected 'openai' or 'vllm'")
+
+        max_concurrency = self.settings["max_concurrency"]
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._fault_rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._handlers = []
+        self.calls = 0
+
+        from extraction.genai_prompts import GenAIPrompts
+        self.prompts = GenAIPrompts()
+
+        logger.info(f"Fake GenAI interface ready (profile={profile}, mode={self.mode})")
+
+    # ========== SCRIPTING ==========
+
+    def register(self, marker: str, response: Union[str, Any, Callable[[str, str], Any]]):
+        """
+        Answer prompts containing marker with a fixed or computed response
+
+        Args:
+            marker: Substring of the system or user prompt
+            response: Response text, a JSON-serializable object, or a
+                callable(system_prompt, user_prompt) returning either
+
+        Later registrations take precedence over earlier ones.
+        """
+        self._handlers.insert(0, (marker, response))
+
+    # ========== GENERATION ==========
+
+    def generate_response(self, system_prompt: str, user_prompt: str, max_tokens: int = None,
+                          temperature: float = 0.0, top_p: float = 1.0) -> str:
+        """Generate a response for a single prompt"""
+        if self.mode == "vllm":
+            return self._generate_batch(system_prompt, [user_prompt], max_tokens)[0]
+
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            start = time.perf_counter()
+            failed, malformed, jitter = self._draw_faults()
+            response = self._respond(system_prompt, user_prompt, malformed)
+            self._wait(self.settings["latency"] + jitter + self._decode_seconds(response))
+            if failed:
+                count("llm_errors")
+                raise FakeBackendError("Simulated request failure")
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+        observe("llm_latency_seconds", time.perf_counter() - start)
+        count("llm_requests")
+        observe("llm_prompt_tokens", self._count_tokens(system_prompt + user_prompt))
+        observe("llm_completion_tokens", self._count_tokens(response))
+        return response
+
+    def _generate_batch(self, system_prompt: str, user_prompts: List[str],
+                        max_tokens: Union[int, List[int]] = 2048) -> List[str]:
+        """
+        Generate responses for a batch of prompts
+
+        In vllm mode prompts are decoded batch_size at a time, each chunk
+        taking as long as its longest response; a failure fails the whole
+        call, as an engine error would.
+        """
+        if self.mode == "openai":
+            return [self.generate_response(system_prompt, prompt) for prompt in user_prompts]
+
+        responses = []
+        for i in range(0, len(user_prompts), self.batch_size):
+            chunk = user_prompts[i:i + self.batch_size]
+            start = time.perf_counter()
+            with span("llm.generate"):
+                failed, _, jitter = self._draw_faults()
+                outputs = [self._respond(system_prompt, prompt, self._draw_faults()[1]) for prompt in chunk]
+                self._wait(self.settings["latency"] + jitter + max(self._decode_seconds(o) for o in outputs))
+            if failed:
+                count("llm_errors")
+                raise FakeBackendError("Simulated engine failure")
+
+            observe("llm_latency_seconds", time.perf_counter() - start)
+            observe("llm_batch_size", len(chunk))
+            count("llm_requests", len(chunk))
+            for prompt, output in zip(chunk, outputs):
+                observe("llm_prompt_tokens", self._count_tokens(system_prompt + prompt))
+                observe("llm_completion_tokens", self._count_tokens(output))
+            responses.extend(outputs)
+        return responses
+
+    def _draw_faults(self) -> tuple:
+        """(fail, malformed, jitter seconds) for the next request, in call order"""
+        with self._lock:
+            return (self._fault_rng.random() < self.settings["failure_rate"],
+                    self._fault_rng.random() < self.settings["malformed_rate"],
+                    self._fault_rng.random() * self.settings["jitter"])
+
+    def _decode_seconds(self, response: str) -> float:
+        tokens_per_second = self.settings["tokens_per_second"]
+        return self._count_tokens(response) / tokens_per_second if tokens_per_second else 0.0
+
+    @staticmethod
+    def _count_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+
+    @staticmethod
+    def _wait(seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _parse_json_response(self, response: str) -> Dict:
+        """Parse JSON from model response"""
+        try:
+            json_match = JSONExtraction.extract_json_from_text(response)
+            if json_match:
+                return json.loads(json_match)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse JSON response: {e}")
+        return {}
+
+    # ========== RESPONSES ==========
+
+    def _respond(self, system_prompt: str, user_prompt: str, malformed: bool = False) -> str:
+        with self._lock:
+            self.calls += 1
+        rng = np.random.default_rng([zlib.crc32(system_prompt.encode()), zlib.crc32(user_prompt.encode()), self.seed])
+
+        for marker, handler in self._handlers:
+            if marker in system_prompt or marker in user_prompt:
+                response = handler(system_prompt, user_prompt) if callable(handler) else handler
+                break
+        else:
+            response = self._default_response(system_prompt, user_prompt, rng)
+
+        if not isinstance(response, str):
+            response = json.dumps(response)
+        if malformed:
+            response = response[:len(response) // 2]
+        return response
+
+    def _default_response(self, system_prompt: str, user_prompt: str, rng: np.random.Generator) -> Any:
+        """Schema-valid answer for each PromptManager prompt; {} for anything else"""
+        if "multiple competency descriptions" in system_prompt:
+            texts = re.split(r"=== Text \d+[^\n]*===", user_prompt)[1:]
+            return [{"text_index": i, "skills": self._extracted_skills(text.split("\n## OUTPUT")[0], rng)}
+                    for i, text in enumerate(texts)]
+        if "skill extraction expert" in system_prompt:
+            match = re.search(r"TEXT TO ANALYZE:(.*?)(?:\n\s*## |\Z)", user_prompt, re.S)
+            return self._extracted_skills(match.group(1) if match else user_prompt, rng)
+        if "educational taxonomy expert" in system_prompt:
+            return str(rng.choice(["Introductory", "Intermediate", "Advanced"], p=[0.3, 0.5, 0.2]))
+        if "comparing human capabilities" in system_prompt:
+            return f"{rng.uniform(0.3, 0.9):.2f}"
+
+        if "relevant keywords" in system_prompt:
+            names = [n.strip() for n in re.findall(r"- Name: (.*)", user_prompt)]
+            return [{"skill_index": i, "name": n, "keywords": list(dict.fromkeys(n.lower().split()))}
+                    for i, n in enumerate(names)]
+        if "descriptions for professional skills" in system_prompt:
+            names = [n.strip() for n in re.findall(r"- Name: (.*)", user_prompt)]
+            return [{"skill_index": i, "name": n, "description": f"Applies {n.lower()} to workplace tasks"}
+                    for i, n in enumerate(names)]
+
+        names = [n.strip() for n in re.findall(r"^\s*Skill(?: \d+)?: (.*)$", user_prompt, re.M)]
+        if "skill assessment expert" in system_prompt:
+            # Combined recalibration: the guideline sections present name the fields requested
+            fields = [field for field, header in (("category", "### Category"), ("level", "### SFIA Level"),
+                                                  ("context", "### Context:")) if header in user_prompt]
+        elif "SFIA" in system_prompt:
+            fields = ["level"]
+        elif "categorization expert" in system_prompt:
+            fields = ["category"]
+        elif "context assessment expert" in system_prompt:
+            fields = ["context"]
+        else:
+            return {}
+        return [{"skill_name": name, **{field: self._field_value(field, rng) for field in fields}}
+                for name in names]
+
+    @staticmethod
+    def _field_value(field: str, rng: np.random.Generator) -> Any:
+        if field == "level":
+            return int(rng.choice([2, 3, 3, 4]))
+        if field == "category":
+            return str(rng.choice([c.value for c in SkillCategory]))
+        return str(rng.choice([c.value for c in SkillContext]))
+
+    def _skill_names(self, text: str, rng: np.random.Generator) -> List[str]:
+        """Skill names from the vocabulary, or three-word phrases of the text"""
+        if self.vocabulary:
+            pool = self.vocabulary
+        else:
+            words = [w.lower() for w in _WORD.findall(text) if w.lower() not in _STOPWORDS]
+            pool = sorted({" ".join(words[i:i + 3]) for i in range(max(0, len(words) - 2))})
+        if not pool:
+            return []
+        picks = rng.choice(len(pool), size=min(self.skills_per_item, len(pool)), replace=False)
+        return [pool[i] for i in picks]
+
+    def _extracted_skills(self, text: str, rng: np.random.Generator) -> List[Dict]:
+        # The extractors' JSON pattern rejects brackets inside objects, as a real model rarely emits them
+        sentences = [s.strip() for s in re.split(r"[.\n]", text)
+                     if len(s.strip()) > 20 and not re.search(r"[\[\]{}]", s)]
+        return [
+            {
+                "name": name,
+                "category": self._field_value("category", rng),
+                "level": self._field_value("level", rng),
+                "context": self._field_value("context", rng),
+                "confidence": round(float(rng.uniform(0.75, 0.95)), 2),
+                "evidence": sentences[rng.integers(len(sentences))][:200] if sentences else "",
+            }
+            for name in self._skill_names(text, rng)
+        ]
+
+    # ========== EDGE CASE HELPERS ==========
+    # Same entry points as the real interfaces; answers are {} unless scripted with register()
+
+    def detect_edge_cases(self, vet_text: str, uni_text: str, mapping_info: Dict) -> Dict:
+        user_prompt = f"VET content: {vet_text[:1000]}\nUniversity content: {uni_text[:1000]}\n" \
+                      f"Mapping summary: {json.dumps(mapping_info, indent=2)}"
+        return self._parse_json_response(self.generate_response(self.prompts.edge_case_detection_prompt(), user_prompt))
+
+    def determine_context(self, text: str) -> Dict:
+        return self._parse_json_response(
+            self.generate_response(self.prompts.context_determination_prompt(), f"Text to analyze:\n{text[:2000]}"))
+
+    def extract_technology_versions(self, text: str) -> Dict:
+        return self._parse_json_response(
+            self.generate_response(self.prompts.technology_version_extraction_prompt(), f"Text to analyze:\n{text[:2000]}"))
+
+    def analyze_prerequisites(self, prerequisites: List[str], course_text: str) -> Dict:
+        user_prompt = f"Prerequisites: {', '.join(prerequisites)}\nCourse context: {course_text[:1000]}"
+        return self._parse_json_response(self.generate_response(self.prompts.prerequisite_analysis_prompt(), user_prompt))
+
+    def decompose_composite_skills(self, skills: List[str]) -> Dict:
+        user_prompt = f"Skills to analyze:\n{json.dumps(skills[:30], indent=2)}"
+        return self._parse_json_response(
+            self.generate_response(self.prompts.composite_skill_decomposition_prompt(), user_prompt))
+
+    def identify_implicit_skills(self, text: str, explicit_skills: List[str]) -> List[Dict]:
+        user_prompt = f"Text: {text[:2000]}\nExplicit skills: {', '.join(explicit_skills[:30])}"
+        result = self._parse_json_response(
+            self.generate_response(self.prompts.implicit_skill_identification_prompt(), user_prompt))
+        return result.get("implicit_skills", [])
+
+    def analyze_skill_similarity(self, skill1: str, skill2: str) -> float:
+        user_prompt = f"Skill 1: {skill1}\nSkill 2: {skill2}"
+        result = self._parse_json_response(self.generate_response(self.prompts.skill_similarity_prompt(), user_prompt))
+        return result.get("similarity_score", 0.5)
+
+    def is_available(self) -> bool:
+        return True
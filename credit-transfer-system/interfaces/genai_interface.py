@@ -7,9 +7,10 @@ import json
 import logging
 import re
 import os
+import time
 from typing import List, Dict, Any, Optional
-from openai import AzureOpenAI
 from utils.converters import JSONExtraction
+from utils.quality_monitor import count, observe
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,7 @@ class GenAIInterface:
         
         # Initialize Azure OpenAI client
         try:
+            from openai import AzureOpenAI
             self.client = AzureOpenAI(
                 azure_endpoint=self.endpoint,
                 api_key=self.api_key,
@@ -102,6 +104,7 @@ class GenAIInterface:
                 }
             ]
             
+            start = time.perf_counter()
             completion = self.client.chat.completions.create(
                 model=self.deployment,
                 messages=messages,
@@ -113,10 +116,16 @@ class GenAIInterface:
                 stream=False,
                 seed=42  # Add seed for additional determinism if supported
             )
+            observe("llm_latency_seconds", time.perf_counter() - start)
+            count("llm_requests")
+            if getattr(completion, "usage", None):
+                observe("llm_prompt_tokens", completion.usage.prompt_tokens)
+                observe("llm_completion_tokens", completion.usage.completion_tokens)
             
             return completion.choices[0].message.content
             
         except Exception as e:
+            count("llm_errors")
             logger.error(f"Azure OpenAI API request failed: {e}")
             raise
     
@@ -2,13 +2,12 @@
 Factory for creating appropriate GenAI interfaces based on configuration
 """
 
+import importlib.util
 import logging
 import os
 from typing import Optional, Union
 from pathlib import Path
 
-import torch
-
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +31,8 @@ class ModelFactory:
             return ModelFactory._create_openai_interface(config)
         elif backend_type == 'vllm':
             return ModelFactory._create_vllm_interface(config)
+        elif backend_type == 'fake':
+            return ModelFactory._create_fake_interface(config)
         else:
             logger.warning(f"Unknown backend type: {backend_type}")
             return None
@@ -75,7 +76,9 @@ class ModelFactory:
                 model_cache_dir=getattr(config, 'MODEL_CACHE_DIR', '/root/.cache/huggingface/hub'),
                 external_model_dir=getattr(config, 'EXTERNAL_MODEL_DIR', None),
                 gpu_memory_utilization=getattr(config, 'GPU_MEMORY_UTILIZATION', 0.85),
-                gpu_id=0  # Using GPU 0
+                gpu_id=0,  # Using GPU 0
+                enable_prefix_caching=getattr(config, 'ENABLE_PREFIX_CACHING', True),
+                lazy_load=getattr(config, 'LAZY_MODEL_LOAD', True)
             )
             
             logger.info(f"Created vLLM batch interface with model: {config.MODEL_NAME}")
@@ -87,11 +90,45 @@ class ModelFactory:
             logger.error(f"Failed to create vLLM interface: {e}")
             return None
     
+    @staticmethod
+    def _create_fake_interface(config):
+        """Create offline fake interface (no model, no network)"""
+        try:
+            from interfaces.fake_interfaces import FakeGenAIInterface
+            
+            interface = FakeGenAIInterface(
+                profile=getattr(config, 'FAKE_PROFILE', 'instant'),
+                model_name=getattr(config, 'MODEL_NAME', 'fake-llm'),
+                seed=getattr(config, 'FAKE_SEED', 0),
+                mode=getattr(config, 'FAKE_MODE', None),
+                latency=getattr(config, 'FAKE_LATENCY', None),
+                failure_rate=getattr(config, 'FAKE_FAILURE_RATE', None),
+                tokens_per_second=getattr(config, 'FAKE_TOKENS_PER_SECOND', None)
+            )
+            
+            logger.info(f"Created fake GenAI interface with profile: {interface.profile} ({interface.mode} mode)")
+            return interface
+            
+        except Exception as e:
+            logger.error(f"Failed to create fake interface: {e}")
+            return None
+    
     @staticmethod
     def create_embedding_interface(config, device_override: str = None):
         """
         Create embedding interface using merged configuration
         """
+        if getattr(config, 'EMBEDDING_MODEL', None) == 'hashing':
+            from interfaces.fake_interfaces import HashingEmbeddingInterface
+            
+            interface = HashingEmbeddingInterface(
+                embedding_dim=getattr(config, 'EMBEDDING_DIM', 384),
+                batch_size=getattr(config, 'EMBEDDING_BATCH_SIZE', 64),
+                seed=getattr(config, 'FAKE_SEED', 0)
+            )
+            logger.info(f"Created hashing embedding interface (dim={interface.embedding_dim})")
+            return interface
+        
         try:
             from interfaces.embedding_interface import EmbeddingInterface
             
@@ -107,7 +144,8 @@ class ModelFactory:
                 model_cache_dir=getattr(config, 'MODEL_CACHE_DIR', '/root/.cache/huggingface/hub'),
                 external_model_dir=getattr(config, 'EXTERNAL_MODEL_DIR', None),
                 device=device,
-                batch_size=batch_size
+                batch_size=batch_size,
+                lazy_load=getattr(config, 'LAZY_MODEL_LOAD', True)
             )
             
             logger.info(f"Created embedding interface: {embedding_model} on {device} (batch_size={batch_size})")
@@ -130,11 +168,11 @@ class ModelFactory:
             except ImportError:
                 pass
         
-        # Check vLLM
-        try:
-            import vllm
+        # Check vLLM (locate the package only; importing it initialises torch/CUDA)
+        if importlib.util.find_spec("vllm") is not None:
             available.append("vllm")
-        except ImportError:
-            pass
+        
+        # The offline fake backend needs nothing beyond numpy
+        available.append("fake")
         
         return available
\ No newline at end of file
@@ -1,25 +1,60 @@
 """
 Interface for local GenAI model integration using vLLM with true batch processing
 """
+import importlib.util
 import os
 import json
 import logging
 import re
 import shutil
-import torch
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
-from huggingface_hub import snapshot_download
 from config import Config
 from utils.converters import JSONExtraction
-from vllm import LLM, SamplingParams
+from utils.quality_monitor import count, observe, span
 
 logger = logging.getLogger(__name__)
 
+# Lazy imports: vLLM pulls in torch and CUDA, which only the model load needs
+LLM = None
+SamplingParams = None
+snapshot_download = None
+
+
+def _load_dependencies():
+    """Lazy load dependencies"""
+    global LLM, SamplingParams, snapshot_download
+    if LLM is None:
+        from vllm import LLM as _LLM, SamplingParams as _SamplingParams
+        LLM, SamplingParams = _LLM, _SamplingParams
+    if snapshot_download is None:
+        from huggingface_hub import snapshot_download as _download
+        snapshot_download = _download
+
 
 class VLLMGenAIInterfaceBatch:
     """Interface for local GenAI model integration using vLLM with batch processing"""
     
+    # Expected response size per task as (fixed tokens, tokens per requested item)
+    OUTPUT_TOKEN_BUDGETS = {
+        "default": (2048, 0),
+        "skill_extraction": (2048, 0),
+        "skill_description": (64, 160),
+        "skill_keywords": (64, 96),
+        "level_assignment": (64, 96),
+        "recalibration": (64, 128),
+        "study_level": (16, 0),
+        "context": (512, 0),
+    }
+    
+    # Extra room for templates that emit a reasoning channel before the answer
+    REASONING_TOKEN_OVERHEAD = {"GPT": 512}
+    
+    # Fallback when the tokenizer is unavailable
+    CHARS_PER_TOKEN = 4
+    
     def __init__(self, 
                  model_name: str = "meta-llama--Llama-3.1-8B-Instruct",
                  number_gpus: int = 1,
@@ -28,7 +63,10 @@ class VLLMGenAIInterfaceBatch:
                  model_cache_dir: str = "/root/.cache/huggingface/hub",
                  external_model_dir: str = "/Volumes/jsa_external_prod/external_vols/scratch/Scratch/Ehsan/Models",
                  gpu_memory_utilization: float = 0.85,
-                 gpu_id: int = 0):  # Add explicit GPU ID parameter
+                 gpu_id: int = 0,  # Add explicit GPU ID parameter
+                 enable_prefix_caching: bool = True,
+                 min_output_tokens: int = 64,
+                 lazy_load: bool = True):
         """
         Initialize vLLM GenAI interface with batch processing
         
@@ -40,7 +78,13 @@ class VLLMGenAIInterfaceBatch:
             model_cache_dir: Directory for HuggingFace cache
             external_model_dir: Directory containing pre-downloaded models
             gpu_id: GPU ID to use (default 0)
+            enable_prefix_caching: Reuse KV cache for the shared system-prompt prefix
+            min_output_tokens: Smallest output budget kept when a prompt nearly fills the context
+            lazy_load: Defer loading the model until the first generate call
         """
+        if importlib.util.find_spec("vllm") is None:
+            raise ImportError("vllm is required for the vLLM backend. Install with: pip install vllm")
+        
         self.MODELS = Config.MODELS
         self.model_name = model_name
         self.number_gpus = number_gpus
@@ -50,16 +94,8 @@ class VLLMGenAIInterfaceBatch:
         self.external_model_dir = Path(external_model_dir)
         self.gpu_memory_utilization = gpu_memory_utilization
         self.gpu_id = gpu_id
-        
-        # Set environment variable to control GPU visibility for vLLM
-        if self.number_gpus == 1:
-            os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_id)
-            logger.info(f"Set CUDA_VISIBLE_DEVICES={gpu_id} for vLLM batch interface")
-        else:
-            # For multi-GPU, set the range starting from gpu_id
-            gpu_list = ",".join(str(gpu_id + i) for i in range(number_gpus))
-            os.environ["CUDA_VISIBLE_DEVICES"] = gpu_list
-            logger.info(f"Set CUDA_VISIBLE_DEVICES={gpu_list} for vLLM batch interface")
+        self.enable_prefix_caching = enable_prefix_caching
+        self.min_output_tokens = min_output_tokens
         
         # Get model configuration
         if model_name not in self.MODELS:
@@ -72,12 +108,40 @@ class VLLMGenAIInterfaceBatch:
         from extraction.genai_prompts import GenAIPrompts
         self.prompts = GenAIPrompts()
         
+        # Requests from concurrent callers are coalesced into shared generate calls
+        self._pending_requests = []
+        self._pending_lock = threading.Lock()
+        self._generate_lock = threading.Lock()
+        
         # Initialize the model
         self.llm = None
-        self._initialize_model()
+        self.tokenizer = None
+        self._sampling_params = {}
+        self._model_lock = threading.Lock()
+        if not lazy_load:
+            self._initialize_model()
         
     def _initialize_model(self):
-        """Initialize the vLLM model"""
+        """Initialize the vLLM model (once; safe to call from several threads)"""
+        with self._model_lock:
+            if self.llm is not None:
+                return
+            self._load_model()
+    
+    def _load_model(self):
+        """Load the vLLM engine and tokenizer on the configured GPU(s)"""
+        _load_dependencies()
+        
+        # Control GPU visibility for vLLM while the engine starts; the previous
+        # value is restored so a lazily loaded engine leaves other models alone
+        previous_devices = os.environ.get("CUDA_VISIBLE_DEVICES")
+        if self.number_gpus == 1:
+            gpu_list = str(self.gpu_id)
+        else:
+            # For multi-GPU, set the range starting from gpu_id
+            gpu_list = ",".join(str(self.gpu_id + i) for i in range(self.number_gpus))
+        os.environ["CUDA_VISIBLE_DEVICES"] = gpu_list
+        logger.info(f"Set CUDA_VISIBLE_DEVICES={gpu_list} for vLLM batch interface")
         try:
             snapshot_location = self._get_snapshot_location()
             logger.info(f"Loading model from: {snapshot_location}")
@@ -87,13 +151,24 @@ class VLLMGenAIInterfaceBatch:
                 model=snapshot_location,
                 tensor_parallel_size=self.number_gpus,
                 max_model_len=self.max_model_len,
-                gpu_memory_utilization=self.gpu_memory_utilization  # Allow vLLM to use 90% of GPU memory
+                gpu_memory_utilization=self.gpu_memory_utilization,  # Allow vLLM to use 90% of GPU memory
+                enable_prefix_caching=self.enable_prefix_caching
             )
             logger.info(f"Successfully loaded model: {self.model_name} on GPU(s) specified by CUDA_VISIBLE_DEVICES")
             
+            try:
+                self.tokenizer = self.llm.get_tokenizer()
+            except Exception as e:
+                logger.warning(f"Tokenizer unavailable, estimating prompt lengths from characters: {e}")
+            
         except Exception as e:
             logger.error(f"Failed to initialize model: {e}")
             raise
+        finally:
+            if previous_devices is None:
+                os.environ.pop("CUDA_VISIBLE_DEVICES", None)
+            else:
+                os.environ["CUDA_VISIBLE_DEVICES"] = previous_devices
     
     def _get_snapshot_location(self, copy_model: bool = False) -> str:
         """Get or download model snapshot location"""
@@ -145,25 +220,164 @@ class VLLMGenAIInterfaceBatch:
         else:  # Default Mistral format
             return f'<s> [INST] {sys_message} [/INST]\nUser: {query}\nAssistant: '
     
-    def _generate_batch(self, system_prompt: str, user_prompts: List[str], max_tokens: int = 2048) -> List[str]:
-        """Generate responses for a batch of prompts"""
-        full_prompts = [
-            self._format_instruction(system_prompt, user_prompt) 
-            for user_prompt in user_prompts
+    # ========== TOKEN BUDGETING ==========
+    
+    def output_budget(self, task: str, n_items: int = 1) -> int:
+        """
+        Output token budget for a request, sized to its expected response
+        
+        Args:
+            task: Key in OUTPUT_TOKEN_BUDGETS
+            n_items: Number of items (e.g. skills) the response covers
+        """
+        base, per_item = self.OUTPUT_TOKEN_BUDGETS.get(task, self.OUTPUT_TOKEN_BUDGETS["default"])
+        budget = base + per_item * max(1, n_items) + self.REASONING_TOKEN_OVERHEAD.get(self.template, 0)
+        return min(budget, self.max_model_len // 2)
+    
+    def _count_tokens(self, text: str) -> int:
+        """Prompt length in tokens, using the model tokenizer when loaded"""
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text, add_special_tokens=False))
+        return len(text) // self.CHARS_PER_TOKEN + 1
+    
+    def _truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        """Cut text down to at most max_tokens tokens"""
+        if self.tokenizer is not None:
+            token_ids = self.tokenizer.encode(text, add_special_tokens=False)
+            return self.tokenizer.decode(token_ids[:max_tokens])
+        return text[:max_tokens * self.CHARS_PER_TOKEN]
+    
+    def _fit_prompt(self, system_prompt: str, user_prompt: str, max_tokens: int) -> tuple:
+        """
+        Format a prompt and fit it together with its output budget into the context
+        
+        The output budget is shrunk first; if the prompt alone leaves less than
+        min_output_tokens, the user prompt is truncated (the system prompt is
+        kept intact since it holds the formatting rules).
+        
+        Returns:
+            (full_prompt, prompt_tokens, max_tokens)
+        """
+        full_prompt = self._format_instruction(system_prompt, user_prompt)
+        prompt_tokens = self._count_tokens(full_prompt)
+        room = self.max_model_len - prompt_tokens
+        
+        if room >= max_tokens:
+            return full_prompt, prompt_tokens, max_tokens
+        
+        output_tokens = min(max_tokens, max(self.min_output_tokens, room))
+        if room >= output_tokens:
+            return full_prompt, prompt_tokens, output_tokens
+        
+        overhead = self._count_tokens(self._format_instruction(system_prompt, ""))
+        available_for_user = max(self.max_model_len - overhead - output_tokens, 0)
+        logger.warning(f"Truncating user prompt from {prompt_tokens - overhead} to {available_for_user} tokens "
+                       f"to fit max_model_len={self.max_model_len}")
+        full_prompt = self._format_instruction(system_prompt, self._truncate_to_tokens(user_prompt, available_for_user))
+        return full_prompt, self._count_tokens(full_prompt), output_tokens
+    
+    def _get_sampling_params(self, max_tokens: int) -> "SamplingParams":
+        """Deterministic sampling params, shared per output budget"""
+        if max_tokens not in self._sampling_params:
+            self._sampling_params[max_tokens] = SamplingParams(
+                max_tokens=max_tokens,
+                temperature=0.0,
+                top_p=1,
+                frequency_penalty=0,
+                presence_penalty=0,
+                n=1,
+                best_of=1
+            )
+        return self._sampling_params[max_tokens]
+    
+    # ========== GENERATION ==========
+    
+    def _generate_batch(self, system_prompt: str, user_prompts: List[str],
+                        max_tokens: Union[int, List[int]] = 2048) -> List[str]:
+        """
+        Generate responses for a batch of prompts
+        
+        Each prompt is checked against max_model_len with the tokenizer and gets
+        its own output budget (max_tokens may be one value or one per prompt).
+        
+        Safe to call from several threads: the vLLM engine is driven by one
+        thread at a time, and whichever caller holds it also runs every request
+        queued by other threads in the same generate call.
+        """
+        if max_tokens is None:
+            max_tokens = 2048
+        self._initialize_model()
+        budgets = max_tokens if isinstance(max_tokens, list) else [max_tokens] * len(user_prompts)
+        
+        fitted = [
+            self._fit_prompt(system_prompt, user_prompt, budget)
+            for user_prompt, budget in zip(user_prompts, budgets)
         ]
         
-        sampling_params = SamplingParams(
-            max_tokens=max_tokens,
-            temperature=0.0,
-            top_p=1,
-            frequency_penalty=0,
-            presence_penalty=0,
-            n=1,
-            best_of=1
-        )
-        
-        outputs = self.llm.generate(full_prompts, sampling_params=sampling_params, use_tqdm=False)
-        return [output.outputs[0].text for output in outputs]
+        request = {
+            "system_prompt": system_prompt,
+            "prompts": [prompt for prompt, _, _ in fitted],
+            "prompt_tokens": [tokens for _, tokens, _ in fitted],
+            "max_tokens": [budget for _, _, budget in fitted],
+            "outputs": None,
+            "error": None
+        }
+        with self._pending_lock:
+            self._pending_requests.append(request)
+        
+        with self._generate_lock:
+            # Another caller may already have served this request
+            if request["outputs"] is None and request["error"] is None:
+                with self._pending_lock:
+                    pending, self._pending_requests = self._pending_requests, []
+                self._run_coalesced(pending)
+        
+        if request["error"] is not None:
+            raise request["error"]
+        return request["outputs"]
+    
+    def _run_coalesced(self, requests: List[Dict[str, Any]]):
+        """
+        Run queued requests in a single generate call
+        
+        Prompts sharing a system prompt are placed next to each other so their
+        common prefix stays hot in the prefix cache, longest first within each
+        group; every prompt carries its own output budget.
+        """
+        entries = [
+            (request["system_prompt"], -request["prompt_tokens"][k], r, k)
+            for r, request in enumerate(requests)
+            for k in range(len(request["prompts"]))
+        ]
+        entries.sort(key=lambda e: (e[0], e[1]))
+        
+        prompts = [requests[r]["prompts"][k] for _, _, r, k in entries]
+        sampling_params = [self._get_sampling_params(requests[r]["max_tokens"][k]) for _, _, r, k in entries]
+        if len(requests) > 1:
+            logger.debug(f"Coalesced {len(requests)} requests into one generate call ({len(prompts)} prompts)")
+        
+        try:
+            start = time.perf_counter()
+            with span("llm.generate"):
+                outputs = self.llm.generate(prompts, sampling_params=sampling_params, use_tqdm=False)
+        except Exception as e:
+            count("llm_errors")
+            for request in requests:
+                request["error"] = e
+            return
+        
+        observe("llm_latency_seconds", time.perf_counter() - start)
+        observe("llm_batch_size", len(prompts))
+        count("llm_requests", len(prompts))
+        for _, _, r, k in entries:
+            observe("llm_prompt_tokens", requests[r]["prompt_tokens"][k])
+        for output in outputs:
+            observe("llm_completion_tokens", len(output.outputs[0].token_ids))
+        
+        for request in requests:
+            request["outputs"] = [None] * len(request["prompts"])
+        for (_, _, r, k), output in zip(entries, outputs):
+            requests[r]["outputs"][k] = output.outputs[0].text
 
     def generate_response(self, system_prompt: str, user_prompt: str, max_tokens: int = 2048) -> str:
         """
@@ -217,7 +431,7 @@ Mapping summary: {json.dumps(mapping_info, indent=2)}"""
         all_results = []
         for i in range(0, len(user_prompts), self.batch_size):
             batch = user_prompts[i:i + self.batch_size]
-            responses = self._generate_batch(system_prompt, batch, max_tokens=512)
+            responses = self._generate_batch(system_prompt, batch, max_tokens=self.output_budget("context"))
             
             for response in responses:
                 all_results.append(self._parse_json_response(response))
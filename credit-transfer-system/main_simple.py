@@ -15,9 +15,11 @@ from analysis.simplified_analyzer import SimplifiedAnalyzer
 from utils.quality_monitor import QualityMonitor
 from reporting.report_generator import ReportGenerator
 
-# Existing imports
-from models.base_models import VETQualification, UniQualification, UnitOfCompetency, UniCourse
-import json
+from utils.qualification_io import load_vet_data, load_uni_data
+from analysis_service import (
+    AnalysisService, AnalysisServiceClient, ServiceBusy, DEFAULT_HOST, DEFAULT_PORT,
+    default_service_url, serve, write_analysis_outputs
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,70 +30,75 @@ logger = logging.getLogger(__name__)
 # At system initialization:
 import random
 import numpy as np
-import torch
 
-def set_global_seed(seed=42):
+def set_global_seed(seed=42, seed_torch=True):
     random.seed(seed)
     np.random.seed(seed)
+    # torch takes seconds to import, so runs whose models never use it skip it
+    if not seed_torch:
+        return
+    try:
+        import torch
+    except ImportError:
+        return
     torch.manual_seed(seed)
     torch.cuda.manual_seed_all(seed)
     torch.backends.cudnn.deterministic = True
     torch.backends.cudnn.benchmark = False
 
 
-def load_vet_data(filepath: str) -> VETQualification:
-    """Load VET qualification data"""
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    
-    vet_qual = VETQualification(
-        code=data["code"],
-        name=data["name"],
-        level=data["level"]
-    )
-    
-    for unit_data in data.get("units", []):
-        unit = UnitOfCompetency(
-            code=unit_data["code"],
-            name=unit_data["name"],
-            description=unit_data.get("description", ""),
-            study_level=unit_data.get("study_level", ""),
-            learning_outcomes=unit_data.get("learning_outcomes", []),
-            assessment_requirements=unit_data.get("assessment_requirements", ""),
-            nominal_hours=unit_data.get("nominal_hours", 0) if unit_data.get("nominal_hours") is not None else 0,  # Default to 0 instead of None
-            prerequisites=unit_data.get("prerequisites", [])
-        )
-        vet_qual.units.append(unit)
-    
-    return vet_qual
+def service_mismatch(health: dict, config, profile: str):
+    """Why a service with this /health status can't run the requested analysis, or None if it can"""
+    expected = {
+        "backend": config.get_model_info(),
+        "embedding": config.get_embedding_info(),
+        "profile": profile,
+    }
+    for key, value in expected.items():
+        if health.get(key) != value:
+            return f"it runs {key} '{health.get(key)}', not '{value}'"
+    return None
 
 
-def load_uni_data(filepath: str) -> UniQualification:
-    """Load university qualification data"""
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    
-    uni_qual = UniQualification(
-        code=data["code"],
-        name=data["name"]
-    )
+def run_via_service(client: AnalysisServiceClient, args) -> int:
+    """Run the analysis on a running service; returns the exit status"""
+    job = {
+        "vet_file": str(Path(args.vet_file).resolve()),
+        "uni_file": str(Path(args.uni_file).resolve()),
+        "output": str(Path(args.output).resolve()),
+        # The report package goes where an in-process run would write it
+        "report_dir": str(Path("output").resolve()),
+        "depth": args.depth,
+        "use_cached_skills": args.use_cached_skills,
+        "clear_cache": args.clear_cache,
+    }
+    logger.info(f"Delegating analysis to service at {client.url}")
+    try:
+        result = client.analyze(job)
+    except ServiceBusy as e:
+        logger.error(f"Analysis service is busy: {e} (retry in {e.retry_after:.0f}s or use --no-service)")
+        return 1
+    except Exception as e:
+        logger.error(f"Analysis failed: {e}")
+        return 1
     
-    for course_data in data.get("courses", []):
-        course = UniCourse(
-            code=course_data["code"],
-            name=course_data["name"],
-            description=course_data.get("description", ""),
-            study_level=course_data.get("study_level", "intermediate"),
-            learning_outcomes=course_data.get("learning_outcomes", []),
-            prerequisites=course_data.get("prerequisites", []),
-            credit_points=course_data.get("credit_points", 0),
-            topics=course_data.get("topics", []),
-            assessment=course_data.get("assessment", ""),
-            year=int(course_data.get("year"))
-        )
-        uni_qual.courses.append(course)
+    print("\n" + "="*60)
+    print("ANALYSIS COMPLETE (service)")
+    print("="*60)
+    print(f"Backend: {result['backend']}")
+    print(f"Profile: {result['profile']}")
+    print(f"Depth: {result['depth']}")
+    print(f"Time: {result['analysis_seconds']:.2f} seconds (queued {result['queue_seconds']:.2f}s)")
+    print(f"Recommendations: {result['recommendation_count']}")
     
-    return uni_qual
+    if result["recommendations"]:
+        print("\nTop Recommendations:")
+        for i, rec in enumerate(result["recommendations"][:5], 1):
+            print(f"{i}. {' + '.join(rec['vet_units'])} → {rec['uni_course']}")
+            print(f"   Score: {rec['score']:.1%} | Type: {rec['type']}")
+    
+    print(f"\nResults saved to: {result['files']['recommendations']}")
+    return 0
 
 
 def main():
@@ -114,9 +121,10 @@ def main():
     # Backend selection
     parser.add_argument(
         "--backend",
-        choices=["openai", "vllm", "auto"],
+        choices=["openai", "vllm", "fake", "auto"],
         default="auto",
-        help="AI backend: openai (Azure OpenAI), vllm (local), or auto (default: auto)"
+        help="AI backend: openai (Azure OpenAI), vllm (local), fake (offline, deterministic) "
+             "or auto (default: auto)"
     )
     
     # Model options
@@ -165,8 +173,8 @@ def main():
     
     parser.add_argument(
     "--embedding",
-    choices=["jina", "minilm", "bge", "e5"],
-    help="Embedding model to use (default: from profile)"
+    choices=["jina", "minilm", "bge", "e5", "hashing"],
+    help="Embedding model to use (default: from profile; hashing with --backend fake)"
     )
 
     parser.add_argument(
@@ -199,6 +207,57 @@ def main():
         default=True,
         help="Use pre-extracted skills if available (default: True)"
     )
+    
+    parser.add_argument(
+        "--vet-file",
+        default="./data/BSB50120_Diploma_of_Business.json",
+        help="Path to VET qualification JSON"
+    )
+    
+    parser.add_argument(
+        "--uni-file",
+        default="./data/933AA_Diploma_of_Business.json",
+        help="Path to university qualification JSON"
+    )
+    
+    # Analysis service
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a long-lived analysis service that keeps models warm"
+    )
+    
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Service bind address (default: {DEFAULT_HOST})"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Service port (default: {DEFAULT_PORT})"
+    )
+    
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        help="Jobs the service accepts before rejecting with 503 (default: 8)"
+    )
+    
+    parser.add_argument(
+        "--service-url",
+        default=default_service_url(),
+        help="Analysis service to delegate to when it is running with the same backend, embedding and "
+             "profile and --monitor is off (default: $ANALYSIS_SERVICE_URL or local port)"
+    )
+    
+    parser.add_argument(
+        "--no-service",
+        action="store_true",
+        help="Always analyze in this process, even if a service is running"
+    )
     args = parser.parse_args()
     
     args.extract_skills = False
@@ -225,13 +284,29 @@ def main():
     if args.embedding_device:
         overrides["EMBEDDING_DEVICE"] = args.embedding_device
     
-    set_global_seed(42)  # Set global seed for reproducibility
-    args.backend = 'openai'
+    if args.backend != 'fake':
+        args.backend = 'openai'
     config = ConfigProfiles.create_config(
         profile_name=args.profile,
         backend=args.backend,
         embedding=args.embedding  # Add embedding selection
     )
+    
+    # Delegate to a running analysis service, which already has the models loaded
+    if not args.serve and not args.no_service:
+        if args.monitor:
+            logger.info("Quality monitoring covers this process only - analyzing in-process")
+        else:
+            client = AnalysisServiceClient(args.service_url)
+            health = client.health()
+            if health is not None:
+                mismatch = service_mismatch(health, config, args.profile)
+                if mismatch is None:
+                    sys.exit(run_via_service(client, args))
+                logger.warning(f"Not using the analysis service at {client.url}: {mismatch} - analyzing in-process")
+    
+    # Set global seed for reproducibility
+    set_global_seed(42, seed_torch=config.IS_VLLM or config.get("EMBEDDING_MODEL") != "hashing")
 
     args.verbose = True  # Set to True for detailed config output
     if args.verbose:
@@ -242,12 +317,15 @@ def main():
     logger.info(f"Analysis depth: {args.depth}")
     
     # Initialize quality monitor
-    monitor = QualityMonitor() if args.monitor else None
-    args.vet_file = "./data/BSB50120_Diploma_of_Business.json"
-    args.uni_file = "./data/933AA_Diploma_of_Business.json"
+    monitor = QualityMonitor().activate() if args.monitor else None
+    
+    if args.serve:
+        service = AnalysisService(config, profile=args.profile, max_queue=args.max_queue).start()
+        serve(service, host=args.host, port=args.port)
+        if monitor:
+            logger.info(f"Quality metrics saved to {monitor.save_session()}")
+        return
     
-    # args.vet_file = "./data/sample_vet.json"
-    # args.uni_file = "./data/sample_uni.json"
     try:
         # Load data
         logger.info("Loading qualifications...")
@@ -315,56 +393,18 @@ def main():
         logger.info(f"Analysis completed in {analysis_time:.2f} seconds")
         logger.info(f"Generated {len(recommendations)} recommendations")
         
-        # Save results
+        # Save results, HTML report and report package
         output_path = Path(args.output)
-        output_path.parent.mkdir(exist_ok=True)
-        
-        # Add backend info to output
-        analyzer.export_results(recommendations, str(output_path))
-        
-        # Generate report
-        report_gen = ReportGenerator()
-        html_path = output_path.with_suffix('.html')
-        
-        # Generate enhanced HTML report
-        html_content = report_gen.generate_html_report(
-            recommendations, vet_qual, uni_qual
-        )
-        
-        # Add backend info to HTML
-        backend_info = f"""
-        <div class='summary-box'>
-            <h3>Analysis Configuration</h3>
-            <p><strong>Backend:</strong> {config.get_model_info()}</p>
-            <p><strong>Profile:</strong> {args.profile}</p>
-            <p><strong>Depth:</strong> {args.depth}</p>
-            <p><strong>Processing Time:</strong> {analysis_time:.2f} seconds</p>
-        </div>
-        """
-        
-        # Insert backend info after the title
-        html_content = html_content.replace(
-            "<h1>Credit Transfer Analysis Report</h1>",
-            f"<h1>Credit Transfer Analysis Report</h1>\n{backend_info}"
-        )
-        
-        with open(html_path, 'w') as f:
-            f.write(html_content)
-        
-        logger.info(f"HTML report saved to {html_path}")
-        
-        logger.info("Exporting extracted skills...")
-        
-        # Generate complete report package including skills
-        files = report_gen.generate_complete_report_package(
-            recommendations, vet_qual, uni_qual
+        files = write_analysis_outputs(
+            analyzer, ReportGenerator(), recommendations, vet_qual, uni_qual,
+            output=args.output, backend_info=config.get_model_info(),
+            profile=args.profile, depth=args.depth, analysis_time=analysis_time
         )
         
         logger.info("Report package generated:")
         for file_type, filepath in files.items():
             logger.info(f"  {file_type}: {filepath}")
         # Save quality metrics if monitoring
-        monitor = False
         if monitor:
             # Log metrics
             if len(recommendations) > 0:
@@ -379,6 +419,9 @@ def main():
             
             session_file = monitor.save_session()
             logger.info(f"Quality metrics saved to {session_file}")
+            logger.info(f"Prometheus metrics saved to {monitor.export_metrics(format='prometheus')}")
+            logger.info(f"Run metrics appended to {monitor.export_metrics(monitor.log_dir / 'metrics.jsonl', format='jsonl')}")
+            print("\n" + monitor.flame_summary())
             
             # Print suggestions
             suggestions = monitor.suggest_improvements()
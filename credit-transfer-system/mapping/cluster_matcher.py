@@ -3,17 +3,16 @@ Enhanced clustering-based skill matcher with proper level-aware matching
 """
 
 import json
+import time
 import numpy as np
 from typing import List, Dict, Any, Tuple, Optional
-from sklearn.cluster import DBSCAN, AgglomerativeClustering
-from sklearn.metrics.pairwise import cosine_similarity
 from dataclasses import dataclass
 import logging
-from mapping.clustering_algo import GridSearchSkillsClusterer
 from models.base_models import Skill
 from models.enums import SkillLevel
 from utils.json_encoder import dumps, loads, make_json_serializable
 from mapping.simple_mapping_types import SimpleMappingClassifier
+from utils.quality_monitor import monitored, span, observe
 
 
 logger = logging.getLogger(__name__)
@@ -87,6 +86,7 @@ class ClusterSkillMatcher:
             ('hybrid', 'hybrid'): 1.0,
         }
     
+    @monitored("matching.match_skills")
     def match_skills(self, 
                      vet_skills: List[Skill], 
                      uni_skills: List[Skill]) -> Dict[str, Any]:
@@ -120,6 +120,7 @@ class ClusterSkillMatcher:
             "unmapped_uni": self._find_unmapped_skills(uni_skills, final_matches, 'uni')
         }
     
+    @monitored("matching.semantic_clustering")
     def _perform_semantic_clustering(self, 
                                      vet_skills: List[Skill], 
                                      uni_skills: List[Skill]) -> List[Dict]:
@@ -127,6 +128,10 @@ class ClusterSkillMatcher:
         Stage 1: Pure semantic clustering based only on skill name embeddings
         This preserves the semantic space integrity
         """
+        # scikit-learn takes seconds to import; runs served from cache never get here
+        from sklearn.metrics.pairwise import cosine_similarity
+        from mapping.clustering_algo import GridSearchSkillsClusterer
+        
         all_skills = vet_skills + uni_skills
         skill_origins = ['vet'] * len(vet_skills) + ['uni'] * len(uni_skills)
         
@@ -149,7 +154,10 @@ class ClusterSkillMatcher:
                                                       embedding_models=[self.config.get("EMBEDDING_MODEL", None)] if self.embeddings else [None],
                                                       embedders={self.config.get("EMBEDDING_MODEL", None): embeddings_matrix},
                                                       clustering_algorithms=['kmeans'])
-        labels = grid_clusterer.grid_search_clustering(skills=[s.name for s in all_skills], embeddings_available=True)
+        start = time.perf_counter()
+        with span("clustering.grid_search"):
+            labels = grid_clusterer.grid_search_clustering(skills=[s.name for s in all_skills], embeddings_available=True)
+        observe("clustering_seconds", time.perf_counter() - start)
         
         # Process clusters
         semantic_clusters = []
@@ -1,8 +1,6 @@
 from typing import List
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.cluster import KMeans, DBSCAN, AgglomerativeClustering, MiniBatchKMeans
 from sklearn.mixture import GaussianMixture
 from sklearn.decomposition import PCA, TruncatedSVD, IncrementalPCA
@@ -16,36 +14,17 @@ from scipy.spatial.distance import pdist, cdist
 from scipy.stats import entropy
 import re
 import gc
-import psutil
 import os
 from collections import Counter, defaultdict
 import warnings
-from sentence_transformers.util import cos_sim
 import itertools
 import time
 from datetime import datetime
 warnings.filterwarnings('ignore')
 
-# Import sentence transformers - required for job skills clustering
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-    print("✅ SentenceTransformers available - perfect for job skills clustering")
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    print("❌ SentenceTransformers required for job skills clustering!")
-    print("   Install with: pip install sentence-transformers")
-    raise ImportError("SentenceTransformers is required for job skills clustering. Install with: pip install sentence-transformers")
-
-# Try to import transformers for additional models
-try:
-    from transformers import AutoTokenizer, AutoModel
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-    print("✅ Transformers available for additional embedding options")
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    print("⚠️  Transformers not available (optional). Install with: pip install transformers torch")
+# Heavy optional dependencies (sentence-transformers, psutil, matplotlib/seaborn)
+# are imported where they are used so importing this module stays cheap; the
+# plotting helpers live in mapping/clustering_plots.py
 
 class GridSearchSkillsClusterer:
     def __init__(self, memory_limit_gb=4, batch_size=1000, 
@@ -104,6 +83,8 @@ class GridSearchSkillsClusterer:
         # Remove duplicates while preserving order
         models_to_load = list(dict.fromkeys(models_to_load))
         
+        from sentence_transformers import SentenceTransformer
+
         print(f"Loading {len(models_to_load)} embedding models for grid search...")
         
         for model_name in models_to_load:
@@ -194,6 +175,7 @@ class GridSearchSkillsClusterer:
     def get_memory_usage(self):
         """Monitor current memory usage"""
         try:
+            import psutil
             process = psutil.Process(os.getpid())
             return process.memory_info().rss / 1024 / 1024 / 1024  # GB
         except:
@@ -894,62 +876,9 @@ class GridSearchSkillsClusterer:
         print(f"   Stability: {best['Stability']:.4f}")
     
     def plot_grid_search_results(self):
-        """Visualize grid search results"""
-        if not self.grid_search_results:
-            print("No results to plot")
-            return
-        
-        # Prepare data
-        results_df = []
-        for result in self.grid_search_results:
-            eval_data = result['evaluation']
-            results_df.append({
-                'embedding_model': result['embedding_model'],
-                'clustering_algorithm': result['clustering_algorithm'],
-                'composite_score': eval_data['composite_score'],
-                'silhouette_score': eval_data.get('silhouette_score', 0),
-                'separation_ratio': eval_data.get('separation_ratio', 0),
-                'n_clusters': result['n_clusters']
-            })
-        
-        df = pd.DataFrame(results_df)
-        
-        # Create visualization
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        
-        # 1. Heatmap of composite scores
-        pivot_composite = df.pivot(index='embedding_model', columns='clustering_algorithm', values='composite_score')
-        sns.heatmap(pivot_composite, annot=True, fmt='.3f', cmap='viridis', ax=axes[0,0])
-        axes[0,0].set_title('Composite Scores by Model and Algorithm')
-        
-        # 2. Silhouette scores comparison
-        pivot_silhouette = df.pivot(index='embedding_model', columns='clustering_algorithm', values='silhouette_score')
-        sns.heatmap(pivot_silhouette, annot=True, fmt='.3f', cmap='plasma', ax=axes[0,1])
-        axes[0,1].set_title('Silhouette Scores by Model and Algorithm')
-        
-        # 3. Bar plot of composite scores
-        df_sorted = df.sort_values('composite_score', ascending=True)
-        df_sorted['combination'] = df_sorted['embedding_model'] + '\\n+ ' + df_sorted['clustering_algorithm']
-        axes[1,0].barh(range(len(df_sorted)), df_sorted['composite_score'], color='skyblue')
-        axes[1,0].set_yticks(range(len(df_sorted)))
-        axes[1,0].set_yticklabels(df_sorted['combination'], fontsize=8)
-        axes[1,0].set_xlabel('Composite Score')
-        axes[1,0].set_title('Composite Scores Ranking')
-        
-        # 4. Scatter plot: Silhouette vs Separation
-        colors = ['red', 'blue', 'green', 'orange', 'purple']
-        for i, algo in enumerate(df['clustering_algorithm'].unique()):
-            algo_data = df[df['clustering_algorithm'] == algo]
-            axes[1,1].scatter(algo_data['silhouette_score'], algo_data['separation_ratio'], 
-                            label=algo, c=colors[i % len(colors)], s=60, alpha=0.7)
-        
-        axes[1,1].set_xlabel('Silhouette Score')
-        axes[1,1].set_ylabel('Separation Ratio')
-        axes[1,1].set_title('Silhouette vs Separation by Algorithm')
-        axes[1,1].legend()
-        
-        plt.tight_layout()
-        plt.show()
+        """Visualize grid search results (requires matplotlib and seaborn)"""
+        from mapping.clustering_plots import plot_grid_search_results
+        plot_grid_search_results(self.grid_search_results)
     
     def get_best_clustering_labels(self):
         """Return the labels from the best performing model"""
@@ -0,0 +1,66 @@
+"""
+Plotting helpers for GridSearchSkillsClusterer
+Kept out of clustering_algo so matplotlib and seaborn are only imported when plotting
+"""
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+
+def plot_grid_search_results(grid_search_results):
+    """Visualize GridSearchSkillsClusterer.grid_search_results"""
+    if not grid_search_results:
+        print("No results to plot")
+        return
+    
+    # Prepare data
+    results_df = []
+    for result in grid_search_results:
+        eval_data = result['evaluation']
+        results_df.append({
+            'embedding_model': result['embedding_model'],
+            'clustering_algorithm': result['clustering_algorithm'],
+            'composite_score': eval_data['composite_score'],
+            'silhouette_score': eval_data.get('silhouette_score', 0),
+            'separation_ratio': eval_data.get('separation_ratio', 0),
+            'n_clusters': result['n_clusters']
+        })
+    
+    df = pd.DataFrame(results_df)
+    
+    # Create visualization
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    
+    # 1. Heatmap of composite scores
+    pivot_composite = df.pivot(index='embedding_model', columns='clustering_algorithm', values='composite_score')
+    sns.heatmap(pivot_composite, annot=True, fmt='.3f', cmap='viridis', ax=axes[0,0])
+    axes[0,0].set_title('Composite Scores by Model and Algorithm')
+    
+    # 2. Silhouette scores comparison
+    pivot_silhouette = df.pivot(index='embedding_model', columns='clustering_algorithm', values='silhouette_score')
+    sns.heatmap(pivot_silhouette, annot=True, fmt='.3f', cmap='plasma', ax=axes[0,1])
+    axes[0,1].set_title('Silhouette Scores by Model and Algorithm')
+    
+    # 3. Bar plot of composite scores
+    df_sorted = df.sort_values('composite_score', ascending=True)
+    df_sorted['combination'] = df_sorted['embedding_model'] + '\\n+ ' + df_sorted['clustering_algorithm']
+    axes[1,0].barh(range(len(df_sorted)), df_sorted['composite_score'], color='skyblue')
+    axes[1,0].set_yticks(range(len(df_sorted)))
+    axes[1,0].set_yticklabels(df_sorted['combination'], fontsize=8)
+    axes[1,0].set_xlabel('Composite Score')
+    axes[1,0].set_title('Composite Scores Ranking')
+    
+    # 4. Scatter plot: Silhouette vs Separation
+    colors = ['red', 'blue', 'green', 'orange', 'purple']
+    for i, algo in enumerate(df['clustering_algorithm'].unique()):
+        algo_data = df[df['clustering_algorithm'] == algo]
+        axes[1,1].scatter(algo_data['silhouette_score'], algo_data['separation_ratio'], 
+                        label=algo, c=colors[i % len(colors)], s=60, alpha=0.7)
+    
+    axes[1,1].set_xlabel('Silhouette Score')
+    axes[1,1].set_ylabel('Separation Ratio')
+    axes[1,1].set_title('Silhouette vs Separation by Algorithm')
+    axes[1,1].legend()
+    
+    plt.tight_layout()
+    plt.show()
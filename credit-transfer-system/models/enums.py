@@ -171,6 +171,25 @@ class StudyLevel(Enum):
         else:
             return year_map.get(course_year, cls.UNI_YEAR_1)   
     
+    @classmethod
+    def from_complexity(cls, item_type: str, complexity: str) -> 'StudyLevel':
+        """
+        Map an introductory/intermediate/advanced rating (as returned by the
+        study level inference prompt) onto the VET or University levels
+        """
+        complexity = complexity.lower()
+        if 'intro' in complexity:
+            tier = 0
+        elif 'adv' in complexity:
+            tier = 2
+        else:
+            tier = 1
+        
+        if "vet" in item_type.lower():
+            return (cls.VET_CERT_III, cls.VET_DIPLOMA, cls.VET_ADV_DIPLOMA)[tier]
+        # Anchored on the prompt's course codes: 100-level, 200-300 level, 400+ level
+        return (cls.UNI_YEAR_1, cls.UNI_YEAR_2, cls.UNI_YEAR_4)[tier]
+    
     @classmethod
     def from_string(cls, study_level: str) -> 'StudyLevel':
         """Convert string to StudyLevel enum"""
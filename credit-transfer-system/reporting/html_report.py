@@ -0,0 +1,1252 @@
+"""
+Streaming HTML renderer for credit transfer reports
+Page fragments are string.Template objects compiled once at import; a report
+is written to a text stream section by section. Full skill descriptions are
+kept in a single JSON block and expanded in the browser on demand
+"""
+
+import json
+from html import escape
+from string import Template
+from typing import List, Dict, TextIO
+
+from models.base_models import VETQualification, UniQualification
+from .report_model import RecommendationDetail
+
+NO_DESCRIPTION = 'No description available'
+
+# ========== PAGE TEMPLATES ==========
+
+PAGE_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Credit Transfer Analysis Report</title>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
+            <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
+            <style>
+                * {
+                    margin: 0;
+                    padding: 0;
+                    box-sizing: border-box;
+                }
+                
+                body { 
+                    font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    min-height: 100vh;
+                    padding: 20px;
+                }
+                
+                .container {
+                    max-width: 1400px;
+                    margin: 0 auto;
+                    background: white;
+                    border-radius: 20px;
+                    box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
+                    overflow: hidden;
+                }
+                
+                .header {
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    padding: 40px;
+                    position: relative;
+                    overflow: hidden;
+                }
+                
+                .header::before {
+                    content: '';
+                    position: absolute;
+                    top: -50%;
+                    right: -50%;
+                    bottom: -50%;
+                    left: -50%;
+                    background: repeating-linear-gradient(
+                        45deg,
+                        transparent,
+                        transparent 10px,
+                        rgba(255, 255, 255, 0.05) 10px,
+                        rgba(255, 255, 255, 0.05) 20px
+                    );
+                    animation: slide 20s linear infinite;
+                }
+                
+                @keyframes slide {
+                    0% { transform: translate(0, 0); }
+                    100% { transform: translate(50px, 50px); }
+                }
+                
+                .header-content {
+                    position: relative;
+                    z-index: 1;
+                }
+                
+                h1 { 
+                    font-size: 2.5rem;
+                    font-weight: 700;
+                    margin-bottom: 10px;
+                    text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
+                }
+                
+                .header-info {
+                    font-size: 0.95rem;
+                    opacity: 0.95;
+                    line-height: 1.6;
+                }
+                
+                .content {
+                    padding: 40px;
+                }
+                
+                h2 { 
+                    color: #2d3748;
+                    font-size: 1.8rem;
+                    font-weight: 600;
+                    margin: 40px 0 20px 0;
+                    display: flex;
+                    align-items: center;
+                    gap: 10px;
+                }
+                
+                h2 i {
+                    color: #667eea;
+                    font-size: 1.5rem;
+                }
+                
+                h3 { 
+                    color: #4a5568;
+                    font-size: 1.2rem;
+                    font-weight: 500;
+                    margin: 20px 0 15px 0;
+                }
+                
+                /* Enhanced table styles with CONDENSED rows */
+                table { 
+                    border-collapse: separate;
+                    border-spacing: 0;
+                    width: 100%;
+                    margin: 25px 0;
+                    border-radius: 12px;
+                    overflow: hidden;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                }
+                
+                th { 
+                    background: linear-gradient(135deg, #4a5568 0%, #2d3748 100%);
+                    color: white;
+                    padding: 6px 10px;
+                    text-align: left;
+                    font-weight: 600;
+                    font-size: 0.8rem;
+                    letter-spacing: 0.5px;
+                    text-transform: uppercase;
+                }
+                
+                td { 
+                    padding: 5px 10px;
+                    border-bottom: 1px solid #e2e8f0;
+                    font-size: 0.85rem;
+                    line-height: 1.3;
+                    transition: all 0.3s ease;
+                }
+                
+                /* Recommendation type colors with gradients */
+                .full.rec-group-even { 
+                    background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
+                }
+                .full.rec-group-odd { 
+                    background: linear-gradient(135deg, #e8f5e8 0%, #d4edda 100%);
+                }
+                .partial.rec-group-even { 
+                    background: linear-gradient(135deg, #fff3cd 0%, #ffe8a1 100%);
+                }
+                .partial.rec-group-odd { 
+                    background: linear-gradient(135deg, #fff8e1 0%, #fff3cd 100%);
+                }
+                
+                /* Enhanced hover effects */
+                .full.hover-highlight { 
+                    background: linear-gradient(135deg, #b8e0c1 0%, #a8d5b1 100%) !important;
+                    transform: scale(1.01);
+                }
+                .partial.hover-highlight { 
+                    background: linear-gradient(135deg, #ffde7d 0%, #ffd966 100%) !important;
+                    transform: scale(1.01);
+                }
+                
+                /* Animated expand button - SMALLER */
+                .expand-btn {
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    border: none;
+                    padding: 5px 12px;
+                    border-radius: 15px;
+                    cursor: pointer;
+                    font-size: 0.75rem;
+                    font-weight: 500;
+                    transition: all 0.3s ease;
+                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+                    display: inline-flex;
+                    align-items: center;
+                    gap: 6px;
+                }
+                
+                .expand-btn:hover {
+                    transform: translateY(-2px);
+                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
+                }
+                
+                .expand-btn i {
+                    transition: transform 0.3s ease;
+                }
+                
+                .expand-btn.expanded {
+                    background: linear-gradient(135deg, #e74c3c 0%, #c0392b 100%);
+                }
+                
+                .expand-btn.expanded i {
+                    transform: rotate(180deg);
+                }
+                
+                /* Enhanced expandable content */
+                .expandable-content {
+                    display: none;
+                    background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
+                    padding: 20px;
+                    animation: slideDown 0.3s ease;
+                }
+                
+                .expandable-content.show {
+                    display: table-cell;
+                }
+                
+                @keyframes slideDown {
+                    from {
+                        opacity: 0;
+                        transform: translateY(-10px);
+                    }
+                    to {
+                        opacity: 1;
+                        transform: translateY(0);
+                    }
+                }
+                
+                /* Enhanced summary boxes */
+                .summary-box { 
+                    background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
+                    padding: 25px;
+                    border-radius: 15px;
+                    margin: 30px 0;
+                    border-left: 4px solid #667eea;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);
+                }
+                
+                /* Enhanced stats grid */
+                .stats-grid { 
+                    display: grid;
+                    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+                    gap: 20px;
+                    margin: 30px 0;
+                }
+                
+                .stat-card { 
+                    background: white;
+                    padding: 25px;
+                    border-radius: 15px;
+                    box-shadow: 0 10px 25px rgba(0, 0, 0, 0.08);
+                    transition: all 0.3s ease;
+                    border-top: 3px solid #667eea;
+                    text-align: center;
+                }
+                
+                .stat-card:hover {
+                    transform: translateY(-5px);
+                    box-shadow: 0 15px 35px rgba(0, 0, 0, 0.12);
+                }
+                
+                .stat-value { 
+                    font-size: 2.5rem;
+                    font-weight: 700;
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    -webkit-background-clip: text;
+                    -webkit-text-fill-color: transparent;
+                    margin-bottom: 8px;
+                }
+                
+                .stat-label { 
+                    color: #718096;
+                    font-size: 0.95rem;
+                    font-weight: 500;
+                    text-transform: uppercase;
+                    letter-spacing: 1px;
+                }
+                
+                /* Enhanced progress bars */
+                .progress-container {
+                    margin: 20px 0;
+                }
+                
+                .progress-label {
+                    display: flex;
+                    justify-content: space-between;
+                    margin-bottom: 8px;
+                    font-size: 0.9rem;
+                    color: #4a5568;
+                }
+                
+                .progress-bar { 
+                    width: 100%;
+                    height: 24px;
+                    background: #e2e8f0;
+                    border-radius: 12px;
+                    overflow: hidden;
+                    box-shadow: inset 0 2px 4px rgba(0, 0, 0, 0.06);
+                }
+                
+                .progress-fill { 
+                    height: 100%;
+                    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+                    border-radius: 12px;
+                    transition: width 0.8s ease;
+                    position: relative;
+                    overflow: hidden;
+                }
+                
+                .progress-fill::after {
+                    content: '';
+                    position: absolute;
+                    top: 0;
+                    left: 0;
+                    right: 0;
+                    bottom: 0;
+                    background: linear-gradient(
+                        90deg,
+                        transparent,
+                        rgba(255, 255, 255, 0.3),
+                        transparent
+                    );
+                    animation: shimmer 2s infinite;
+                }
+                
+                @keyframes shimmer {
+                    0% { transform: translateX(-100%); }
+                    100% { transform: translateX(100%); }
+                }
+                
+                /* Enhanced skill badges - SMALLER */
+                .skill-badge { 
+                    display: inline-block;
+                    padding: 6px 12px;
+                    margin: 4px;
+                    background: linear-gradient(135deg, #edf2f7 0%, #e2e8f0 100%);
+                    border-radius: 20px;
+                    font-size: 0.85rem;
+                    font-weight: 500;
+                    transition: all 0.3s ease;
+                    border: 1px solid #cbd5e0;
+                    cursor: default;
+                }
+                
+                .skill-badge:hover {
+                    transform: translateY(-2px);
+                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    border-color: transparent;
+                }
+                
+                .skill-level-badge {
+                    display: inline-block;
+                    padding: 2px 6px;
+                    margin-left: 4px;
+                    background: linear-gradient(135deg, #4a5568 0%, #2d3748 100%);
+                    color: white;
+                    border-radius: 8px;
+                    font-size: 0.65rem;
+                    font-weight: 600;
+                }
+                
+                .skill-context-badge {
+                    display: inline-block;
+                    padding: 2px 6px;
+                    margin-left: 3px;
+                    border-radius: 8px;
+                    font-size: 0.65rem;
+                    font-weight: 600;
+                    color: white;
+                }
+                
+                .skill-context-badge.theoretical {
+                    background: linear-gradient(135deg, #9f7aea 0%, #805ad5 100%);
+                }
+                
+                .skill-context-badge.practical {
+                    background: linear-gradient(135deg, #48bb78 0%, #38a169 100%);
+                }
+                
+                .skill-context-badge.hybrid {
+                    background: linear-gradient(135deg, #4299e1 0%, #3182ce 100%);
+                }
+                
+                /* NEW: Tooltip styles for skill descriptions */
+                .skill-name {
+                    position: relative;
+                    cursor: help;
+                    border-bottom: 1px dotted #667eea;
+                    display: inline-block;
+                }
+                
+                .skill-description-tooltip {
+                    visibility: hidden;
+                    width: 320px;
+                    background: linear-gradient(135deg, #2d3748 0%, #1a202c 100%);
+                    color: white;
+                    text-align: left;
+                    border-radius: 8px;
+                    padding: 12px;
+                    position: absolute;
+                    z-index: 1000;
+                    bottom: 125%;
+                    left: 50%;
+                    margin-left: -160px;
+                    opacity: 0;
+                    transition: opacity 0.3s;
+                    font-size: 0.8rem;
+                    line-height: 1.4;
+                    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
+                    pointer-events: none;
+                }
+                
+                .skill-description-tooltip::after {
+                    content: "";
+                    position: absolute;
+                    top: 100%;
+                    left: 50%;
+                    margin-left: -5px;
+                    border-width: 5px;
+                    border-style: solid;
+                    border-color: #2d3748 transparent transparent transparent;
+                }
+                
+                .skill-name:hover .skill-description-tooltip {
+                    visibility: visible;
+                    opacity: 1;
+                }
+                
+                .skill-description-label {
+                    font-weight: 600;
+                    color: #667eea;
+                    margin-bottom: 4px;
+                    display: block;
+                }
+                
+                /* NEW: Expandable row toggle for skill details */
+                .skill-detail-toggle {
+                    cursor: pointer;
+                    color: #667eea;
+                    font-size: 0.7rem;
+                    margin-left: 6px;
+                    transition: transform 0.3s ease;
+                    display: inline-block;
+                }
+                
+                .skill-detail-toggle:hover {
+                    color: #764ba2;
+                }
+                
+                .skill-detail-toggle.expanded {
+                    transform: rotate(180deg);
+                }
+                
+                .skill-detail-row {
+                    display: none;
+                    background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
+                }
+                
+                .skill-detail-row.show {
+                    display: table-row;
+                }
+                
+                .skill-detail-content {
+                    padding: 15px;
+                    animation: slideDown 0.3s ease;
+                }
+                
+                .skill-description-box {
+                    background: white;
+                    padding: 12px;
+                    border-radius: 8px;
+                    margin: 8px 0;
+                    border-left: 3px solid #667eea;
+                    font-size: 0.8rem;
+                    line-height: 1.5;
+                }
+                
+                .skill-description-box h4 {
+                    font-size: 0.85rem;
+                    color: #2d3748;
+                    margin-bottom: 6px;
+                    font-weight: 600;
+                    display: flex;
+                    align-items: center;
+                    gap: 6px;
+                }
+                
+                .skill-description-box p {
+                    color: #4a5568;
+                    margin: 0;
+                }
+                
+                .skill-description-empty {
+                    color: #a0aec0;
+                    font-style: italic;
+                }
+                
+                /* Enhanced inner skill mapping table - SMALLER */
+                .skill-mapping-inner-table {
+                    width: 100%;
+                    border-collapse: separate;
+                    border-spacing: 0;
+                    margin: 15px 0;
+                    font-size: 0.85rem;
+                    background: white;
+                    border-radius: 10px;
+                    overflow: hidden;
+                    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
+                }
+                
+                .skill-mapping-inner-table th {
+                    background: linear-gradient(135deg, #718096 0%, #4a5568 100%);
+                    color: white;
+                    padding: 6px 8px;
+                    text-align: left;
+                    font-size: 0.75rem;
+                    font-weight: 600;
+                    text-transform: uppercase;
+                    letter-spacing: 0.5px;
+                }
+                
+                .skill-mapping-inner-table td {
+                    padding: 5px 8px;
+                    border-bottom: 1px solid #e2e8f0;
+                    font-size: 0.75rem;
+                    line-height: 1.3;
+                }
+                
+                .mapping-direct td {
+                    background: linear-gradient(90deg, #d4edda 0%, #c3e6cb 100%);
+                    color: #155724;
+                    font-weight: 500;
+                }
+                
+                .mapping-partial td {
+                    background: linear-gradient(90deg, #fff3cd 0%, #ffeaa7 100%);
+                    color: #856404;
+                    font-weight: 500;
+                }
+                
+                .mapping-unmapped td {
+                    background: linear-gradient(90deg, #f8d7da 0%, #f5c6cb 100%);
+                    color: #721c24;
+                }
+                
+                .mapping-summary {
+                    margin: 15px 0;
+                    padding: 15px;
+                    background: linear-gradient(135deg, #edf2f7 0%, #e2e8f0 100%);
+                    border-radius: 10px;
+                    font-size: 0.9rem;
+                    display: flex;
+                    justify-content: space-around;
+                    align-items: center;
+                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
+                }
+                
+                .mapping-stat {
+                    display: flex;
+                    flex-direction: column;
+                    align-items: center;
+                }
+                
+                .mapping-stat-value {
+                    font-size: 1.5rem;
+                    font-weight: 700;
+                    color: #667eea;
+                }
+                
+                .mapping-stat-label {
+                    font-size: 0.8rem;
+                    color: #718096;
+                    text-transform: uppercase;
+                    letter-spacing: 0.5px;
+                }
+                
+                /* Separator between recommendations */
+                .rec-group-last {
+                    border-bottom: 3px solid #667eea !important;
+                }
+                
+                /* Search/Filter Bar */
+                .search-container {
+                    margin: 30px 0;
+                    display: flex;
+                    gap: 15px;
+                    align-items: center;
+                    flex-wrap: wrap;
+                }
+                
+                .search-box {
+                    flex: 1;
+                    min-width: 300px;
+                    position: relative;
+                }
+                
+                .search-box input {
+                    width: 100%;
+                    padding: 12px 40px 12px 15px;
+                    border: 2px solid #e2e8f0;
+                    border-radius: 10px;
+                    font-size: 0.95rem;
+                    transition: all 0.3s ease;
+                }
+                
+                .search-box input:focus {
+                    outline: none;
+                    border-color: #667eea;
+                    box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
+                }
+                
+                .search-box i {
+                    position: absolute;
+                    right: 15px;
+                    top: 50%;
+                    transform: translateY(-50%);
+                    color: #718096;
+                }
+                
+                .filter-btn {
+                    padding: 12px 20px;
+                    background: white;
+                    border: 2px solid #e2e8f0;
+                    border-radius: 10px;
+                    cursor: pointer;
+                    font-size: 0.95rem;
+                    transition: all 0.3s ease;
+                    display: flex;
+                    align-items: center;
+                    gap: 8px;
+                }
+                
+                .filter-btn:hover {
+                    border-color: #667eea;
+                    color: #667eea;
+                }
+                
+                .filter-btn.active {
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    border-color: transparent;
+                }
+                
+                /* Tooltip */
+                .tooltip {
+                    position: relative;
+                    cursor: help;
+                }
+                
+                .tooltip .tooltiptext {
+                    visibility: hidden;
+                    width: 250px;
+                    background: linear-gradient(135deg, #2d3748 0%, #1a202c 100%);
+                    color: white;
+                    text-align: center;
+                    border-radius: 8px;
+                    padding: 10px;
+                    position: absolute;
+                    z-index: 1;
+                    bottom: 125%;
+                    left: 50%;
+                    margin-left: -125px;
+                    opacity: 0;
+                    transition: opacity 0.3s;
+                    font-size: 0.85rem;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.2);
+                }
+                
+                .tooltip:hover .tooltiptext {
+                    visibility: visible;
+                    opacity: 1;
+                }
+                
+                /* Back to top button */
+                .back-to-top {
+                    position: fixed;
+                    bottom: 30px;
+                    right: 30px;
+                    width: 50px;
+                    height: 50px;
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    border: none;
+                    border-radius: 50%;
+                    cursor: pointer;
+                    display: none;
+                    align-items: center;
+                    justify-content: center;
+                    font-size: 1.2rem;
+                    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
+                    transition: all 0.3s ease;
+                    z-index: 1000;
+                }
+                
+                .back-to-top:hover {
+                    transform: translateY(-5px);
+                    box-shadow: 0 6px 20px rgba(0, 0, 0, 0.3);
+                }
+                
+                .back-to-top.show {
+                    display: flex;
+                }
+                
+                /* Print styles */
+                @media print {
+                    .header {
+                        background: none;
+                        color: black;
+                    }
+                    .expand-btn, .back-to-top, .search-container {
+                        display: none !important;
+                    }
+                    .expandable-content {
+                        display: table-cell !important;
+                    }
+                }
+            </style>
+            <script>
+                function toggleExpand(btn, rowId) {
+                    var content = document.getElementById('expand-' + rowId);
+                    var icon = btn.querySelector('i');
+                    if (content.classList.contains('show')) {
+                        content.classList.remove('show');
+                        btn.innerHTML = '<i class="fas fa-chevron-down"></i> Mapped Skills';
+                        btn.classList.remove('expanded');
+                    } else {
+                        content.classList.add('show');
+                        btn.innerHTML = '<i class="fas fa-chevron-up"></i> Hide Skills';
+                        btn.classList.add('expanded');
+                    }
+                }
+                
+                // Skill detail rows are built from the skill-details JSON on first expand
+                var skillDetails = null;
+                
+                function describeSkill(iconClass, title, text) {
+                    var box = document.createElement('div');
+                    box.className = 'skill-description-box';
+                    var heading = document.createElement('h4');
+                    heading.innerHTML = '<i class="fas ' + iconClass + '"></i> ';
+                    heading.appendChild(document.createTextNode(title));
+                    var body = document.createElement('p');
+                    if (text === 'No description available') {
+                        body.className = 'skill-description-empty';
+                    }
+                    body.textContent = text;
+                    box.appendChild(heading);
+                    box.appendChild(body);
+                    return box;
+                }
+                
+                function buildSkillDetail(icon, rowId) {
+                    if (skillDetails === null) {
+                        skillDetails = JSON.parse(document.getElementById('skill-details').textContent);
+                    }
+                    var d = skillDetails[rowId];
+                    var row = document.createElement('tr');
+                    row.id = rowId;
+                    row.className = 'skill-detail-row';
+                    var cell = document.createElement('td');
+                    cell.colSpan = 7;
+                    var content = document.createElement('div');
+                    content.className = 'skill-detail-content';
+                    content.appendChild(describeSkill('fa-tools', 'VET Skill: ' + d[0], d[1]));
+                    content.appendChild(describeSkill('fa-book', 'University Skill: ' + d[2], d[3]));
+                    cell.appendChild(content);
+                    row.appendChild(cell);
+                    var mappingRow = icon.closest('tr');
+                    mappingRow.parentNode.insertBefore(row, mappingRow.nextSibling);
+                    return row;
+                }
+                
+                function toggleSkillDetail(icon, rowId) {
+                    var row = document.getElementById(rowId) || buildSkillDetail(icon, rowId);
+                    if (row.classList.contains('show')) {
+                        row.classList.remove('show');
+                        icon.classList.remove('expanded');
+                    } else {
+                        row.classList.add('show');
+                        icon.classList.add('expanded');
+                    }
+                }
+                
+                // Enhanced hover effect for grouped rows
+                document.addEventListener('DOMContentLoaded', function() {
+                    // Hover effect
+                    var rows = document.querySelectorAll('tr[data-rec-group]');
+                    rows.forEach(function(row) {
+                        row.addEventListener('mouseenter', function() {
+                            var groupId = this.getAttribute('data-rec-group');
+                            var groupRows = document.querySelectorAll('tr[data-rec-group="' + groupId + '"]');
+                            groupRows.forEach(function(r) {
+                                r.classList.add('hover-highlight');
+                            });
+                        });
+                        row.addEventListener('mouseleave', function() {
+                            var groupId = this.getAttribute('data-rec-group');
+                            var groupRows = document.querySelectorAll('tr[data-rec-group="' + groupId + '"]');
+                            groupRows.forEach(function(r) {
+                                r.classList.remove('hover-highlight');
+                            });
+                        });
+                    });
+                    
+                    // Search functionality
+                    var searchInput = document.getElementById('searchInput');
+                    if (searchInput) {
+                        searchInput.addEventListener('keyup', function() {
+                            var filter = this.value.toLowerCase();
+                            var rows = document.querySelectorAll('tbody tr[data-rec-group]');
+                            var currentGroup = '';
+                            rows.forEach(function(row) {
+                                var group = row.getAttribute('data-rec-group');
+                                if (group !== currentGroup) {
+                                    currentGroup = group;
+                                    var text = row.textContent.toLowerCase();
+                                    var groupRows = document.querySelectorAll('tr[data-rec-group="' + group + '"]');
+                                    if (text.indexOf(filter) > -1) {
+                                        groupRows.forEach(function(r) {
+                                            r.style.display = '';
+                                        });
+                                    } else {
+                                        groupRows.forEach(function(r) {
+                                            r.style.display = 'none';
+                                        });
+                                    }
+                                }
+                            });
+                        });
+                    }
+                    
+                    // Filter buttons
+                    var filterBtns = document.querySelectorAll('.filter-btn');
+                    filterBtns.forEach(function(btn) {
+                        btn.addEventListener('click', function() {
+                            var filterType = this.getAttribute('data-filter');
+                            
+                            // Toggle active state
+                            if (this.classList.contains('active')) {
+                                this.classList.remove('active');
+                                // Show all rows
+                                document.querySelectorAll('tbody tr').forEach(function(row) {
+                                    row.style.display = '';
+                                });
+                            } else {
+                                // Remove active from all buttons
+                                filterBtns.forEach(function(b) {
+                                    b.classList.remove('active');
+                                });
+                                this.classList.add('active');
+                                
+                                // Filter rows
+                                var rows = document.querySelectorAll('tbody tr[data-rec-group]');
+                                rows.forEach(function(row) {
+                                    if (row.classList.contains(filterType) || !row.classList.contains('full') && !row.classList.contains('conditional') && !row.classList.contains('partial')) {
+                                        row.style.display = '';
+                                    } else {
+                                        row.style.display = 'none';
+                                    }
+                                });
+                            }
+                        });
+                    });
+                    
+                    // Back to top button
+                    window.onscroll = function() {
+                        var backToTop = document.getElementById('backToTop');
+                        if (document.body.scrollTop > 100 || document.documentElement.scrollTop > 100) {
+                            backToTop.classList.add('show');
+                        } else {
+                            backToTop.classList.remove('show');
+                        }
+                    };
+                    
+                    // Animate progress bars on load
+                    setTimeout(function() {
+                        var progressFills = document.querySelectorAll('.progress-fill');
+                        progressFills.forEach(function(fill) {
+                            var width = fill.getAttribute('data-width');
+                            if (width) {
+                                fill.style.width = width;
+                            }
+                        });
+                    }, 100);
+                });
+                
+                function scrollToTop() {
+                    window.scrollTo({top: 0, behavior: 'smooth'});
+                }
+            </script>
+        </head>
+        <body>
+        <div class="container">
+"""
+
+HEADER = Template("""
+        <div class="header">
+            <div class="header-content">
+                <h1><i class="fas fa-graduation-cap"></i> Credit Transfer Analysis Report</h1>
+                <div class="header-info">
+                    <p><i class="fas fa-certificate"></i> VET Qualification: $vet_code - $vet_name</p>
+                    <p><i class="fas fa-university"></i> University Program: $uni_code - $uni_name</p>
+                </div>
+            </div>
+        </div>
+        <div class="content">
+""")
+
+STAT_CARD = Template("""<div class='stat-card'>
+<i class='fas $icon' style='font-size: 2rem; color: $color; margin-bottom: 15px;'></i>
+<div class='stat-value'>$value</div>
+<div class='stat-label'>$label</div>
+</div>
+""")
+
+SUMMARY_OPEN = Template("""<div class='summary-box'>
+<h2><i class='fas fa-clipboard-list'></i> Executive Summary</h2>
+<p style='font-size: 1.1rem; margin-bottom: 20px;'><strong>Total Recommendations:</strong> $total</p>
+<p style='font-size: 1.1rem; margin-bottom: 30px;'><strong>Average Alignment Score:</strong> $avg_alignment</p>
+<h3>Recommendation Distribution</h3>
+""")
+
+PROGRESS = Template("""<div class='progress-container'>
+<div class='progress-label'>
+<span><i class='fas $icon' style='color: $color;'></i> $label</span>
+<span><strong>$count</strong> ($percent)</span>
+</div>
+<div class='progress-bar'><div class='progress-fill' data-width='$width%' style='width: 0;'></div></div>
+</div>
+""")
+
+RECOMMENDATIONS_OPEN = """<h2><i class='fas fa-search'></i> Credit Transfer Recommendations</h2>
+<div class='search-container'>
+<div class='search-box'>
+<input type='text' id='searchInput' placeholder='Search recommendations...' />
+<i class='fas fa-search'></i>
+</div>
+<button class='filter-btn' data-filter='full'><i class='fas fa-check-circle'></i> Full Only</button>
+<button class='filter-btn' data-filter='partial'><i class='fas fa-exclamation-circle'></i> Partial Only</button>
+</div>
+<table>
+<thead><tr><th>Action</th><th>VET Units</th><th>Uni Course</th><th>Study Level</th><th>Skills</th><th>Alignment</th><th>Confidence</th><th>Type</th><th>Conditions</th></tr></thead>
+<tbody>
+"""
+
+REC_FIRST_ROW = Template("""<tr class='$row_classes' data-rec-group='rec-$idx'>
+<td rowspan='$span'><button class='expand-btn' onclick='toggleExpand(this, $idx)'><i class='fas fa-chevron-down'></i> Mapped Skills</button></td>
+<td>$unit</td>
+<td rowspan='$span'>$course</td>
+<td rowspan='$span'><span class='skill-level-badge'>$study_level</span></td>
+<td rowspan='$span'>$vet_skill_count → $uni_skill_count</td>
+<td rowspan='$span'><div class='tooltip'>$alignment<span class='tooltiptext'>Based on skill coverage, quality, and level alignment</span></div></td>
+<td rowspan='$span'>$confidence</td>
+<td rowspan='$span'><i class='fas $type_icon' style='color: $type_color; margin-right: 5px;'></i>$type_label</td>
+<td rowspan='$span'>$conditions</td>
+</tr>
+""")
+
+REC_UNIT_ROW = Template("""<tr class='$row_classes' data-rec-group='rec-$idx'>
+<td>$unit</td>
+</tr>
+""")
+
+EXPAND_OPEN = Template("""<tr class='$group_class' data-rec-group='rec-$idx'>
+<td colspan='9' class='expandable-content' id='expand-$idx'>
+""")
+
+EXPAND_CLOSE = """</td>
+</tr>
+"""
+
+MAPPING_SUMMARY = Template("""<div class='mapping-summary'>
+<div class='mapping-stat'><div class='mapping-stat-value'>$direct</div><div class='mapping-stat-label'>Direct Matches</div></div>
+<div class='mapping-stat'><div class='mapping-stat-value'>$partial</div><div class='mapping-stat-label'>Partial Matches</div></div>
+<div class='mapping-stat'><div class='mapping-stat-value'>$unmapped</div><div class='mapping-stat-label'>Unmapped Skills</div></div>
+</div>
+<table class='skill-mapping-inner-table'>
+<thead><tr><th>VET Unit</th><th>VET Skill</th><th>Uni Course</th><th>Uni Skill</th><th>Type</th><th>Match %</th><th>Analysis</th></tr></thead>
+<tbody>
+""")
+
+SKILL_CELL = Template("""<span class='skill-name'>$name<span class='skill-description-tooltip'><span class='skill-description-label'>$label Skill Description:</span>$preview</span></span>""")
+
+CONTEXT_BADGE = Template("""<span class='skill-context-badge $context'>$context_title</span>""")
+
+MATCHED_ROW = Template("""<tr class='mapping-$css'>
+<td>$vet_unit</td>
+<td>$vet_skill<i class='fas fa-chevron-down skill-detail-toggle' onclick='toggleSkillDetail(this, "$mapping_id")' title='Show full description'></i><span class='skill-level-badge'>L$vet_level</span>$vet_context</td>
+<td>$uni_course</td>
+<td>$uni_skill<span class='skill-level-badge'>L$uni_level</span>$uni_context</td>
+<td><i class='fas $icon'></i> $mapping_type</td>
+<td>$similarity</td>
+<td>$reasoning</td>
+</tr>
+""")
+
+UNMAPPED_ROW = Template("""<tr class='mapping-unmapped'>
+<td>$vet_unit</td>
+<td>$vet_skill</td>
+<td>$uni_course</td>
+<td>$uni_skill</td>
+<td><i class='fas fa-times-circle'></i> $mapping_type</td>
+<td>-</td>
+<td>$reasoning</td>
+</tr>
+""")
+
+NO_MAPPINGS = """<p style='text-align:center; color: #718096;'><i class='fas fa-info-circle'></i> No skill mapping data available.</p>
+"""
+
+SKILL_BADGE = Template("""<span class='skill-badge'><i class='fas $icon' style='font-size: 0.8rem; margin-right: 4px;'></i>$name</span>
+""")
+
+GAP_ITEM = Template("""<li style='margin: 10px 0;'><strong>$skill</strong> <span style='color: #718096;'>($count occurrences)</span></li>
+""")
+
+PAGE_FOOT = Template("""</div>
+</div>
+        <button id="backToTop" class="back-to-top" onclick="scrollToTop()">
+            <i class="fas fa-arrow-up"></i>
+        </button>
+        <script type="application/json" id="skill-details">$skill_details</script>
+        </body>
+        </html>
+""")
+
+TYPE_ICONS = {'full': 'fa-check-circle', 'partial': 'fa-exclamation-circle', 'none': 'fa-ban'}
+TYPE_COLORS = {'full': '#48bb78', 'partial': '#ed8936', 'none': '#718096'}
+MATCH_ICONS = {'Direct': 'fa-check-circle', 'Partial': 'fa-exclamation-circle'}
+
+
+def _e(value) -> str:
+    """HTML-escape any value"""
+    return escape(str(value))
+
+
+class HTMLReportRenderer:
+    """Render the credit transfer HTML report to a text stream"""
+
+    def __init__(self, max_recommendations: int = 50, top_skills: int = 20,
+                 preview_length: int = 150):
+        """
+        Initialize renderer
+
+        Args:
+            max_recommendations: Recommendations shown in the main table
+            top_skills: Skills shown per side in the top skills section
+            preview_length: Description characters shown in skill tooltips
+        """
+        self.max_recommendations = max_recommendations
+        self.top_skills = top_skills
+        self.preview_length = preview_length
+
+    def render(self,
+               out: TextIO,
+               details: List[RecommendationDetail],
+               vet_qual: VETQualification,
+               uni_qual: UniQualification,
+               summary: Dict,
+               gaps: Dict):
+        """
+        Write the full report
+
+        Args:
+            out: Writable text stream
+            details: Per-recommendation report data, in report order
+            vet_qual: VET qualification
+            uni_qual: University qualification
+            summary: Summary statistics (ReportGenerator._generate_summary_stats)
+            gaps: Gap analysis (ReportGenerator._analyze_gaps)
+        """
+        vet_skills = [s for unit in vet_qual.units for s in unit.extracted_skills]
+        uni_skills = [s for course in uni_qual.courses for s in course.extracted_skills]
+        skill_details = {}
+
+        out.write(PAGE_HEAD)
+        out.write(HEADER.substitute(
+            vet_code=_e(vet_qual.code), vet_name=_e(vet_qual.name),
+            uni_code=_e(uni_qual.code), uni_name=_e(uni_qual.name)
+        ))
+
+        self._write_skill_summary(out, vet_skills, uni_skills)
+        self._write_executive_summary(out, summary)
+
+        out.write(RECOMMENDATIONS_OPEN)
+        for idx, detail in enumerate(details[:self.max_recommendations], 1):
+            self._write_recommendation(out, idx, detail, skill_details)
+        out.write("</tbody></table>\n")
+
+        self._write_top_skills(out, vet_skills, uni_skills)
+        self._write_gaps(out, gaps)
+
+        # Keep '</' out of the script element
+        payload = json.dumps(skill_details, ensure_ascii=False).replace('</', '<\\/')
+        out.write(PAGE_FOOT.substitute(skill_details=payload))
+
+    # ========== SECTIONS ==========
+
+    def _write_skill_summary(self, out: TextIO, vet_skills: List, uni_skills: List):
+        common_count = len(set(s.name.lower() for s in vet_skills).intersection(
+            set(s.name.lower() for s in uni_skills)))
+
+        out.write("<h2><i class='fas fa-chart-bar'></i> Skill Extraction Summary</h2>\n<div class='stats-grid'>\n")
+        out.write(STAT_CARD.substitute(icon='fa-tools', color='#667eea', value=len(vet_skills), label='VET Skills'))
+        out.write(STAT_CARD.substitute(icon='fa-book', color='#764ba2', value=len(uni_skills), label='University Skills'))
+        out.write(STAT_CARD.substitute(icon='fa-link', color='#48bb78', value=common_count, label='Common Skills'))
+        out.write("</div>\n")
+
+    def _write_executive_summary(self, out: TextIO, summary: Dict):
+        out.write(SUMMARY_OPEN.substitute(
+            total=summary['total'], avg_alignment=f"{summary['avg_alignment']:.1%}"
+        ))
+        for label, count, percent, icon, color in [
+            ('Full Credit', summary['full_count'], summary['full_percent'], 'fa-check-circle', '#48bb78'),
+            ('Partial', summary['partial_count'], summary['partial_percent'], 'fa-exclamation-circle', '#ed8936')
+        ]:
+            out.write(PROGRESS.substitute(
+                icon=icon, color=color, label=label, count=count,
+                percent=f"{percent:.1%}", width=percent * 100
+            ))
+        out.write("</div>\n")
+
+    def _write_recommendation(self, out: TextIO, idx: int, detail: RecommendationDetail,
+                              skill_details: Dict[str, List[str]]):
+        rec = detail.rec
+        rec_type = rec.recommendation.value
+        group_class = 'rec-group-even' if idx % 2 == 0 else 'rec-group-odd'
+        units = rec.vet_units
+
+        for unit_idx, unit in enumerate(units):
+            row_classes = f"{rec_type} {group_class}"
+            if unit_idx == len(units) - 1:
+                row_classes += " rec-group-last"
+            unit_label = _e(f"{unit.code}: {unit.name}")
+
+            if unit_idx == 0:
+                out.write(REC_FIRST_ROW.substitute(
+                    row_classes=row_classes, idx=idx, span=len(units), unit=unit_label,
+                    course=_e(f"{rec.uni_course.code}: {rec.uni_course.name}"),
+                    study_level=_e(rec.uni_course.study_level.title()),
+                    vet_skill_count=detail.vet_skill_count,
+                    uni_skill_count=detail.uni_skill_count,
+                    alignment=f"{rec.alignment_score:.1%}",
+                    confidence=f"{rec.confidence:.1%}",
+                    type_icon=TYPE_ICONS.get(rec_type, 'fa-question'),
+                    type_color=TYPE_COLORS.get(rec_type, '#718096'),
+                    type_label=_e(rec_type.upper()),
+                    conditions=_e('; '.join(rec.conditions[:2]) if rec.conditions else 'None')
+                ))
+            else:
+                out.write(REC_UNIT_ROW.substitute(row_classes=row_classes, idx=idx, unit=unit_label))
+
+        out.write(EXPAND_OPEN.substitute(group_class=group_class, idx=idx))
+        self._write_mappings(out, idx, detail.skill_mappings, skill_details)
+        out.write(EXPAND_CLOSE)
+
+    def _write_mappings(self, out: TextIO, idx: int, mappings: List[Dict],
+                        skill_details: Dict[str, List[str]]):
+        if not mappings:
+            out.write(NO_MAPPINGS)
+            return
+
+        by_type = {'Direct': [], 'Partial': [], 'Unmapped': []}
+        for mapping in mappings:
+            if mapping['mapping_type'] in by_type:
+                by_type[mapping['mapping_type']].append(mapping)
+
+        out.write(MAPPING_SUMMARY.substitute(
+            direct=len(by_type['Direct']), partial=len(by_type['Partial']),
+            unmapped=len(by_type['Unmapped'])
+        ))
+
+        for mapping_type in ('Direct', 'Partial'):
+            for mapping_idx, mapping in enumerate(by_type[mapping_type]):
+                mapping_id = f"rec{idx}-{mapping_type.lower()}-{mapping_idx}"
+                vet_desc = str(mapping.get('vet_description', NO_DESCRIPTION))
+                uni_desc = str(mapping.get('uni_description', NO_DESCRIPTION))
+                # Full descriptions are only rendered when the row is expanded
+                skill_details[mapping_id] = [str(mapping['vet_skill']), vet_desc,
+                                             str(mapping['uni_skill']), uni_desc]
+                out.write(MATCHED_ROW.substitute(
+                    css=mapping_type.lower(),
+                    vet_unit=_e(mapping['vet_unit']),
+                    vet_skill=self._skill_cell(mapping['vet_skill'], 'VET', vet_desc),
+                    mapping_id=mapping_id,
+                    vet_level=_e(mapping['vet_level']),
+                    vet_context=self._context_badge(mapping.get('vet_context', '-')),
+                    uni_course=_e(mapping['uni_course']),
+                    uni_skill=self._skill_cell(mapping['uni_skill'], 'Uni', uni_desc),
+                    uni_level=_e(mapping['uni_level']),
+                    uni_context=self._context_badge(mapping.get('uni_context', '-')),
+                    icon=MATCH_ICONS[mapping_type],
+                    mapping_type=_e(mapping['mapping_type']),
+                    similarity=f"{mapping['similarity']:.0%}",
+                    reasoning=_e(mapping['reasoning'])
+                ))
+
+        for mapping in by_type['Unmapped']:
+            out.write(UNMAPPED_ROW.substitute(
+                vet_unit=_e(mapping['vet_unit']),
+                vet_skill=_e(mapping.get('vet_skill', '-')),
+                uni_course=_e(mapping['uni_course']),
+                uni_skill=_e(mapping.get('uni_skill', '-')),
+                mapping_type=_e(mapping['mapping_type']),
+                reasoning=_e(mapping['reasoning'])
+            ))
+
+        out.write("</tbody></table>\n")
+
+    def _write_top_skills(self, out: TextIO, vet_skills: List, uni_skills: List):
+        out.write("<h2><i class='fas fa-star'></i> Top Extracted Skills</h2>\n")
+        for title, icon, skills in [
+            (f"VET Skills (Top {self.top_skills})", 'fa-tools', vet_skills),
+            (f"University Skills (Top {self.top_skills})", 'fa-book', uni_skills)
+        ]:
+            out.write(f"<h3>{title}</h3>\n<div style='padding: 20px;'>\n")
+            top = sorted(skills, key=lambda s: s.confidence, reverse=True)[:self.top_skills]
+            for skill in top:
+                out.write(SKILL_BADGE.substitute(icon=icon, name=_e(skill.name)))
+            out.write("</div>\n")
+
+    def _write_gaps(self, out: TextIO, gaps: Dict):
+        if not gaps['common_gaps']:
+            return
+        out.write("<h2><i class='fas fa-exclamation-triangle'></i> Common Skill Gaps</h2>\n")
+        out.write("<div class='summary-box'>\n<ul style='columns: 2; column-gap: 40px;'>\n")
+        for skill, count in gaps['common_gaps'][:10]:
+            out.write(GAP_ITEM.substitute(skill=_e(skill), count=count))
+        out.write("</ul>\n</div>\n")
+
+    # ========== FRAGMENTS ==========
+
+    def _skill_cell(self, name, label: str, description: str) -> str:
+        if len(description) > self.preview_length:
+            description = description[:self.preview_length] + '...'
+        return SKILL_CELL.substitute(name=_e(name), label=label, preview=_e(description))
+
+    @staticmethod
+    def _context_badge(context) -> str:
+        if not context or context == '-':
+            return ''
+        return CONTEXT_BADGE.substitute(context=_e(context), context_title=_e(str(context).title()))
@@ -6,8 +6,10 @@ MODIFIED VERSION: Includes tooltip + expandable row for skill descriptions
 import logging
 import json
 import csv
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TextIO, Union
 from io import StringIO
 from pathlib import Path
 
@@ -19,7 +21,10 @@ from models.base_models import (
     UniQualification
 )
 from models.enums import RecommendationType, StudyLevel
+from utils.quality_monitor import monitored, span
 from .skill_export import SkillExportManager
+from .html_report import HTMLReportRenderer
+from .report_model import RecommendationDetail, ReportModel
 from utils.json_encoder import dumps, loads, make_json_serializable
 
 logger = logging.getLogger(__name__)
@@ -27,19 +32,24 @@ logger = logging.getLogger(__name__)
 class ReportGenerator:
     """Generate various report formats for credit transfer analysis"""
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", max_workers: int = 4):
         """
         Initialize report generator with skill export capability
         
         Args:
             output_dir: Base output directory for reports
+            max_workers: Threads used to write report package files concurrently
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max(1, max_workers)
         
         # Initialize skill export manager
         self.skill_export = SkillExportManager(str(self.output_dir / "skills"))
+        
+        self.html_renderer = HTMLReportRenderer()
     
+    @monitored("report.package")
     def generate_complete_report_package(self,
                                         recommendations: List[CreditTransferRecommendation],
                                         vet_qual: VETQualification,
@@ -59,63 +69,142 @@ class ReportGenerator:
         package_dir = self.output_dir / f"report_package_{timestamp}"
         package_dir.mkdir(exist_ok=True)
         
-        files = {}
-        
-        # Generate main recommendation report
-        files['recommendations_json'] = str(package_dir / "recommendations.json")
-        self._export_recommendations_json(recommendations, vet_qual, uni_qual, files['recommendations_json'])
-        
-        # Generate HTML report
-        files['report_html'] = str(package_dir / "report.html")
-        html_content = self.generate_html_report(recommendations, vet_qual, uni_qual)
-        with open(files['report_html'], 'w') as f:
-            f.write(html_content)
-        
-        # Generate CSV report
-        files['recommendations_csv'] = str(package_dir / "recommendations.csv")
-        csv_content = self.generate_csv_report(recommendations)
-        with open(files['recommendations_csv'], 'w') as f:
-            f.write(csv_content)
-        
-        # Export extracted skills
         skill_export_dir = package_dir / "extracted_skills"
         skill_export_dir.mkdir(exist_ok=True)
         
-        # Export VET skills
-        files['vet_skills_json'] = str(skill_export_dir / f"{vet_qual.code}_skills.json")
-        self._export_skills_json(vet_qual, None, files['vet_skills_json'])
+        # Single pass over the recommendations; every writer renders from this model
+        model = self.build_report_model(recommendations, vet_qual, uni_qual)
+        model.prefetch_mappings()
+        
+        files = {
+            'recommendations_json': str(package_dir / "recommendations.json"),
+            'report_html': str(package_dir / "report.html"),
+            'recommendations_csv': str(package_dir / "recommendations.csv"),
+            'vet_skills_json': str(skill_export_dir / f"{vet_qual.code}_skills.json"),
+            'vet_skills_excel': str(skill_export_dir / f"{vet_qual.code}_skills.xlsx"),
+            'uni_skills_json': str(skill_export_dir / f"{uni_qual.code}_skills.json"),
+            'uni_skills_excel': str(skill_export_dir / f"{uni_qual.code}_skills.xlsx"),
+            'combined_skills_json': str(skill_export_dir / "combined_skills.json"),
+            'skill_analysis': str(skill_export_dir / "skill_analysis.txt"),
+            'skill_mappings_csv': str(package_dir / "skill_mappings.csv"),
+        }
         
-        files['vet_skills_excel'] = str(skill_export_dir / f"{vet_qual.code}_skills.xlsx")
-        self._export_skills_excel(vet_qual, None, files['vet_skills_excel'])
+        writers = {
+            'recommendations_json': lambda path: self._export_recommendations_json(
+                recommendations, vet_qual, uni_qual, path, model),
+            'report_html': lambda path: self.write_html_report(
+                recommendations, vet_qual, uni_qual, path, model),
+            'recommendations_csv': lambda path: self._write_text(
+                path, self.generate_csv_report(recommendations, model)),
+            'vet_skills_json': lambda path: self._export_skills_json(vet_qual, None, path),
+            'vet_skills_excel': lambda path: self._export_skills_excel(vet_qual, None, path),
+            'uni_skills_json': lambda path: self._export_skills_json(None, uni_qual, path),
+            'uni_skills_excel': lambda path: self._export_skills_excel(None, uni_qual, path),
+            'combined_skills_json': lambda path: self._export_skills_json(vet_qual, uni_qual, path),
+            'skill_analysis': lambda path: self._write_text(
+                path, self.skill_export.generate_skill_report(vet_qual, uni_qual)),
+            'skill_mappings_csv': lambda path: self.export_skill_mappings_to_csv(
+                recommendations, path, model),
+        }
         
-        # Export University skills
-        files['uni_skills_json'] = str(skill_export_dir / f"{uni_qual.code}_skills.json")
-        self._export_skills_json(None, uni_qual, files['uni_skills_json'])
+        # Writers touch disjoint files and only read the model
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Each writer runs in a copy of the current context so its spans nest under this one
+            futures = {
+                key: executor.submit(copy_context().run, self._run_writer, key, writer, files[key])
+                for key, writer in writers.items()
+            }
+            for future in futures.values():
+                future.result()
         
-        files['uni_skills_excel'] = str(skill_export_dir / f"{uni_qual.code}_skills.xlsx")
-        self._export_skills_excel(None, uni_qual, files['uni_skills_excel'])
+        # Create package summary once every file is in place
+        files['package_summary'] = str(package_dir / "package_summary.json")
+        self._create_package_summary(files, recommendations, vet_qual, uni_qual,
+                                     files['package_summary'], model)
         
-        # Export combined skills
-        files['combined_skills_json'] = str(skill_export_dir / "combined_skills.json")
-        self._export_skills_json(vet_qual, uni_qual, files['combined_skills_json'])
+        return files
+    
+    @staticmethod
+    def _run_writer(key: str, writer, path: str):
+        with span(f"report.write.{key}"):
+            writer(path)
+    
+    @monitored("report.model")
+    def build_report_model(self,
+                           recommendations: List[CreditTransferRecommendation],
+                           vet_qual: Optional[VETQualification] = None,
+                           uni_qual: Optional[UniQualification] = None) -> ReportModel:
+        """
+        Build the shared report model in a single pass over the recommendations
+        
+        Args:
+            recommendations: List of credit transfer recommendations
+            vet_qual: VET qualification (optional for recommendation-only formats)
+            uni_qual: University qualification (optional for recommendation-only formats)
+            
+        Returns:
+            ReportModel holding details, summary statistics, gaps and skill overview
+        """
+        return ReportModel(
+            recommendations=recommendations,
+            vet_qual=vet_qual,
+            uni_qual=uni_qual,
+            details=self.build_recommendation_details(recommendations),
+            summary=self._generate_summary_stats(recommendations),
+            gaps=self._analyze_gaps(recommendations),
+            course_coverage=self._analyze_course_coverage(recommendations, uni_qual) if uni_qual else {},
+            skill_overview=self._skill_overview(vet_qual, uni_qual) if vet_qual and uni_qual else {}
+        )
+    
+    def _skill_overview(self, vet_qual: VETQualification, uni_qual: UniQualification) -> Dict:
+        """Skill extraction counts and common skills across both qualifications"""
+        vet_names = [s.name.lower() for unit in vet_qual.units for s in unit.extracted_skills]
+        uni_names = [s.name.lower() for course in uni_qual.courses for s in course.extracted_skills]
+        vet_unique = set(vet_names)
+        uni_unique = set(uni_names)
         
-        # Generate skill analysis report
-        files['skill_analysis'] = str(skill_export_dir / "skill_analysis.txt")
-        skill_report = self.skill_export.generate_skill_report(vet_qual, uni_qual)
-        with open(files['skill_analysis'], 'w') as f:
-            f.write(skill_report)
+        return {
+            "vet_skills_extracted": len(vet_names),
+            "vet_unique_skills": len(vet_unique),
+            "uni_skills_extracted": len(uni_names),
+            "uni_unique_skills": len(uni_unique),
+            "common_skills": sorted(vet_unique & uni_unique)
+        }
+    
+    def _write_text(self, filepath: str, content: str):
+        """Write rendered text content to a file"""
+        with open(filepath, 'w') as f:
+            f.write(content)
+    
+    def build_recommendation_details(self,
+                                     recommendations: List[CreditTransferRecommendation]) -> List[RecommendationDetail]:
+        """
+        Derive match analysis and reasoning for each recommendation once
         
-        # Create package summary
-        files['package_summary'] = str(package_dir / "package_summary.json")
-        self._create_package_summary(files, recommendations, vet_qual, uni_qual, files['package_summary'])
+        Skill mappings are extracted on first access, so writers that never
+        read them do not pay for them.
         
-        # Add after the semantic clusters export
-        files['skill_mappings_csv'] = str(package_dir / "skill_mappings.csv")
-        self.export_skill_mappings_to_csv(recommendations, files['skill_mappings_csv'])
+        Args:
+            recommendations: List of credit transfer recommendations
             
-        # In generate_complete_report_package, after the main reports
+        Returns:
+            One RecommendationDetail per recommendation, in the same order
+        """
+        from mapping.simple_mapping_types import SimpleMappingClassifier
+        classifier = SimpleMappingClassifier()
         
-        return files
+        details = []
+        for rec in recommendations:
+            match_info = self._extract_detailed_match_info(rec)
+            details.append(RecommendationDetail(
+                rec=rec,
+                match_info=match_info,
+                reasoning=self._generate_transfer_reasoning(rec, match_info),
+                vet_skill_count=sum(len(unit.extracted_skills) for unit in rec.vet_units),
+                uni_skill_count=len(rec.uni_course.extracted_skills),
+                _mapping_factory=lambda r: self._extract_skill_mappings_for_single_rec(r, classifier)
+            ))
+        return details
     
     def _export_skills_json(self, 
                            vet_qual: Optional[VETQualification],
@@ -148,8 +237,12 @@ class ReportGenerator:
                                 recommendations: List[CreditTransferRecommendation],
                                 vet_qual: VETQualification,
                                 uni_qual: UniQualification,
-                                filepath: str):
+                                filepath: str,
+                                model: Optional[ReportModel] = None):
         """Export recommendations to JSON with skill details"""
+        if model is None:
+            model = self.build_report_model(recommendations, vet_qual, uni_qual)
+        
         data = {
             "export_timestamp": datetime.now().isoformat(),
             "vet_qualification": {
@@ -161,16 +254,17 @@ class ReportGenerator:
                 "code": uni_qual.code,
                 "name": uni_qual.name
             },
-            "summary": self._generate_summary_stats(recommendations),
+            "summary": model.summary,
             "recommendations": []
         }
         
-        for rec in recommendations:
+        for detail in model.details:
+            rec = detail.rec
             # Get base recommendation data
             rec_data = rec.to_dict()
             
             # Add detailed match analysis
-            match_info = self._extract_detailed_match_info(rec)
+            match_info = detail.match_info
             rec_data['detailed_analysis'] = {
                 'match_breakdown': {
                     'direct': match_info['direct_matches'],
@@ -182,7 +276,7 @@ class ReportGenerator:
                 'quality_metrics': match_info['quality_breakdown'],
                 'edge_cases': match_info['edge_cases'],
                 'alignment_formula': match_info['alignment_calculation'],
-                'reasoning': self._generate_transfer_reasoning(rec, match_info).replace('<br>', ' | ')
+                'reasoning': detail.reasoning_text(' | ')
             }
             
             # Add skill details for mapped units and courses
@@ -218,16 +312,12 @@ class ReportGenerator:
                                recommendations: List[CreditTransferRecommendation],
                                vet_qual: VETQualification,
                                uni_qual: UniQualification,
-                               filepath: str):
+                               filepath: str,
+                               model: Optional[ReportModel] = None):
         """Create a summary of the report package"""
-        # Calculate skill statistics
-        vet_skills = []
-        for unit in vet_qual.units:
-            vet_skills.extend(unit.extracted_skills)
-        
-        uni_skills = []
-        for course in uni_qual.courses:
-            uni_skills.extend(course.extracted_skills)
+        if model is None:
+            model = self.build_report_model(recommendations, vet_qual, uni_qual)
+        skill_overview = model.skill_overview
         
         summary = {
             "package_created": datetime.now().isoformat(),
@@ -236,29 +326,30 @@ class ReportGenerator:
                 "vet_qualification": f"{vet_qual.code} - {vet_qual.name}",
                 "uni_qualification": f"{uni_qual.code} - {uni_qual.name}",
                 "total_recommendations": len(recommendations),
-                "recommendation_breakdown": self._generate_summary_stats(recommendations)
+                "recommendation_breakdown": model.summary
             },
             "skill_extraction_summary": {
-                "vet_skills_extracted": len(vet_skills),
-                "vet_unique_skills": len(set(s.name.lower() for s in vet_skills)),
-                "uni_skills_extracted": len(uni_skills),
-                "uni_unique_skills": len(set(s.name.lower() for s in uni_skills)),
-                "common_skills_count": len(
-                    set(s.name.lower() for s in vet_skills).intersection(
-                        set(s.name.lower() for s in uni_skills)
-                    )
-                )
+                "vet_skills_extracted": skill_overview['vet_skills_extracted'],
+                "vet_unique_skills": skill_overview['vet_unique_skills'],
+                "uni_skills_extracted": skill_overview['uni_skills_extracted'],
+                "uni_unique_skills": skill_overview['uni_unique_skills'],
+                "common_skills_count": len(skill_overview['common_skills'])
             }
         }
         
         with open(filepath, 'w') as f:
             json.dump(summary, f, indent=2)
     
+    @monitored("report.text")
     def generate_full_report(self,
                              recommendations: List[CreditTransferRecommendation],
                              vet_qual: VETQualification,
-                             uni_qual: UniQualification) -> str:
+                             uni_qual: UniQualification,
+                             model: Optional[ReportModel] = None) -> str:
         """Generate comprehensive text report with skill details"""
+        if model is None:
+            model = self.build_report_model(recommendations, vet_qual, uni_qual)
+        skill_overview = model.skill_overview
         report = []
         
         # Header
@@ -270,28 +361,22 @@ class ReportGenerator:
         report.append(f"Total Units: {len(vet_qual.units)}")
         
         # Add VET skill summary
-        vet_skills = []
-        for unit in vet_qual.units:
-            vet_skills.extend(unit.extracted_skills)
-        report.append(f"Total VET Skills Extracted: {len(vet_skills)}")
-        report.append(f"Unique VET Skills: {len(set(s.name.lower() for s in vet_skills))}")
+        report.append(f"Total VET Skills Extracted: {skill_overview['vet_skills_extracted']}")
+        report.append(f"Unique VET Skills: {skill_overview['vet_unique_skills']}")
         
         report.append(f"\nUniversity Program: {uni_qual.code} - {uni_qual.name}")
         report.append(f"Total Courses: {len(uni_qual.courses)}")
         
         # Add University skill summary
-        uni_skills = []
-        for course in uni_qual.courses:
-            uni_skills.extend(course.extracted_skills)
-        report.append(f"Total University Skills Extracted: {len(uni_skills)}")
-        report.append(f"Unique University Skills: {len(set(s.name.lower() for s in uni_skills))}")
+        report.append(f"Total University Skills Extracted: {skill_overview['uni_skills_extracted']}")
+        report.append(f"Unique University Skills: {skill_overview['uni_unique_skills']}")
         
         # Executive Summary
         report.append("\n" + "=" * 80)
         report.append("EXECUTIVE SUMMARY")
         report.append("=" * 80)
         
-        summary = self._generate_summary_stats(recommendations)
+        summary = model.summary
         report.append(f"\nTotal Recommendations: {summary['total']}")
         report.append(f"  • Full Credit Transfers: {summary['full_count']} ({summary['full_percent']:.1%})")
         report.append(f"  • Conditional Transfers: {summary['conditional_count']} ({summary['conditional_percent']:.1%})")
@@ -305,13 +390,11 @@ class ReportGenerator:
         report.append("SKILL MATCHING SUMMARY")
         report.append("=" * 80)
         
-        common_skills = set(s.name.lower() for s in vet_skills).intersection(
-            set(s.name.lower() for s in uni_skills)
-        )
+        common_skills = skill_overview['common_skills']
         report.append(f"\nCommon Skills Found: {len(common_skills)}")
         if common_skills:
             report.append("Top Common Skills:")
-            for skill in sorted(list(common_skills))[:10]:
+            for skill in common_skills[:10]:
                 report.append(f"  • {skill}")
         
         # Course Coverage Analysis
@@ -319,7 +402,7 @@ class ReportGenerator:
         report.append("COURSE COVERAGE ANALYSIS")
         report.append("=" * 80)
         
-        coverage = self._analyze_course_coverage(recommendations, uni_qual)
+        coverage = model.course_coverage
         report.append(f"\nCourses with Credit Transfer Options: {coverage['courses_covered']}/{coverage['total_courses']}")
         report.append(f"Coverage Rate: {coverage['coverage_rate']:.1%}")
         
@@ -359,7 +442,7 @@ class ReportGenerator:
         report.append("GAP ANALYSIS")
         report.append("=" * 80)
         
-        gaps = self._analyze_gaps(recommendations)
+        gaps = model.gaps
         report.append(f"\nMost Common Skill Gaps:")
         for skill, count in gaps['common_gaps'][:10]:
             report.append(f"  • {skill}: {count} occurrences")
@@ -440,8 +523,14 @@ class ReportGenerator:
         
         return "\n".join(lines)
     
-    def generate_csv_report(self, recommendations: List[CreditTransferRecommendation]) -> str:
+    @monitored("report.csv")
+    def generate_csv_report(self,
+                            recommendations: List[CreditTransferRecommendation],
+                            model: Optional[ReportModel] = None) -> str:
         """Generate CSV report with skill counts and detailed match info"""
+        if model is None:
+            model = self.build_report_model(recommendations)
+        
         output = StringIO()
         
         fieldnames = [
@@ -455,22 +544,16 @@ class ReportGenerator:
         writer = csv.DictWriter(output, fieldnames=fieldnames)
         writer.writeheader()
         
-        for rec in recommendations:
-            # Extract detailed match info
-            match_info = self._extract_detailed_match_info(rec)
-            
-            # Count VET skills
-            vet_skill_count = sum(len(unit.extracted_skills) for unit in rec.vet_units)
-            
-            # Count university skills
-            uni_skill_count = len(rec.uni_course.extracted_skills)
+        for detail in model.details:
+            rec = detail.rec
+            match_info = detail.match_info
             
             writer.writerow({
                 'VET_Units': ', '.join(rec.get_vet_unit_codes()),
-                'VET_Skill_Count': vet_skill_count,
+                'VET_Skill_Count': detail.vet_skill_count,
                 'Uni_Course_Code': rec.uni_course.code,
                 'Uni_Course_Name': rec.uni_course.name,
-                'Uni_Skill_Count': uni_skill_count,
+                'Uni_Skill_Count': detail.uni_skill_count,
                 'Study_Level': rec.uni_course.study_level,
                 'Direct_Matches': match_info['direct_matches'],
                 'Partial_Matches': match_info['partial_matches'],
@@ -482,7 +565,7 @@ class ReportGenerator:
                 'Alignment_Score': f"{rec.alignment_score:.2%}",
                 'Confidence': f"{rec.confidence:.2%}",
                 'Recommendation_Type': rec.recommendation.value,
-                'Transfer_Reasoning': self._generate_transfer_reasoning(rec, match_info).replace('<br>', '; '),
+                'Transfer_Reasoning': detail.reasoning_text('; '),
                 'Conditions': '; '.join(rec.conditions[:3]),
                 'Evidence': '; '.join(rec.evidence[:3])
             })
@@ -492,1254 +575,38 @@ class ReportGenerator:
     def generate_html_report(self,
                          recommendations: List[CreditTransferRecommendation],
                          vet_qual: VETQualification,
-                         uni_qual: UniQualification) -> str:
+                         uni_qual: UniQualification,
+                         model: Optional[ReportModel] = None) -> str:
         """Generate HTML report with enhanced interactivity and modern design"""
-        html = []
-        
-        # Enhanced HTML header with modern styles and libraries
-        html.append("""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Credit Transfer Analysis Report</title>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-            <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
-            <style>
-                * {
-                    margin: 0;
-                    padding: 0;
-                    box-sizing: border-box;
-                }
-                
-                body { 
-                    font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                    padding: 20px;
-                }
-                
-                .container {
-                    max-width: 1400px;
-                    margin: 0 auto;
-                    background: white;
-                    border-radius: 20px;
-                    box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-                    overflow: hidden;
-                }
-                
-                .header {
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 40px;
-                    position: relative;
-                    overflow: hidden;
-                }
-                
-                .header::before {
-                    content: '';
-                    position: absolute;
-                    top: -50%;
-                    right: -50%;
-                    bottom: -50%;
-                    left: -50%;
-                    background: repeating-linear-gradient(
-                        45deg,
-                        transparent,
-                        transparent 10px,
-                        rgba(255, 255, 255, 0.05) 10px,
-                        rgba(255, 255, 255, 0.05) 20px
-                    );
-                    animation: slide 20s linear infinite;
-                }
-                
-                @keyframes slide {
-                    0% { transform: translate(0, 0); }
-                    100% { transform: translate(50px, 50px); }
-                }
-                
-                .header-content {
-                    position: relative;
-                    z-index: 1;
-                }
-                
-                h1 { 
-                    font-size: 2.5rem;
-                    font-weight: 700;
-                    margin-bottom: 10px;
-                    text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
-                }
-                
-                .header-info {
-                    font-size: 0.95rem;
-                    opacity: 0.95;
-                    line-height: 1.6;
-                }
-                
-                .content {
-                    padding: 40px;
-                }
-                
-                h2 { 
-                    color: #2d3748;
-                    font-size: 1.8rem;
-                    font-weight: 600;
-                    margin: 40px 0 20px 0;
-                    display: flex;
-                    align-items: center;
-                    gap: 10px;
-                }
-                
-                h2 i {
-                    color: #667eea;
-                    font-size: 1.5rem;
-                }
-                
-                h3 { 
-                    color: #4a5568;
-                    font-size: 1.2rem;
-                    font-weight: 500;
-                    margin: 20px 0 15px 0;
-                }
-                
-                /* Enhanced table styles with CONDENSED rows */
-                table { 
-                    border-collapse: separate;
-                    border-spacing: 0;
-                    width: 100%;
-                    margin: 25px 0;
-                    border-radius: 12px;
-                    overflow: hidden;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                }
-                
-                th { 
-                    background: linear-gradient(135deg, #4a5568 0%, #2d3748 100%);
-                    color: white;
-                    padding: 6px 10px;
-                    text-align: left;
-                    font-weight: 600;
-                    font-size: 0.8rem;
-                    letter-spacing: 0.5px;
-                    text-transform: uppercase;
-                }
-                
-                td { 
-                    padding: 5px 10px;
-                    border-bottom: 1px solid #e2e8f0;
-                    font-size: 0.85rem;
-                    line-height: 1.3;
-                    transition: all 0.3s ease;
-                }
-                
-                /* Recommendation type colors with gradients */
-                .full.rec-group-even { 
-                    background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
-                }
-                .full.rec-group-odd { 
-                    background: linear-gradient(135deg, #e8f5e8 0%, #d4edda 100%);
-                }
-                .partial.rec-group-even { 
-                    background: linear-gradient(135deg, #fff3cd 0%, #ffe8a1 100%);
-                }
-                .partial.rec-group-odd { 
-                    background: linear-gradient(135deg, #fff8e1 0%, #fff3cd 100%);
-                }
-                
-                /* Enhanced hover effects */
-                .full.hover-highlight { 
-                    background: linear-gradient(135deg, #b8e0c1 0%, #a8d5b1 100%) !important;
-                    transform: scale(1.01);
-                }
-                .partial.hover-highlight { 
-                    background: linear-gradient(135deg, #ffde7d 0%, #ffd966 100%) !important;
-                    transform: scale(1.01);
-                }
-                
-                /* Animated expand button - SMALLER */
-                .expand-btn {
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    border: none;
-                    padding: 5px 12px;
-                    border-radius: 15px;
-                    cursor: pointer;
-                    font-size: 0.75rem;
-                    font-weight: 500;
-                    transition: all 0.3s ease;
-                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 6px;
-                }
-                
-                .expand-btn:hover {
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-                }
-                
-                .expand-btn i {
-                    transition: transform 0.3s ease;
-                }
-                
-                .expand-btn.expanded {
-                    background: linear-gradient(135deg, #e74c3c 0%, #c0392b 100%);
-                }
-                
-                .expand-btn.expanded i {
-                    transform: rotate(180deg);
-                }
-                
-                /* Enhanced expandable content */
-                .expandable-content {
-                    display: none;
-                    background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
-                    padding: 20px;
-                    animation: slideDown 0.3s ease;
-                }
-                
-                .expandable-content.show {
-                    display: table-cell;
-                }
-                
-                @keyframes slideDown {
-                    from {
-                        opacity: 0;
-                        transform: translateY(-10px);
-                    }
-                    to {
-                        opacity: 1;
-                        transform: translateY(0);
-                    }
-                }
-                
-                /* Enhanced summary boxes */
-                .summary-box { 
-                    background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
-                    padding: 25px;
-                    border-radius: 15px;
-                    margin: 30px 0;
-                    border-left: 4px solid #667eea;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);
-                }
-                
-                /* Enhanced stats grid */
-                .stats-grid { 
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                    gap: 20px;
-                    margin: 30px 0;
-                }
-                
-                .stat-card { 
-                    background: white;
-                    padding: 25px;
-                    border-radius: 15px;
-                    box-shadow: 0 10px 25px rgba(0, 0, 0, 0.08);
-                    transition: all 0.3s ease;
-                    border-top: 3px solid #667eea;
-                    text-align: center;
-                }
-                
-                .stat-card:hover {
-                    transform: translateY(-5px);
-                    box-shadow: 0 15px 35px rgba(0, 0, 0, 0.12);
-                }
-                
-                .stat-value { 
-                    font-size: 2.5rem;
-                    font-weight: 700;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    -webkit-background-clip: text;
-                    -webkit-text-fill-color: transparent;
-                    margin-bottom: 8px;
-                }
-                
-                .stat-label { 
-                    color: #718096;
-                    font-size: 0.95rem;
-                    font-weight: 500;
-                    text-transform: uppercase;
-                    letter-spacing: 1px;
-                }
-                
-                /* Enhanced progress bars */
-                .progress-container {
-                    margin: 20px 0;
-                }
-                
-                .progress-label {
-                    display: flex;
-                    justify-content: space-between;
-                    margin-bottom: 8px;
-                    font-size: 0.9rem;
-                    color: #4a5568;
-                }
-                
-                .progress-bar { 
-                    width: 100%;
-                    height: 24px;
-                    background: #e2e8f0;
-                    border-radius: 12px;
-                    overflow: hidden;
-                    box-shadow: inset 0 2px 4px rgba(0, 0, 0, 0.06);
-                }
-                
-                .progress-fill { 
-                    height: 100%;
-                    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-                    border-radius: 12px;
-                    transition: width 0.8s ease;
-                    position: relative;
-                    overflow: hidden;
-                }
-                
-                .progress-fill::after {
-                    content: '';
-                    position: absolute;
-                    top: 0;
-                    left: 0;
-                    right: 0;
-                    bottom: 0;
-                    background: linear-gradient(
-                        90deg,
-                        transparent,
-                        rgba(255, 255, 255, 0.3),
-                        transparent
-                    );
-                    animation: shimmer 2s infinite;
-                }
-                
-                @keyframes shimmer {
-                    0% { transform: translateX(-100%); }
-                    100% { transform: translateX(100%); }
-                }
-                
-                /* Enhanced skill badges - SMALLER */
-                .skill-badge { 
-                    display: inline-block;
-                    padding: 6px 12px;
-                    margin: 4px;
-                    background: linear-gradient(135deg, #edf2f7 0%, #e2e8f0 100%);
-                    border-radius: 20px;
-                    font-size: 0.85rem;
-                    font-weight: 500;
-                    transition: all 0.3s ease;
-                    border: 1px solid #cbd5e0;
-                    cursor: default;
-                }
-                
-                .skill-badge:hover {
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    border-color: transparent;
-                }
-                
-                .skill-level-badge {
-                    display: inline-block;
-                    padding: 2px 6px;
-                    margin-left: 4px;
-                    background: linear-gradient(135deg, #4a5568 0%, #2d3748 100%);
-                    color: white;
-                    border-radius: 8px;
-                    font-size: 0.65rem;
-                    font-weight: 600;
-                }
-                
-                .skill-context-badge {
-                    display: inline-block;
-                    padding: 2px 6px;
-                    margin-left: 3px;
-                    border-radius: 8px;
-                    font-size: 0.65rem;
-                    font-weight: 600;
-                    color: white;
-                }
-                
-                .skill-context-badge.theoretical {
-                    background: linear-gradient(135deg, #9f7aea 0%, #805ad5 100%);
-                }
-                
-                .skill-context-badge.practical {
-                    background: linear-gradient(135deg, #48bb78 0%, #38a169 100%);
-                }
-                
-                .skill-context-badge.hybrid {
-                    background: linear-gradient(135deg, #4299e1 0%, #3182ce 100%);
-                }
-                
-                /* NEW: Tooltip styles for skill descriptions */
-                .skill-name {
-                    position: relative;
-                    cursor: help;
-                    border-bottom: 1px dotted #667eea;
-                    display: inline-block;
-                }
-                
-                .skill-description-tooltip {
-                    visibility: hidden;
-                    width: 320px;
-                    background: linear-gradient(135deg, #2d3748 0%, #1a202c 100%);
-                    color: white;
-                    text-align: left;
-                    border-radius: 8px;
-                    padding: 12px;
-                    position: absolute;
-                    z-index: 1000;
-                    bottom: 125%;
-                    left: 50%;
-                    margin-left: -160px;
-                    opacity: 0;
-                    transition: opacity 0.3s;
-                    font-size: 0.8rem;
-                    line-height: 1.4;
-                    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
-                    pointer-events: none;
-                }
-                
-                .skill-description-tooltip::after {
-                    content: "";
-                    position: absolute;
-                    top: 100%;
-                    left: 50%;
-                    margin-left: -5px;
-                    border-width: 5px;
-                    border-style: solid;
-                    border-color: #2d3748 transparent transparent transparent;
-                }
-                
-                .skill-name:hover .skill-description-tooltip {
-                    visibility: visible;
-                    opacity: 1;
-                }
-                
-                .skill-description-label {
-                    font-weight: 600;
-                    color: #667eea;
-                    margin-bottom: 4px;
-                    display: block;
-                }
-                
-                /* NEW: Expandable row toggle for skill details */
-                .skill-detail-toggle {
-                    cursor: pointer;
-                    color: #667eea;
-                    font-size: 0.7rem;
-                    margin-left: 6px;
-                    transition: transform 0.3s ease;
-                    display: inline-block;
-                }
-                
-                .skill-detail-toggle:hover {
-                    color: #764ba2;
-                }
-                
-                .skill-detail-toggle.expanded {
-                    transform: rotate(180deg);
-                }
-                
-                .skill-detail-row {
-                    display: none;
-                    background: linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%);
-                }
-                
-                .skill-detail-row.show {
-                    display: table-row;
-                }
-                
-                .skill-detail-content {
-                    padding: 15px;
-                    animation: slideDown 0.3s ease;
-                }
-                
-                .skill-description-box {
-                    background: white;
-                    padding: 12px;
-                    border-radius: 8px;
-                    margin: 8px 0;
-                    border-left: 3px solid #667eea;
-                    font-size: 0.8rem;
-                    line-height: 1.5;
-                }
-                
-                .skill-description-box h4 {
-                    font-size: 0.85rem;
-                    color: #2d3748;
-                    margin-bottom: 6px;
-                    font-weight: 600;
-                    display: flex;
-                    align-items: center;
-                    gap: 6px;
-                }
-                
-                .skill-description-box p {
-                    color: #4a5568;
-                    margin: 0;
-                }
-                
-                .skill-description-empty {
-                    color: #a0aec0;
-                    font-style: italic;
-                }
-                
-                /* Enhanced inner skill mapping table - SMALLER */
-                .skill-mapping-inner-table {
-                    width: 100%;
-                    border-collapse: separate;
-                    border-spacing: 0;
-                    margin: 15px 0;
-                    font-size: 0.85rem;
-                    background: white;
-                    border-radius: 10px;
-                    overflow: hidden;
-                    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
-                }
-                
-                .skill-mapping-inner-table th {
-                    background: linear-gradient(135deg, #718096 0%, #4a5568 100%);
-                    color: white;
-                    padding: 6px 8px;
-                    text-align: left;
-                    font-size: 0.75rem;
-                    font-weight: 600;
-                    text-transform: uppercase;
-                    letter-spacing: 0.5px;
-                }
-                
-                .skill-mapping-inner-table td {
-                    padding: 5px 8px;
-                    border-bottom: 1px solid #e2e8f0;
-                    font-size: 0.75rem;
-                    line-height: 1.3;
-                }
-                
-                .mapping-direct td {
-                    background: linear-gradient(90deg, #d4edda 0%, #c3e6cb 100%);
-                    color: #155724;
-                    font-weight: 500;
-                }
-                
-                .mapping-partial td {
-                    background: linear-gradient(90deg, #fff3cd 0%, #ffeaa7 100%);
-                    color: #856404;
-                    font-weight: 500;
-                }
-                
-                .mapping-unmapped td {
-                    background: linear-gradient(90deg, #f8d7da 0%, #f5c6cb 100%);
-                    color: #721c24;
-                }
-                
-                .mapping-summary {
-                    margin: 15px 0;
-                    padding: 15px;
-                    background: linear-gradient(135deg, #edf2f7 0%, #e2e8f0 100%);
-                    border-radius: 10px;
-                    font-size: 0.9rem;
-                    display: flex;
-                    justify-content: space-around;
-                    align-items: center;
-                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
-                }
-                
-                .mapping-stat {
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                }
-                
-                .mapping-stat-value {
-                    font-size: 1.5rem;
-                    font-weight: 700;
-                    color: #667eea;
-                }
-                
-                .mapping-stat-label {
-                    font-size: 0.8rem;
-                    color: #718096;
-                    text-transform: uppercase;
-                    letter-spacing: 0.5px;
-                }
-                
-                /* Separator between recommendations */
-                .rec-group-last {
-                    border-bottom: 3px solid #667eea !important;
-                }
-                
-                /* Search/Filter Bar */
-                .search-container {
-                    margin: 30px 0;
-                    display: flex;
-                    gap: 15px;
-                    align-items: center;
-                    flex-wrap: wrap;
-                }
-                
-                .search-box {
-                    flex: 1;
-                    min-width: 300px;
-                    position: relative;
-                }
-                
-                .search-box input {
-                    width: 100%;
-                    padding: 12px 40px 12px 15px;
-                    border: 2px solid #e2e8f0;
-                    border-radius: 10px;
-                    font-size: 0.95rem;
-                    transition: all 0.3s ease;
-                }
-                
-                .search-box input:focus {
-                    outline: none;
-                    border-color: #667eea;
-                    box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-                }
-                
-                .search-box i {
-                    position: absolute;
-                    right: 15px;
-                    top: 50%;
-                    transform: translateY(-50%);
-                    color: #718096;
-                }
-                
-                .filter-btn {
-                    padding: 12px 20px;
-                    background: white;
-                    border: 2px solid #e2e8f0;
-                    border-radius: 10px;
-                    cursor: pointer;
-                    font-size: 0.95rem;
-                    transition: all 0.3s ease;
-                    display: flex;
-                    align-items: center;
-                    gap: 8px;
-                }
-                
-                .filter-btn:hover {
-                    border-color: #667eea;
-                    color: #667eea;
-                }
-                
-                .filter-btn.active {
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    border-color: transparent;
-                }
-                
-                /* Tooltip */
-                .tooltip {
-                    position: relative;
-                    cursor: help;
-                }
-                
-                .tooltip .tooltiptext {
-                    visibility: hidden;
-                    width: 250px;
-                    background: linear-gradient(135deg, #2d3748 0%, #1a202c 100%);
-                    color: white;
-                    text-align: center;
-                    border-radius: 8px;
-                    padding: 10px;
-                    position: absolute;
-                    z-index: 1;
-                    bottom: 125%;
-                    left: 50%;
-                    margin-left: -125px;
-                    opacity: 0;
-                    transition: opacity 0.3s;
-                    font-size: 0.85rem;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.2);
-                }
-                
-                .tooltip:hover .tooltiptext {
-                    visibility: visible;
-                    opacity: 1;
-                }
-                
-                /* Back to top button */
-                .back-to-top {
-                    position: fixed;
-                    bottom: 30px;
-                    right: 30px;
-                    width: 50px;
-                    height: 50px;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    border: none;
-                    border-radius: 50%;
-                    cursor: pointer;
-                    display: none;
-                    align-items: center;
-                    justify-content: center;
-                    font-size: 1.2rem;
-                    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
-                    transition: all 0.3s ease;
-                    z-index: 1000;
-                }
-                
-                .back-to-top:hover {
-                    transform: translateY(-5px);
-                    box-shadow: 0 6px 20px rgba(0, 0, 0, 0.3);
-                }
-                
-                .back-to-top.show {
-                    display: flex;
-                }
-                
-                /* Print styles */
-                @media print {
-                    .header {
-                        background: none;
-                        color: black;
-                    }
-                    .expand-btn, .back-to-top, .search-container {
-                        display: none !important;
-                    }
-                    .expandable-content {
-                        display: table-cell !important;
-                    }
-                }
-            </style>
-            <script>
-                function toggleExpand(btn, rowId) {
-                    var content = document.getElementById('expand-' + rowId);
-                    var icon = btn.querySelector('i');
-                    if (content.classList.contains('show')) {
-                        content.classList.remove('show');
-                        btn.innerHTML = '<i class="fas fa-chevron-down"></i> Mapped Skills';
-                        btn.classList.remove('expanded');
-                    } else {
-                        content.classList.add('show');
-                        btn.innerHTML = '<i class="fas fa-chevron-up"></i> Hide Skills';
-                        btn.classList.add('expanded');
-                    }
-                }
-                
-                // NEW: Toggle skill detail row
-                function toggleSkillDetail(icon, rowId) {
-                    var row = document.getElementById(rowId);
-                    if (row.classList.contains('show')) {
-                        row.classList.remove('show');
-                        icon.classList.remove('expanded');
-                    } else {
-                        row.classList.add('show');
-                        icon.classList.add('expanded');
-                    }
-                }
-                
-                // Enhanced hover effect for grouped rows
-                document.addEventListener('DOMContentLoaded', function() {
-                    // Hover effect
-                    var rows = document.querySelectorAll('tr[data-rec-group]');
-                    rows.forEach(function(row) {
-                        row.addEventListener('mouseenter', function() {
-                            var groupId = this.getAttribute('data-rec-group');
-                            var groupRows = document.querySelectorAll('tr[data-rec-group="' + groupId + '"]');
-                            groupRows.forEach(function(r) {
-                                r.classList.add('hover-highlight');
-                            });
-                        });
-                        row.addEventListener('mouseleave', function() {
-                            var groupId = this.getAttribute('data-rec-group');
-                            var groupRows = document.querySelectorAll('tr[data-rec-group="' + groupId + '"]');
-                            groupRows.forEach(function(r) {
-                                r.classList.remove('hover-highlight');
-                            });
-                        });
-                    });
-                    
-                    // Search functionality
-                    var searchInput = document.getElementById('searchInput');
-                    if (searchInput) {
-                        searchInput.addEventListener('keyup', function() {
-                            var filter = this.value.toLowerCase();
-                            var rows = document.querySelectorAll('tbody tr[data-rec-group]');
-                            var currentGroup = '';
-                            rows.forEach(function(row) {
-                                var group = row.getAttribute('data-rec-group');
-                                if (group !== currentGroup) {
-                                    currentGroup = group;
-                                    var text = row.textContent.toLowerCase();
-                                    var groupRows = document.querySelectorAll('tr[data-rec-group="' + group + '"]');
-                                    if (text.indexOf(filter) > -1) {
-                                        groupRows.forEach(function(r) {
-                                            r.style.display = '';
-                                        });
-                                    } else {
-                                        groupRows.forEach(function(r) {
-                                            r.style.display = 'none';
-                                        });
-                                    }
-                                }
-                            });
-                        });
-                    }
-                    
-                    // Filter buttons
-                    var filterBtns = document.querySelectorAll('.filter-btn');
-                    filterBtns.forEach(function(btn) {
-                        btn.addEventListener('click', function() {
-                            var filterType = this.getAttribute('data-filter');
-                            
-                            // Toggle active state
-                            if (this.classList.contains('active')) {
-                                this.classList.remove('active');
-                                // Show all rows
-                                document.querySelectorAll('tbody tr').forEach(function(row) {
-                                    row.style.display = '';
-                                });
-                            } else {
-                                // Remove active from all buttons
-                                filterBtns.forEach(function(b) {
-                                    b.classList.remove('active');
-                                });
-                                this.classList.add('active');
-                                
-                                // Filter rows
-                                var rows = document.querySelectorAll('tbody tr[data-rec-group]');
-                                rows.forEach(function(row) {
-                                    if (row.classList.contains(filterType) || !row.classList.contains('full') && !row.classList.contains('conditional') && !row.classList.contains('partial')) {
-                                        row.style.display = '';
-                                    } else {
-                                        row.style.display = 'none';
-                                    }
-                                });
-                            }
-                        });
-                    });
-                    
-                    // Back to top button
-                    window.onscroll = function() {
-                        var backToTop = document.getElementById('backToTop');
-                        if (document.body.scrollTop > 100 || document.documentElement.scrollTop > 100) {
-                            backToTop.classList.add('show');
-                        } else {
-                            backToTop.classList.remove('show');
-                        }
-                    };
-                    
-                    // Animate progress bars on load
-                    setTimeout(function() {
-                        var progressFills = document.querySelectorAll('.progress-fill');
-                        progressFills.forEach(function(fill) {
-                            var width = fill.getAttribute('data-width');
-                            if (width) {
-                                fill.style.width = width;
-                            }
-                        });
-                    }, 100);
-                });
-                
-                function scrollToTop() {
-                    window.scrollTo({top: 0, behavior: 'smooth'});
-                }
-            </script>
-        </head>
-        <body>
-        <div class="container">
-        """)
-        
-        # Enhanced header
-        html.append(f"""
-        <div class="header">
-            <div class="header-content">
-                <h1><i class="fas fa-graduation-cap"></i> Credit Transfer Analysis Report</h1>
-                <div class="header-info">
-                    <p><i class="fas fa-certificate"></i> VET Qualification: {vet_qual.code} - {vet_qual.name}</p>
-                    <p><i class="fas fa-university"></i> University Program: {uni_qual.code} - {uni_qual.name}</p>
-                </div>
-            </div>
-        </div>
-        """)
-        
-        html.append('<div class="content">')
-        
-        # Skill extraction summary with icons
-        vet_skills = []
-        for unit in vet_qual.units:
-            vet_skills.extend(unit.extracted_skills)
-        
-        uni_skills = []
-        for course in uni_qual.courses:
-            uni_skills.extend(course.extracted_skills)
-        
-        html.append("<h2><i class='fas fa-chart-bar'></i> Skill Extraction Summary</h2>")
-        html.append("<div class='stats-grid'>")
-        
-        html.append("<div class='stat-card'>")
-        html.append("<i class='fas fa-tools' style='font-size: 2rem; color: #667eea; margin-bottom: 15px;'></i>")
-        html.append(f"<div class='stat-value'>{len(vet_skills)}</div>")
-        html.append("<div class='stat-label'>VET Skills</div>")
-        html.append("</div>")
-        
-        html.append("<div class='stat-card'>")
-        html.append("<i class='fas fa-book' style='font-size: 2rem; color: #764ba2; margin-bottom: 15px;'></i>")
-        html.append(f"<div class='stat-value'>{len(uni_skills)}</div>")
-        html.append("<div class='stat-label'>University Skills</div>")
-        html.append("</div>")
-        
-        common_count = len(set(s.name.lower() for s in vet_skills).intersection(
-            set(s.name.lower() for s in uni_skills)))
-        
-        html.append("<div class='stat-card'>")
-        html.append("<i class='fas fa-link' style='font-size: 2rem; color: #48bb78; margin-bottom: 15px;'></i>")
-        html.append(f"<div class='stat-value'>{common_count}</div>")
-        html.append("<div class='stat-label'>Common Skills</div>")
-        html.append("</div>")
-        
-        html.append("</div>")
-        
-        # Executive Summary with enhanced progress bars
-        summary = self._generate_summary_stats(recommendations)
-        html.append("<div class='summary-box'>")
-        html.append("<h2><i class='fas fa-clipboard-list'></i> Executive Summary</h2>")
-        html.append(f"<p style='font-size: 1.1rem; margin-bottom: 20px;'><strong>Total Recommendations:</strong> {summary['total']}</p>")
-        html.append(f"<p style='font-size: 1.1rem; margin-bottom: 30px;'><strong>Average Alignment Score:</strong> {summary['avg_alignment']:.1%}</p>")
-        
-        html.append("<h3>Recommendation Distribution</h3>")
-        for rec_type, count, percent, icon, color in [
-            ('Full Credit', summary['full_count'], summary['full_percent'], 'fa-check-circle', '#48bb78'),
-            ('Partial', summary['partial_count'], summary['partial_percent'], 'fa-exclamation-circle', '#ed8936')
-        ]:
-            html.append(f"<div class='progress-container'>")
-            html.append(f"<div class='progress-label'>")
-            html.append(f"<span><i class='fas {icon}' style='color: {color};'></i> {rec_type}</span>")
-            html.append(f"<span><strong>{count}</strong> ({percent:.1%})</span>")
-            html.append(f"</div>")
-            html.append(f"<div class='progress-bar'><div class='progress-fill' data-width='{percent*100}%' style='width: 0;'></div></div>")
-            html.append(f"</div>")
-        
-        html.append("</div>")
-        
-        # Search and Filter Bar
-        html.append("<h2><i class='fas fa-search'></i> Credit Transfer Recommendations</h2>")
-        html.append("<div class='search-container'>")
-        html.append("<div class='search-box'>")
-        html.append("<input type='text' id='searchInput' placeholder='Search recommendations...' />")
-        html.append("<i class='fas fa-search'></i>")
-        html.append("</div>")
-        html.append("<button class='filter-btn' data-filter='full'><i class='fas fa-check-circle'></i> Full Only</button>")
-        html.append("<button class='filter-btn' data-filter='partial'><i class='fas fa-exclamation-circle'></i> Partial Only</button>")
-        html.append("</div>")
-        
-        # Enhanced recommendations table
-        html.append("<table>")
-        html.append("<thead><tr>")
-        html.append("<th>Action</th>")
-        html.append("<th>VET Units</th>")
-        html.append("<th>Uni Course</th>")
-        html.append("<th>Study Level</th>")
-        html.append("<th>Skills</th>")
-        html.append("<th>Alignment</th>")
-        html.append("<th>Confidence</th>")
-        html.append("<th>Type</th>")
-        html.append("<th>Conditions</th>")
-        html.append("</tr></thead>")
-        html.append("<tbody>")
-        
-        for idx, rec in enumerate(recommendations[:50], 1):  # Limit to top 50
-            rec_class = rec.recommendation.value
-            
-            # Count skill matches
-            vet_skill_count = sum(len(unit.extracted_skills) for unit in rec.vet_units)
-            uni_skill_count = len(rec.uni_course.extracted_skills)
-            
-            # Determine group class for alternating background
-            group_class = 'rec-group-even' if idx % 2 == 0 else 'rec-group-odd'
-            
-            # Create rows for each VET unit
-            vet_units = rec.vet_units
-            for unit_idx, vet_unit in enumerate(vet_units):
-                # Determine if this is the last row of this recommendation group
-                is_last_row = (unit_idx == len(vet_units) - 1)
-                row_classes = f"{rec_class} {group_class}"
-                if is_last_row:
-                    row_classes += " rec-group-last"
-                
-                html.append(f"<tr class='{row_classes}' data-rec-group='rec-{idx}'>")
-                
-                # First column: Show button only on first row
-                if unit_idx == 0:
-                    html.append(f"<td rowspan='{len(vet_units)}'><button class='expand-btn' onclick='toggleExpand(this, {idx})'><i class='fas fa-chevron-down'></i> Mapped Skills</button></td>")
-                
-                # Second column: VET unit code and name (one per row)
-                html.append(f"<td>{vet_unit.code}: {vet_unit.name}</td>")
-                
-                # Remaining columns: span across all VET unit rows (only on first row)
-                if unit_idx == 0:
-                    html.append(f"<td rowspan='{len(vet_units)}'>{rec.uni_course.code}: {rec.uni_course.name}</td>")
-                    html.append(f"<td rowspan='{len(vet_units)}'><span class='skill-level-badge'>{rec.uni_course.study_level.title()}</span></td>")
-                    html.append(f"<td rowspan='{len(vet_units)}'>{vet_skill_count} → {uni_skill_count}</td>")
-                    
-                    # Alignment with tooltip
-                    html.append(f"<td rowspan='{len(vet_units)}'>")
-                    html.append(f"<div class='tooltip'>{rec.alignment_score:.1%}")
-                    html.append(f"<span class='tooltiptext'>Based on skill coverage, quality, and level alignment</span>")
-                    html.append(f"</div>")
-                    html.append(f"</td>")
-                    
-                    html.append(f"<td rowspan='{len(vet_units)}'>{rec.confidence:.1%}</td>")
-                    
-                    # Type with icon
-                    type_icons = {'full': 'fa-check-circle', 'partial': 'fa-exclamation-circle', 'none': 'fa-ban'}
-                    type_colors = {'full': '#48bb78', 'partial': '#ed8936', 'none': '#718096'}
-                    icon = type_icons.get(rec.recommendation.value, 'fa-question')
-                    color = type_colors.get(rec.recommendation.value, '#718096')
-                    html.append(f"<td rowspan='{len(vet_units)}'><i class='fas {icon}' style='color: {color}; margin-right: 5px;'></i>{rec.recommendation.value.upper()}</td>")
-                    
-                    html.append(f"<td rowspan='{len(vet_units)}'>{'; '.join(rec.conditions[:2]) if rec.conditions else 'None'}</td>")
-                
-                html.append("</tr>")
-            
-            # Expandable row with enhanced skill mappings
-            html.append(f"<tr class='{group_class}' data-rec-group='rec-{idx}'>")
-            html.append(f"<td colspan='9' class='expandable-content' id='expand-{idx}'>")
-            
-            # Get skill mappings for this specific recommendation
-            skill_mappings = self._extract_skill_mappings_for_single_rec(rec)
-            
-            if skill_mappings:
-                # Group mappings by type
-                direct_mappings = [m for m in skill_mappings if m['mapping_type'] == 'Direct']
-                partial_mappings = [m for m in skill_mappings if m['mapping_type'] == 'Partial']
-                unmapped_mappings = [m for m in skill_mappings if m['mapping_type'] == 'Unmapped']
-                
-                # Enhanced summary with stats
-                html.append(f"<div class='mapping-summary'>")
-                html.append(f"<div class='mapping-stat'>")
-                html.append(f"<div class='mapping-stat-value'>{len(direct_mappings)}</div>")
-                html.append(f"<div class='mapping-stat-label'>Direct Matches</div>")
-                html.append(f"</div>")
-                html.append(f"<div class='mapping-stat'>")
-                html.append(f"<div class='mapping-stat-value'>{len(partial_mappings)}</div>")
-                html.append(f"<div class='mapping-stat-label'>Partial Matches</div>")
-                html.append(f"</div>")
-                html.append(f"<div class='mapping-stat'>")
-                html.append(f"<div class='mapping-stat-value'>{len(unmapped_mappings)}</div>")
-                html.append(f"<div class='mapping-stat-label'>Unmapped Skills</div>")
-                html.append(f"</div>")
-                html.append(f"</div>")
-                
-                # Create skill mapping table
-                html.append("<table class='skill-mapping-inner-table'>")
-                html.append("<thead><tr>")
-                html.append("<th>VET Unit</th>")
-                html.append("<th>VET Skill</th>")
-                html.append("<th>Uni Course</th>")
-                html.append("<th>Uni Skill</th>")
-                html.append("<th>Type</th>")
-                html.append("<th>Match %</th>")
-                html.append("<th>Analysis</th>")
-                html.append("</tr></thead>")
-                html.append("<tbody>")
-                
-                # Display direct mappings with tooltips and expandable descriptions
-                for mapping_idx, mapping in enumerate(direct_mappings):
-                    mapping_id = f"rec{idx}-direct-{mapping_idx}"
-                    html.append(f"<tr class='mapping-direct'>")
-                    html.append(f"<td>{mapping['vet_unit']}</td>")
-                    
-                    # VET skill with tooltip and toggle
-                    html.append(f"<td>")
-                    html.append(f"<span class='skill-name'>")
-                    html.append(f"{mapping['vet_skill']}")
-                    # Tooltip for quick preview
-                    vet_desc = mapping.get('vet_description', 'No description available')
-                    preview = vet_desc[:150] + '...' if len(vet_desc) > 150 else vet_desc
-                    html.append(f"<span class='skill-description-tooltip'>")
-                    html.append(f"<span class='skill-description-label'>VET Skill Description:</span>")
-                    html.append(f"{preview}")
-                    html.append(f"</span>")
-                    html.append(f"</span>")
-                    # Toggle for full description
-                    html.append(f"<i class='fas fa-chevron-down skill-detail-toggle' onclick='toggleSkillDetail(this, \"{mapping_id}\")' title='Show full description'></i>")
-                    html.append(f"<span class='skill-level-badge'>L{mapping['vet_level']}</span>")
-                    if 'vet_context' in mapping and mapping['vet_context'] != '-':
-                        html.append(f"<span class='skill-context-badge {mapping['vet_context']}'>{mapping['vet_context'].title()}</span>")
-                    html.append(f"</td>")
-                    
-                    html.append(f"<td>{mapping['uni_course']}</td>")
-                    
-                    # Uni skill with tooltip and toggle
-                    html.append(f"<td>")
-                    html.append(f"<span class='skill-name'>")
-                    html.append(f"{mapping['uni_skill']}")
-                    # Tooltip for quick preview
-                    uni_desc = mapping.get('uni_description', 'No description available')
-                    preview = uni_desc[:150] + '...' if len(uni_desc) > 150 else uni_desc
-                    html.append(f"<span class='skill-description-tooltip'>")
-                    html.append(f"<span class='skill-description-label'>Uni Skill Description:</span>")
-                    html.append(f"{preview}")
-                    html.append(f"</span>")
-                    html.append(f"</span>")
-                    # Same toggle as VET (will expand same row)
-                    html.append(f"<span class='skill-level-badge'>L{mapping['uni_level']}</span>")
-                    if 'uni_context' in mapping and mapping['uni_context'] != '-':
-                        html.append(f"<span class='skill-context-badge {mapping['uni_context']}'>{mapping['uni_context'].title()}</span>")
-                    html.append(f"</td>")
-                    
-                    html.append(f"<td><i class='fas fa-check-circle'></i> {mapping['mapping_type']}</td>")
-                    html.append(f"<td>{mapping['similarity']:.0%}</td>")
-                    html.append(f"<td>{mapping['reasoning']}</td>")
-                    html.append("</tr>")
-                    
-                    # Expandable description row
-                    html.append(f"<tr id='{mapping_id}' class='skill-detail-row'>")
-                    html.append(f"<td colspan='7'>")
-                    html.append(f"<div class='skill-detail-content'>")
-                    html.append(f"<div class='skill-description-box'>")
-                    html.append(f"<h4><i class='fas fa-tools'></i> VET Skill: {mapping['vet_skill']}</h4>")
-                    html.append(f"<p class='{'skill-description-empty' if vet_desc == 'No description available' else ''}'>{vet_desc}</p>")
-                    html.append(f"</div>")
-                    html.append(f"<div class='skill-description-box'>")
-                    html.append(f"<h4><i class='fas fa-book'></i> University Skill: {mapping['uni_skill']}</h4>")
-                    html.append(f"<p class='{'skill-description-empty' if uni_desc == 'No description available' else ''}'>{uni_desc}</p>")
-                    html.append(f"</div>")
-                    html.append(f"</div>")
-                    html.append(f"</td>")
-                    html.append(f"</tr>")
-                
-                # Display partial mappings
-                for mapping_idx, mapping in enumerate(partial_mappings):
-                    mapping_id = f"rec{idx}-partial-{mapping_idx}"
-                    html.append(f"<tr class='mapping-partial'>")
-                    html.append(f"<td>{mapping['vet_unit']}</td>")
-                    
-                    # VET skill with tooltip and toggle
-                    html.append(f"<td>")
-                    html.append(f"<span class='skill-name'>")
-                    html.append(f"{mapping['vet_skill']}")
-                    vet_desc = mapping.get('vet_description', 'No description available')
-                    preview = vet_desc[:150] + '...' if len(vet_desc) > 150 else vet_desc
-                    html.append(f"<span class='skill-description-tooltip'>")
-                    html.append(f"<span class='skill-description-label'>VET Skill Description:</span>")
-                    html.append(f"{preview}")
-                    html.append(f"</span>")
-                    html.append(f"</span>")
-                    html.append(f"<i class='fas fa-chevron-down skill-detail-toggle' onclick='toggleSkillDetail(this, \"{mapping_id}\")' title='Show full description'></i>")
-                    html.append(f"<span class='skill-level-badge'>L{mapping['vet_level']}</span>")
-                    if 'vet_context' in mapping and mapping['vet_context'] != '-':
-                        html.append(f"<span class='skill-context-badge {mapping['vet_context']}'>{mapping['vet_context'].title()}</span>")
-                    html.append(f"</td>")
-                    
-                    html.append(f"<td>{mapping['uni_course']}</td>")
-                    
-                    # Uni skill with tooltip and toggle
-                    html.append(f"<td>")
-                    html.append(f"<span class='skill-name'>")
-                    html.append(f"{mapping['uni_skill']}")
-                    uni_desc = mapping.get('uni_description', 'No description available')
-                    preview = uni_desc[:150] + '...' if len(uni_desc) > 150 else uni_desc
-                    html.append(f"<span class='skill-description-tooltip'>")
-                    html.append(f"<span class='skill-description-label'>Uni Skill Description:</span>")
-                    html.append(f"{preview}")
-                    html.append(f"</span>")
-                    html.append(f"</span>")
-                    html.append(f"<span class='skill-level-badge'>L{mapping['uni_level']}</span>")
-                    if 'uni_context' in mapping and mapping['uni_context'] != '-':
-                        html.append(f"<span class='skill-context-badge {mapping['uni_context']}'>{mapping['uni_context'].title()}</span>")
-                    html.append(f"</td>")
-                    
-                    html.append(f"<td><i class='fas fa-exclamation-circle'></i> {mapping['mapping_type']}</td>")
-                    html.append(f"<td>{mapping['similarity']:.0%}</td>")
-                    html.append(f"<td>{mapping['reasoning']}</td>")
-                    html.append("</tr>")
-                    
-                    # Expandable description row
-                    html.append(f"<tr id='{mapping_id}' class='skill-detail-row'>")
-                    html.append(f"<td colspan='7'>")
-                    html.append(f"<div class='skill-detail-content'>")
-                    html.append(f"<div class='skill-description-box'>")
-                    html.append(f"<h4><i class='fas fa-tools'></i> VET Skill: {mapping['vet_skill']}</h4>")
-                    html.append(f"<p class='{'skill-description-empty' if vet_desc == 'No description available' else ''}'>{vet_desc}</p>")
-                    html.append(f"</div>")
-                    html.append(f"<div class='skill-description-box'>")
-                    html.append(f"<h4><i class='fas fa-book'></i> University Skill: {mapping['uni_skill']}</h4>")
-                    html.append(f"<p class='{'skill-description-empty' if uni_desc == 'No description available' else ''}'>{uni_desc}</p>")
-                    html.append(f"</div>")
-                    html.append(f"</div>")
-                    html.append(f"</td>")
-                    html.append(f"</tr>")
-                
-                # Display unmapped mappings (no descriptions needed)
-                for mapping in unmapped_mappings:
-                    html.append(f"<tr class='mapping-unmapped'>")
-                    html.append(f"<td>{mapping['vet_unit']}</td>")
-                    html.append(f"<td>{mapping.get('vet_skill', '-')}</td>")
-                    html.append(f"<td>{mapping['uni_course']}</td>")
-                    html.append(f"<td>{mapping.get('uni_skill', '-')}</td>")
-                    html.append(f"<td><i class='fas fa-times-circle'></i> {mapping['mapping_type']}</td>")
-                    html.append(f"<td>-</td>")
-                    html.append(f"<td>{mapping['reasoning']}</td>")
-                    html.append("</tr>")
-                
-                # Add note if more mappings exist
-                # total_mappings = len(skill_mappings)
-                # shown_mappings = min(25, len(direct_mappings) + len(partial_mappings) + len(unmapped_mappings))
-                # if total_mappings > shown_mappings:
-                #     html.append(f"<tr><td colspan='7' style='text-align:center; font-style:italic; color: #718096;'>")
-                #     html.append(f"<i class='fas fa-ellipsis-h'></i> {total_mappings - shown_mappings} more mappings not shown")
-                #     html.append(f"</td></tr>")
-                
-                html.append("</tbody></table>")
-            else:
-                html.append("<p style='text-align:center; color: #718096;'><i class='fas fa-info-circle'></i> No skill mapping data available.</p>")
-            
-            html.append("</td>")
-            html.append("</tr>")
-        
-        html.append("</tbody></table>")
-        
-        # Top Skills Section with enhanced badges
-        html.append("<h2><i class='fas fa-star'></i> Top Extracted Skills</h2>")
-        
-        html.append("<h3>VET Skills (Top 20)</h3>")
-        html.append("<div style='padding: 20px;'>")
-        vet_skill_names = [s.name for s in sorted(vet_skills, key=lambda x: x.confidence, reverse=True)]
-        for skill_name in vet_skill_names[:20]:
-            html.append(f"<span class='skill-badge'><i class='fas fa-tools' style='font-size: 0.8rem; margin-right: 4px;'></i>{skill_name}</span>")
-        html.append("</div>")
-        
-        html.append("<h3>University Skills (Top 20)</h3>")
-        html.append("<div style='padding: 20px;'>")
-        uni_skill_names = [s.name for s in sorted(uni_skills, key=lambda x: x.confidence, reverse=True)]
-        for skill_name in uni_skill_names[:20]:
-            html.append(f"<span class='skill-badge'><i class='fas fa-book' style='font-size: 0.8rem; margin-right: 4px;'></i>{skill_name}</span>")
-        html.append("</div>")
-        
-        # Gap Analysis
-        gaps = self._analyze_gaps(recommendations)
-        if gaps['common_gaps']:
-            html.append("<h2><i class='fas fa-exclamation-triangle'></i> Common Skill Gaps</h2>")
-            html.append("<div class='summary-box'>")
-            html.append("<ul style='columns: 2; column-gap: 40px;'>")
-            for skill, count in gaps['common_gaps'][:10]:
-                html.append(f"<li style='margin: 10px 0;'><strong>{skill}</strong> <span style='color: #718096;'>({count} occurrences)</span></li>")
-            html.append("</ul>")
-            html.append("</div>")
-        
-        html.append("</div>") # Close content div
-        html.append("</div>") # Close container div
-        
-        # Back to top button
-        html.append("""
-        <button id="backToTop" class="back-to-top" onclick="scrollToTop()">
-            <i class="fas fa-arrow-up"></i>
-        </button>
-        """)
+        output = StringIO()
+        self.write_html_report(recommendations, vet_qual, uni_qual, output, model)
+        return output.getvalue()
+    
+    @monitored("report.html")
+    def write_html_report(self,
+                          recommendations: List[CreditTransferRecommendation],
+                          vet_qual: VETQualification,
+                          uni_qual: UniQualification,
+                          out: Union[str, Path, TextIO],
+                          model: Optional[ReportModel] = None):
+        """
+        Stream the HTML report to a file path or text stream section by section
         
-        # Footer
-        html.append("""
-        </body>
-        </html>
-        """)
+        Args:
+            recommendations: List of credit transfer recommendations
+            vet_qual: VET qualification
+            uni_qual: University qualification
+            out: Output file path or writable text stream
+            model: Prebuilt report model (built if not given)
+        """
+        if model is None:
+            model = self.build_report_model(recommendations, vet_qual, uni_qual)
         
-        return "\n".join(html)
+        if isinstance(out, (str, Path)):
+            with open(out, 'w', encoding='utf-8') as f:
+                self.html_renderer.render(f, model.details, vet_qual, uni_qual, model.summary, model.gaps)
+        else:
+            self.html_renderer.render(out, model.details, vet_qual, uni_qual, model.summary, model.gaps)
         
     def _generate_summary_stats(self, recommendations: List[CreditTransferRecommendation]) -> Dict:
         """Generate summary statistics"""
@@ -1918,11 +785,12 @@ class ReportGenerator:
             'matching_strategy': matching_strategy
         }
         
-    def _extract_skill_mappings_for_single_rec(self, rec: CreditTransferRecommendation) -> List[Dict]:
+    def _extract_skill_mappings_for_single_rec(self, rec: CreditTransferRecommendation, classifier=None) -> List[Dict]:
         """Extract skill mappings for a single recommendation WITH DESCRIPTIONS"""
         
-        from mapping.simple_mapping_types import SimpleMappingClassifier
-        classifier = SimpleMappingClassifier()
+        if classifier is None:
+            from mapping.simple_mapping_types import SimpleMappingClassifier
+            classifier = SimpleMappingClassifier()
         
         # Get matching strategy from metadata
         matching_strategy = rec.metadata.get('matching_strategy', 'clustering')
@@ -2234,30 +1102,19 @@ class ReportGenerator:
         }
         return colors.get(mapping_type, '#ffffff')
     
-    def _extract_skill_mappings(self, recommendations: List[CreditTransferRecommendation]) -> List[Dict]:
+    def _extract_skill_mappings(self,
+                                recommendations: List[CreditTransferRecommendation],
+                                model: Optional[ReportModel] = None) -> List[Dict]:
         """Extract skill mappings for all matching strategies (clustering, direct, hybrid)"""
+        if model is None:
+            model = self.build_report_model(recommendations)
+        return model.skill_mappings
         
-        from mapping.simple_mapping_types import SimpleMappingClassifier
-        classifier = SimpleMappingClassifier()
-        
-        all_mappings = []
-        
-        for rec in recommendations:
-            # Get matching strategy from metadata
-            matching_strategy = rec.metadata.get('matching_strategy', 'clustering')
-            
-            if matching_strategy in ['direct', 'direct_one_vs_all', 'hybrid']:
-                # Handle direct and hybrid matching
-                all_mappings.extend(self._extract_direct_skill_mappings_with_descriptions(rec, classifier))
-            else:
-                # Original clustering logic
-                all_mappings.extend(self._extract_cluster_skill_mappings_with_descriptions(rec, classifier))
-        
-        return all_mappings
-        
+    @monitored("report.skill_mappings_csv")
     def export_skill_mappings_to_csv(self, 
                                  recommendations: List[CreditTransferRecommendation],
-                                 filepath: str = None) -> str:
+                                 filepath: str = None,
+                                 model: Optional[ReportModel] = None) -> str:
         """
         Export detailed skill mappings to CSV
         """
@@ -2268,7 +1125,7 @@ class ReportGenerator:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filepath = f"output/skill_mappings_{timestamp}.csv"
         
-        skill_mappings = self._extract_skill_mappings(recommendations)
+        skill_mappings = self._extract_skill_mappings(recommendations, model)
         
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
             fieldnames = [
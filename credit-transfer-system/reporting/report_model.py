@@ -0,0 +1,58 @@
+"""
+Shared report data model
+Match analysis, reasoning, skill mappings, gaps and summary statistics are
+derived once and reused by every report writer (HTML, CSV, JSON, text)
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Callable, Optional
+
+from models.base_models import CreditTransferRecommendation, VETQualification, UniQualification
+
+
+@dataclass
+class RecommendationDetail:
+    """Derived report data for one recommendation"""
+    rec: CreditTransferRecommendation
+    match_info: Dict[str, Any]
+    reasoning: str                          # '<br>'-joined key points
+    vet_skill_count: int
+    uni_skill_count: int
+    _mapping_factory: Optional[Callable[[CreditTransferRecommendation], List[Dict]]] = field(
+        default=None, repr=False
+    )
+    _skill_mappings: Optional[List[Dict]] = field(default=None, repr=False)
+
+    @property
+    def skill_mappings(self) -> List[Dict]:
+        """Skill mapping rows, extracted on first access"""
+        if self._skill_mappings is None:
+            self._skill_mappings = self._mapping_factory(self.rec) if self._mapping_factory else []
+        return self._skill_mappings
+
+    def reasoning_text(self, separator: str) -> str:
+        """Reasoning with the HTML line breaks replaced for plain-text formats"""
+        return self.reasoning.replace('<br>', separator)
+
+
+@dataclass
+class ReportModel:
+    """Normalized view of one analysis run that all report formats render from"""
+    recommendations: List[CreditTransferRecommendation]
+    vet_qual: Optional[VETQualification]
+    uni_qual: Optional[UniQualification]
+    details: List[RecommendationDetail]
+    summary: Dict[str, Any]
+    gaps: Dict[str, Any]
+    course_coverage: Dict[str, Any] = field(default_factory=dict)
+    skill_overview: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def skill_mappings(self) -> List[Dict]:
+        """Skill mapping rows for all recommendations, in recommendation order"""
+        return [mapping for detail in self.details for mapping in detail.skill_mappings]
+
+    def prefetch_mappings(self):
+        """Extract all skill mappings now so concurrent writers only read them"""
+        for detail in self.details:
+            detail.skill_mappings
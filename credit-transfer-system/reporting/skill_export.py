@@ -10,7 +10,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 from io import StringIO
-import pandas as pd 
+from collections import Counter
 
 from models.base_models import (
     VETQualification, UniQualification, 
@@ -24,6 +24,13 @@ logger = logging.getLogger(__name__)
 class SkillExportManager:
     """Manages export and import of extracted skills for courses"""
     
+    # Skill columns shared by the per-qualification 'All Skills' sheets
+    EXCEL_SKILL_COLUMNS = [
+        'Skill Name', 'Description', 'Category', 'Level', 'Level Value', 'Context',
+        'Confidence', 'Keywords', 'Evidence', 'Translation Rationale'
+    ]
+    EXCEL_NUMBER_FORMATS = {'Confidence': '0.00'}
+    
     def __init__(self, output_dir: str = "output/skills"):
         """
         Initialize skill export manager
@@ -356,108 +363,66 @@ class SkillExportManager:
     def _export_vet_to_excel(self, vet_qual: VETQualification, filepath: Path):
         """Export VET skills to Excel file with multiple sheets"""
         
-        # Create a Pandas Excel writer
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        from .excel_writer import StreamingExcelWriter
+        with StreamingExcelWriter(filepath) as writer:
             # Sheet 1: Summary
-            summary_data = {
-                'Metric': ['Qualification Code', 'Qualification Name', 'Level', 'Total Units', 'Total Skills'],
-                'Value': [vet_qual.code, vet_qual.name, vet_qual.level, len(vet_qual.units), 
-                        sum(len(u.extracted_skills) for u in vet_qual.units)]
-            }
-            pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
+            writer.write_sheet('Summary', ['Metric', 'Value'], zip(
+                ['Qualification Code', 'Qualification Name', 'Level', 'Total Units', 'Total Skills'],
+                [vet_qual.code, vet_qual.name, vet_qual.level, len(vet_qual.units),
+                 sum(len(u.extracted_skills) for u in vet_qual.units)]
+            ))
             
             # Sheet 2: All Skills
-            all_skills_data = []
-            for unit in vet_qual.units:
-                for skill in unit.extracted_skills:
-                    all_skills_data.append({
-                        'Unit Code': unit.code,
-                        'Unit Name': unit.name,
-                        'Nominal Hours': unit.nominal_hours,
-                        'Skill Name': skill.name,
-                        'Description': skill.description,
-                        'Category': skill.category.value,
-                        'Level': skill.level.name,
-                        'Level Value': skill.level.value,
-                        'Context': skill.context.value,
-                        'Confidence': skill.confidence,
-                        'Keywords': '; '.join(skill.keywords),
-                        'Evidence': skill.evidence,
-                        'Translation Rationale': skill.translation_rationale
-                    })
-            
-            pd.DataFrame(all_skills_data).to_excel(writer, sheet_name='All Skills', index=False)
-            
-            # Sheet 3: Skills by Unit (pivot)
-            if all_skills_data:
-                skills_df = pd.DataFrame(all_skills_data)
-                pivot = skills_df.pivot_table(
-                    values='Skill Name', 
-                    index='Unit Code', 
-                    aggfunc='count'
-                ).rename(columns={'Skill Name': 'Skill Count'})
-                pivot.to_excel(writer, sheet_name='Skills by Unit')
+            columns = ['Unit Code', 'Unit Name', 'Nominal Hours'] + self.EXCEL_SKILL_COLUMNS
+            rows = (
+                [unit.code, unit.name, unit.nominal_hours] + self._excel_skill_cells(skill)
+                for unit in vet_qual.units
+                for skill in unit.extracted_skills
+            )
+            writer.write_sheet('All Skills', columns, rows, number_formats=self.EXCEL_NUMBER_FORMATS)
+            
+            # Sheet 3: Skills by Unit
+            by_unit = self._count_skills_by(vet_qual.units, lambda unit: unit.code)
+            if by_unit:
+                writer.write_sheet('Skills by Unit', ['Unit Code', 'Skill Count'], by_unit)
 
     def _export_uni_to_excel(self, uni_qual: UniQualification, filepath: Path):
         """Export University skills to Excel file with multiple sheets"""
         
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        from .excel_writer import StreamingExcelWriter
+        with StreamingExcelWriter(filepath) as writer:
             # Sheet 1: Summary
-            summary_data = {
-                'Metric': ['Qualification Code', 'Qualification Name', 'Total Courses', 
-                        'Total Credit Points', 'Duration Years', 'Total Skills'],
-                'Value': [uni_qual.code, uni_qual.name, len(uni_qual.courses),
-                        uni_qual.total_credit_points, uni_qual.duration_years,
-                        sum(len(c.extracted_skills) for c in uni_qual.courses)]
-            }
-            pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
+            writer.write_sheet('Summary', ['Metric', 'Value'], zip(
+                ['Qualification Code', 'Qualification Name', 'Total Courses',
+                 'Total Credit Points', 'Duration Years', 'Total Skills'],
+                [uni_qual.code, uni_qual.name, len(uni_qual.courses),
+                 uni_qual.total_credit_points, uni_qual.duration_years,
+                 sum(len(c.extracted_skills) for c in uni_qual.courses)]
+            ))
             
             # Sheet 2: All Skills
-            all_skills_data = []
-            for course in uni_qual.courses:
-                for skill in course.extracted_skills:
-                    all_skills_data.append({
-                        'Course Code': course.code,
-                        'Course Name': course.name,
-                        'Study Level': course.study_level,
-                        'Credit Points': course.credit_points,
-                        'Skill Name': skill.name,
-                        'Description': skill.description,
-                        'Category': skill.category.value,
-                        'Level': skill.level.name,
-                        'Level Value': skill.level.value,
-                        'Context': skill.context.value,
-                        'Confidence': skill.confidence,
-                        'Keywords': '; '.join(skill.keywords),
-                        'Evidence': skill.evidence,
-                        'Translation Rationale': skill.translation_rationale
-                    })
-            
-            pd.DataFrame(all_skills_data).to_excel(writer, sheet_name='All Skills', index=False)
+            columns = ['Course Code', 'Course Name', 'Study Level', 'Credit Points'] + self.EXCEL_SKILL_COLUMNS
+            rows = (
+                [course.code, course.name, course.study_level, course.credit_points] + self._excel_skill_cells(skill)
+                for course in uni_qual.courses
+                for skill in course.extracted_skills
+            )
+            writer.write_sheet('All Skills', columns, rows, number_formats=self.EXCEL_NUMBER_FORMATS)
             
             # Sheet 3: Skills by Course
-            if all_skills_data:
-                skills_df = pd.DataFrame(all_skills_data)
-                pivot = skills_df.pivot_table(
-                    values='Skill Name',
-                    index='Course Code',
-                    aggfunc='count'
-                ).rename(columns={'Skill Name': 'Skill Count'})
-                pivot.to_excel(writer, sheet_name='Skills by Course')
-            
-            # Sheet 4: Skills by Study Level
-            if all_skills_data:
-                level_pivot = skills_df.pivot_table(
-                    values='Skill Name',
-                    index='Study Level',
-                    aggfunc='count'
-                ).rename(columns={'Skill Name': 'Skill Count'})
-                level_pivot.to_excel(writer, sheet_name='Skills by Level')
+            by_course = self._count_skills_by(uni_qual.courses, lambda course: course.code)
+            if by_course:
+                writer.write_sheet('Skills by Course', ['Course Code', 'Skill Count'], by_course)
+                
+                # Sheet 4: Skills by Study Level
+                by_level = self._count_skills_by(uni_qual.courses, lambda course: course.study_level)
+                writer.write_sheet('Skills by Level', ['Study Level', 'Skill Count'], by_level)
 
     def _export_combined_to_excel(self, vet_qual: VETQualification, uni_qual: UniQualification, filepath: Path):
         """Export combined VET and University skills to Excel with comparison"""
         
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        from .excel_writer import StreamingExcelWriter
+        with StreamingExcelWriter(filepath) as writer:
             # Sheet 1: Comparison Summary
             vet_skills = []
             for unit in vet_qual.units:
@@ -469,47 +434,59 @@ class SkillExportManager:
             
             common_skills = self._find_common_skills(vet_skills, uni_skills)
             
-            summary_data = {
-                'Metric': ['VET Qualification', 'University Qualification', 
-                        'Total VET Skills', 'Total Uni Skills', 'Common Skills'],
-                'Value': [f"{vet_qual.code} - {vet_qual.name}",
-                        f"{uni_qual.code} - {uni_qual.name}",
-                        len(vet_skills), len(uni_skills), len(common_skills)]
-            }
-            pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
+            writer.write_sheet('Summary', ['Metric', 'Value'], zip(
+                ['VET Qualification', 'University Qualification',
+                 'Total VET Skills', 'Total Uni Skills', 'Common Skills'],
+                [f"{vet_qual.code} - {vet_qual.name}",
+                 f"{uni_qual.code} - {uni_qual.name}",
+                 len(vet_skills), len(uni_skills), len(common_skills)]
+            ))
             
             # Sheet 2: VET Skills
-            vet_data = []
-            for unit in vet_qual.units:
-                for skill in unit.extracted_skills:
-                    vet_data.append({
-                        'Unit Code': unit.code,
-                        'Unit Name': unit.name,
-                        'Skill Name': skill.name,
-                        'Category': skill.category.value,
-                        'Level': skill.level.value,
-                        'Context': skill.context.value,
-                        'Confidence': skill.confidence
-                    })
-            pd.DataFrame(vet_data).to_excel(writer, sheet_name='VET Skills', index=False)
+            vet_rows = (
+                [unit.code, unit.name, skill.name, skill.category.value,
+                 skill.level.value, skill.context.value, skill.confidence]
+                for unit in vet_qual.units
+                for skill in unit.extracted_skills
+            )
+            writer.write_sheet(
+                'VET Skills',
+                ['Unit Code', 'Unit Name', 'Skill Name', 'Category', 'Level', 'Context', 'Confidence'],
+                vet_rows, number_formats=self.EXCEL_NUMBER_FORMATS
+            )
             
             # Sheet 3: University Skills
-            uni_data = []
-            for course in uni_qual.courses:
-                for skill in course.extracted_skills:
-                    uni_data.append({
-                        'Course Code': course.code,
-                        'Course Name': course.name,
-                        'Skill Name': skill.name,
-                        'Category': skill.category.value,
-                        'Level': skill.level.value,
-                        'Context': skill.context.value,
-                        'Confidence': skill.confidence
-                    })
-            pd.DataFrame(uni_data).to_excel(writer, sheet_name='University Skills', index=False)
+            uni_rows = (
+                [course.code, course.name, skill.name, skill.category.value,
+                 skill.level.value, skill.context.value, skill.confidence]
+                for course in uni_qual.courses
+                for skill in course.extracted_skills
+            )
+            writer.write_sheet(
+                'University Skills',
+                ['Course Code', 'Course Name', 'Skill Name', 'Category', 'Level', 'Context', 'Confidence'],
+                uni_rows, number_formats=self.EXCEL_NUMBER_FORMATS
+            )
             
             # Sheet 4: Common Skills
-            pd.DataFrame({'Common Skills': common_skills}).to_excel(writer, sheet_name='Common Skills', index=False)
+            writer.write_sheet('Common Skills', ['Common Skills'], ([name] for name in common_skills))
+    
+    def _excel_skill_cells(self, skill: Skill) -> List[Any]:
+        """Cells for EXCEL_SKILL_COLUMNS"""
+        return [
+            skill.name, skill.description, skill.category.value, skill.level.name,
+            skill.level.value, skill.context.value, skill.confidence,
+            '; '.join(skill.keywords), skill.evidence, skill.translation_rationale
+        ]
+    
+    def _count_skills_by(self, items: List, key) -> List[tuple]:
+        """(key, skill count) rows sorted by key, skipping items without skills or a key"""
+        counts = Counter()
+        for item in items:
+            group = key(item)
+            if item.extracted_skills and group is not None:
+                counts[group] += len(item.extracted_skills)
+        return sorted(counts.items())
     
     # ========== IMPORT METHODS ==========
     
@@ -0,0 +1,507 @@
+"""
+Incremental per-unit skill store
+Keeps extracted skills for each VET unit / University course in an
+append-only data file with a small index, keyed by item code and
+validated against a hash of the item's source text. Entries are stored
+as JSON lines or as compact binary records (utils.skill_codec).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+
+from models.base_models import Skill
+from utils.skill_codec import encode_skills, decode_skills
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are not serialised across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class SkillStore:
+    """Append-only store of extracted skills with a per-kind index file"""
+
+    INDEX_VERSION = 2
+    KINDS = ("vet", "uni")
+    # Data file suffix per entry format
+    FORMATS = {"json": ".jsonl", "binary": ".skl"}
+    # Binary records are preceded by their length so the data file can be walked
+    _LENGTH_PREFIX = struct.Struct("<I")
+    # Binary entries start with the item code so a read can be checked against the index;
+    # records written before that hold only the encoded skills
+    _ENTRY_MAGIC = b"SKE"
+    _CODE_LENGTH = struct.Struct("<H")
+
+    def __init__(self, store_dir: str = "output/skills/store", format: str = "binary"):
+        """
+        Initialize skill store
+
+        Args:
+            store_dir: Directory holding '<kind>.jsonl' / '<kind>.skl' data files and
+                '<kind>_index.json' indexes
+            format: Format for newly written entries ('binary' or 'json'); entries in
+                either format are always readable
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported skill store format: {format}")
+
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self._indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # (mtime_ns, size) of each index file when it was loaded
+        self._index_stats: Dict[str, Optional[tuple]] = {}
+
+    # ========== PATHS AND INDEX ==========
+
+    def _data_path(self, kind: str, format: Optional[str] = None) -> Path:
+        return self.store_dir / f"{kind}{self.FORMATS[format or self.format]}"
+
+    def _index_path(self, kind: str) -> Path:
+        return self.store_dir / f"{kind}_index.json"
+
+    def _lock_path(self, kind: str) -> Path:
+        return self.store_dir / f"{kind}.lock"
+
+    @contextmanager
+    def _write_lock(self, kind: str):
+        """
+        Hold an exclusive lock on a kind's data files and index
+
+        Another process may have appended entries since the index was loaded,
+        so it is re-read once the lock is held.
+        """
+        with open(self._lock_path(kind), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._indexes.pop(kind, None)
+                yield self._get_index(kind)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _index_stat(self, kind: str) -> Optional[tuple]:
+        try:
+            stat = self._index_path(kind).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _get_index(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the index for a kind, kept in memory
+
+        The index file is re-read when its mtime or size changed, so writes and
+        compactions by other processes are picked up by long-lived stores.
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unsupported skill store kind: {kind}")
+
+        stat = self._index_stat(kind)
+        if kind not in self._indexes or self._index_stats.get(kind) != stat:
+            index_path = self._index_path(kind)
+            entries = {}
+            if index_path.exists():
+                try:
+                    with open(index_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if data.get("version") == self.INDEX_VERSION:
+                        entries = data.get("entries", {})
+                    elif data.get("version") == 1:
+                        # Version 1 stores only held JSON lines
+                        entries = {code: {**entry, "format": "json"}
+                                   for code, entry in data.get("entries", {}).items()}
+                    else:
+                        logger.warning(f"Ignoring skill store index {index_path} with version {data.get('version')}")
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.warning(f"Could not read skill store index {index_path}: {e}")
+            self._indexes[kind] = entries
+            self._index_stats[kind] = stat
+
+        return self._indexes[kind]
+
+    def _write_index(self, kind: str):
+        """Atomically rewrite the index file for a kind"""
+        index_path = self._index_path(kind)
+        tmp_path = index_path.with_suffix(".json.tmp")
+        data = {
+            "version": self.INDEX_VERSION,
+            "updated": datetime.now().isoformat(),
+            "entries": self._get_index(kind)
+        }
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+        self._index_stats[kind] = self._index_stat(kind)
+
+    # ========== HASHING ==========
+
+    @staticmethod
+    def content_hash(item: Any) -> str:
+        """Hash of the source text a unit/course's skills were extracted from"""
+        return hashlib.sha256(item.get_full_text().encode("utf-8")).hexdigest()
+
+    # ========== LOOKUP ==========
+
+    def has_entry(self, kind: str, code: str) -> bool:
+        """Check whether any version of a unit/course is stored"""
+        return code in self._get_index(kind)
+
+    def load_skills(self, kind: str, items: Iterable[Any]) -> Dict[str, List[Skill]]:
+        """
+        Load stored skills for the given units/courses
+
+        Only entries whose content hash matches the item's current text are
+        returned; each entry is read with a single seek into its data file.
+
+        Args:
+            kind: 'vet' or 'uni'
+            items: UnitOfCompetency or UniCourse objects
+
+        Returns:
+            Dictionary mapping item code to its stored skills
+        """
+        index = self._get_index(kind)
+        wanted = []
+        for item in items:
+            entry = index.get(item.code)
+            if entry is None:
+                continue
+            if entry["hash"] != self.content_hash(item):
+                logger.info(f"Source text changed for {kind} {item.code}, stored skills are stale")
+                continue
+            wanted.append((item.code, entry))
+
+        return self._read_entries(kind, wanted)
+
+    def entries(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        """Index metadata (name, hash, stored_at, skill_count, ...) of every stored unit/course"""
+        return {code: dict(entry) for code, entry in self._get_index(kind).items()}
+
+    def load_entries(self, kind: str, codes: Optional[Iterable[str]] = None) -> Dict[str, List[Skill]]:
+        """
+        Load stored skills by code, without checking them against source text
+
+        Args:
+            kind: 'vet' or 'uni'
+            codes: Unit/course codes to load (default: every stored entry)
+
+        Returns:
+            Dictionary mapping item code to its stored skills
+        """
+        index = self._get_index(kind)
+        codes = index.keys() if codes is None else codes
+        return self._read_entries(kind, [(code, index[code]) for code in codes if code in index])
+
+    def _read_entries(self, kind: str, wanted: List[tuple]) -> Dict[str, List[Skill]]:
+        """Decode (code, index entry) pairs"""
+        results = {}
+        if not wanted:
+            return results
+
+        # Read in file order so each data file is scanned forwards
+        wanted.sort(key=lambda pair: (pair[1]["format"], pair[1]["offset"]))
+        handles = {}
+        try:
+            for code, entry in wanted:
+                fmt = entry["format"]
+                if fmt not in handles:
+                    handles[fmt] = open(self._data_path(kind, fmt), 'rb')
+                f = handles[fmt]
+                f.seek(entry["offset"])
+                raw = f.read(entry["length"])
+                try:
+                    results[code] = self._decode_entry(raw, fmt, code)
+                except (ValueError, KeyError) as e:
+                    logger.warning(f"Corrupt skill store entry for {kind} {code}: {e}")
+        finally:
+            for f in handles.values():
+                f.close()
+
+        return results
+
+    @classmethod
+    def _decode_entry(cls, raw: bytes, format: str, code: str) -> List[Skill]:
+        """
+        Decode one stored entry into skills
+
+        Raises:
+            ValueError: If the record belongs to another item (e.g. an offset
+                from an index that went stale during a compaction)
+        """
+        if format == "binary":
+            stored_code = None
+            if raw[:len(cls._ENTRY_MAGIC)] == cls._ENTRY_MAGIC:
+                start = len(cls._ENTRY_MAGIC) + cls._CODE_LENGTH.size
+                (length,) = cls._CODE_LENGTH.unpack_from(raw, len(cls._ENTRY_MAGIC))
+                stored_code = raw[start:start + length].decode("utf-8")
+                raw = raw[start + length:]
+            if stored_code is not None and stored_code != code:
+                raise ValueError(f"record holds skills of {stored_code}")
+            return decode_skills(raw)
+        record = json.loads(raw.decode("utf-8"))
+        if record.get("code") != code:
+            raise ValueError(f"record holds skills of {record.get('code')}")
+        return [Skill.from_dict(s) for s in record["skills"]]
+
+    def _encode_entry(self, code: str, name: str, skills: List[Skill], text_hash: str, stored_at: str) -> bytes:
+        """Encode one entry in the store's write format"""
+        if self.format == "binary":
+            code_bytes = code.encode("utf-8")
+            return (self._ENTRY_MAGIC + self._CODE_LENGTH.pack(len(code_bytes)) + code_bytes
+                    + encode_skills(skills))
+        record = {
+            "code": code,
+            "name": name,
+            "hash": text_hash,
+            "stored_at": stored_at,
+            "skills": [s.to_dict() for s in skills]
+        }
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    # ========== LEGACY EXPORTS ==========
+
+    def import_legacy_export(self, kind: str, qual_code: str, items: List[Any],
+                             export_dir: str = "output/skills") -> Dict[str, List[Skill]]:
+        """
+        Load skills for items from the newest '<export_dir>/<kind>/<qual_code>_skills_*.json'
+        export and migrate them into the store
+
+        Skills found in the export are set on the matching items, which are
+        then saved under their current source text.
+
+        Returns:
+            Dictionary mapping item code to the skills found in the export
+        """
+        legacy_dir = Path(export_dir) / kind
+        legacy_files = list(legacy_dir.glob(f"{qual_code}_skills_*.json")) if legacy_dir.exists() else []
+        if not legacy_files:
+            logger.info(f"No cached {kind} skills file found for {qual_code}")
+            return {}
+
+        latest = max(legacy_files, key=lambda p: p.stat().st_mtime)
+        logger.info(f"Loading pre-extracted {kind} skills from legacy export {latest}")
+
+        try:
+            from reporting.skill_export import SkillExportManager
+            skill_export = SkillExportManager(output_dir=export_dir)
+            if kind == 'vet':
+                loaded_items = skill_export.import_vet_skills(str(latest)).units
+            else:
+                loaded_items = skill_export.import_uni_skills(str(latest)).courses
+        except Exception as e:
+            logger.error(f"Error loading {kind} skills from legacy export: {e}")
+            return {}
+
+        loaded_map = {item.code: item.extracted_skills for item in loaded_items if item.extracted_skills}
+        found = {}
+        for item in items:
+            if item.code in loaded_map:
+                item.extracted_skills = loaded_map[item.code]
+                found[item.code] = item.extracted_skills
+
+        # Migrate so later runs read only these entries from the store
+        if found:
+            self.save_skills(kind, [item for item in items if item.code in found])
+
+        return found
+
+    # ========== WRITES ==========
+
+    def save_skills(self, kind: str, items: Iterable[Any]) -> int:
+        """
+        Append skills for the given units/courses and update the index
+
+        Items whose stored entry already matches their text are skipped.
+
+        Args:
+            kind: 'vet' or 'uni'
+            items: UnitOfCompetency or UniCourse objects with extracted skills
+
+        Returns:
+            Number of entries written
+        """
+        written = 0
+
+        with self._write_lock(kind) as index, open(self._data_path(kind), 'ab') as f:
+            for item in items:
+                if not item.extracted_skills:
+                    continue
+
+                text_hash = self.content_hash(item)
+                entry = index.get(item.code)
+                if entry is not None and entry["hash"] == text_hash:
+                    continue
+
+                stored_at = datetime.now().isoformat()
+                record = self._encode_entry(item.code, item.name, item.extracted_skills, text_hash, stored_at)
+                offset = self._write_record(f, record)
+                index[item.code] = {
+                    "name": item.name,
+                    "hash": text_hash,
+                    "format": self.format,
+                    "offset": offset,
+                    "length": len(record),
+                    "skill_count": len(item.extracted_skills),
+                    "stored_at": stored_at
+                }
+                written += 1
+
+            if written:
+                f.flush()
+                self._write_index(kind)
+
+        if written:
+            logger.info(f"Stored skills for {written} {kind} items in {self.store_dir}")
+
+        return written
+
+    def update_skills(self, kind: str, skills_by_code: Dict[str, List[Skill]]) -> int:
+        """
+        Replace the skills of stored entries, keeping their source text hash
+
+        Used when skills are changed without re-extraction (e.g. recalibration),
+        so the entries stay valid for the unchanged unit/course text. Codes
+        without a stored entry are ignored.
+
+        Returns:
+            Number of entries written
+        """
+        written = 0
+
+        with self._write_lock(kind) as index, open(self._data_path(kind), 'ab') as f:
+            for code, skills in skills_by_code.items():
+                entry = index.get(code)
+                if entry is None:
+                    continue
+
+                stored_at = datetime.now().isoformat()
+                record = self._encode_entry(code, entry.get("name", ""), skills, entry["hash"], stored_at)
+                offset = self._write_record(f, record)
+                index[code] = {
+                    **entry,
+                    "format": self.format,
+                    "offset": offset,
+                    "length": len(record),
+                    "skill_count": len(skills),
+                    "stored_at": stored_at
+                }
+                written += 1
+
+            if written:
+                f.flush()
+                self._write_index(kind)
+
+        if written:
+            logger.info(f"Updated skills for {written} {kind} items in {self.store_dir}")
+
+        return written
+
+    def compact(self, kind: str) -> int:
+        """
+        Rewrite the data file keeping only the entries referenced by the index
+
+        Entries stored in another format are converted to the store's write
+        format, after which data files of other formats are removed.
+
+        Returns:
+            Number of superseded entries dropped
+        """
+        with self._write_lock(kind) as index:
+            return self._compact(kind, index)
+
+    def _compact(self, kind: str, index: Dict[str, Dict[str, Any]]) -> int:
+        """Rewrite a kind's data file from `index`; the caller holds the write lock"""
+        sources = {fmt: self._data_path(kind, fmt) for fmt in self.FORMATS}
+        sources = {fmt: path for fmt, path in sources.items() if path.exists()}
+        if not sources:
+            return 0
+
+        total_entries = sum(self._count_records(path, fmt) for fmt, path in sources.items())
+
+        data_path = self._data_path(kind)
+        tmp_path = data_path.with_suffix(data_path.suffix + ".tmp")
+        handles = {fmt: open(path, 'rb') for fmt, path in sources.items()}
+        new_index = {}
+        try:
+            with open(tmp_path, 'wb') as dst:
+                ordered = sorted(index.items(), key=lambda pair: (pair[1]["format"], pair[1]["offset"]))
+                for code, entry in ordered:
+                    src = handles[entry["format"]]
+                    src.seek(entry["offset"])
+                    raw = src.read(entry["length"])
+                    # Binary records hold only the code and skills, so the item name is kept in the index;
+                    # entries written before that take it from their JSON line
+                    name = entry.get("name")
+                    if name is None and entry["format"] == "json":
+                        name = json.loads(raw.decode("utf-8")).get("name")
+                    name = name or ""
+                    # Re-encode entries of another format and binary records written without their code
+                    if entry["format"] != self.format or (
+                            self.format == "binary" and not raw.startswith(self._ENTRY_MAGIC)):
+                        skills = self._decode_entry(raw, entry["format"], code)
+                        raw = self._encode_entry(code, name, skills, entry["hash"], entry["stored_at"])
+                    offset = self._write_record(dst, raw)
+                    new_index[code] = {**entry, "name": name, "format": self.format,
+                                       "offset": offset, "length": len(raw)}
+        finally:
+            for f in handles.values():
+                f.close()
+
+        os.replace(tmp_path, data_path)
+        for fmt, path in sources.items():
+            if fmt != self.format:
+                path.unlink()
+        self._indexes[kind] = new_index
+        self._write_index(kind)
+
+        dropped = total_entries - len(new_index)
+        logger.info(f"Compacted {kind} skill store: dropped {dropped} superseded entries")
+        return dropped
+
+    def _write_record(self, f, record: bytes) -> int:
+        """Append an encoded entry and return the offset its payload starts at"""
+        if self.format == "binary":
+            f.write(self._LENGTH_PREFIX.pack(len(record)))
+        offset = f.tell()
+        f.write(record)
+        return offset
+
+    def _count_records(self, path: Path, format: str) -> int:
+        """Count the entries held in a data file, including superseded ones"""
+        count = 0
+        with open(path, 'rb') as f:
+            if format == "json":
+                return sum(1 for _ in f)
+            prefix_size = self._LENGTH_PREFIX.size
+            while True:
+                prefix = f.read(prefix_size)
+                if len(prefix) < prefix_size:
+                    return count
+                f.seek(self._LENGTH_PREFIX.unpack(prefix)[0], os.SEEK_CUR)
+                count += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get entry counts and data file sizes per kind"""
+        stats = {}
+        for kind in self.KINDS:
+            index = self._get_index(kind)
+            stats[kind] = {
+                "entries": len(index),
+                "skills": sum(e.get("skill_count", 0) for e in index.values()),
+                "data_file_bytes": sum(
+                    path.stat().st_size for path in
+                    (self._data_path(kind, fmt) for fmt in self.FORMATS) if path.exists()
+                )
+            }
+        return stats
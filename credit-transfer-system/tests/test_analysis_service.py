@@ -0,0 +1,173 @@
+"""
+AnalysisService admission over HTTP with a stubbed run_job
+Covers 503 with Retry-After when the queue is full, all-or-nothing batch
+admission, 400 for invalid jobs, and when main_simple delegates to a service.
+One job runs for real on the fake backend to check where its reports go.
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from urllib import error as urlerror, request as urlrequest
+
+import pytest
+
+from analysis_service import AnalysisService, AnalysisServiceClient, ServiceBusy, _ServiceRequestHandler
+from config_profiles import ConfigProfiles
+from main_simple import service_mismatch
+
+JOB = {"vet_file": "vet.json", "uni_file": "uni.json"}
+
+
+class StubService(AnalysisService):
+    """Records jobs instead of analyzing them; jobs wait until `release` is set"""
+
+    def __init__(self, config, max_queue):
+        super().__init__(config, profile="robust", max_queue=max_queue, request_timeout=10)
+        self.release = threading.Event()
+        self.started_jobs = []
+
+    def start(self, warm_up: bool = False) -> "StubService":
+        self.started_at = time.time()
+        self._worker = threading.Thread(target=self._run_worker, daemon=True)
+        self._worker.start()
+        return self
+
+    def run_job(self, job):
+        self.started_jobs.append(job)
+        self.release.wait(10)
+        return {"vet": job["vet_file"], "depth": job["depth"]}
+
+
+@pytest.fixture
+def config():
+    return ConfigProfiles.create_config("robust", backend="fake", embedding="hashing")
+
+
+@pytest.fixture
+def make_server(config):
+    servers = []
+
+    def make(max_queue):
+        service = StubService(config, max_queue).start()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ServiceRequestHandler)
+        server.daemon_threads = True
+        server.service = service
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return service, AnalysisServiceClient(f"http://127.0.0.1:{server.server_port}", timeout=10)
+
+    yield make
+    for server in servers:
+        server.service.release.set()
+        server.shutdown()
+        server.server_close()
+        server.service.stop(timeout=5)
+
+
+def post(client, path, body):
+    """(status, headers, payload) of a raw POST"""
+    req = urlrequest.Request(f"{client.url}{path}", data=body, method="POST",
+                             headers={"Content-Type": "application/json"})
+    try:
+        with urlrequest.urlopen(req, timeout=10) as response:
+            return response.status, response.headers, json.loads(response.read())
+    except urlerror.HTTPError as e:
+        return e.code, e.headers, json.loads(e.read())
+
+
+def occupy(service, client):
+    """Send one job that blocks in run_job and wait until it is running"""
+    thread = threading.Thread(target=client.analyze, args=(JOB,), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not service.started_jobs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert service.started_jobs
+    return thread
+
+
+def test_full_queue_answers_503_with_retry_after(make_server):
+    service, client = make_server(max_queue=1)
+    running = occupy(service, client)
+
+    status, headers, payload = post(client, "/analyze", json.dumps(JOB).encode())
+    assert status == 503
+    assert int(headers["Retry-After"]) >= 1
+    assert payload["retry_after"] >= 1.0
+    with pytest.raises(ServiceBusy):
+        client.analyze(JOB)
+    assert service.stats["rejected"] == 2
+
+    service.release.set()
+    running.join(5)
+    assert client.analyze(JOB)["vet"] == "vet.json"
+
+
+def test_batch_is_admitted_all_or_nothing(make_server):
+    service, client = make_server(max_queue=2)
+    running = occupy(service, client)
+
+    # Two more jobs do not fit next to the running one: none of them is queued
+    with pytest.raises(ServiceBusy):
+        client.batch_analyze([JOB, dict(JOB, vet_file="other.json")])
+    assert client.health()["pending"] == 1
+
+    service.release.set()
+    running.join(5)
+    results = client.batch_analyze([JOB, dict(JOB, vet_file="other.json")])
+    assert [r["result"]["vet"] for r in results] == ["vet.json", "other.json"]
+    assert len(service.started_jobs) == 3
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/analyze", json.dumps({"vet_file": "vet.json"}).encode()),
+    ("/analyze", json.dumps(dict(JOB, depth="exhaustive")).encode()),
+    ("/analyze", b"{not json"),
+    ("/batch-analyze", json.dumps({"jobs": []}).encode()),
+    ("/batch-analyze", json.dumps({"jobs": [JOB, {"uni_file": "uni.json"}]}).encode()),
+])
+def test_invalid_job_answers_400(make_server, path, body):
+    service, client = make_server(max_queue=4)
+
+    status, _, payload = post(client, path, body)
+
+    assert status == 400
+    assert payload["error"]
+    assert service.started_jobs == []
+    assert client.health()["pending"] == 0
+
+
+def test_delegation_requires_matching_backend_embedding_and_profile(config):
+    health = {"backend": config.get_model_info(), "embedding": config.get_embedding_info(), "profile": "robust"}
+    assert service_mismatch(health, config, "robust") is None
+
+    for key, value in (("backend", "vLLM (other)"), ("embedding", "other on cpu"), ("profile", "fast")):
+        assert key in service_mismatch(dict(health, **{key: value}), config, "robust")
+
+
+def test_report_package_goes_to_the_job_report_dir(config, tmp_path, monkeypatch):
+    service_dir, report_dir = tmp_path / "service", tmp_path / "client" / "output"
+    service_dir.mkdir()
+    monkeypatch.chdir(service_dir)
+    service = AnalysisService(config, profile="robust", max_queue=1).start(warm_up=False)
+    vet = {"code": "ICT50220", "name": "Diploma of IT", "level": "Diploma", "units": [
+        {"code": "ICTICT214", "name": "Operate application software",
+         "description": "Use spreadsheets, word processing and databases", "study_level": "VET_Diploma"}]}
+    uni = {"code": "BIT", "name": "Bachelor of IT", "courses": [
+        {"code": "COMP1000", "name": "Computing Fundamentals", "study_level": "University_Year_1", "year": 1,
+         "description": "Spreadsheets, databases and office software for analysis"}]}
+    try:
+        result = service.run_job({"vet": vet, "uni": uni, "depth": "quick",
+                                  "output": str(report_dir / "recommendations.json"),
+                                  "report_dir": str(report_dir)})
+    finally:
+        service.stop(timeout=5)
+
+    package_files = {key: path for key, path in result["files"].items()
+                     if key not in ("recommendations", "html_report")}
+    assert package_files
+    assert all(os.path.abspath(path).startswith(str(report_dir)) for path in package_files.values())
+    assert not list(service_dir.glob("output/report_package_*"))
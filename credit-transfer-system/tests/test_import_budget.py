@@ -0,0 +1,34 @@
+"""
+Entry modules must import quickly and without heavy packages
+Each module from benchmarks/import_budget.py is imported in a fresh interpreter
+through the script's import_profile; the packages left in sys.modules are
+checked against HEAVY_PACKAGES (less the module's STAGE_MODULES exemptions)
+and the cumulative import time against DEFAULT_BUDGET. Stage modules are
+exempt from the time budget, as in the script.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from import_budget import DEFAULT_BUDGET, DEFAULT_MODULES, HEAVY_PACKAGES, STAGE_MODULES, import_profile
+
+# Imports per module; the fastest counts, as in the script
+REPEAT = 3
+
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_module_imports_within_budget(module):
+    runs = [import_profile(module) for _ in range(REPEAT)]
+    assert "error" not in runs[0], f"{module} failed to import: {runs[0].get('error')}"
+
+    heavy = sorted(set(HEAVY_PACKAGES) & set(runs[0]["packages"]) - STAGE_MODULES.get(module, set()))
+    assert heavy == [], f"{module} imports {', '.join(heavy)} at module level"
+
+    if module not in STAGE_MODULES:
+        seconds = min(run["seconds"] for run in runs)
+        assert seconds <= DEFAULT_BUDGET, f"{module} takes {seconds:.3f}s to import (budget {DEFAULT_BUDGET}s)"
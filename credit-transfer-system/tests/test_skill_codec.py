@@ -0,0 +1,78 @@
+"""
+Binary skill codec round trips and equivalence with the JSON form
+Every available backend must decode to the same Skill.to_dict() values a
+JSON round trip gives; the msgpack backend is skipped only when msgpack is
+not installed.
+"""
+
+import json
+
+import pytest
+
+from models.base_models import Skill
+from models.enums import SkillCategory, SkillContext, SkillLevel
+from utils import skill_codec
+from utils.skill_codec import BACKEND_MSGPACK, BACKEND_PICKLE, decode_skills, encode_skills
+
+BACKENDS = [
+    pytest.param(BACKEND_PICKLE, id="pickle"),
+    pytest.param(BACKEND_MSGPACK, id="msgpack",
+                 marks=pytest.mark.skipif(not skill_codec.MSGPACK_AVAILABLE, reason="msgpack not installed")),
+]
+
+
+def make_skills():
+    levels, categories, contexts = list(SkillLevel), list(SkillCategory), list(SkillContext)
+    return [
+        Skill(name=f"Skill {i}", category=categories[i % len(categories)], level=levels[i % len(levels)],
+              context=contexts[i % len(contexts)], code=f"S{i}", description=f"Applies skill {i} at work",
+              keywords=[f"k{i}", "shared", "ünïcode"], evidence_type="explicit", confidence=i / 7,
+              source="vet", evidence=f"Evidence line {i}\nsecond line", translation_rationale="direct",
+              metadata={"batch": i, "tags": ["a", "b"], "nested": {"score": 0.5, "flag": i % 2 == 0}})
+        for i in range(9)
+    ]
+
+
+def json_round_trip(skills):
+    return [Skill.from_dict(s) for s in json.loads(json.dumps([s.to_dict() for s in skills]))]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_round_trip_keeps_every_field(backend):
+    skills = make_skills()
+
+    decoded = decode_skills(encode_skills(skills, backend=backend))
+
+    assert [s.to_dict() for s in decoded] == [s.to_dict() for s in skills]
+    assert all(isinstance(s.level, SkillLevel) and isinstance(s.category, SkillCategory)
+               and isinstance(s.context, SkillContext) for s in decoded)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_binary_matches_json_serialization(backend):
+    skills = make_skills()
+
+    from_binary = decode_skills(encode_skills(skills, backend=backend))
+    from_json = json_round_trip(skills)
+
+    assert json.dumps([s.to_dict() for s in from_binary]) == json.dumps([s.to_dict() for s in from_json])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_empty_skill_list(backend):
+    assert decode_skills(encode_skills([], backend=backend)) == []
+
+
+def test_default_backend_prefers_msgpack():
+    expected = BACKEND_MSGPACK if skill_codec.MSGPACK_AVAILABLE else BACKEND_PICKLE
+    assert encode_skills(make_skills())[len(skill_codec.MAGIC):len(skill_codec.MAGIC) + 1] == expected
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"JSON{}", "Not an encoded skill record"),
+    (skill_codec.MAGIC + BACKEND_PICKLE + bytes([skill_codec.SCHEMA_VERSION + 1]), "schema version"),
+    (skill_codec.MAGIC + b"x" + bytes([skill_codec.SCHEMA_VERSION]), "Unknown skill codec backend"),
+])
+def test_rejects_foreign_records(data, message):
+    with pytest.raises(ValueError, match=message):
+        decode_skills(data)
@@ -0,0 +1,157 @@
+"""
+SkillStore round trips, source text invalidation, partial loads and locked writes
+Multi-process tests start fresh interpreters that share one store directory;
+a store kept open in the test process must see their writes and compactions.
+"""
+
+import json
+import multiprocessing
+
+import pytest
+
+from models.base_models import Skill, UnitOfCompetency
+from models.enums import SkillCategory, SkillContext, SkillLevel
+from reporting.skill_store import SkillStore
+
+FORMATS = ["binary", "json"]
+
+
+def make_unit(code, description=None):
+    unit = UnitOfCompetency(code=code, name=f"Unit {code}", description=description or f"Work with {code}",
+                            study_level="VET_Diploma")
+    unit.extracted_skills = [
+        Skill(name=f"{code} skill {i}", category=SkillCategory.TECHNICAL, level=SkillLevel.APPLY,
+              context=SkillContext.PRACTICAL, keywords=[code.lower(), str(i)], confidence=0.5 + i / 10)
+        for i in range(3)
+    ]
+    return unit
+
+
+def skill_names(skills):
+    return [skill.name for skill in skills]
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_saved_skills_load_back(tmp_path, format):
+    units = [make_unit("BSB1"), make_unit("BSB2")]
+    assert SkillStore(tmp_path, format=format).save_skills("vet", units) == 2
+
+    loaded = SkillStore(tmp_path, format=format).load_skills("vet", [make_unit("BSB1"), make_unit("BSB2")])
+
+    assert sorted(loaded) == ["BSB1", "BSB2"]
+    for unit in units:
+        original = [skill.to_dict() for skill in unit.extracted_skills]
+        assert [skill.to_dict() for skill in loaded[unit.code]] == original
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_changed_source_text_invalidates_entry(tmp_path, format):
+    store = SkillStore(tmp_path, format=format)
+    store.save_skills("vet", [make_unit("BSB1")])
+
+    changed = make_unit("BSB1", description="Rewritten unit text")
+    assert store.load_skills("vet", [changed]) == {}
+    assert store.has_entry("vet", "BSB1")
+
+    # Saving the new text replaces the entry; unchanged text is not written again
+    assert store.save_skills("vet", [changed]) == 1
+    assert store.save_skills("vet", [changed]) == 0
+    assert skill_names(store.load_skills("vet", [changed])["BSB1"]) == skill_names(changed.extracted_skills)
+
+
+def test_partial_load_returns_only_stored_items(tmp_path):
+    store = SkillStore(tmp_path)
+    store.save_skills("vet", [make_unit("BSB1"), make_unit("BSB3")])
+
+    loaded = store.load_skills("vet", [make_unit(code) for code in ("BSB1", "BSB2", "BSB3")])
+
+    assert sorted(loaded) == ["BSB1", "BSB3"]
+    assert store.load_entries("vet", ["BSB3", "missing"]).keys() == {"BSB3"}
+    assert store.load_skills("uni", [make_unit("BSB1")]) == {}
+
+
+def test_items_without_skills_are_not_stored(tmp_path):
+    store = SkillStore(tmp_path)
+    unit = make_unit("BSB1")
+    unit.extracted_skills = []
+
+    assert store.save_skills("vet", [unit]) == 0
+    assert not store.has_entry("vet", "BSB1")
+
+
+def _write_units(store_dir, format, worker, count):
+    store = SkillStore(store_dir, format=format)
+    for i in range(count):
+        store.save_skills("vet", [make_unit(f"W{worker}_{i}")])
+
+
+def _compact_store(store_dir, format):
+    SkillStore(store_dir, format=format).compact("vet")
+
+
+def run_process(target, *args):
+    process = multiprocessing.get_context("spawn").Process(target=target, args=args)
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_open_store_sees_other_process_writes(tmp_path, format):
+    reader = SkillStore(tmp_path, format=format)
+    reader.save_skills("vet", [make_unit("W0_0", description="Old text")])
+    assert reader.load_skills("vet", [make_unit("W0_0")]) == {}
+
+    # Another process stores the current text of W0_0 and a new unit, then compacts
+    run_process(_write_units, str(tmp_path), format, 0, 2)
+    run_process(_compact_store, str(tmp_path), format)
+
+    loaded = reader.load_skills("vet", [make_unit("W0_0"), make_unit("W0_1")])
+    assert sorted(loaded) == ["W0_0", "W0_1"]
+    assert skill_names(loaded["W0_1"]) == skill_names(make_unit("W0_1").extracted_skills)
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_entry_read_from_wrong_offset_is_skipped(tmp_path, format):
+    SkillStore(tmp_path, format=format).save_skills("vet", [make_unit("BSB1"), make_unit("BSB2")])
+
+    # Point BSB2 at BSB1's record, as an index that went stale during a compaction would
+    index_path = tmp_path / "vet_index.json"
+    index = json.loads(index_path.read_text())
+    index["entries"]["BSB2"].update(offset=index["entries"]["BSB1"]["offset"],
+                                    length=index["entries"]["BSB1"]["length"])
+    index_path.write_text(json.dumps(index))
+
+    loaded = SkillStore(tmp_path, format=format).load_entries("vet")
+    assert list(loaded) == ["BSB1"]
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_concurrent_writers_keep_every_entry(tmp_path, format):
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_write_units, args=(str(tmp_path), format, w, 20)) for w in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+        assert process.exitcode == 0
+
+    codes = [f"W{w}_{i}" for w in range(4) for i in range(20)]
+    loaded = SkillStore(tmp_path, format=format).load_skills("vet", [make_unit(code) for code in codes])
+
+    assert sorted(loaded) == sorted(codes)
+    assert all(loaded[code][0].name == f"{code} skill 0" for code in codes)
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_compact_keeps_current_entries(tmp_path, format):
+    store = SkillStore(tmp_path, format=format)
+    store.save_skills("vet", [make_unit("BSB1"), make_unit("BSB2")])
+    store.save_skills("vet", [make_unit("BSB1", description="New text")])
+
+    assert store.compact("vet") == 1
+
+    loaded = SkillStore(tmp_path, format=format).load_skills(
+        "vet", [make_unit("BSB1", description="New text"), make_unit("BSB2")])
+    assert sorted(loaded) == ["BSB1", "BSB2"]
+    assert store.entries("vet")["BSB1"]["name"] == "Unit BSB1"
@@ -1057,6 +1057,97 @@ Return ONLY a JSON array for direct parsing:
 }
 ]
 
+Return ONLY the JSON:"""
+        
+        return system_prompt, user_prompt
+    
+    @staticmethod
+    def get_skill_recalibration_prompt(
+        skills: List[Any],
+        context_text: str,
+        item_type: str,
+        study_level: Optional[str] = None,
+        fields: Tuple[str, ...] = ("category", "level", "context"),
+        backend_type: str = "standard"
+    ) -> Tuple[str, str]:
+        """
+        Single prompt recalibrating category, SFIA level and/or context of existing skills
+        
+        Args:
+            fields: Attributes to reassess, any of "category", "level", "context"
+        """
+        system_prompt = """You are a skill assessment expert. Your task is to reassess existing skills: their category, their SFIA proficiency level (1-7) and the context (theoretical/practical/hybrid) in which they are applied, based on the evidence provided."""
+
+        if study_level:
+            study_enum = StudyLevel.from_string(study_level)
+            expected_min, expected_max = StudyLevel.get_expected_skill_level_range(study_enum)
+        else:
+            expected_min, expected_max = 2, 4
+        
+        user_prompt = f"""Reassess these existing skills.
+
+## CONTEXT:
+Item Type: {item_type}
+Study Level: {study_level if study_level else 'Not specified'}
+Original Text (for context):
+{context_text[:1500]}
+
+## SKILLS TO ASSESS:
+"""
+        
+        for skill in skills[:50]:
+            user_prompt += f"""
+Skill: {skill.name}
+Evidence: {skill.evidence[:150] if hasattr(skill, 'evidence') else ''}
+"""
+        
+        user_prompt += "\n## ASSESSMENT GUIDELINES:\n"
+        
+        if "category" in fields:
+            user_prompt += """
+### Category (mutually exclusive - choose the most dominant aspect):
+- technical: specific tools, technologies, programming, systems, hands-on implementation or operation
+- cognitive: analysis, evaluation, problem solving, research, planning, decision-making
+- interpersonal: communication, collaboration, leadership, negotiation, managing people or relationships
+- domain_knowledge: principles, theory, regulations, standards and subject matter expertise of a field
+Management of systems/processes is technical; management of people is interpersonal.
+"""
+        
+        if "level" in fields:
+            user_prompt += f"""
+### SFIA Level (BE CONSERVATIVE - most skills are at levels 2-4):
+- 1 Follow: routine tasks under close supervision
+- 2 Assist: assists others, routine supervision, limited discretion
+- 3 Apply: varied standard professional work under general direction (MOST COMMON)
+- 4 Enable: complex work, guides others, works autonomously
+- 5 Ensure/Advise: authoritative guidance, accountable for significant outcomes (strong evidence only)
+- 6-7 Initiate/Set Strategy: organizational or industry-wide strategy (rare)
+Expected typical levels for this item: {max(1, expected_min-1)}-{min(4, expected_max-1)}. If unclear from evidence use level 3.
+"""
+        
+        if "context" in fields:
+            user_prompt += """
+### Context:
+- theoretical: understanding concepts and principles without hands-on application
+- practical: hands-on application, implementation, creating deliverables
+- hybrid: both understanding and applying (default when evidence is unclear)
+"""
+        
+        example = {"skill_name": "exact skill name as input"}
+        if "category" in fields:
+            example["category"] = "cognitive|technical|interpersonal|domain_knowledge"
+        if "level" in fields:
+            example["level"] = 3
+        if "context" in fields:
+            example["context"] = "theoretical|practical|hybrid"
+        
+        user_prompt += f"""
+## OUTPUT FORMAT:
+Return ONLY a JSON array with one object per skill for direct parsing:
+[
+{json.dumps(example, indent=4)}
+]
+
 Return ONLY the JSON:"""
         
         return system_prompt, user_prompt
@@ -0,0 +1,69 @@
+"""
+Loading of VET and university qualification JSON files into model objects
+"""
+
+import json
+from typing import Any, Dict
+
+from models.base_models import VETQualification, UniQualification, UnitOfCompetency, UniCourse
+
+
+def load_vet_data(filepath: str) -> VETQualification:
+    """Load VET qualification data"""
+    with open(filepath, 'r') as f:
+        return parse_vet_data(json.load(f))
+
+
+def parse_vet_data(data: Dict[str, Any]) -> VETQualification:
+    """Build a VET qualification from its JSON representation"""
+    vet_qual = VETQualification(
+        code=data["code"],
+        name=data["name"],
+        level=data["level"]
+    )
+    
+    for unit_data in data.get("units", []):
+        unit = UnitOfCompetency(
+            code=unit_data["code"],
+            name=unit_data["name"],
+            description=unit_data.get("description", ""),
+            study_level=unit_data.get("study_level", ""),
+            learning_outcomes=unit_data.get("learning_outcomes", []),
+            assessment_requirements=unit_data.get("assessment_requirements", ""),
+            nominal_hours=unit_data.get("nominal_hours", 0) if unit_data.get("nominal_hours") is not None else 0,  # Default to 0 instead of None
+            prerequisites=unit_data.get("prerequisites", [])
+        )
+        vet_qual.units.append(unit)
+    
+    return vet_qual
+
+
+def load_uni_data(filepath: str) -> UniQualification:
+    """Load university qualification data"""
+    with open(filepath, 'r') as f:
+        return parse_uni_data(json.load(f))
+
+
+def parse_uni_data(data: Dict[str, Any]) -> UniQualification:
+    """Build a university qualification from its JSON representation"""
+    uni_qual = UniQualification(
+        code=data["code"],
+        name=data["name"]
+    )
+    
+    for course_data in data.get("courses", []):
+        course = UniCourse(
+            code=course_data["code"],
+            name=course_data["name"],
+            description=course_data.get("description", ""),
+            study_level=course_data.get("study_level", "intermediate"),
+            learning_outcomes=course_data.get("learning_outcomes", []),
+            prerequisites=course_data.get("prerequisites", []),
+            credit_points=course_data.get("credit_points", 0),
+            topics=course_data.get("topics", []),
+            assessment=course_data.get("assessment", ""),
+            year=int(course_data.get("year"))
+        )
+        uni_qual.courses.append(course)
+    
+    return uni_qual
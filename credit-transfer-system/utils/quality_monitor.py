@@ -1,21 +1,127 @@
 """
 Quality monitoring and feedback system
+Also a low-overhead instrumentation layer: named timing spans, counters,
+histograms (LLM latency/tokens, embedding batch sizes, clustering time) and
+memory high-water marks. Components report through the module-level span(),
+monitored(), count() and observe() helpers, which do nothing until a monitor
+is activated. Metrics are written as Prometheus text or JSONL, and
+flame_summary() renders the span tree at the end of a run.
 """
 
 import json
+import sys
 import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import numpy as np
 
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+# Bucket bounds per histogram; names not listed here use LATENCY_BUCKETS
+HISTOGRAM_BUCKETS = {
+    "llm_latency_seconds": LATENCY_BUCKETS,
+    "llm_batch_size": SIZE_BUCKETS,
+    "llm_prompt_tokens": SIZE_BUCKETS,
+    "llm_completion_tokens": SIZE_BUCKETS,
+    "embedding_batch_size": SIZE_BUCKETS,
+    "clustering_seconds": LATENCY_BUCKETS,
+}
+
+METRIC_PREFIX = "credit_transfer"
+
+# (monitor, [path, child time]) of the innermost open span
+_current_span: ContextVar[Optional[tuple]] = ContextVar("quality_monitor_span", default=None)
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def peak_rss_bytes() -> int:
+    """Process memory high-water mark (0 where unavailable)"""
+    if not RESOURCE_AVAILABLE:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)   # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+    
+    def observe(self, value: float):
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = np.cumsum(self.bucket_counts).tolist()
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.sum / self.count if self.count else None,
+            "buckets": {str(bound): n for bound, n in zip(self.buckets + ("+Inf",), cumulative)}
+        }
+
+
+class SpanStats:
+    """Aggregated timings of one span path"""
+    
+    __slots__ = ("calls", "total", "child_total", "max", "rss_growth")
+    
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.child_total = 0.0
+        self.max = 0.0
+        self.rss_growth = 0
+    
+    @property
+    def self_time(self) -> float:
+        return max(0.0, self.total - self.child_total)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_seconds": self.total,
+            "self_seconds": self.self_time,
+            "max_seconds": self.max,
+            "rss_growth_mb": self.rss_growth / 2**20
+        }
+
 
 class QualityMonitor:
     """Monitor and improve analysis quality"""
     
     def __init__(self, log_dir: str = "output/quality_logs"):
         self.log_dir = Path(log_dir)
-        self.log_dir.mkdir(exist_ok=True)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._reset_instrumentation()
         
         self.current_session = {
             "start_time": time.time(),
@@ -52,6 +158,223 @@ class QualityMonitor:
         """Log cache miss"""
         self.current_session["cache_misses"] += 1
     
+    def activate(self) -> 'QualityMonitor':
+        """Make this the monitor that the module-level span/count/observe helpers report to"""
+        global _active_monitor
+        _active_monitor = self
+        return self
+    
+    def deactivate(self):
+        """Stop receiving metrics from the module-level helpers"""
+        global _active_monitor
+        if _active_monitor is self:
+            _active_monitor = None
+    
+    def _reset_instrumentation(self):
+        self.spans: Dict[Tuple[str, ...], SpanStats] = {}
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.peak_rss = peak_rss_bytes()
+        self.run_started = datetime.now().isoformat()
+        self._run_start = time.perf_counter()
+    
+    @contextmanager
+    def span(self, name: str):
+        """
+        Time a named span
+        
+        Spans nest through a context variable, so code run with
+        contextvars.copy_context() in worker threads nests under the submitting
+        span. Stats are kept per path from the outermost span, with self time
+        (excluding child spans) and the growth of the process memory
+        high-water mark while the span was open.
+        """
+        parent = _current_span.get()
+        if parent is not None and parent[0] is not self:
+            parent = None
+        path = parent[1][0] + (name,) if parent else (name,)
+        frame = [path, 0.0]   # path, time spent in child spans
+        token = _current_span.set((self, frame))
+        rss_before = peak_rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            rss_after = peak_rss_bytes()
+            _current_span.reset(token)
+            
+            with self._lock:
+                if parent:
+                    parent[1][1] += duration
+                stats = self.spans.get(path)
+                if stats is None:
+                    stats = self.spans[path] = SpanStats()
+                stats.calls += 1
+                stats.total += duration
+                stats.child_total += frame[1]
+                stats.max = max(stats.max, duration)
+                stats.rss_growth += rss_after - rss_before
+                self.peak_rss = max(self.peak_rss, rss_after)
+    
+    def count(self, name: str, value: float = 1):
+        """Increment a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def observe(self, name: str, value: float):
+        """Record a value in a histogram (bucket bounds from HISTOGRAM_BUCKETS)"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(HISTOGRAM_BUCKETS.get(name, LATENCY_BUCKETS))
+            histogram.observe(value)
+    
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        
+        def family(name: str, metric_type: str, help_text: str):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {metric_type}")
+        
+        with self._lock:
+            if self.spans:
+                family("span_seconds_total", "counter", "Wall time spent in span, including child spans")
+                for path, stats in self.spans.items():
+                    lines.append(f'{METRIC_PREFIX}_span_seconds_total{{span="{_label(path)}"}} {stats.total:.6f}')
+                family("span_self_seconds_total", "counter", "Wall time spent in span, excluding child spans")
+                for path, stats in self.spans.items():
+                    lines.append(f'{METRIC_PREFIX}_span_self_seconds_total{{span="{_label(path)}"}} {stats.self_time:.6f}')
+                family("span_calls_total", "counter", "Number of times the span was entered")
+                for path, stats in self.spans.items():
+                    lines.append(f'{METRIC_PREFIX}_span_calls_total{{span="{_label(path)}"}} {stats.calls}')
+            
+            for name, value in sorted(self.counters.items()):
+                metric = _metric_name(name) + "_total"
+                family(metric, "counter", name)
+                lines.append(f"{METRIC_PREFIX}_{metric} {value}")
+            
+            for name, histogram in sorted(self.histograms.items()):
+                metric = _metric_name(name)
+                family(metric, "histogram", name)
+                cumulative = 0
+                for bound, n in zip(histogram.buckets + ("+Inf",), histogram.bucket_counts):
+                    cumulative += n
+                    lines.append(f'{METRIC_PREFIX}_{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f"{METRIC_PREFIX}_{metric}_sum {histogram.sum}")
+                lines.append(f"{METRIC_PREFIX}_{metric}_count {histogram.count}")
+            
+            family("memory_peak_rss_bytes", "gauge", "Process memory high-water mark")
+            lines.append(f"{METRIC_PREFIX}_memory_peak_rss_bytes {max(self.peak_rss, peak_rss_bytes())}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Metrics as flat records, one per span/counter/histogram, tagged with the run start"""
+        base = {"run": self.run_started, "timestamp": datetime.now().isoformat()}
+        with self._lock:
+            records = [
+                {**base, "type": "span", "name": ";".join(path), **stats.to_dict()}
+                for path, stats in self.spans.items()
+            ]
+            records += [
+                {**base, "type": "counter", "name": name, "value": value}
+                for name, value in self.counters.items()
+            ]
+            records += [
+                {**base, "type": "histogram", "name": name, **histogram.to_dict()}
+                for name, histogram in self.histograms.items()
+            ]
+            records.append({**base, "type": "memory", "name": "peak_rss_mb",
+                            "value": max(self.peak_rss, peak_rss_bytes()) / 2**20})
+        return records
+    
+    def to_folded(self) -> str:
+        """Span self times in folded-stack format ('a;b;c <microseconds>') for flame graph tools"""
+        with self._lock:
+            return "".join(
+                f"{';'.join(path)} {int(stats.self_time * 1e6)}\n"
+                for path, stats in self.spans.items()
+            )
+    
+    def export_metrics(self, filepath: Optional[str] = None, format: str = "prometheus") -> str:
+        """
+        Write metrics to a local file
+        
+        Args:
+            filepath: Output path (default: log_dir/metrics_<timestamp>.<ext>)
+            format: "prometheus" (overwrites), "jsonl" (appends, so runs can be
+                compared) or "folded" (overwrites, flame graph input)
+            
+        Returns:
+            Path written
+        """
+        extensions = {"prometheus": ".prom", "jsonl": ".jsonl", "folded": ".folded"}
+        if format not in extensions:
+            raise ValueError(f"Unknown metrics format: {format}")
+        
+        if filepath is None:
+            filepath = self.log_dir / f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extensions[format]}"
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        
+        if format == "jsonl":
+            with open(filepath, 'a') as f:
+                f.writelines(json.dumps(record) + "\n" for record in self.to_records())
+        else:
+            content = self.to_prometheus() if format == "prometheus" else self.to_folded()
+            with open(filepath, 'w') as f:
+                f.write(content)
+        
+        return str(filepath)
+    
+    def flame_summary(self, min_fraction: float = 0.0) -> str:
+        """
+        Span tree with total/self time, calls, share of run time and memory growth
+        
+        Args:
+            min_fraction: Hide spans below this share of the run time
+        """
+        run_time = max(time.perf_counter() - self._run_start, 1e-9)
+        with self._lock:
+            spans = dict(self.spans)
+        
+        children: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+        for path in spans:
+            children.setdefault(path[:-1], []).append(path)
+        
+        lines = [
+            "=" * 96,
+            f"{'SPAN':<52}{'TOTAL':>10}{'SELF':>10}{'CALLS':>8}{'RUN%':>8}{'RSS+MB':>8}",
+            "-" * 96,
+        ]
+        
+        def render(parent: Tuple[str, ...]):
+            for path in sorted(children.get(parent, []), key=lambda p: -spans[p].total):
+                stats = spans[path]
+                fraction = stats.total / run_time
+                if fraction < min_fraction:
+                    continue
+                label = ("  " * (len(path) - 1) + path[-1])[:51]
+                lines.append(f"{label:<52}{stats.total:>9.2f}s{stats.self_time:>9.2f}s"
+                             f"{stats.calls:>8}{fraction:>7.1%}{stats.rss_growth / 2**20:>8.1f}")
+                render(path)
+        
+        render(())
+        lines.append("-" * 96)
+        lines.append(f"Run time: {run_time:.2f}s   Peak RSS: {max(self.peak_rss, peak_rss_bytes()) / 2**20:.1f} MB")
+        
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                if histogram.count:
+                    lines.append(f"{name}: n={histogram.count} mean={histogram.sum / histogram.count:.3f} "
+                                 f"min={histogram.min:.3f} max={histogram.max:.3f}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name}: {value:g}")
+        lines.append("=" * 96)
+        return "\n".join(lines)
+    
     def get_performance_summary(self) -> Dict:
         """Get current performance summary"""
         
@@ -64,8 +387,9 @@ class QualityMonitor:
             "avg_skills_per_unit": np.mean(self.current_session["skills_per_unit"]) if self.current_session["skills_per_unit"] else 0,
             "avg_confidence": np.mean(self.current_session["confidence_scores"]) if self.current_session["confidence_scores"] else 0,
             "avg_match_score": np.mean(self.current_session["match_scores"]) if self.current_session["match_scores"] else 0,
-            "total_ai_calls": self.current_session["ai_calls"],
-            "cache_hit_rate": self.current_session["cache_hits"] / max(1, self.current_session["cache_hits"] + self.current_session["cache_misses"])
+            "total_ai_calls": self.current_session["ai_calls"] + int(self.counters.get("llm_requests", 0)),
+            "cache_hit_rate": self.current_session["cache_hits"] / max(1, self.current_session["cache_hits"] + self.current_session["cache_misses"]),
+            "peak_rss_mb": max(self.peak_rss, peak_rss_bytes()) / 2**20
         }
     
     def suggest_improvements(self) -> List[str]:
@@ -107,6 +431,9 @@ class QualityMonitor:
             "timestamp": datetime.now().isoformat(),
             "metrics": self.get_performance_summary(),
             "suggestions": self.suggest_improvements(),
+            "spans": {";".join(path): stats.to_dict() for path, stats in self.spans.items()},
+            "counters": dict(self.counters),
+            "histograms": {name: hist.to_dict() for name, hist in self.histograms.items()},
             "raw_data": self.current_session
         }
         
@@ -117,6 +444,7 @@ class QualityMonitor:
     
     def reset_session(self):
         """Reset session metrics"""
+        self._reset_instrumentation()
         self.current_session = {
             "start_time": time.time(),
             "extraction_times": [],
@@ -127,4 +455,56 @@ class QualityMonitor:
             "ai_calls": 0,
             "cache_hits": 0,
             "cache_misses": 0
-        }
\ No newline at end of file
+        }
+
+
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+
+
+def _label(path: Tuple[str, ...]) -> str:
+    return ";".join(path).replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Monitor receiving metrics from the helpers below; None disables instrumentation
+_active_monitor: Optional[QualityMonitor] = None
+_NULL_SPAN = nullcontext()
+
+
+def get_active_monitor() -> Optional[QualityMonitor]:
+    """Monitor activated with QualityMonitor.activate(), if any"""
+    return _active_monitor
+
+
+def span(name: str):
+    """Context manager timing a span on the active monitor (no-op when none is active)"""
+    monitor = _active_monitor
+    return _NULL_SPAN if monitor is None else monitor.span(name)
+
+
+def monitored(name: str):
+    """Decorator timing every call of a function as a span"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            monitor = _active_monitor
+            if monitor is None:
+                return func(*args, **kwargs)
+            with monitor.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: float = 1):
+    """Increment a counter on the active monitor"""
+    monitor = _active_monitor
+    if monitor is not None:
+        monitor.count(name, value)
+
+
+def observe(name: str, value: float):
+    """Record a histogram value on the active monitor"""
+    monitor = _active_monitor
+    if monitor is not None:
+        monitor.observe(name, value)
@@ -0,0 +1,114 @@
+"""
+Compact binary encoding for skill lists
+Skills are packed column-wise holding the same values as Skill.to_dict(),
+so decoding and re-serializing to JSON is lossless.
+msgpack is used when installed, otherwise pickle.
+"""
+
+import pickle
+from dataclasses import fields
+from itertools import starmap
+from typing import List, Iterable, Optional
+
+from models.base_models import Skill
+from models.enums import SkillCategory, SkillLevel, SkillContext
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+MAGIC = b"SKL"
+SCHEMA_VERSION = 1
+
+# Column layout for SCHEMA_VERSION 1; bump the version when this changes
+SKILL_FIELDS = (
+    "name", "category", "level", "context", "code", "description", "keywords",
+    "evidence_type", "confidence", "source", "evidence", "translation_rationale", "metadata"
+)
+
+# decode_skills builds Skill positionally, so the layout must follow Skill's field order
+if SKILL_FIELDS != tuple(f.name for f in fields(Skill)):
+    raise ImportError("utils.skill_codec SKILL_FIELDS no longer match the Skill dataclass fields; "
+                      "update the layout and bump SCHEMA_VERSION")
+
+BACKEND_MSGPACK = b"m"
+BACKEND_PICKLE = b"p"
+
+_CATEGORIES = {c.value: c for c in SkillCategory}
+_LEVELS = dict(SkillLevel.__members__)
+_CONTEXTS = {c.value: c for c in SkillContext}
+
+
+def default_backend() -> bytes:
+    """Backend used when none is requested"""
+    return BACKEND_MSGPACK if MSGPACK_AVAILABLE else BACKEND_PICKLE
+
+
+def encode_skills(skills: Iterable[Skill], backend: Optional[bytes] = None) -> bytes:
+    """
+    Encode skills as a versioned binary record
+
+    Args:
+        skills: Skills to encode
+        backend: BACKEND_MSGPACK or BACKEND_PICKLE (default: msgpack if installed)
+
+    Returns:
+        Bytes starting with the magic, backend tag and schema version
+    """
+    backend = backend or default_backend()
+    skills = list(skills)
+    columns = [[getattr(s, name) for s in skills] for name in SKILL_FIELDS]
+    columns[1] = [category.value for category in columns[1]]
+    columns[2] = [level.name for level in columns[2]]
+    columns[3] = [context.value for context in columns[3]]
+
+    if backend == BACKEND_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("msgpack backend requested but msgpack is not installed")
+        payload = msgpack.packb(columns, use_bin_type=True)
+    elif backend == BACKEND_PICKLE:
+        payload = pickle.dumps(columns, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        raise ValueError(f"Unknown skill codec backend: {backend!r}")
+
+    return MAGIC + backend + bytes([SCHEMA_VERSION]) + payload
+
+
+def decode_skills(data: bytes) -> List[Skill]:
+    """
+    Decode a record written by encode_skills
+
+    Raises:
+        ValueError: If the record is not a skill record, uses an unknown schema
+            version, or needs a backend that is not installed
+    """
+    header_length = len(MAGIC) + 2
+    if len(data) < header_length or data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not an encoded skill record")
+
+    backend = data[len(MAGIC):len(MAGIC) + 1]
+    version = data[len(MAGIC) + 1]
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported skill record schema version {version}")
+
+    payload = memoryview(data)[header_length:]
+    if backend == BACKEND_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Skill record was written with msgpack, which is not installed")
+        columns = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    elif backend == BACKEND_PICKLE:
+        columns = pickle.loads(payload)
+    else:
+        raise ValueError(f"Unknown skill codec backend: {backend!r}")
+
+    if len(columns) != len(SKILL_FIELDS):
+        raise ValueError(f"Skill record has {len(columns)} columns, expected {len(SKILL_FIELDS)}")
+
+    columns[1] = map(_CATEGORIES.__getitem__, columns[1])
+    columns[2] = map(_LEVELS.__getitem__, columns[2])
+    columns[3] = map(_CONTEXTS.__getitem__, columns[3])
+    # Positional construction is safe: SKILL_FIELDS is checked against Skill at import
+    return list(starmap(Skill, zip(*columns)))
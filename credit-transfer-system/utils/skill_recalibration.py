@@ -1,10 +1,18 @@
 """
 Skill Recalibration Tool
-Re-categorizes and/or re-levels existing cached skills without re-extraction
+Re-categorizes, re-levels and/or re-contextualizes existing cached skills without re-extraction.
+Category, level and context are reassessed with one combined prompt per batch, batches are
+dispatched together, and results are kept in a persistent cache so unchanged skills are skipped.
+Skills are recalibrated in place in the skill store (or in exported JSON files), and progress is
+journaled per store entry/file so an interrupted run can simply be restarted.
 """
 
 import json
+import hashlib
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
@@ -29,6 +37,74 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Bump when the recalibration prompts or definitions change so cached results are redone
+RECALIBRATION_PROMPT_VERSION = 1
+
+RECALIBRATION_FIELDS = ("category", "level", "context")
+
+
+class RecalibrationCache:
+    """
+    Persistent cache of recalibration results
+    
+    Entries are appended to a JSONL file keyed by a hash of the skill text, its
+    source context and the prompt version; later lines win when a key repeats.
+    """
+    
+    def __init__(self, filepath: Optional[str] = None):
+        """
+        Args:
+            filepath: JSONL cache file (None keeps the cache in memory only)
+        """
+        self.filepath = Path(filepath) if filepath else None
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        
+        if self.filepath and self.filepath.exists():
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by an interrupted run
+                        continue
+                    self.entries[record["key"]] = record["result"]
+            logger.info(f"Loaded {len(self.entries)} cached recalibration results from {self.filepath}")
+    
+    @staticmethod
+    def make_key(skill: Skill, context_text: str, item_type: str,
+                 study_level: Optional[str], backend_type: str) -> str:
+        """Key for a skill as seen in a given item under the current prompt version"""
+        parts = [
+            str(RECALIBRATION_PROMPT_VERSION), backend_type, item_type, str(study_level),
+            context_text[:1500], skill.name, skill.evidence or ""
+        ]
+        return hashlib.sha1("\x1f".join(parts).encode('utf-8')).hexdigest()
+    
+    def get(self, key: str, fields: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """Cached result if it covers all requested fields"""
+        result = self.entries.get(key)
+        if result is not None and all(field in result for field in fields):
+            return result
+        return None
+    
+    def put_many(self, results: Dict[str, Dict[str, Any]]):
+        """Merge results into their entries and append them to the cache file"""
+        if not results:
+            return
+        
+        with self._lock:
+            lines = []
+            for key, result in results.items():
+                merged = {**self.entries.get(key, {}), **result}
+                self.entries[key] = merged
+                lines.append(json.dumps({"key": key, "result": merged}) + "\n")
+            
+            if self.filepath:
+                self.filepath.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.filepath, 'a', encoding='utf-8') as f:
+                    f.writelines(lines)
+
 
 class SkillRecalibrationTool:
     """Tool for recalibrating cached skills with updated category/level definitions"""
@@ -50,12 +126,29 @@ class SkillRecalibrationTool:
         # Detect backend type
         self.backend_type = self._detect_backend_type()
         
+        # Combined prompts need a backend that answers structured JSON prompts
+        self.use_combined_prompt = (self.config.get("combined_recalibration", True)
+                                    and self.backend_type in ("openai", "vllm"))
+        self.batch_size = max(1, self.config.get("recalibration_batch_size", 20))
+        
+        # Ensemble runs only differ when sampled: the first run is greedy and the
+        # rest use level_ensemble_temperature. vLLM batches always decode greedily,
+        # so they get a single run.
+        ensemble = self.config.get("ensemble_level_recalibration", True) and self.backend_type == "openai"
+        self.level_runs = max(1, self.config.get("level_recalibration_runs", 3)) if ensemble else 1
+        self.ensemble_temperature = self.config.get("level_ensemble_temperature", 0.7)
+        
+        cache_file = self.config.get("recalibration_cache_file", "cache/recalibration_cache.jsonl")
+        self.cache = RecalibrationCache(cache_file if self.config.get("use_recalibration_cache", True) else None)
+        self.skill_store = None
+        
         # Track changes for reporting
         self.changes_made = {
             'category_changes': 0,
             'level_changes': 0,
             'context_changes': 0,
             'total_skills_processed': 0,
+            'cached_skills': 0,
             'units_processed': 0,
             'courses_processed': 0
         }
@@ -76,95 +169,222 @@ class SkillRecalibrationTool:
         else:
             return "unknown"
     
+    def _get_skill_store(self):
+        """Skill store the analyzer reads cached skills from"""
+        if self.skill_store is None:
+            from reporting.skill_store import SkillStore
+            self.skill_store = SkillStore(self.config.get("SKILL_STORE_DIR", "output/skills/store"),
+                                          format=self.config.get("SKILL_STORE_FORMAT", "binary"))
+        return self.skill_store
+    
     def recalibrate_vet_skills(self, 
                               input_vet_qual: VETQualification,
                               recalibrate_categories: bool = False,
                               recalibrate_levels: bool = False,
-                              recalibrate_contexts: bool = False,
-                              backup: bool = False) -> str:
+                              recalibrate_contexts: bool = False) -> int:
         """
-        Recalibrate VET qualification skills from cached file
+        Recalibrate the stored skills of a VET qualification's units
+        
+        Units not yet in the skill store are first migrated from the latest
+        skills export, as the analyzer does when loading cached skills.
         
         Args:
-            filepath: Path to cached VET skills JSON file
+            input_vet_qual: Source qualification whose unit text is used as context
             recalibrate_categories: Whether to update categories
             recalibrate_levels: Whether to update levels
-            batch_size: Number of skills to process in each AI batch
-            backup: Whether to create backup before overwriting
+            recalibrate_contexts: Whether to update contexts
             
         Returns:
-            Path to updated file
+            Number of units whose stored skills were updated
         """
-        vet_dir = Path("output/skills/vet")
-        vet_files = list(vet_dir.glob(f"{input_vet_qual.code}_skills_*.json"))
-        filepath = max(vet_files, key=lambda p: p.stat().st_mtime)
-        logger.info(f"Loading pre-extracted VET skills from {filepath}")
+        updated = self.recalibrate_store(
+            kinds=("vet",),
+            qualifications=[input_vet_qual],
+            recalibrate_categories=recalibrate_categories,
+            recalibrate_levels=recalibrate_levels,
+            recalibrate_contexts=recalibrate_contexts,
+            resume=False
+        )
+        return updated["vet"]
+    
+    def recalibrate_uni_skills(self, 
+                              input_uni_qual: UniQualification,
+                              recalibrate_categories: bool = False,
+                              recalibrate_levels: bool = False,
+                              recalibrate_contexts: bool = False) -> int:
+        """
+        Recalibrate the stored skills of a University qualification's courses
         
-        # Create backup if requested
-        if backup:
-            backup_path = self._create_backup(filepath)
-            logger.info(f"Created backup at {backup_path}")
+        Courses not yet in the skill store are first migrated from the latest
+        skills export, as the analyzer does when loading cached skills.
         
-        # Load the qualification
-        vet_qual = self.skill_export.import_vet_skills(filepath)
-        loaded_units_map_desc = {unit.code: unit.get_full_text() for unit in input_vet_qual.units}
-        # Process each unit
-        for unit in tqdm(vet_qual.units, desc="Processing VET units"):
-            if unit.extracted_skills:
-                logger.info(f"Recalibrating {len(unit.extracted_skills)} skills for unit {unit.code}")
-                
-                # Recalibrate skills
-                recalibrated_skills = self._recalibrate_skills(
-                    skills=unit.extracted_skills,
-                    context_text=loaded_units_map_desc.get(unit.code, ""),
-                    item_type="VET Unit",
-                    item_code=unit.code,
-                    study_level=None,  # VET doesn't have explicit study levels
-                    recalibrate_categories=recalibrate_categories,
-                    recalibrate_levels=recalibrate_levels,
-                    recalibrate_contexts=recalibrate_contexts
-                )
-                
-                # Update the skills
-                unit.extracted_skills = recalibrated_skills
-                self.changes_made['units_processed'] += 1
+        Args:
+            input_uni_qual: Source qualification whose course text is used as context
+            recalibrate_categories: Whether to update categories
+            recalibrate_levels: Whether to update levels
+            recalibrate_contexts: Whether to update contexts
+            
+        Returns:
+            Number of courses whose stored skills were updated
+        """
+        updated = self.recalibrate_store(
+            kinds=("uni",),
+            qualifications=[input_uni_qual],
+            recalibrate_categories=recalibrate_categories,
+            recalibrate_levels=recalibrate_levels,
+            recalibrate_contexts=recalibrate_contexts,
+            resume=False
+        )
+        return updated["uni"]
+    
+    def recalibrate_store(self,
+                          kinds: Tuple[str, ...] = ("vet", "uni"),
+                          qualifications: Optional[List[Any]] = None,
+                          recalibrate_categories: bool = False,
+                          recalibrate_levels: bool = False,
+                          recalibrate_contexts: bool = False,
+                          resume: bool = True) -> Dict[str, int]:
+        """
+        Recalibrate skills in the skill store as one resumable job
         
-        # Save the updated qualification
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = Path(filepath).parent / f"{vet_qual.code}_skills_recalibrated_{timestamp}.json"
+        Updated skills are written back to the store under the entry's existing
+        source text hash, so the analyzer uses them on its next run. Entries
+        are processed in chunks (config 'recalibration_chunk_size' items); after
+        each chunk the recalibrated entries are recorded in a progress file
+        (config 'recalibration_store_progress_file'). With resume, entries
+        recorded for the same fields and not re-extracted since are skipped.
+        Once a kind has been updated its data file is compacted.
         
-        # Export using the skill export manager's method
-        self._export_vet_with_metadata(vet_qual, output_path)
+        Args:
+            kinds: Store kinds to recalibrate ('vet' and/or 'uni')
+            qualifications: Limit the job to these qualifications' units/courses,
+                using their text (and University study levels) as context; without
+                them every stored entry is recalibrated with its item name as context
+            resume: Skip entries already recalibrated by a previous run
+            
+        Returns:
+            Number of entries updated per kind
+        """
+        fields = [name for name, enabled in zip(
+            RECALIBRATION_FIELDS, (recalibrate_categories, recalibrate_levels, recalibrate_contexts)
+        ) if enabled]
+        progress_path = Path(self.config.get("recalibration_store_progress_file",
+                                             "cache/recalibration_store_progress.json"))
+        progress = self._load_progress(progress_path) if resume else {}
+        chunk_size = max(1, self.config.get("recalibration_chunk_size", 50))
+        store = self._get_skill_store()
         
-        # Print summary
-        self._print_summary()
+        updated = {kind: 0 for kind in kinds}
+        for kind in kinds:
+            item_type, counter = ("VET Unit", 'units_processed') if kind == "vet" \
+                else ("University Course", 'courses_processed')
+            
+            # code -> (context text, study level) for the items to recalibrate
+            if qualifications is None:
+                targets = {code: (entry.get("name") or code, None)
+                           for code, entry in store.entries(kind).items()}
+                load = lambda codes: store.load_entries(kind, codes)
+            else:
+                items = self._stored_items(kind, qualifications, store)
+                targets = {item.code: (item.get_full_text(), item.study_level if kind == "uni" else None)
+                           for item in items}
+                by_code = {item.code: item for item in items}
+                load = lambda codes: store.load_skills(kind, [by_code[code] for code in codes])
+            
+            index = store.entries(kind)
+            pending = [
+                code for code in targets
+                if index[code].get("skill_count", 0)
+                and not (resume and self._is_entry_recalibrated(progress.get(f"{kind}/{code}"), index[code], fields))
+            ]
+            logger.info(f"Recalibrating {len(pending)} stored {kind} entries "
+                        f"({len(targets) - len(pending)} up to date)")
+            
+            for start in tqdm(range(0, len(pending), chunk_size), desc=f"Recalibrating {kind} skills"):
+                skills_by_code = load(pending[start:start + chunk_size])
+                entries = [
+                    (skills, targets[code][0], item_type, targets[code][1])
+                    for code, skills in skills_by_code.items()
+                ]
+                self._recalibrate_items(entries, recalibrate_categories, recalibrate_levels, recalibrate_contexts)
+                self.changes_made[counter] += len(entries)
+                
+                updated[kind] += store.update_skills(kind, skills_by_code)
+                index = store.entries(kind)
+                for code in skills_by_code:
+                    progress[f"{kind}/{code}"] = {
+                        'hash': index[code]["hash"],
+                        'stored_at': index[code]["stored_at"],
+                        'fields': fields,
+                        'completed': datetime.now().isoformat()
+                    }
+                self._save_progress(progress_path, progress)
+            
+            # Each update appends a full entry, so drop the superseded ones
+            if updated[kind]:
+                store.compact(kind)
         
-        logger.info(f"Recalibrated VET skills saved to {output_path}")
-        return str(output_path)
+        self._print_summary()
+        return updated
     
-    def recalibrate_uni_skills(self, 
-                              input_uni_qual: UniQualification,
-                              recalibrate_categories: bool = False,
-                              recalibrate_levels: bool = False,
-                              recalibrate_contexts: bool = False,
-                              backup: bool = False) -> str:
+    def _stored_items(self, kind: str, qualifications: List[Any], store) -> List[Any]:
+        """Units/courses of the qualifications whose skills are in the store, migrating old exports"""
+        stored = []
+        for qual in qualifications:
+            items = getattr(qual, "units" if kind == "vet" else "courses", None)
+            if not items:
+                continue
+            
+            current = store.load_skills(kind, items)
+            missing = [item for item in items if item.code not in current and not store.has_entry(kind, item.code)]
+            if missing:
+                current.update(store.import_legacy_export(kind, qual.code, missing))
+            
+            stale = [item.code for item in items if item.code not in current and store.has_entry(kind, item.code)]
+            if stale:
+                logger.warning(f"Skipping {len(stale)} {kind} items of {qual.code} whose text changed "
+                               f"since extraction; re-run the analysis to re-extract them")
+            stored.extend(item for item in items if item.code in current)
+        return stored
+    
+    @staticmethod
+    def _is_entry_recalibrated(record: Optional[Dict], entry: Dict[str, Any], fields: List[str]) -> bool:
+        """Whether a progress record covers the store entry as it is now, for the fields"""
+        return (record is not None
+                and set(fields) <= set(record.get('fields', []))
+                and record.get('hash') == entry["hash"]
+                and record.get('stored_at') == entry.get("stored_at"))
+    
+    def recalibrate_file(self,
+                         filepath,
+                         qual_type: Optional[str] = None,
+                         context_texts: Optional[Dict[str, str]] = None,
+                         recalibrate_categories: bool = False,
+                         recalibrate_levels: bool = False,
+                         recalibrate_contexts: bool = False,
+                         backup: bool = False) -> str:
         """
-        Recalibrate University qualification skills from cached file
+        Recalibrate one exported skills file
+        
+        All units/courses of the file are recalibrated together, so their
+        batches are dispatched at once.
         
         Args:
-            filepath: Path to cached University skills JSON file
+            filepath: Exported VET or University skills JSON file
+            qual_type: "vet" or "uni" (detected from the file when None)
+            context_texts: Source text per unit/course code; defaults to the text in the export
             recalibrate_categories: Whether to update categories
             recalibrate_levels: Whether to update levels
-            batch_size: Number of skills to process in each AI batch
+            recalibrate_contexts: Whether to update contexts
             backup: Whether to create backup before overwriting
             
         Returns:
             Path to updated file
         """
-        uni_dir = Path("output/skills/uni")
-        uni_files = list(uni_dir.glob(f"{input_uni_qual.code}_skills_*.json"))
-        filepath = max(uni_files, key=lambda p: p.stat().st_mtime)
-        logger.info(f"Loading University skills from {filepath}")
+        filepath = Path(filepath)
+        qual_type = qual_type or self._detect_file_type(filepath)
+        context_texts = context_texts or {}
+        logger.info(f"Loading pre-extracted {qual_type.upper()} skills from {filepath}")
         
         # Create backup if requested
         if backup:
@@ -172,42 +392,155 @@ class SkillRecalibrationTool:
             logger.info(f"Created backup at {backup_path}")
         
         # Load the qualification
-        uni_qual = self.skill_export.import_uni_skills(filepath)
-        loaded_course_map_desc = {course.code: course.get_full_text() for course in input_uni_qual.courses}
-        # Process each course
-        for course in tqdm(uni_qual.courses, desc="Processing University courses"):
-            if course.extracted_skills:
-                logger.info(f"Recalibrating {len(course.extracted_skills)} skills for course {course.code}")
-                
-                # Recalibrate skills
-                recalibrated_skills = self._recalibrate_skills(
-                    skills=course.extracted_skills,
-                    context_text=loaded_course_map_desc.get(course.code, ""),
-                    item_type="University Course",
-                    item_code=course.code,
-                    study_level=course.study_level,
-                    recalibrate_categories=recalibrate_categories,
-                    recalibrate_levels=recalibrate_levels,
-                    recalibrate_contexts=recalibrate_contexts
-                )
-                
-                # Update the skills
-                course.extracted_skills = recalibrated_skills
-                self.changes_made['courses_processed'] += 1
+        if qual_type == "vet":
+            qual = self.skill_export.import_vet_skills(filepath)
+            items, item_type, counter = qual.units, "VET Unit", 'units_processed'
+        else:
+            qual = self.skill_export.import_uni_skills(filepath)
+            items, item_type, counter = qual.courses, "University Course", 'courses_processed'
+        
+        entries = [
+            (item.extracted_skills,
+             context_texts.get(item.code) or item.get_full_text(),
+             item_type,
+             # VET doesn't have explicit study levels
+             item.study_level if qual_type == "uni" else None)
+            for item in items if item.extracted_skills
+        ]
+        logger.info(f"Recalibrating {sum(len(e[0]) for e in entries)} skills across {len(entries)} items of {qual.code}")
+        
+        self._recalibrate_items(entries, recalibrate_categories, recalibrate_levels, recalibrate_contexts)
+        self.changes_made[counter] += len(entries)
         
         # Save the updated qualification
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = Path(filepath).parent / f"{uni_qual.code}_skills_recalibrated_{timestamp}.json"
-        
-        # Export using the skill export manager's method
-        self._export_uni_with_metadata(uni_qual, output_path)
+        output_path = filepath.parent / f"{qual.code}_skills_recalibrated_{timestamp}.json"
         
-        # Print summary
-        self._print_summary()
+        if qual_type == "vet":
+            self._export_vet_with_metadata(qual, output_path)
+        else:
+            self._export_uni_with_metadata(qual, output_path)
         
-        logger.info(f"Recalibrated University skills saved to {output_path}")
+        logger.info(f"Recalibrated skills saved to {output_path}")
         return str(output_path)
     
+    def recalibrate_files(self,
+                          paths: List[str],
+                          recalibrate_categories: bool = False,
+                          recalibrate_levels: bool = False,
+                          recalibrate_contexts: bool = False,
+                          backup: bool = False,
+                          resume: bool = True) -> Dict[str, str]:
+        """
+        Recalibrate many exported skills files as one resumable job
+        
+        Directories are searched recursively and contribute the latest export
+        of each qualification. Finished files are recorded in a progress file
+        (config 'recalibration_progress_file'); with resume, files finished
+        with the same fields are skipped, and skills of an interrupted file
+        come from the result cache when it is run again.
+        
+        Args:
+            paths: Exported skills files and/or directories
+            resume: Skip files already recalibrated by a previous run
+            
+        Returns:
+            Mapping of input file to recalibrated output file
+        """
+        fields = [name for name, enabled in zip(
+            RECALIBRATION_FIELDS, (recalibrate_categories, recalibrate_levels, recalibrate_contexts)
+        ) if enabled]
+        progress_path = Path(self.config.get("recalibration_progress_file", "cache/recalibration_progress.json"))
+        progress = self._load_progress(progress_path) if resume else {}
+        
+        outputs = {}
+        for filepath in tqdm(self._expand_skill_files(paths), desc="Recalibrating skill files"):
+            key = str(filepath.resolve())
+            if resume and self._is_recalibrated(filepath, progress, fields):
+                logger.info(f"Skipping {filepath}: already recalibrated")
+                continue
+            
+            try:
+                mtime = filepath.stat().st_mtime
+                output_path = self.recalibrate_file(
+                    filepath,
+                    recalibrate_categories=recalibrate_categories,
+                    recalibrate_levels=recalibrate_levels,
+                    recalibrate_contexts=recalibrate_contexts,
+                    backup=backup
+                )
+            except Exception as e:
+                logger.error(f"Failed to recalibrate {filepath}: {e}")
+                continue
+            
+            outputs[str(filepath)] = output_path
+            progress[key] = {
+                'mtime': mtime,
+                'fields': fields,
+                'output': str(Path(output_path).resolve()),
+                'completed': datetime.now().isoformat()
+            }
+            self._save_progress(progress_path, progress)
+        
+        self._print_summary()
+        return outputs
+    
+    def _expand_skill_files(self, paths: List[str]) -> List[Path]:
+        """Resolve files and directories to exported skills JSON files"""
+        files = []
+        for path in map(Path, paths):
+            if not path.is_dir():
+                files.append(path)
+                continue
+            
+            # Latest export per qualification, as recalibrate_*_skills would pick
+            latest = {}
+            for candidate in path.rglob("*_skills_*.json"):
+                if candidate.name.endswith(".backup.json"):
+                    continue
+                code = (candidate.parent, candidate.name.split("_skills_")[0])
+                if code not in latest or candidate.stat().st_mtime > latest[code].stat().st_mtime:
+                    latest[code] = candidate
+            files.extend(sorted(latest.values()))
+        return files
+    
+    @staticmethod
+    def _detect_file_type(filepath: Path) -> str:
+        """Qualification type of an exported skills file"""
+        if filepath.parent.name in ("vet", "uni"):
+            return filepath.parent.name
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return "vet" if "units" in json.load(f) else "uni"
+    
+    @staticmethod
+    def _is_recalibrated(filepath: Path, progress: Dict[str, Dict], fields: List[str]) -> bool:
+        """Whether a previous run already covered this file (or produced it) for the fields"""
+        resolved = str(filepath.resolve())
+        for source, record in progress.items():
+            if not set(fields) <= set(record.get('fields', [])) or not Path(record['output']).exists():
+                continue
+            if record['output'] == resolved:
+                return True
+            if source == resolved and record.get('mtime') == filepath.stat().st_mtime:
+                return True
+        return False
+    
+    @staticmethod
+    def _load_progress(progress_path: Path) -> Dict[str, Dict]:
+        if progress_path.exists():
+            with open(progress_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+    
+    @staticmethod
+    def _save_progress(progress_path: Path, progress: Dict[str, Dict]):
+        # Write then rename so an interrupted run never leaves a truncated file
+        progress_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = progress_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(progress, f, indent=2)
+        tmp_path.replace(progress_path)
+    
     def _recalibrate_skills(self,
                            skills: List[Skill],
                            context_text: str,
@@ -228,61 +561,238 @@ class SkillRecalibrationTool:
             study_level: Study level if known
             recalibrate_categories: Whether to update categories
             recalibrate_levels: Whether to update levels
-            batch_size: Batch size for AI processing
+            recalibrate_contexts: Whether to update contexts
             
         Returns:
             List of recalibrated skills
         """
+        self._recalibrate_items([(skills, context_text, item_type, study_level)],
+                                recalibrate_categories, recalibrate_levels, recalibrate_contexts)
+        return skills
+    
+    def _recalibrate_items(self,
+                           entries: List[tuple],
+                           recalibrate_categories: bool,
+                           recalibrate_levels: bool,
+                           recalibrate_contexts: bool):
+        """
+        Recalibrate the skills of many units/courses in place
+        
+        Args:
+            entries: (skills, context_text, item_type, study_level) tuples, one per item
+        """
         if not self.genai:
             logger.warning("No GenAI interface available, returning skills unchanged")
-            return skills
-        
-        self.changes_made['total_skills_processed'] += len(skills)
+            return
         
         # Store original values for comparison
-        original_values = {
-            skill.name: {
-                'category': skill.category,
-                'level': skill.level,
-                'context': skill.context
-            }
-            for skill in skills
-        }
-            
-        # Recalibrate categories if requested
-        if recalibrate_categories:
-            logger.debug(f"Recalibrating categories for batch {len(skills)}")
-            self._recalibrate_categories_batch(skills, context_text, item_type)
-        
-        # Recalibrate levels if requested
-        if recalibrate_levels:
-            logger.debug(f"Recalibrating levels for batch {len(skills)}")
-            self._recalibrate_levels_batch(skills, context_text, item_type, study_level)
-            
-        # Recalibrate contexts if requested
-        if recalibrate_contexts:
-            logger.debug(f"Recalibrating contexts for batch {len(skills)}")
-            self._recalibrate_contexts_batch(skills, context_text, item_type, study_level)
+        original_values = [
+            (skill, skill.category, skill.level, skill.context)
+            for skills, _, _, _ in entries for skill in skills
+        ]
+        self.changes_made['total_skills_processed'] += len(original_values)
+        
+        if self.use_combined_prompt:
+            fields = tuple(name for name, enabled in zip(
+                RECALIBRATION_FIELDS, (recalibrate_categories, recalibrate_levels, recalibrate_contexts)
+            ) if enabled)
+            if fields:
+                self._recalibrate_combined(entries, fields)
+        else:
+            # One pass per attribute, one item at a time
+            for skills, context_text, item_type, study_level in entries:
+                if recalibrate_categories:
+                    logger.debug(f"Recalibrating categories for batch {len(skills)}")
+                    self._recalibrate_categories_batch(skills, context_text, item_type)
+                if recalibrate_levels:
+                    logger.debug(f"Recalibrating levels for batch {len(skills)}")
+                    self._recalibrate_levels_batch(skills, context_text, item_type, study_level)
+                if recalibrate_contexts:
+                    logger.debug(f"Recalibrating contexts for batch {len(skills)}")
+                    self._recalibrate_contexts_batch(skills, context_text, item_type, study_level)
         
         # Count changes
-        for skill in skills:
-            original = original_values[skill.name]
-            if skill.category != original['category']:
+        for skill, category, level, context in original_values:
+            if skill.category != category:
                 self.changes_made['category_changes'] += 1
                 logger.debug(f"Category changed for '{skill.name}': "
-                           f"{original['category'].value} → {skill.category.value}")
+                           f"{category.value} → {skill.category.value}")
             
-            if skill.level != original['level']:
+            if skill.level != level:
                 self.changes_made['level_changes'] += 1
                 logger.debug(f"Level changed for '{skill.name}': "
-                           f"{original['level'].value} → {skill.level.value}")
+                           f"{level.value} → {skill.level.value}")
                 
-            if skill.context != original['context']:
+            if skill.context != context:
                 self.changes_made['context_changes'] += 1
                 logger.debug(f"Context changed for '{skill.name}': "
-                           f"{original['context'].value} → {skill.context.value}")
+                           f"{context.value} → {skill.context.value}")
+    
+    def _recalibrate_combined(self, entries: List[tuple], fields: Tuple[str, ...]):
+        """
+        Reassess the requested fields with one combined prompt per batch
         
-        return skills
+        Cached skills are applied directly. Prompts for all remaining batches
+        (and all level ensemble runs) are issued together; each field takes
+        the majority vote over the runs. A skill key shared by several items
+        (the same skill and text in more than one qualification) is asked once.
+        """
+        num_runs = self.level_runs if "level" in fields else 1
+        
+        skill_keys = []
+        resolved = {}
+        missing = []
+        queued = set()
+        for idx, (skills, context_text, item_type, study_level) in enumerate(entries):
+            item_missing = []
+            for skill in skills:
+                key = RecalibrationCache.make_key(skill, context_text, item_type, study_level, self.backend_type)
+                skill_keys.append((skill, key))
+                cached = self.cache.get(key, fields)
+                if cached is not None:
+                    resolved[key] = cached
+                elif key not in resolved and key not in queued:
+                    queued.add(key)
+                    item_missing.append((skill, key))
+            if item_missing:
+                missing.append((idx, item_missing))
+        
+        cached_keys = set(resolved)
+        self.changes_made['cached_skills'] += sum(1 for _, key in skill_keys if key in cached_keys)
+        
+        # OpenAI rates a batch of skills per prompt, vLLM one skill per prompt
+        group_size = self.batch_size if self.backend_type == "openai" else 1
+        system_prompt = None
+        user_prompts = []
+        prompt_groups = []
+        for idx, item_missing in missing:
+            _, context_text, item_type, study_level = entries[idx]
+            for start in range(0, len(item_missing), group_size):
+                group = item_missing[start:start + group_size]
+                system_prompt, user_prompt = self.prompt_manager.get_skill_recalibration_prompt(
+                    skills=[skill for skill, _ in group],
+                    context_text=context_text,
+                    item_type=item_type,
+                    study_level=study_level,
+                    fields=fields,
+                    backend_type=self.backend_type
+                )
+                user_prompts.append(user_prompt)
+                prompt_groups.append(group)
+        
+        if user_prompts:
+            logger.info(f"Recalibrating {sum(len(m) for _, m in missing)} skills "
+                        f"({len(cached_keys)} cached) with {len(user_prompts) * num_runs} prompts")
+            
+            votes = {key: {field: [] for field in fields} for group in prompt_groups for _, key in group}
+            max_tokens = [self._output_budget(len(group)) for group in prompt_groups] * num_runs
+            temperatures = [0.0] * len(user_prompts) + [self.ensemble_temperature] * len(user_prompts) * (num_runs - 1)
+            responses = self._generate_many(system_prompt, user_prompts * num_runs, max_tokens, temperatures)
+            
+            for group, response in zip(prompt_groups * num_runs, responses):
+                assignments = self._parse_recalibration_response(response)
+                for skill, key in group:
+                    for field, value in assignments.get(skill.name, {}).items():
+                        if field in votes[key]:
+                            votes[key][field].append(value)
+            
+            # Majority vote per field
+            new_results = {}
+            for key, field_votes in votes.items():
+                result = {}
+                for field, values in field_votes.items():
+                    if values:
+                        result[field] = Counter(values).most_common(1)[0][0]
+                if "level" in result:
+                    result["level_votes"] = field_votes["level"]
+                if result:
+                    new_results[key] = result
+            
+            self.cache.put_many(new_results)
+            resolved.update(new_results)
+        
+        for skill, key in skill_keys:
+            if key in resolved:
+                self._apply_recalibration(skill, resolved[key], fields, from_cache=key in cached_keys)
+    
+    def _apply_recalibration(self, skill: Skill, result: Dict[str, Any],
+                             fields: Tuple[str, ...], from_cache: bool = False):
+        """Set recalibrated values on a skill and record them in its history"""
+        history = skill.metadata.setdefault('recalibration_history', [])
+        timestamp = datetime.now().isoformat()
+        
+        def record(change_type: str, old_value, new_value, **extra):
+            entry = {'timestamp': timestamp, 'type': change_type,
+                     'old_value': old_value, 'new_value': new_value, **extra}
+            if from_cache:
+                entry['cached'] = True
+            history.append(entry)
+        
+        if "category" in fields and "category" in result:
+            record('category', skill.category.value, result["category"])
+            skill.category = self._map_category(result["category"])
+        
+        if "level" in fields and "level" in result:
+            votes = result.get("level_votes", [result["level"]])
+            record('level', skill.level.value, result["level"], votes=votes,
+                   consensus_confidence=votes.count(result["level"]) / len(votes))
+            skill.level = SkillLevel(result["level"])
+        
+        if "context" in fields and "context" in result:
+            record('context', skill.context.value, result["context"])
+            skill.context = self._map_context(result["context"])
+    
+    def _parse_recalibration_response(self, response: str) -> Dict[str, Dict[str, Any]]:
+        """Parse a combined recalibration response into normalized values per skill name"""
+        assignments = {}
+        data = self.extractor._parse_single_response(response) if isinstance(response, str) else None
+        
+        for item in data or []:
+            if not isinstance(item, dict) or not item.get('skill_name'):
+                continue
+            values = {}
+            if item.get('category'):
+                values['category'] = self._map_category(str(item['category'])).value
+            try:
+                level = int(item['level'])
+                if 1 <= level <= 7:
+                    values['level'] = level
+            except (KeyError, TypeError, ValueError):
+                pass
+            if item.get('context'):
+                values['context'] = self._map_context(str(item['context'])).value
+            assignments[item['skill_name']] = values
+        
+        return assignments
+    
+    def _generate_many(self, system_prompt: str, user_prompts: List[str], max_tokens: List[int],
+                       temperatures: Optional[List[float]] = None) -> List[str]:
+        """
+        Issue independent prompts together
+        
+        vLLM receives them as one (greedy) batch; other backends get bounded
+        concurrent calls (MAX_CONCURRENT_REQUESTS) at the given temperatures.
+        """
+        if self.backend_type == "vllm" and hasattr(self.genai, '_generate_batch'):
+            return self.genai._generate_batch(system_prompt, user_prompts, max_tokens=max_tokens)
+        
+        def call(user_prompt: str, temperature: float) -> str:
+            try:
+                return self.genai.generate_response(system_prompt, user_prompt, temperature=temperature)
+            except Exception as e:
+                logger.error(f"GenAI call failed: {e}")
+                return "[]"
+        
+        temperatures = temperatures or [0.0] * len(user_prompts)
+        max_workers = max(1, self.config.get("MAX_CONCURRENT_REQUESTS", 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(call, user_prompts, temperatures))
+    
+    def _output_budget(self, n_skills: int) -> int:
+        """Output token budget for a recalibration prompt covering n_skills"""
+        if hasattr(self.genai, 'output_budget'):
+            return self.genai.output_budget("recalibration", n_skills)
+        return 2048
     
     def _recalibrate_categories_batch(self, 
                                      skills: List[Skill],
@@ -340,9 +850,8 @@ class SkillRecalibrationTool:
                                  study_level: Optional[str]):
         """Recalibrate levels for a batch of skills using ensemble if configured"""
         
-        # if self.config.get("ensemble_level_recalibration", True):
-        # Use ensemble approach for consistency
-        num_runs = self.config.get("level_recalibration_runs", 3)
+        # Ensemble runs (OpenAI only, see __init__)
+        num_runs = self.level_runs
         level_votes = {skill.name: [] for skill in skills}
         
         for run in range(num_runs):
@@ -355,9 +864,9 @@ class SkillRecalibrationTool:
                 backend_type=self.backend_type
             )
             
-            # Add slight variation for ensemble
+            # Runs after the first are sampled so the ensemble can disagree
             if self.backend_type == "openai":
-                temperature = 0.0
+                temperature = 0.0 if run == 0 else self.ensemble_temperature
                 response = self.genai.generate_response(
                     system_prompt, user_prompt, 
                     temperature=temperature, top_p=1.0
@@ -600,6 +1109,7 @@ class SkillRecalibrationTool:
         print("RECALIBRATION SUMMARY")
         print("=" * 60)
         print(f"Total skills processed: {self.changes_made['total_skills_processed']}")
+        print(f"Skills from cache: {self.changes_made['cached_skills']}")
         print(f"Units processed: {self.changes_made['units_processed']}")
         print(f"Courses processed: {self.changes_made['courses_processed']}")
         print(f"Category changes: {self.changes_made['category_changes']}")
@@ -619,22 +1129,39 @@ class SkillRecalibrationTool:
         print("=" * 60)
 
 
+def _load_qualification(path: str):
+    """Load a VET or University qualification JSON file"""
+    from utils.qualification_io import load_vet_data, load_uni_data
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return load_vet_data(path) if "units" in data else load_uni_data(path)
+
+
 def main():
     """Command-line interface for skill recalibration"""
     parser = argparse.ArgumentParser(
-        description="Recalibrate categories and/or levels for cached skills"
+        description="Recalibrate categories, levels and/or contexts for cached skills"
+    )
+    
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Exported skills JSON files and/or directories (e.g. output/skills/vet); "
+             "without paths the skill store is recalibrated"
     )
     
     parser.add_argument(
-        "filepath",
-        help="Path to cached skills JSON file"
+        "--store-dir",
+        default="output/skills/store",
+        help="Skill store to recalibrate (default: output/skills/store)"
     )
     
     parser.add_argument(
-        "--type",
-        choices=["vet", "uni"],
-        required=True,
-        help="Type of qualification (vet or uni)"
+        "--qualifications",
+        nargs="+",
+        help="VET/University qualification JSON files whose units/courses to recalibrate "
+             "in the store, using their text as context (default: every stored entry)"
     )
     
     parser.add_argument(
@@ -649,17 +1176,53 @@ def main():
         help="Recalibrate skill levels"
     )
     
+    parser.add_argument(
+        "--contexts",
+        action="store_true",
+        help="Recalibrate skill contexts"
+    )
+    
     parser.add_argument(
         "--both",
         action="store_true",
         help="Recalibrate both categories and levels"
     )
     
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Recalibrate categories, levels and contexts"
+    )
+    
     parser.add_argument(
         "--batch-size",
         type=int,
-        default=50,
-        help="Batch size for AI processing (default: 50)"
+        default=20,
+        help="Skills per combined prompt (default: 20)"
+    )
+    
+    parser.add_argument(
+        "--separate-prompts",
+        action="store_true",
+        help="Use one prompt per attribute instead of the combined prompt"
+    )
+    
+    parser.add_argument(
+        "--cache-file",
+        default="cache/recalibration_cache.jsonl",
+        help="Persistent recalibration result cache (default: cache/recalibration_cache.jsonl)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the recalibration cache"
+    )
+    
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Recalibrate every file/store entry again instead of resuming the previous job"
     )
     
     parser.add_argument(
@@ -685,15 +1248,12 @@ def main():
     args = parser.parse_args()
     
     # Determine what to recalibrate
-    if args.both:
-        recalibrate_categories = True
-        recalibrate_levels = True
-    else:
-        recalibrate_categories = args.categories
-        recalibrate_levels = args.levels
-    
-    if not recalibrate_categories and not recalibrate_levels:
-        print("Error: Must specify --categories, --levels, or --both")
+    recalibrate_categories = args.categories or args.both or args.all
+    recalibrate_levels = args.levels or args.both or args.all
+    recalibrate_contexts = args.contexts or args.all
+    
+    if not (recalibrate_categories or recalibrate_levels or recalibrate_contexts):
+        print("Error: Must specify --categories, --levels, --contexts, --both or --all")
         return
     
     # Create configuration
@@ -706,7 +1266,12 @@ def main():
     config_dict = config.to_dict()
     config_dict.update({
         'ensemble_level_recalibration': True,
-        'level_recalibration_runs': 3
+        'level_recalibration_runs': 3,
+        'recalibration_batch_size': args.batch_size,
+        'combined_recalibration': not args.separate_prompts,
+        'recalibration_cache_file': args.cache_file,
+        'use_recalibration_cache': not args.no_cache,
+        'SKILL_STORE_DIR': args.store_dir
     })
     
     # Initialize GenAI interface
@@ -721,23 +1286,33 @@ def main():
     
     # Run recalibration
     try:
-        if args.type == "vet":
-            output_path = tool.recalibrate_vet_skills(
-                input_vet_qual=None,
+        if not args.paths:
+            qualifications = None
+            if args.qualifications:
+                qualifications = [_load_qualification(path) for path in args.qualifications]
+            updated = tool.recalibrate_store(
+                qualifications=qualifications,
                 recalibrate_categories=recalibrate_categories,
                 recalibrate_levels=recalibrate_levels,
-                backup=not args.no_backup
-            )
-        else:
-            output_path = tool.recalibrate_uni_skills(
-                input_uni_qual=None,
-                recalibrate_categories=recalibrate_categories,
-                recalibrate_levels=recalibrate_levels,
-                backup=not args.no_backup
+                recalibrate_contexts=recalibrate_contexts,
+                resume=not args.restart
             )
+            print(f"\nRecalibration complete! {updated['vet']} VET units and "
+                  f"{updated['uni']} University courses updated in {args.store_dir}")
+            return
+        
+        outputs = tool.recalibrate_files(
+            args.paths,
+            recalibrate_categories=recalibrate_categories,
+            recalibrate_levels=recalibrate_levels,
+            recalibrate_contexts=recalibrate_contexts,
+            backup=not args.no_backup,
+            resume=not args.restart
+        )
         
-        print(f"\nRecalibration complete!")
-        print(f"Output saved to: {output_path}")
+        print(f"\nRecalibration complete! {len(outputs)} files recalibrated")
+        for source, output_path in outputs.items():
+            print(f"  {source} -> {output_path}")
         
     except Exception as e:
         print(f"Error during recalibration: {e}")
@@ -746,4 +1321,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
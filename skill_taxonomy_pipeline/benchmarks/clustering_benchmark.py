@@ -0,0 +1,117 @@
+"""
+Benchmark: exact HDBSCAN vs kNN-graph HDBSCAN in MultiFactorClusterer
+Clusters synthetic embedding blobs with both paths and reports wall time,
+cluster counts, noise and agreement with the generating labels
+
+Usage:
+    python benchmarks/clustering_benchmark.py --sizes 5000 20000 --dim 64
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.clustering.hierarchical_clustering import MultiFactorClusterer
+
+
+def make_embeddings(n_samples: int, dim: int, n_clusters: int, spread: float, seed: int):
+    """Unit-norm blobs around random centres, like sentence embeddings"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(n_clusters, dim))
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    labels = rng.integers(0, n_clusters, n_samples)
+    embeddings = centres[labels] + rng.normal(scale=spread / np.sqrt(dim), size=(n_samples, dim))
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings.astype(np.float32), labels
+
+
+def make_clusterer(cache_dir: str, method: str, args) -> MultiFactorClusterer:
+    config = {
+        'clustering': {
+            'method': method,
+            'min_cluster_size': args.min_cluster_size,
+            'min_samples': args.min_samples,
+            'metric': 'euclidean',
+            'use_umap_reduction': False,
+            'cluster_selection_epsilon': 0.0,
+            'alpha': 1.0,
+            'knn_neighbors': args.knn_neighbors,
+            'n_jobs': args.n_jobs,
+            'cache_results': False,
+        },
+        'paths': {'cache_dir': cache_dir},
+        'embedding': {},
+    }
+    return MultiFactorClusterer(config)
+
+
+def run_method(clusterer: MultiFactorClusterer, method: str, features: np.ndarray):
+    start = time.perf_counter()
+    if method == 'knn_hdbscan':
+        labels = clusterer._perform_knn_hdbscan(features)
+    else:
+        labels = clusterer._perform_hdbscan(features)
+    return np.asarray(labels), time.perf_counter() - start
+
+
+def summarize(labels: np.ndarray, truth: np.ndarray, seconds: float) -> dict:
+    clustered = labels != -1
+    return {
+        'seconds': round(seconds, 3),
+        'n_clusters': int(len(set(labels[clustered]))),
+        'noise_fraction': round(float(1 - clustered.mean()), 4),
+        'ari': round(float(adjusted_rand_score(truth, labels)), 4),
+        'nmi': round(float(normalized_mutual_info_score(truth, labels)), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 20000])
+    parser.add_argument('--dim', type=int, default=64)
+    parser.add_argument('--clusters', type=int, default=50)
+    parser.add_argument('--spread', type=float, default=0.5)
+    parser.add_argument('--min-cluster-size', type=int, default=10)
+    parser.add_argument('--min-samples', type=int, default=5)
+    parser.add_argument('--knn-neighbors', type=int, default=30)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--methods', nargs='+', default=['hdbscan', 'knn_hdbscan'])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='Write results as JSON')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for n_samples in args.sizes:
+            features, truth = make_embeddings(n_samples, args.dim, args.clusters, args.spread, args.seed)
+            row = {'n_samples': n_samples, 'dim': args.dim}
+            method_labels = {}
+
+            for method in args.methods:
+                clusterer = make_clusterer(cache_dir, method, args)
+                labels, seconds = run_method(clusterer, method, features)
+                method_labels[method] = labels
+                row[method] = summarize(labels, truth, seconds)
+                print(f"n={n_samples:>7} {method:<12} {json.dumps(row[method])}")
+
+            if {'hdbscan', 'knn_hdbscan'} <= set(method_labels):
+                row['agreement_ari'] = round(float(adjusted_rand_score(
+                    method_labels['hdbscan'], method_labels['knn_hdbscan'])), 4)
+                print(f"n={n_samples:>7} agreement ARI {row['agreement_ari']}")
+
+            results.append(row)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
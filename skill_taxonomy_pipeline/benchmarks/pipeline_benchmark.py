@@ -0,0 +1,205 @@
+"""
+Benchmark: end-to-end SkillAssertionPipeline on synthetic assertions
+Builds skill assertion rows from the vocabulary of the sample VET file,
+runs the full pipeline on the offline "hashing" embedding and "fake" LLM
+backends (no model download, CPU only) and reports wall time and memory
+for every stage
+
+Usage:
+    python benchmarks/pipeline_benchmark.py --sizes 2000 10000
+    python benchmarks/pipeline_benchmark.py --sizes 5000 --llm-profile vllm --output bench.json
+    python benchmarks/pipeline_benchmark.py --sizes 5000 --output new.json --baseline bench.json
+"""
+import argparse
+import copy
+import json
+import logging
+import platform
+import re
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import CONFIG
+from src.pipeline import SkillAssertionPipeline
+from src.dedup.deduplicator import SkillDeduplicator
+from src.export.assertion_builder import AssertionBuilder
+from src.interfaces.fake_interfaces import PROFILES as LLM_PROFILES
+
+SAMPLE_VET = Path(__file__).resolve().parents[2] / "data" / "sample_vet.json"
+
+# (stage name, owner, method) in pipeline order; owner "pipeline" means the instance
+STAGES = [
+    ('preprocess', 'preprocessor', 'preprocess'),
+    ('reassign_levels', 'pipeline', '_reassign_levels'),
+    ('deduplicate', SkillDeduplicator, 'deduplicate'),
+    ('embeddings', 'pipeline', '_generate_skill_embeddings'),
+    ('assign_facets', 'pipeline', '_assign_facets_to_skills'),
+    ('ability_groups', 'pipeline', '_build_ability_groups'),
+    ('build_schema', AssertionBuilder, 'build'),
+    ('build_export', 'pipeline', '_build_export'),
+    ('export_html', 'pipeline', '_export_search_engine'),
+    ('export_excel', 'pipeline', '_export_excel'),
+]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def make_assertions(n_rows: int, n_units: int, n_skills: int, seed: int, sample_path: Path = SAMPLE_VET) -> pd.DataFrame:
+    """Assertion rows (skill name, unit code, level, context, ...) drawn from the sample vocabulary"""
+    with open(sample_path) as f:
+        sample = json.load(f)
+    rng = np.random.default_rng(seed)
+
+    outcomes = [o for unit in sample['units'] for o in unit.get('learning_outcomes', [])]
+    text = ' '.join(outcomes + [unit.get('description', '') for unit in sample['units']])
+    verbs = sorted({o.split()[0].lower() for o in outcomes if o.split()})
+    nouns = sorted({w.lower() for w in re.findall(r'[A-Za-z][A-Za-z\-]{3,}', text)} - set(verbs))
+
+    names = set()
+    while len(names) < n_skills:
+        names.add(f"{rng.choice(verbs)} {rng.choice(nouns)} {rng.choice(nouns)}")
+    names = sorted(names)
+    prefixes = [unit['code'][:6] for unit in sample['units']]
+    units = [f"{prefixes[i % len(prefixes)]}{i:04d}" for i in range(n_units)]
+
+    skill_idx = rng.integers(0, len(names), n_rows)
+    return pd.DataFrame({
+        'name': [names[i] for i in skill_idx],
+        'code': rng.choice(units, n_rows),
+        'level': rng.integers(1, 8, n_rows),
+        'context': rng.choice(['PRACTICAL', 'THEORETICAL', 'HYBRID'], n_rows),
+        'confidence': rng.uniform(0.7, 1.0, n_rows).round(2),
+        'category': rng.choice(['technical', 'cognitive', 'interpersonal', 'domain_knowledge'], n_rows),
+        'description': [f"Applies {names[i]} in workplace tasks" for i in skill_idx],
+        'evidence': rng.choice(outcomes, n_rows),
+        'keywords': [', '.join(names[i].split()) for i in skill_idx],
+    })
+
+
+def timed(method, name: str, stages: dict):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stage = stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += time.perf_counter() - start
+            stage['calls'] += 1
+            stage['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    return wrapper
+
+
+def run_pipeline(df: pd.DataFrame, args) -> dict:
+    stages = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        config = copy.deepcopy(CONFIG)
+        config['paths']['cache_dir'] = str(Path(workdir) / 'cache')
+        config['paths']['output_dir'] = str(Path(workdir) / 'output')
+        config['embedding'] = {**config['embedding'], 'model_name': 'hashing', 'embedding_dim': args.dim,
+                               'seed': args.seed}
+        config['backed_type'] = 'fake'
+        config['llm']['fake'] = {**config['llm']['fake'], 'profile': args.llm_profile or 'instant',
+                                 'seed': args.seed}
+        pipeline = SkillAssertionPipeline(config)
+
+        patched = []
+        for name, owner, attr in STAGES:
+            if owner == 'pipeline':
+                setattr(pipeline, attr, timed(getattr(pipeline, attr), name, stages))
+            elif owner == 'preprocessor':
+                setattr(pipeline.preprocessor, attr, timed(getattr(pipeline.preprocessor, attr), name, stages))
+            else:
+                patched.append((owner, attr, getattr(owner, attr)))
+                setattr(owner, attr, timed(getattr(owner, attr), name, stages))
+
+        start = time.perf_counter()
+        try:
+            results = pipeline.run(df, output_dir=config['paths']['output_dir'], skip_genai=args.llm_profile is None)
+        finally:
+            for owner, attr, original in patched:
+                setattr(owner, attr, original)
+        total = time.perf_counter() - start
+
+    if results.get('status') != 'success':
+        raise RuntimeError(f"Pipeline failed: {results.get('error')}")
+    for stage in stages.values():
+        stage['seconds'] = round(stage['seconds'], 3)
+    return {
+        'seconds': round(total, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'skills': results['skills'],
+        'assertions': results['assertions'],
+        'stages': stages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2000, 10000], help='Assertion rows per run')
+    parser.add_argument('--skills-per-row', type=float, default=0.3,
+                        help='Distinct skill names as a fraction of rows')
+    parser.add_argument('--rows-per-unit', type=int, default=15)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--llm-profile', default='instant', choices=list(LLM_PROFILES) + ['none'],
+                        help="Simulated LLM backend profile; 'none' skips the LLM steps")
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per size; the fastest is reported')
+    parser.add_argument('--sample', type=Path, default=SAMPLE_VET, help='VET sample supplying the vocabulary')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='Write results as JSON')
+    parser.add_argument('--baseline', type=str, default=None, help='Earlier --output file to compare against')
+    args = parser.parse_args()
+    if args.llm_profile == 'none':
+        args.llm_profile = None
+
+    logging.basicConfig(level=logging.ERROR)
+
+    results = []
+    for n_rows in args.sizes:
+        df = make_assertions(n_rows, max(1, n_rows // args.rows_per_unit), max(1, int(n_rows * args.skills_per_row)),
+                             args.seed, args.sample)
+        runs = [run_pipeline(df, args) for _ in range(args.repeat)]
+        row = {'n_rows': n_rows, **min(runs, key=lambda r: r['seconds'])}
+        results.append(row)
+
+        print(f"n={n_rows:>7} total {row['seconds']:.2f}s, {row['skills']} skills, "
+              f"peak RSS {row['peak_rss_mb']:.0f} MB")
+        for name, stage in row['stages'].items():
+            print(f"n={n_rows:>7}   {name:<16} {stage['seconds']:8.3f}s")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r['n_rows']: r for r in json.load(f)['results']}
+        print(f"\nComparison with {args.baseline}:")
+        for row in results:
+            before = baseline.get(row['n_rows'])
+            if before is None:
+                continue
+            for name in ['total'] + list(row['stages']):
+                old = before['seconds'] if name == 'total' else before['stages'].get(name, {}).get('seconds')
+                new = row['seconds'] if name == 'total' else row['stages'][name]['seconds']
+                if old:
+                    print(f"n={row['n_rows']:>7}   {name:<16} {old:8.3f}s -> {new:8.3f}s  ({(new - old) / old * 100:+.1f}%)")
+
+    if args.output:
+        meta = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        }
+        with open(args.output, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
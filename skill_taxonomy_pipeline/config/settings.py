@@ -34,8 +34,11 @@ DEDUP_CONFIG = {
 #  EMBEDDING
 # ═══════════════════════════════════════════════════════════════════
 
+# LLM_BACKEND=fake runs the pipeline offline on CPU with the stand-ins in src/interfaces/fake_interfaces.py
+LLM_BACKEND = os.getenv("LLM_BACKEND") or ("openai" if os.getenv("USE_AZURE_OPENAI", "false") == "true" else "vllm")
+
 EMBEDDING_CONFIG = {
-    "model_name": "jinaai--jina-embeddings-v4",
+    "model_name": os.getenv("EMBEDDING_MODEL") or ("hashing" if LLM_BACKEND == "fake" else "jinaai--jina-embeddings-v4"),
     "batch_size": 64,
     "normalize_embeddings": True,
     "device": os.environ.get("EMBEDDING_DEVICE", "cuda:1"),
@@ -58,6 +61,10 @@ FACET_ASSIGNMENT_CONFIG = {
     "embedding_similarity_threshold": 0.90,
     "multi_value_threshold": 0.25,
     "max_multi_values": 5,
+    # Related skills kNN graph: 'auto' uses FAISS when installed, else blocked numpy
+    "knn_backend": "auto",
+    "knn_index_type": "flat",   # 'flat' (exact) or 'ivf' (approximate, large catalogues)
+    "knn_block_size": 1024,
 }
 
 # ═══════════════════════════════════════════════════════════════════
@@ -111,6 +118,11 @@ LLM_CONFIG = {
         "model_cache_dir": os.getenv("MODEL_CACHE_DIR", "/root/.cache/huggingface/hub"),
         "external_model_dir": os.getenv("EXTERNAL_MODEL_DIR", "/Volumes/jsa_external_prod/external_vols/scratch/Scratch/Ehsan/Models"),
         "gpu_memory_utilization": 0.9,
+    },
+    "fake": {
+        "model_name": "fake-llm",
+        "profile": os.getenv("FAKE_LLM_PROFILE", "instant"),  # instant, azure, vllm or flaky
+        "seed": int(os.getenv("FAKE_LLM_SEED", "0")),
     }
 }
 
@@ -147,7 +159,7 @@ LLM_MODELS = {
 # ═══════════════════════════════════════════════════════════════════
 
 CONFIG = {
-    "backed_type": "openai" if os.getenv("USE_AZURE_OPENAI", "false") == "true" else "vllm",
+    "backed_type": LLM_BACKEND,
     "data": DATA_CONFIG,
     "embedding": EMBEDDING_CONFIG,
     "dedup": DEDUP_CONFIG,
@@ -218,6 +218,10 @@ FACET_ASSIGNMENT_CONFIG = {
     "multi_value_threshold": 0.25,
     "max_multi_values": 5,
     "max_retries": 3,
+    # Related skills kNN graph: 'auto' uses FAISS when installed, else blocked numpy
+    "knn_backend": "auto",
+    "knn_index_type": "flat",   # 'flat' (exact) or 'ivf' (approximate, large catalogues)
+    "knn_block_size": 1024,
     "facets_to_assign": [
         "NAT",    # Skill Nature
         "TRF",    # Transferability
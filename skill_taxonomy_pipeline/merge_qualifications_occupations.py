@@ -24,6 +24,7 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Any, Set, Tuple
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
@@ -54,6 +55,14 @@ class QualificationOccupationMerger:
         self.all_qualifications = {}  # code -> title
         self.all_occupations = {}     # code -> title
         
+        # Deduplicated relationship tables (in file order) behind the lookups
+        self.code_qualification_table = None  # code, qualification_code, qualification_title
+        self.code_occupation_table = None     # code, anzsco_code, anzsco_title
+        
+        # Exploded skill -> entry tables from the last merge
+        self.skill_qualifications = None      # skill_pos, code, title
+        self.skill_occupations = None         # skill_pos, code, title
+        
         # Statistics
         self.stats = {
             'total_skills': 0,
@@ -126,46 +135,41 @@ class QualificationOccupationMerger:
         """Build lookup tables for fast code-to-qualification/occupation mapping"""
         logger.info("Building lookup tables...")
         
-        has_code_name = 'code_name' in self.relationships_df.columns
+        df = self.relationships_df
+        has_code_name = 'code_name' in df.columns
         
-        for _, row in self.relationships_df.iterrows():
-            code = row['code']
-            qual_code = row['qualification_code']
-            qual_title = row['qualification_title']
-            occ_code = row['anzsco_code']
-            occ_title = row['anzsco_title']
-            
-            # Build code -> code_name mapping
-            if has_code_name:
-                code_name = row['code_name']
-                if code_name and code not in self.code_to_code_name:
-                    self.code_to_code_name[code] = code_name
-            
-            # Build code -> qualifications mapping
-            if qual_code and qual_title:
-                qual_entry = {'code': qual_code, 'title': qual_title}
-                if qual_entry not in self.code_to_qualifications[code]:
-                    self.code_to_qualifications[code].append(qual_entry)
-                
-                # Track all unique qualifications
-                if qual_code not in self.all_qualifications:
-                    self.all_qualifications[qual_code] = qual_title
-            
-            # Build code -> occupations mapping
-            if occ_code and occ_title:
-                occ_entry = {'code': occ_code, 'title': occ_title}
-                if occ_entry not in self.code_to_occupations[code]:
-                    self.code_to_occupations[code].append(occ_entry)
-                
-                # Track all unique occupations
-                if occ_code not in self.all_occupations:
-                    self.all_occupations[occ_code] = occ_title
-            
-            # Build qualification -> occupations mapping
-            if qual_code and occ_code and occ_title:
-                occ_entry = {'code': occ_code, 'title': occ_title}
-                if occ_entry not in self.qualification_to_occupations[qual_code]:
-                    self.qualification_to_occupations[qual_code].append(occ_entry)
+        # Build code -> code_name mapping (first non-empty name per code)
+        if has_code_name:
+            named = df.loc[df['code_name'] != '', ['code', 'code_name']].drop_duplicates('code')
+            self.code_to_code_name = dict(zip(named['code'], named['code_name']))
+        
+        # Build code -> qualifications mapping
+        quals = df.loc[(df['qualification_code'] != '') & (df['qualification_title'] != ''),
+                       ['code', 'qualification_code', 'qualification_title']]
+        self.code_qualification_table = quals.drop_duplicates().reset_index(drop=True)
+        self.code_to_qualifications = self._group_entries(
+            self.code_qualification_table, 'code', 'qualification_code', 'qualification_title')
+        
+        # Track all unique qualifications
+        first_quals = quals.drop_duplicates('qualification_code')
+        self.all_qualifications = dict(zip(first_quals['qualification_code'], first_quals['qualification_title']))
+        
+        # Build code -> occupations mapping
+        occ_mask = (df['anzsco_code'] != '') & (df['anzsco_title'] != '')
+        occs = df.loc[occ_mask, ['code', 'anzsco_code', 'anzsco_title']]
+        self.code_occupation_table = occs.drop_duplicates().reset_index(drop=True)
+        self.code_to_occupations = self._group_entries(
+            self.code_occupation_table, 'code', 'anzsco_code', 'anzsco_title')
+        
+        # Track all unique occupations
+        first_occs = occs.drop_duplicates('anzsco_code')
+        self.all_occupations = dict(zip(first_occs['anzsco_code'], first_occs['anzsco_title']))
+        
+        # Build qualification -> occupations mapping
+        qual_occs = df.loc[occ_mask & (df['qualification_code'] != ''),
+                           ['qualification_code', 'anzsco_code', 'anzsco_title']].drop_duplicates()
+        self.qualification_to_occupations = self._group_entries(
+            qual_occs, 'qualification_code', 'anzsco_code', 'anzsco_title')
         
         self.stats['total_qualifications'] = len(self.all_qualifications)
         self.stats['total_occupations'] = len(self.all_occupations)
@@ -176,6 +180,14 @@ class QualificationOccupationMerger:
         logger.info(f"  - Unique qualifications: {self.stats['total_qualifications']}")
         logger.info(f"  - Unique occupations: {self.stats['total_occupations']}")
     
+    @staticmethod
+    def _group_entries(table: pd.DataFrame, key_col: str, code_col: str, title_col: str) -> Dict[str, List[Dict]]:
+        """Group a (key, code, title) table into key -> [{code, title}] in table order"""
+        lookup = defaultdict(list)
+        for key, code, title in zip(table[key_col], table[code_col], table[title_col]):
+            lookup[key].append({'code': code, 'title': title})
+        return lookup
+    
     def get_skill_codes(self, skill: Dict) -> Set[str]:
         """Extract all codes associated with a skill"""
         codes = set()
@@ -226,6 +238,37 @@ class QualificationOccupationMerger:
             return self.code_to_code_name.get(str(primary_code).strip(), '')
         return ''
     
+    def _skill_code_table(self, skills: List[Dict]) -> pd.DataFrame:
+        """Exploded (skill_pos, code) table of every code associated with each skill"""
+        skill_codes = pd.DataFrame({
+            'skill_pos': np.arange(len(skills)),
+            'code': [sorted(self.get_skill_codes(skill)) for skill in skills]
+        }).explode('code').dropna(subset=['code'])
+        return skill_codes
+    
+    @staticmethod
+    def _resolve_entries(skill_codes: pd.DataFrame, code_table: pd.DataFrame,
+                         code_col: str, title_col: str) -> pd.DataFrame:
+        """
+        Join skill codes to a code -> entry table
+        
+        Entries are unique per skill by entry code (first title wins), ordered
+        by skill and then by the relationship table's order.
+        """
+        table = code_table.rename(columns={code_col: 'entry_code', title_col: 'title'})
+        table['rank'] = np.arange(len(table))
+        joined = skill_codes.merge(table, on='code', how='inner')
+        joined = joined.sort_values(['skill_pos', 'rank'], kind='stable')
+        joined = joined.drop_duplicates(['skill_pos', 'entry_code'])
+        return joined[['skill_pos', 'entry_code', 'title']].rename(columns={'entry_code': 'code'}).reset_index(drop=True)
+    
+    @staticmethod
+    def _entry_lists(entries: pd.DataFrame, n_skills: int) -> List[List[Dict]]:
+        """Split a resolved (skill_pos, code, title) table into one list per skill"""
+        records = [{'code': code, 'title': title} for code, title in zip(entries['code'], entries['title'])]
+        bounds = np.searchsorted(entries['skill_pos'].to_numpy(), np.arange(n_skills + 1))
+        return [records[bounds[pos]:bounds[pos + 1]] for pos in range(n_skills)]
+    
     def merge(self) -> Dict:
         """Merge qualifications and occupations into the taxonomy"""
         logger.info("Merging qualifications and occupations with taxonomy...")
@@ -233,31 +276,28 @@ class QualificationOccupationMerger:
         # Build lookup tables
         self.build_lookup_tables()
         
+        skills = self.taxonomy_data.get('skills', [])
+        
+        # Resolve skill -> codes -> qualifications / occupations with joins
+        skill_codes = self._skill_code_table(skills)
+        self.skill_qualifications = self._resolve_entries(
+            skill_codes, self.code_qualification_table, 'qualification_code', 'qualification_title')
+        self.skill_occupations = self._resolve_entries(
+            skill_codes, self.code_occupation_table, 'anzsco_code', 'anzsco_title')
+        
+        qualification_lists = self._entry_lists(self.skill_qualifications, len(skills))
+        occupation_lists = self._entry_lists(self.skill_occupations, len(skills))
+        
         # Process each skill
-        for skill in self.taxonomy_data.get('skills', []):
+        for skill, qualifications, occupations in zip(skills, qualification_lists, occupation_lists):
             # Get code name for this skill
-            code_name = self.get_code_name_for_skill(skill)
-            if code_name:
-                skill['code_name'] = code_name
-                self.stats['skills_with_code_names'] += 1
-            else:
-                skill['code_name'] = ''
-            
-            # Get qualifications for this skill
-            qualifications = self.get_qualifications_for_skill(skill)
-            if qualifications:
-                skill['qualifications'] = qualifications
-                self.stats['skills_with_qualifications'] += 1
-            else:
-                skill['qualifications'] = []
-            
-            # Get occupations for this skill
-            occupations = self.get_occupations_for_skill(skill)
-            if occupations:
-                skill['occupations'] = occupations
-                self.stats['skills_with_occupations'] += 1
-            else:
-                skill['occupations'] = []
+            skill['code_name'] = self.get_code_name_for_skill(skill)
+            skill['qualifications'] = qualifications
+            skill['occupations'] = occupations
+        
+        self.stats['skills_with_code_names'] += sum(1 for skill in skills if skill['code_name'])
+        self.stats['skills_with_qualifications'] += int(self.skill_qualifications['skill_pos'].nunique())
+        self.stats['skills_with_occupations'] += int(self.skill_occupations['skill_pos'].nunique())
         
         # Add qualification and occupation facets to the taxonomy
         self._add_facets_to_taxonomy()
@@ -346,23 +386,12 @@ class QualificationOccupationMerger:
         if 'facet_distributions' not in stats:
             stats['facet_distributions'] = {}
         
-        # Count skills per qualification
-        qual_dist = defaultdict(int)
-        occ_dist = defaultdict(int)
-        
-        for skill in self.taxonomy_data.get('skills', []):
-            for qual in skill.get('qualifications', []):
-                qual_dist[qual['code']] += 1
-            for occ in skill.get('occupations', []):
-                occ_dist[occ['code']] += 1
-        
-        # Store top 20 by count
-        stats['facet_distributions']['QUAL'] = dict(
-            sorted(qual_dist.items(), key=lambda x: x[1], reverse=True)[:20]
-        )
-        stats['facet_distributions']['OCC'] = dict(
-            sorted(occ_dist.items(), key=lambda x: x[1], reverse=True)[:20]
-        )
+        # Count skills per qualification / occupation, store top 20 by count
+        # (ties keep first-seen order)
+        for facet_id, entries in (('QUAL', self.skill_qualifications), ('OCC', self.skill_occupations)):
+            counts = entries.groupby('code', sort=False).size()
+            top = counts.iloc[np.argsort(-counts.to_numpy(), kind='stable')[:20]]
+            stats['facet_distributions'][facet_id] = {code: int(n) for code, n in top.items()}
         
         # Update generated_at timestamp
         self.taxonomy_data['metadata']['generated_at'] = datetime.now().isoformat()
@@ -395,60 +424,77 @@ class QualificationOccupationMerger:
         
         logger.info(f"Saved JSON: {output_path}")
     
+    EXCEL_FACETS = ['NAT', 'TRF', 'COG', 'CTX', 'FUT', 'LRN', 'DIG', 'ASCED', 'LVL']
+    
+    def _excel_columns(self) -> List[str]:
+        """Column order of the flattened Excel export"""
+        columns = ['skill_id', 'skill_name', 'description', 'category', 'level',
+                   'context', 'confidence', 'code', 'code_name']
+        for facet_id in self.EXCEL_FACETS:
+            columns += [f'facet_{facet_id}_code', f'facet_{facet_id}_name']
+        columns += ['qualification_codes', 'qualification_titles', 'qualification_count',
+                    'occupation_codes', 'occupation_titles', 'occupation_count',
+                    'alternative_titles', 'all_related_codes', 'all_related_keywords']
+        return columns
+    
+    def _excel_row(self, skill: Dict) -> List[Any]:
+        """Flatten one skill into Excel cell values (in _excel_columns order)"""
+        row = [
+            skill.get('id', ''),
+            skill.get('name', ''),
+            skill.get('description', ''),
+            skill.get('category', ''),
+            skill.get('level', ''),
+            skill.get('context', ''),
+            skill.get('confidence', ''),
+            skill.get('code', ''),
+            skill.get('code_name', ''),
+        ]
+        
+        # Add facets
+        facets = skill.get('facets', {})
+        for facet_id in self.EXCEL_FACETS:
+            facet_data = facets.get(facet_id, {})
+            row += [facet_data.get('code', ''), facet_data.get('name', '')]
+        
+        # Add qualifications and occupations (as semicolon-separated)
+        qualifications = skill.get('qualifications', [])
+        occupations = skill.get('occupations', [])
+        row += [
+            '; '.join([q['code'] for q in qualifications]),
+            '; '.join([q['title'] for q in qualifications]),
+            len(qualifications),
+            '; '.join([o['code'] for o in occupations]),
+            '; '.join([o['title'] for o in occupations]),
+            len(occupations),
+        ]
+        
+        # Add other fields
+        for field in ('alternative_titles', 'all_related_codes', 'all_related_kw'):
+            values = skill.get(field, [])
+            row.append('; '.join(values) if isinstance(values, list) and values else '')
+        
+        # Cells hold scalars only; anything else is written as text
+        return [v if v is None or isinstance(v, (str, int, float, bool)) else str(v) for v in row]
+    
     def save_excel(self, output_path: str):
-        """Save the merged taxonomy as Excel"""
+        """Save the merged taxonomy as Excel, streaming rows through a write-only workbook"""
+        from src.export.excel_writer import StreamingExcelWriter
+        
         logger.info(f"Saving merged taxonomy to Excel: {output_path}")
         
-        try:
-            # Flatten skills data for Excel
-            rows = []
+        skill = None
+        
+        def rows():
+            nonlocal skill
             for skill in self.taxonomy_data.get('skills', []):
-                row = {
-                    'skill_id': skill.get('id', ''),
-                    'skill_name': skill.get('name', ''),
-                    'description': skill.get('description', ''),
-                    'category': skill.get('category', ''),
-                    'level': skill.get('level', ''),
-                    'context': skill.get('context', ''),
-                    'confidence': skill.get('confidence', ''),
-                    'code': skill.get('code', ''),
-                    'code_name': skill.get('code_name', ''),
-                }
-                
-                # Add facets
-                facets = skill.get('facets', {})
-                for facet_id in ['NAT', 'TRF', 'COG', 'CTX', 'FUT', 'LRN', 'DIG', 'ASCED', 'LVL']:
-                    facet_data = facets.get(facet_id, {})
-                    row[f'facet_{facet_id}_code'] = facet_data.get('code', '')
-                    row[f'facet_{facet_id}_name'] = facet_data.get('name', '')
-                
-                # Add qualifications (as semicolon-separated)
-                qualifications = skill.get('qualifications', [])
-                row['qualification_codes'] = '; '.join([q['code'] for q in qualifications])
-                row['qualification_titles'] = '; '.join([q['title'] for q in qualifications])
-                row['qualification_count'] = len(qualifications)
-                
-                # Add occupations (as semicolon-separated)
-                occupations = skill.get('occupations', [])
-                row['occupation_codes'] = '; '.join([o['code'] for o in occupations])
-                row['occupation_titles'] = '; '.join([o['title'] for o in occupations])
-                row['occupation_count'] = len(occupations)
-                
-                # Add other fields
-                alternative_titles = skill.get('alternative_titles', []) if isinstance(skill.get('alternative_titles', []), list) else []
-                all_related_codes = skill.get('all_related_codes', []) if isinstance(skill.get('all_related_codes', []), list) else []
-                all_related_kw = skill.get('all_related_kw', []) if isinstance(skill.get('all_related_kw', []), list) else []
-                row['alternative_titles'] = '; '.join(alternative_titles) if alternative_titles else ''
-                row['all_related_codes'] = '; '.join(all_related_codes) if all_related_codes else ''
-                row['all_related_keywords'] = '; '.join(all_related_kw) if all_related_kw else ''
-                
-                rows.append(row)
-            
-            # Create DataFrame and save
-            df = pd.DataFrame(rows)
-            df.to_excel(output_path, index=False, engine='openpyxl')
+                yield self._excel_row(skill)
+        
+        try:
+            with StreamingExcelWriter(output_path) as writer:
+                n_rows = writer.write_sheet('Sheet1', self._excel_columns(), rows())
             
-            logger.info(f"Saved Excel with {len(rows)} rows: {output_path}")
+            logger.info(f"Saved Excel with {n_rows} rows: {output_path}")
         except Exception as e:
             logger.error(f"skill: {skill}")
             logger.error(f"Error saving Excel file: {e}")
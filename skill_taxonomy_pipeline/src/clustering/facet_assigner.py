@@ -25,6 +25,8 @@ from tqdm import tqdm
 import json
 import re
 
+from src.embeddings.knn_graph import build_knn_graph, row_neighbors
+
 try:
     from config.facets import (
         ALL_FACETS, MULTI_VALUE_FACETS, ORDERED_FACETS, FACET_PRIORITY,
@@ -79,6 +81,9 @@ class FacetAssigner:
         self.facet_embeddings = {}
         self.facet_value_keys = {}
         
+        # Sparse top-k similarity graph from the last related-skills computation
+        self.related_skills_graph = None
+        
         # Statistics
         self.assignment_stats = defaultdict(lambda: defaultdict(int))
         
@@ -464,63 +469,66 @@ class FacetAssigner:
     
     def _compute_related_skills(self, df: pd.DataFrame, embeddings: np.ndarray, 
                                  top_k: int = 20, similarity_threshold: float = 0.7) -> Dict[Any, List[Dict]]:
-        """Compute related skills for each skill using embeddings + LLM re-ranking."""
+        """
+        Compute related skills for each skill using a sparse top-k embedding
+        graph + LLM re-ranking. The graph is kept on self.related_skills_graph
+        (rows/columns follow df's row order) for reuse by other consumers.
+        """
         related_skills_map = {}
         indices = df.index.tolist()
-        
-        skill_id_to_name = {}
-        skill_id_to_idx = {}
-        for idx in indices:
-            skill_id = df.loc[idx, 'skill_id'] if 'skill_id' in df.columns else str(idx)
-            skill_id_to_name[skill_id] = df.loc[idx, 'name']
-            skill_id_to_idx[skill_id] = idx
-        
-        logger.info(f"Computing pairwise similarities for {len(indices)} skills...")
-        all_similarities = self.embedding_interface.similarity(embeddings, embeddings)
+        n = len(indices)
+        
+        # Column arrays, so candidates are gathered without per-cell .loc lookups
+        if 'skill_id' in df.columns:
+            skill_ids = df['skill_id'].to_numpy()
+        else:
+            skill_ids = np.array([str(idx) for idx in indices], dtype=object)
+        names = df['name'].to_numpy()
+        if 'description' in df.columns:
+            descriptions = df['description'].astype(str).to_numpy()
+        else:
+            descriptions = np.full(n, '', dtype=object)
+        
+        logger.info(f"Building top-{top_k} related skills graph for {n} skills...")
+        graph = build_knn_graph(
+            embeddings,
+            k=top_k,
+            threshold=similarity_threshold,
+            block_size=self.facet_config.get('knn_block_size', 1024),
+            backend=self.facet_config.get('knn_backend', 'auto'),
+            index_type=self.facet_config.get('knn_index_type', 'flat'),
+        )
+        self.related_skills_graph = graph
         
         to_be_reranked = []
         
-        for i, idx in enumerate(tqdm(indices, desc="Finding related skills")):
-            position = df.index.get_loc(idx)
-            skill_id = df.loc[idx, 'skill_id'] if 'skill_id' in df.columns else str(idx)
-            skill_name = df.loc[idx, 'name']
-            skill_desc = df.loc[idx, 'description'] if 'description' in df.columns else ''
-            
-            similarities = all_similarities[position]
-            top_indices = np.argsort(similarities)[-top_k-1:][::-1]
+        for position in range(n):
+            neighbor_positions, neighbor_sims = row_neighbors(graph, position)
+            if len(neighbor_positions) == 0:
+                continue
             
-            candidates = []
-            for top_idx in top_indices:
-                if top_idx == position:
-                    continue
-                
-                sim = similarities[top_idx]
-                if sim >= similarity_threshold:
-                    cand_idx = indices[top_idx]
-                    cand_id = df.loc[cand_idx, 'skill_id'] if 'skill_id' in df.columns else str(cand_idx)
-                    cand_name = df.loc[cand_idx, 'name']
-                    cand_desc = df.loc[cand_idx, 'description']
-                    candidates.append({
-                        'skill_id': cand_id,
-                        'skill_name': cand_name,
-                        'skill_desc': str(cand_desc),
-                        'similarity': float(sim),
-                        'idx': cand_idx
-                    })
-                
-                if len(candidates) >= top_k:
-                    break
+            candidates = [
+                {
+                    'skill_id': skill_ids[cand],
+                    'skill_name': names[cand],
+                    'skill_desc': descriptions[cand],
+                    'similarity': float(sim),
+                    'idx': indices[cand]
+                }
+                for cand, sim in zip(neighbor_positions[:10], neighbor_sims[:10])
+            ]
             
-            if candidates and self.use_llm_reranking and len(candidates) > 3:
+            idx = indices[position]
+            if self.use_llm_reranking and len(neighbor_positions) > 3:
                 to_be_reranked.append({
                     'idx': idx,
-                    'skill_id': skill_id,
-                    'skill_name': skill_name,
-                    'skill_desc': str(skill_desc),
-                    'candidates': candidates[:10]
+                    'skill_id': skill_ids[position],
+                    'skill_name': names[position],
+                    'skill_desc': descriptions[position],
+                    'candidates': candidates
                 })
-            elif candidates:
-                related_skills_map[idx] = candidates[:10]
+            else:
+                related_skills_map[idx] = candidates
         
         if to_be_reranked and self.genai_interface:
             logger.info(f"LLM re-ranking related skills for {len(to_be_reranked)} skills...")
@@ -651,7 +659,7 @@ class FacetAssigner:
         skills = []
         
         related_skills_map = {}
-        if embeddings is not None and self.embedding_interface is not None:
+        if embeddings is not None:
             logger.info("Computing related skills...")
             related_skills_map = self._compute_related_skills(df, embeddings, similarity_threshold = self.embedding_threshold)
         
@@ -1,10 +1,18 @@
 """
 Family Assignment Module - Replaces Clustering
 Assigns skills to predefined skill families using GenAI and embedding-based matching
+
+All skills are scored against the family embeddings in blocked matrix
+products; only ambiguous skills (best similarity between the re-rank and
+direct-assignment thresholds) go to the LLM, in fixed-size batches that are
+dispatched concurrently, so the number of LLM calls is known up front.
 """
+import hashlib
 import logging
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 from tqdm import tqdm
@@ -53,10 +61,21 @@ class SkillFamilyAssigner:
         self.use_llm_reranking = self.family_config.get('use_llm_reranking', False) and genai_interface is not None
         self.rerank_top_k = self.family_config.get('rerank_top_k', 5)
         self.rerank_similarity_threshold = self.family_config.get('rerank_similarity_threshold', 0.5)
+        self.max_retries = self.family_config.get('max_retries', 3)
+        
+        # Engine settings
+        self.score_block_size = self.family_config.get('score_block_size', 4096)
+        # Only interfaces that are safe to call from several threads get concurrent batches
+        self.max_concurrent_batches = self.family_config.get('max_concurrent_batches', 4) \
+            if getattr(genai_interface, 'supports_concurrent_requests', False) else 1
+        self.cache_family_embeddings = self.family_config.get('cache_family_embeddings', True)
+        cache_root = config.get('paths', {}).get('cache_dir')
+        self.cache_dir = Path(cache_root) / "family_embeddings" if cache_root else None
         
         # Precompute family embeddings for similarity matching
         self.family_embeddings = None
         self.family_keys = None
+        self.family_definition_hash = None
         self.family_names = {k: v.get('name', k) for k, v in self.families.items()}
         self.domain_names = {k: v.get('name', k) for k, v in self.domains.items()}
         
@@ -69,16 +88,10 @@ class SkillFamilyAssigner:
         logger.info(f"  Use GenAI: {self.use_genai}")
         logger.info(f"  Fallback to keywords: {self.fallback_to_keywords}")
     
-    def _precompute_family_embeddings(self):
-        """Precompute embeddings for all families for similarity matching"""
-        if self.embedding_interface is None:
-            logger.warning("No embedding interface provided, skipping family embedding precomputation")
-            return
-        
-        logger.info("Precomputing family embeddings...")
-        
+    def _family_texts(self) -> Tuple[List[str], List[str]]:
+        """Text representation of each family used for embedding"""
         family_texts = []
-        self.family_keys = []
+        family_keys = []
         
         for family_key, family_info in self.families.items():
             # Create rich text representation of family
@@ -92,15 +105,70 @@ class SkillFamilyAssigner:
             
             family_text = '. '.join([p for p in text_parts if p]) #+ f". Domain: {self.domains.get(family_info.get('domain', ''), {}).get('name', '')}"
             family_texts.append(family_text)
-            self.family_keys.append(family_key)
+            family_keys.append(family_key)
         
-        if family_texts:
-            self.family_embeddings = self.embedding_interface.encode(
+        return family_keys, family_texts
+    
+    def _definition_hash(self, family_keys: List[str], family_texts: List[str]) -> str:
+        """Hash of the family definitions and embedding model"""
+        model_name = getattr(self.embedding_interface, 'model_name', type(self.embedding_interface).__name__)
+        content = json.dumps([model_name, family_keys, family_texts], ensure_ascii=False)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+    
+    def _precompute_family_embeddings(self):
+        """
+        Precompute normalized embeddings for all families
+        
+        Embeddings are reused while the family definitions are unchanged and
+        cached on disk by definition hash.
+        """
+        if self.embedding_interface is None:
+            logger.warning("No embedding interface provided, skipping family embedding precomputation")
+            return
+        
+        family_keys, family_texts = self._family_texts()
+        if not family_texts:
+            return
+        
+        definition_hash = self._definition_hash(family_keys, family_texts)
+        if definition_hash == self.family_definition_hash and self.family_embeddings is not None:
+            return
+        
+        cache_path = self.cache_dir / f"families_{definition_hash}.npy" if self.cache_dir else None
+        embeddings = None
+        if self.cache_family_embeddings and cache_path is not None and cache_path.exists():
+            try:
+                embeddings = np.load(cache_path)
+                logger.info(f"Loaded cached family embeddings: {cache_path}")
+            except Exception as e:
+                logger.warning(f"Failed to load cached family embeddings: {e}")
+        
+        if embeddings is None:
+            logger.info("Precomputing family embeddings...")
+            embeddings = np.asarray(self.embedding_interface.encode(
                 family_texts,
                 batch_size=32,
                 show_progress=True
-            )
-            logger.info(f"  Computed embeddings for {len(self.family_keys)} families")
+            ))
+            if self.cache_family_embeddings and cache_path is not None:
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    np.save(cache_path, embeddings)
+                except Exception as e:
+                    logger.warning(f"Failed to save family embeddings to cache: {e}")
+        
+        self.family_keys = family_keys
+        self.family_embeddings = self._normalize(embeddings)
+        self.family_definition_hash = definition_hash
+        logger.info(f"  Computed embeddings for {len(self.family_keys)} families")
+    
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        """L2-normalize rows as float32"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        return embeddings / (np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10)
     
     def assign_families(self, df: pd.DataFrame, embeddings: Optional[np.ndarray] = None) -> pd.DataFrame:
         """
@@ -162,54 +230,70 @@ class SkillFamilyAssigner:
         return df_result
     
     def _assign_with_genai(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Assign skills to families using GenAI"""
+        """Assign skills to families using GenAI, dispatching batches concurrently"""
         logger.info("Assigning skills using GenAI...")
         
         # Create family summary for prompt
         family_summary = self._create_family_summary()
         
-        # Process in batches
-        unassigned_indices = df[df['assigned_family'].isna()].index.tolist()
+        # Prepare batches of unassigned skills
+        unassigned = df[df['assigned_family'].isna()]
+        names = unassigned['name'].tolist()
+        descriptions = unassigned['description'].tolist() if 'description' in df.columns else [''] * len(unassigned)
+        skills = [
+            {
+                'index': idx,
+                'name': name,
+                'description': str(desc)[:200]  # Truncate description
+            }
+            for idx, name, desc in zip(unassigned.index, names, descriptions)
+        ]
+        batches = [skills[start:start + self.batch_size] for start in range(0, len(skills), self.batch_size)]
+        logger.info(f"  {len(skills)} skills in {len(batches)} LLM calls")
         
-        for batch_start in tqdm(range(0, len(unassigned_indices), self.batch_size), 
-                                desc="GenAI family assignment"):
-            batch_end = min(batch_start + self.batch_size, len(unassigned_indices))
-            batch_indices = unassigned_indices[batch_start:batch_end]
-            
-            # Prepare batch of skills
-            skills_batch = []
-            for idx in batch_indices:
-                skill_name = df.loc[idx, 'name']
-                skill_desc = df.loc[idx, 'description'] if 'description' in df.columns else ''
-                skills_batch.append({
-                    'index': idx,
-                    'name': skill_name,
-                    'description': str(skill_desc)[:200]  # Truncate description
-                })
-            
-            # Call GenAI for assignment
-            try:
-                assignments = self._call_genai_for_assignment(skills_batch, family_summary)
-                
-                # Apply assignments
-                for assignment in assignments:
-                    idx = assignment.get('index')
-                    family_key = assignment.get('family_key')
-                    confidence = assignment.get('confidence', 0.7)
-                    
-                    if idx is not None and family_key in self.families:
-                        df.loc[idx, 'assigned_family'] = family_key
-                        df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                        df.loc[idx, 'family_assignment_method'] = 'genai'
-                        df.loc[idx, 'family_assignment_confidence'] = confidence
-                        self.assignment_stats['genai'] += 1
-                        
-            except Exception as e:
-                logger.warning(f"GenAI assignment failed for batch: {e}")
-                continue
+        assignments = []
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrent_batches)) as executor:
+            futures = [
+                executor.submit(self._call_genai_for_assignment, batch, family_summary)
+                for batch in batches
+            ]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="GenAI family assignment"):
+                try:
+                    assignments.extend(future.result() or [])
+                except Exception as e:
+                    logger.warning(f"GenAI assignment failed for batch: {e}")
+        
+        # Apply assignments
+        valid = {}
+        for assignment in assignments:
+            idx = assignment.get('index')
+            family_key = assignment.get('family_key')
+            if idx is not None and family_key in self.families:
+                valid[idx] = (family_key, assignment.get('confidence', 0.7))
+        
+        if valid:
+            labels = list(valid.keys())
+            family_keys = [family_key for family_key, _ in valid.values()]
+            self._set_assignments(
+                df, labels, family_keys,
+                [self.family_names[family_key] for family_key in family_keys],
+                'genai', [confidence for _, confidence in valid.values()]
+            )
+            self.assignment_stats['genai'] += len(valid)
         
         return df
     
+    def _set_assignments(self, df: pd.DataFrame, labels, family_keys, family_names,
+                         method: str, confidences):
+        """Write family assignment columns for the given row labels"""
+        labels = list(labels)
+        if not labels:
+            return
+        df.loc[labels, 'assigned_family'] = pd.Series(list(family_keys), index=labels, dtype=object)
+        df.loc[labels, 'assigned_family_name'] = pd.Series(list(family_names), index=labels, dtype=object)
+        df.loc[labels, 'family_assignment_method'] = method
+        df.loc[labels, 'family_assignment_confidence'] = np.asarray(confidences, dtype=float)
+    
     def _call_genai_for_assignment(self, skills_batch: List[Dict], family_summary: str) -> List[Dict]:
         """Call GenAI to assign skills to families"""
         
@@ -367,271 +451,193 @@ Respond with JSON only:"""
         
         return '\n'.join(lines)
     
-    def _assign_with_embeddings(self, df: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
-        """Assign skills using embedding similarity"""
-        if self.skill_embeddings is None or self.family_embeddings is None:
-            return df
+    def _score_families(self, skill_embeddings: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k families for every skill by cosine similarity
         
-        indices = df[mask].index.tolist()
-        to_be_reranked = []
-        for idx in tqdm(indices, desc="Embedding similarity assignment"):
-            # Get skill embedding
-            position = df.index.get_loc(idx)
-            skill_emb = self.skill_embeddings[position].reshape(1, -1)
-            
-            # Calculate similarity to all families
-            similarities = self.embedding_interface.similarity(skill_emb, self.family_embeddings)[0]
-
-            # Get top-K candidates
-            top_k = self.rerank_top_k if self.use_llm_reranking else 1
-            top_indices = np.argsort(similarities)[-top_k:][::-1]
-            top_similarities = similarities[top_indices]
-            
-            # Default: use best embedding match
-            best_idx = top_indices[0]
-            best_similarity = top_similarities[0]
-            
-            # If LLM re-ranking is enabled and we have multiple candidates above threshold
-            if self.use_llm_reranking and len(top_indices) > 1 and top_similarities[0] >= self.rerank_similarity_threshold and best_similarity < self.embedding_threshold:
-                # Get skill info
-                skill_name = df.loc[idx, 'name']
-                skill_desc = df.loc[idx, 'description'] if 'description' in df.columns else ''
-                
-                # Get top-K family candidates
-                candidates = []
-                for i, fam_idx in enumerate(top_indices):
-                    if top_similarities[i] >= self.rerank_similarity_threshold:
-                        family_key = self.family_keys[fam_idx]
-                        candidates.append({
-                            'key': family_key,
-                            'name': self.families[family_key].get('name', family_key),
-                            'description': self.families[family_key].get('description', ''),
-                            'domain': self.domains.get(self.families[family_key].get('domain', ''), {}).get('name', ''),
-                            'similarity': float(top_similarities[i])
-                        })
-                
-                # Re-rank with LLM if we have multiple candidates
-                if len(candidates) > 1:
-                    best_family, confidence = self._rerank_with_llm(skill_name, skill_desc, candidates)
-                    if best_family and confidence >= self.rerank_similarity_threshold:
-                        df.loc[idx, 'assigned_family'] = best_family
-                        df.loc[idx, 'assigned_family_name'] = self.family_names[best_family]
-                        df.loc[idx, 'family_assignment_method'] = 'embedding+llm_rerank'
-                        df.loc[idx, 'family_assignment_confidence'] = confidence
-                        self.assignment_stats['embedding+llm_rerank'] += 1
-                    else:
-                        # Fallback to best embedding match
-                        family_key = self.family_keys[best_idx]
-                        df.loc[idx, 'assigned_family'] = None
-                        df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                        df.loc[idx, 'family_assignment_method'] = 'Not assigned'
-                        df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                        self.assignment_stats['Not assigned'] += 1
-                else:
-                        # Fallback to best embedding match
-                        family_key = self.family_keys[best_idx]
-                        df.loc[idx, 'assigned_family'] = None
-                        df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                        df.loc[idx, 'family_assignment_method'] = 'Not assigned'
-                        df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                        self.assignment_stats['Not assigned'] += 1
+        Skills are scored in blocks of score_block_size rows, so memory stays
+        O(block * families).
+        
+        Returns:
+            (top_indices, top_similarities), both (n_skills, top_k), best first
+        """
+        n_skills = len(skill_embeddings)
+        top_k = max(1, min(top_k, len(self.family_keys)))
+        top_indices = np.empty((n_skills, top_k), dtype=np.int64)
+        top_similarities = np.empty((n_skills, top_k), dtype=np.float32)
+        
+        for start in range(0, n_skills, self.score_block_size):
+            end = min(start + self.score_block_size, n_skills)
+            similarities = self._normalize(skill_embeddings[start:end]) @ self.family_embeddings.T
             
-            elif best_similarity >= self.embedding_threshold:
-                family_key = self.family_keys[best_idx]
-                df.loc[idx, 'assigned_family'] = family_key
-                df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                df.loc[idx, 'family_assignment_method'] = 'embedding'
-                df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                self.assignment_stats['embedding'] += 1
+            if top_k < similarities.shape[1]:
+                top = np.argpartition(-similarities, top_k - 1, axis=1)[:, :top_k]
             else:
-                family_key = self.family_keys[best_idx]
-                df.loc[idx, 'assigned_family'] = None
-                df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                df.loc[idx, 'family_assignment_method'] = 'Not assigned'
-                df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                self.assignment_stats['Not assigned'] += 1
+                top = np.broadcast_to(np.arange(similarities.shape[1]), similarities.shape)
+            top_sims = np.take_along_axis(similarities, top, axis=1)
+            order = np.argsort(-top_sims, axis=1, kind='stable')
+            
+            top_indices[start:end] = np.take_along_axis(top, order, axis=1)
+            top_similarities[start:end] = np.take_along_axis(top_sims, order, axis=1)
         
-        return df
+        return top_indices, top_similarities
     
     def _assign_with_embeddings_batch(self, df: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
-        """Assign skills using embedding similarity"""
+        """Assign skills using embedding similarity, re-ranking only ambiguous skills with the LLM"""
         if self.skill_embeddings is None or self.family_embeddings is None:
             return df
         
-        indices = df[mask].index.tolist()
-        to_be_reranked = []
-        for idx in tqdm(indices, desc="Embedding similarity assignment"):
-            # Get skill embedding
-            position = df.index.get_loc(idx)
-            skill_emb = self.skill_embeddings[position].reshape(1, -1)
-            
-            # Calculate similarity to all families
-            similarities = self.embedding_interface.similarity(skill_emb, self.family_embeddings)[0]
-
-            # Get top-K candidates
-            top_k = self.rerank_top_k if self.use_llm_reranking else 1
-            top_indices = np.argsort(similarities)[-top_k:][::-1]
-            top_similarities = similarities[top_indices]
+        positions = np.flatnonzero(np.asarray(mask))
+        labels = df.index[positions]
+        
+        top_k = self.rerank_top_k if self.use_llm_reranking else 1
+        top_indices, top_similarities = self._score_families(self.skill_embeddings[positions], top_k)
+        best_indices = top_indices[:, 0]
+        best_similarities = top_similarities[:, 0]
+        family_keys = np.array(self.family_keys, dtype=object)
+        family_names = np.array([self.family_names[k] for k in self.family_keys], dtype=object)
+        
+        # Ambiguous: above the re-rank threshold but below direct assignment,
+        # with more than one candidate family above the re-rank threshold
+        direct = best_similarities >= self.embedding_threshold
+        ambiguous = np.zeros(len(positions), dtype=bool)
+        if self.use_llm_reranking and top_indices.shape[1] > 1:
+            in_band = (best_similarities >= self.rerank_similarity_threshold) & ~direct
+            n_candidates = (top_similarities >= self.rerank_similarity_threshold).sum(axis=1)
+            ambiguous = in_band & (n_candidates > 1)
+        
+        # Direct embedding assignments
+        self._set_assignments(
+            df, labels[direct], family_keys[best_indices[direct]],
+            family_names[best_indices[direct]], 'embedding', best_similarities[direct]
+        )
+        self.assignment_stats['embedding'] += int(direct.sum())
+        
+        # Everything else starts as not assigned (keeping the best match's name)
+        # and is overwritten if the LLM re-rank succeeds
+        not_direct = ~direct
+        self._set_assignments(
+            df, labels[not_direct], [None] * int(not_direct.sum()),
+            family_names[best_indices[not_direct]], 'Not assigned', best_similarities[not_direct]
+        )
+        
+        reranked = 0
+        ambiguous_rows = np.flatnonzero(ambiguous)
+        if len(ambiguous_rows):
+            names = df['name'].to_numpy()
+            descriptions = df['description'].to_numpy() if 'description' in df.columns else None
+            to_be_reranked = []
+            for row in ambiguous_rows:
+                position = positions[row]
+                keep = top_similarities[row] >= self.rerank_similarity_threshold
+                candidates = [
+                    self._candidate(self.family_keys[fam_idx], sim)
+                    for fam_idx, sim in zip(top_indices[row][keep], top_similarities[row][keep])
+                ]
+                skill_desc = descriptions[position] if descriptions is not None else ''
+                to_be_reranked.append((labels[row], names[position], skill_desc, candidates))
             
-            # Default: use best embedding match
-            best_idx = top_indices[0]
-            best_similarity = top_similarities[0]
-            
-            # If LLM re-ranking is enabled and we have multiple candidates above threshold
-            if self.use_llm_reranking and len(top_indices) > 1 and top_similarities[0] >= self.rerank_similarity_threshold and best_similarity < self.embedding_threshold:
-                # Get skill info
-                skill_name = df.loc[idx, 'name']
-                skill_desc = df.loc[idx, 'description'] if 'description' in df.columns else ''
-                
-                # Get top-K family candidates
-                candidates = []
-                for i, fam_idx in enumerate(top_indices):
-                    if top_similarities[i] >= self.rerank_similarity_threshold:
-                        family_key = self.family_keys[fam_idx]
-                        candidates.append({
-                            'key': family_key,
-                            'name': self.families[family_key].get('name', family_key),
-                            'description': self.families[family_key].get('description', ''),
-                            'domain': self.domains.get(self.families[family_key].get('domain', ''), {}).get('name', ''),
-                            'similarity': float(top_similarities[i])
-                        })
-                
-                # Re-rank with LLM if we have multiple candidates
-                if len(candidates) > 1:
-                    to_be_reranked.append((idx, skill_name, skill_desc, candidates))
-                else:
-                    # Fallback to best embedding match
-                    family_key = self.family_keys[best_idx]
-                    df.loc[idx, 'assigned_family'] = None
-                    df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                    df.loc[idx, 'family_assignment_method'] = 'Not assigned'
-                    df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                    self.assignment_stats['Not assigned'] += 1
-            
-            elif best_similarity >= self.embedding_threshold:
-                family_key = self.family_keys[best_idx]
-                df.loc[idx, 'assigned_family'] = family_key
-                df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                df.loc[idx, 'family_assignment_method'] = 'embedding'
-                df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                self.assignment_stats['embedding'] += 1
-            else:
-                family_key = self.family_keys[best_idx]
-                df.loc[idx, 'assigned_family'] = None
-                df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                df.loc[idx, 'family_assignment_method'] = 'Not assigned'
-                df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                self.assignment_stats['Not assigned'] += 1
-        
-        if to_be_reranked:
-            to_be_reranked_idx = [idx for idx, _, _, _ in to_be_reranked]
-            logger.info(f"Re-ranking {len(to_be_reranked)} skills with LLM...")
+            logger.info(f"Re-ranking {len(to_be_reranked)} of {len(positions)} skills with LLM...")
             rerank_results = self._rerank_with_llm_batch(to_be_reranked)
-            for idx in to_be_reranked_idx:
-                if idx in rerank_results:
-                    best_family, confidence = rerank_results[idx]
-                    if best_family and confidence >= self.rerank_similarity_threshold:
-                        df.loc[idx, 'assigned_family'] = best_family
-                        df.loc[idx, 'assigned_family_name'] = self.family_names[best_family]
-                        df.loc[idx, 'family_assignment_method'] = 'embedding+llm_rerank'
-                        df.loc[idx, 'family_assignment_confidence'] = confidence
-                        self.assignment_stats['embedding+llm_rerank'] += 1
-                    else:
-                        # Fallback to best embedding match
-                        position = df.index.get_loc(idx)
-                        skill_emb = self.skill_embeddings[position].reshape(1, -1)
-                        similarities = self.embedding_interface.similarity(skill_emb, self.family_embeddings)[0]
-                        best_idx = np.argmax(similarities)
-                        best_similarity = similarities[best_idx]
-                        
-                        family_key = self.family_keys[best_idx]
-                        df.loc[idx, 'assigned_family'] = None
-                        df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                        df.loc[idx, 'family_assignment_method'] = 'Not assigned'
-                        df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                        self.assignment_stats['Not assigned'] += 1
-                else:
-                    # Fallback to best embedding match
-                    position = df.index.get_loc(idx)
-                    skill_emb = self.skill_embeddings[position].reshape(1, -1)
-                    similarities = self.embedding_interface.similarity(skill_emb, self.family_embeddings)[0]
-                    best_idx = np.argmax(similarities)
-                    best_similarity = similarities[best_idx]
-                    
-                    family_key = self.family_keys[best_idx]
-                    df.loc[idx, 'assigned_family'] = None
-                    df.loc[idx, 'assigned_family_name'] = self.family_names[family_key]
-                    df.loc[idx, 'family_assignment_method'] = 'Not assigned'
-                    df.loc[idx, 'family_assignment_confidence'] = float(best_similarity)
-                    self.assignment_stats['Not assigned'] += 1
+            
+            accepted = {
+                idx: (best_family, confidence)
+                for idx, (best_family, confidence) in rerank_results.items()
+                if best_family and confidence >= self.rerank_similarity_threshold
+            }
+            if accepted:
+                self._set_assignments(
+                    df, accepted.keys(), [f for f, _ in accepted.values()],
+                    [self.family_names[f] for f, _ in accepted.values()],
+                    'embedding+llm_rerank', [c for _, c in accepted.values()]
+                )
+            reranked = len(accepted)
+            self.assignment_stats['embedding+llm_rerank'] += reranked
+        
+        self.assignment_stats['Not assigned'] += int(not_direct.sum()) - reranked
         return df
     
+    def _candidate(self, family_key: str, similarity: float) -> Dict:
+        """Candidate family entry for the re-rank prompt"""
+        family_info = self.families[family_key]
+        return {
+            'key': family_key,
+            'name': family_info.get('name', family_key),
+            'description': family_info.get('description', ''),
+            'domain': self.domains.get(family_info.get('domain', ''), {}).get('name', ''),
+            'similarity': float(similarity)
+        }
     
-    def _rerank_with_llm_batch(self, to_be_reranked: List[Tuple[Any, str, str, List[Dict]]]) -> List[Tuple[Optional[str], float]]:
-        """Batch re-rank skills with LLM"""
-        user_prompts = []
-        system_prompt = None
+    def _rerank_with_llm_batch(self, to_be_reranked: List[Tuple[Any, str, str, List[Dict]]]) -> Dict[Any, Tuple[Optional[str], float]]:
+        """
+        Batch re-rank skills with LLM
+        
+        Skills are split into batches of batch_size prompts and the batches are
+        dispatched concurrently. Responses that cannot be parsed are retried
+        together in one extra batch per round, up to max_retries rounds, so at
+        most ceil(n / batch_size) * (1 + max_retries) LLM batch calls are made.
+        
+        Returns:
+            Dictionary mapping skill index to (family_key, confidence)
+        """
         results = {}
-        for idx, skill_name, skill_desc, candidates in to_be_reranked:
-            system_prompt, user_prompt = self.get_prompt(skill_name, skill_desc, candidates)
-            user_prompts.append(user_prompt)
+        pending = list(to_be_reranked)
         
-        try:
-            responses = self.genai_interface._generate_batch(
-                user_prompts=user_prompts,
-                system_prompt=system_prompt
-            )
+        for attempt in range(1 + self.max_retries):
+            if not pending:
+                break
+            if attempt:
+                logger.info(f"Retrying {len(pending)} unparsed re-rank responses ({attempt}/{self.max_retries})")
             
-            for response, (idx, skill_name, skill_desc, candidates) in zip(responses, to_be_reranked):
-                loop = True
-                counter = 5
-                while loop:
-                    loop = False
+            batches = [pending[start:start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+            failed = []
+            with ThreadPoolExecutor(max_workers=max(1, self.max_concurrent_batches)) as executor:
+                futures = {executor.submit(self._rerank_batch, batch): batch for batch in batches}
+                for future in as_completed(futures):
                     try:
-                        response = self.genai_interface._parse_json_response(response)
-                        if response and isinstance(response, dict):
-                            choice = response['choice']
-                            confidence = response['confidence']
-                            
-                            selected = candidates[choice - 1]
-                            final_confidence = (confidence + selected['similarity']) / 2
-                            results[idx] = (selected['key'], final_confidence)
-                        else:
-                            logger.info(f"Response in LLM re-ranking is not a dictionary")
-                            logger.info(f"Response: {response}")
-                            if counter >= 0:
-                                counter -= 1
-                                loop = True
-                                for idx_f, skill_name, skill_desc, candidates in to_be_reranked:
-                                    if idx_f == idx:
-                                        system_prompt, user_prompt = self.get_prompt(skill_name, skill_desc, candidates)
-                                        user_prompts = [user_prompt]
-                                        responses = self.genai_interface._generate_batch(
-                                            user_prompts=user_prompts,
-                                            system_prompt=system_prompt
-                                        )
-                                        response = responses[0]
-                                logger.info(f"Trying {counter} more time ..")
+                        batch_results = future.result()
                     except Exception as e:
                         logger.error(f"LLM batch re-ranking failed: {e}")
-                        logger.info(f"Response: {response}")
-                        if counter >= 0:
-                            counter -= 1
-                            loop = True
-                            for idx_f, skill_name, skill_desc, candidates in to_be_reranked:
-                                if idx_f == idx:
-                                    system_prompt, user_prompt = self.get_prompt(skill_name, skill_desc, candidates)
-                                    user_prompts = [user_prompt]
-                                    responses = self.genai_interface._generate_batch(
-                                        user_prompts=user_prompts,
-                                        system_prompt=system_prompt
-                                    )
-                                    response = responses[0]
-                            logger.info(f"Trying {counter} more time ..")
-                        pass
-        except Exception as e:
-            logger.error(f"LLM batch re-ranking totally failed: {e}")
-            raise
+                        batch_results = {}
+                    results.update(batch_results)
+                    failed.extend(item for item in futures[future] if item[0] not in batch_results)
+            pending = failed
+        
+        if pending:
+            logger.warning(f"LLM re-ranking gave no usable answer for {len(pending)} skills")
+        
+        return results
+    
+    def _rerank_batch(self, batch: List[Tuple[Any, str, str, List[Dict]]]) -> Dict[Any, Tuple[str, float]]:
+        """Re-rank one batch of skills with a single LLM batch call"""
+        system_prompt = None
+        user_prompts = []
+        for idx, skill_name, skill_desc, candidates in batch:
+            system_prompt, user_prompt = self.get_prompt(skill_name, skill_desc, candidates)
+            user_prompts.append(user_prompt)
+        
+        responses = self.genai_interface._generate_batch(
+            user_prompts=user_prompts,
+            system_prompt=system_prompt
+        )
+        
+        results = {}
+        for response, (idx, skill_name, skill_desc, candidates) in zip(responses, batch):
+            try:
+                parsed = self.genai_interface._parse_json_response(response)
+                if not parsed or not isinstance(parsed, dict):
+                    raise ValueError(f"Response is not a dict: {type(parsed)}")
+                
+                choice = int(parsed['choice'])
+                if not 1 <= choice <= len(candidates):
+                    raise ValueError(f"Invalid choice: {choice}, expected 1-{len(candidates)}")
+                
+                selected = candidates[choice - 1]
+                # Blend LLM confidence with embedding similarity
+                final_confidence = (float(parsed['confidence']) + selected['similarity']) / 2
+                results[idx] = (selected['key'], final_confidence)
+            except Exception as e:
+                logger.debug(f"Could not parse re-rank response for '{skill_name}': {e}")
         
         return results
     
@@ -674,105 +680,67 @@ Respond with JSON only:"""
         return system_prompt, user_prompt
         
     
-    def _rerank_with_llm(self, skill_name: str, skill_desc: str, candidates: List[Dict]) -> Tuple[Optional[str], float]:
+    def _assign_with_keywords(self, df: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
         """
-        Use LLM to re-rank top-K embedding candidates and select the best match.
+        Assign skills using keyword matching
         
-        Args:
-            skill_name: Name of the skill
-            skill_desc: Description of the skill
-            candidates: List of candidate families with keys, names, descriptions, and similarities
-            
-        Returns:
-            Tuple of (best_family_key, confidence_score) or (None, 0.0) if re-ranking fails
+        Each distinct keyword is matched once across all skill texts; a family
+        scores one point per keyword found, plus two if any word of its name
+        appears. Ties go to the first family in definition order.
         """
-        if not self.genai_interface or not candidates:
-            return None, 0.0
-        
-        system_prompt, user_prompt = self.get_prompt(skill_name, skill_desc, candidates)
-        loop = True
-        counter = 5
-        while loop:
-            loop = False
-            try:
-                response = self.genai_interface.generate_json(
-                    prompt=user_prompt,
-                    system_prompt=system_prompt,
-                    max_tokens=1000,
-                    temperature=0.1
-                )
-                
-                if response and isinstance(response, dict):
-                    choice = response['choice']
-                    confidence = response['confidence']
-                    
-                    # if 1 <= choice <= len(candidates):
-                    selected = candidates[choice - 1]
-                    #     # Blend LLM confidence with embedding similarity
-                    final_confidence = (confidence + selected['similarity']) / 2
-                    return selected['key'], final_confidence
-                else:
-                    logger.info(f"Response in LLM re-ranking is not a dictionary")
-                    logger.info(f"Response: {response}")
-                    
-                    if counter >= 0:
-                        counter -= 1
-                        loop = True
-                    logger.info(f"Trying {counter} more time ..")
-                        
-            except Exception as e:
-                logger.error(f"LLM re-ranking failed for '{skill_name}': {e}")
-                logger.info(f"Response: {response}")
-                if counter >= 0:
-                    counter -= 1
-                    loop = True
-                logger.info(f"Trying {counter} more time ..")
-                pass
-        
-        return None, 0.0
-    
-    def _assign_with_keywords(self, df: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
-        """Assign skills using keyword matching"""
-        indices = df[mask].index.tolist()
+        subset = df[mask]
+        if len(subset) == 0 or not self.families:
+            return df
         
-        for idx in indices:
-            skill_text = str(df.loc[idx, 'name']).lower()
-            if 'description' in df.columns:
-                skill_text += ' ' + str(df.loc[idx, 'description']).lower()
-            
-            best_family = None
-            best_score = 0
-            
-            for family_key, family_info in self.families.items():
-                keywords = family_info.get('keywords', [])
-                score = sum(1 for kw in keywords if kw.lower() in skill_text)
-                
-                # Also check family name
-                family_name = family_info.get('name', '').lower()
-                if any(word in skill_text for word in family_name.split()):
-                    score += 2
-                
-                if score > best_score:
-                    best_score = score
-                    best_family = family_key
+        texts = subset['name'].map(str).str.lower()
+        if 'description' in df.columns:
+            texts = texts + ' ' + subset['description'].map(str).str.lower()
+        texts = texts.tolist()
+        
+        keyword_hits = {}
+        
+        def contains(keyword: str) -> np.ndarray:
+            if keyword not in keyword_hits:
+                keyword_hits[keyword] = np.fromiter((keyword in text for text in texts),
+                                                    dtype=bool, count=len(texts))
+            return keyword_hits[keyword]
+        
+        family_keys = list(self.families.keys())
+        scores = np.zeros((len(texts), len(family_keys)), dtype=np.int64)
+        for col, family_info in enumerate(self.families.values()):
+            for kw in family_info.get('keywords', []):
+                scores[:, col] += contains(kw.lower())
             
-            if best_family and best_score >= self.keyword_threshold:
-                df.loc[idx, 'assigned_family'] = best_family
-                df.loc[idx, 'assigned_family_name'] = self.family_names[best_family]
-                df.loc[idx, 'family_assignment_method'] = 'keyword'
-                df.loc[idx, 'family_assignment_confidence'] = min(0.9, 0.4 + best_score * 0.1)
-                self.assignment_stats['keyword'] += 1
-            else:
-                # Assign to most generic family in the category if we have category info
-                if 'category' in df.columns:
-                    category = str(df.loc[idx, 'category']).lower()
-                    default_family = self._get_default_family_for_category(category)
-                    if default_family:
-                        df.loc[idx, 'assigned_family'] = None
-                        df.loc[idx, 'assigned_family_name'] = None
-                        df.loc[idx, 'family_assignment_method'] = 'Not assigned'
-                        df.loc[idx, 'family_assignment_confidence'] = 0.0
-                        self.assignment_stats['Not assigned'] += 1
+            # Also check family name
+            name_words = family_info.get('name', '').lower().split()
+            if name_words:
+                name_match = np.logical_or.reduce([contains(word) for word in name_words])
+                scores[:, col] += 2 * name_match
+        
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(texts)), best]
+        matched = (best_scores > 0) & (best_scores >= self.keyword_threshold)
+        
+        labels = subset.index[matched]
+        matched_families = [family_keys[col] for col in best[matched]]
+        self._set_assignments(
+            df, labels, matched_families,
+            [self.family_names[k] for k in matched_families],
+            'keyword', np.minimum(0.9, 0.4 + best_scores[matched] * 0.1)
+        )
+        self.assignment_stats['keyword'] += int(matched.sum())
+        
+        # Skills with a known category are recorded as not assigned
+        if 'category' in df.columns:
+            categories = subset['category'].map(str).str.lower()
+            has_default = categories.map(self._get_default_family_for_category).notna().to_numpy()
+            unmatched = subset.index[~matched & has_default]
+            if len(unmatched):
+                df.loc[unmatched, 'assigned_family'] = None
+                df.loc[unmatched, 'assigned_family_name'] = None
+                df.loc[unmatched, 'family_assignment_method'] = 'Not assigned'
+                df.loc[unmatched, 'family_assignment_confidence'] = 0.0
+                self.assignment_stats['Not assigned'] += len(unmatched)
         
         return df
     
@@ -788,32 +756,26 @@ Respond with JSON only:"""
     
     def _assign_domains(self, df: pd.DataFrame) -> pd.DataFrame:
         """Assign domains based on family assignments"""
-        for idx in df.index:
-            family_key = df.loc[idx, 'assigned_family']
-            if family_key and family_key in self.families:
-                domain_key = self.families[family_key].get('domain')
-                df.loc[idx, 'assigned_domain'] = domain_key
-                df.loc[idx, 'assigned_domain_name'] = self.domain_names.get(domain_key, domain_key)
+        family_domains = {k: v.get('domain') for k, v in self.families.items()}
+        domains = df['assigned_family'].map(family_domains)
+        has_family = df['assigned_family'].isin(list(family_domains.keys())).to_numpy()
+        
+        if has_family.any():
+            labels = df.index[has_family]
+            df.loc[labels, 'assigned_domain'] = domains[has_family]
+            df.loc[labels, 'assigned_domain_name'] = domains[has_family].map(
+                lambda domain_key: self.domain_names.get(domain_key, domain_key)
+            )
         
         return df
     
     def _create_cluster_ids(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create cluster IDs from family assignments for compatibility"""
-        # Create a mapping from family to cluster ID
-        family_to_cluster = {}
-        cluster_id = 0
+        # Each family is one cluster, numbered in definition order
+        family_to_cluster = {family_key: cluster_id for cluster_id, family_key in enumerate(self.families.keys())}
         
-        for family_key in self.families.keys():
-            family_to_cluster[family_key] = cluster_id
-            cluster_id += 1
-        
-        # Assign cluster IDs
-        for idx in df.index:
-            family_key = df.loc[idx, 'assigned_family']
-            if family_key in family_to_cluster:
-                df.loc[idx, 'cluster_id'] = family_to_cluster[family_key]
-            else:
-                df.loc[idx, 'cluster_id'] = -1  # Unassigned
+        # Unassigned skills get -1
+        df['cluster_id'] = df['assigned_family'].map(family_to_cluster).fillna(-1).astype(int)
         
         return df
     
@@ -6,15 +6,19 @@ import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional, Tuple, Union
 import logging
+import hashlib
+import json
 from tqdm import tqdm
 import hdbscan
 import umap
+from sklearn.cluster import HDBSCAN as SparseHDBSCAN
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 from collections import Counter
 import pickle
 from pathlib import Path
 from src.clustering.clustering_algo import GridSearchSkillsClusterer
+from src.embeddings.knn_graph import build_distance_graph
 import warnings
 warnings.filterwarnings('ignore', category=UserWarning)
 
@@ -36,6 +40,15 @@ class MultiFactorClusterer:
         self.cache_dir = Path(config['paths']['cache_dir']) / "clustering"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Clustering path: 'grid_search' (k-means grid search), 'hdbscan' (exact),
+        # or 'knn_hdbscan' (HDBSCAN over a precomputed approximate kNN graph)
+        self.method = config['clustering'].get('method', 'grid_search')
+        self.knn_neighbors = config['clustering'].get('knn_neighbors', 30)
+        self.knn_backend = config['clustering'].get('knn_backend', 'auto')
+        self.knn_index_type = config['clustering'].get('knn_index_type', 'flat')
+        self.n_jobs = config['clustering'].get('n_jobs', -1)
+        self.use_result_cache = config['clustering'].get('cache_results', True)
+        
         # Multi-factor weights
         self.semantic_weight = config.get('semantic_weight', 0.6)
         self.level_weight = config.get('level_weight', 0.25)
@@ -109,48 +122,52 @@ class MultiFactorClusterer:
         Create level-based features with proximity encoding
         Skills with similar levels get similar representations
         """
-        n_skills = len(df)
-        level_features = np.zeros((n_skills, 7))  # 7 SFIA levels
-        
-        if 'level' in df.columns:
-            for idx, row in df.iterrows():
-                level = self._extract_level_value(row['level'])
-                # Use gaussian-like distribution around the level
-                for l in range(1, 8):
-                    distance = abs(l - level)
-                    if distance == 0:
-                        level_features[idx, l-1] = 1.0
-                    elif distance == 1:
-                        level_features[idx, l-1] = 0.5
-                    elif distance == 2:
-                        level_features[idx, l-1] = 0.25
-        else:
+        if 'level' not in df.columns:
             # No level info, use uniform
             raise Exception("'level' column is required for multi-factor matching but not found.")
         
+        levels = self._extract_level_values(df['level'])
+        
+        # Gaussian-like weights by distance to the level: 1.0, 0.5, 0.25, then 0
+        proximity_weights = np.array([1.0, 0.5, 0.25, 0.0])
+        distance = np.abs(np.arange(1, 8)[None, :] - levels[:, None])  # 7 SFIA levels
+        level_features = proximity_weights[np.minimum(distance, 3)]
+        
         return level_features
     
     def _create_context_features(self, df: pd.DataFrame) -> np.ndarray:
         """Create context-based features"""
         n_skills = len(df)
-        context_features = np.zeros((n_skills, 3))  # practical, theoretical, hybrid
-        
-        if 'context' in df.columns:
-            context_map = {'practical': 0, 'theoretical': 1, 'hybrid': 2}
-            for idx, row in df.iterrows():
-                context = self._extract_context_value(row['context'])
-                context_idx = context_map.get(context, 2)  # Default to hybrid
-                context_features[idx, context_idx] = 1.0
-                
-                # Add partial weights for hybrid
-                if context == 'hybrid':
-                    context_features[idx, 0] = 0.5  # Part practical
-                    context_features[idx, 1] = 0.5  # Part theoretical
-        else:
+        
+        if 'context' not in df.columns:
             # No context info, assume hybrid
+            context_features = np.zeros((n_skills, 3))  # practical, theoretical, hybrid
             context_features[:, 2] = 1.0
+            return context_features
+        
+        # One feature row per distinct context value, gathered by category code
+        context_rows = {
+            'practical': [1.0, 0.0, 0.0],
+            'theoretical': [0.0, 1.0, 0.0],
+            'hybrid': [0.5, 0.5, 1.0],  # Partial weights for hybrid
+        }
+        codes, uniques = pd.factorize(df['context'], use_na_sentinel=False)
+        table = np.array([
+            context_rows.get(self._extract_context_value(c), [0.0, 0.0, 1.0])  # Default to hybrid
+            for c in uniques
+        ]).reshape(len(uniques), 3)
         
-        return context_features
+        return table[codes]
+    
+    def _extract_level_values(self, levels: pd.Series) -> np.ndarray:
+        """Vectorized _extract_level_value over a column"""
+        if pd.api.types.is_numeric_dtype(levels) and not levels.isna().any():
+            return np.clip(levels.to_numpy(), 1, 7).astype(int)
+        
+        # Convert each distinct value once, then gather by category code
+        codes, uniques = pd.factorize(levels, use_na_sentinel=False)
+        values = np.array([self._extract_level_value(l) for l in uniques], dtype=int)
+        return values[codes]
     
     def _extract_level_value(self, level) -> int:
         """Extract numeric level value from various formats"""
@@ -203,23 +220,16 @@ class MultiFactorClusterer:
         # Prepare multi-factor features
         enhanced_features = embeddings_subset# self.prepare_multi_factor_features(df_subset, embeddings_subset)
         
+        # Reuse labels from a previous run with the same inputs and parameters
+        cache_key = self._cache_key(enhanced_features, self._clustering_params(),
+                                    texts=df['combined_text'].values.tolist()) if self.use_result_cache else None
+        cluster_labels = self._load_cached_array("labels", cache_key)
         
-        
-        # Reduce dimensionality if needed
-        # if self.use_umap and enhanced_features.shape[0] > 5000:
-        #     reduced_features = self._reduce_dimensions(enhanced_features)
-        # else:
-        #     reduced_features = enhanced_features
-        
-        # # Perform clustering
-        # cluster_labels = self._perform_hdbscan(reduced_features)
-        
-        grid_clusterer = GridSearchSkillsClusterer(memory_limit_gb=10,
-                                                      batch_size=256,
-                                                      embedding_models=["Auto"],
-                                                      embedders={"Auto": enhanced_features},
-                                                      clustering_algorithms=['kmeans'])
-        cluster_labels = grid_clusterer.grid_search_clustering(skills=df['combined_text'].values.tolist(), embeddings_available=True)
+        if cluster_labels is not None:
+            logger.info(f"Loaded cached cluster labels ({cache_key[:12]})")
+        else:
+            cluster_labels = self._compute_cluster_labels(df, enhanced_features)
+            self._save_cached_array("labels", cache_key, cluster_labels)
         
         # Add cluster information
         df_subset['cluster_id'] = cluster_labels
@@ -236,6 +246,104 @@ class MultiFactorClusterer:
         
         return df_subset
     
+    def _compute_cluster_labels(self, df: pd.DataFrame, features: np.ndarray) -> np.ndarray:
+        """Run the configured clustering path on the feature matrix"""
+        if self.method == 'grid_search':
+            grid_clusterer = GridSearchSkillsClusterer(memory_limit_gb=10,
+                                                          batch_size=256,
+                                                          embedding_models=["Auto"],
+                                                          embedders={"Auto": features},
+                                                          clustering_algorithms=['kmeans'])
+            return grid_clusterer.grid_search_clustering(skills=df['combined_text'].values.tolist(), embeddings_available=True)
+        
+        # Reduce dimensionality if needed
+        if self.use_umap and features.shape[0] > 5000:
+            reduced_features = self._reduce_dimensions_cached(features)
+        else:
+            reduced_features = features
+        
+        if self.method == 'knn_hdbscan':
+            return self._perform_knn_hdbscan(reduced_features)
+        if self.method == 'hdbscan':
+            return self._perform_hdbscan(reduced_features)
+        raise ValueError(f"Unknown clustering method: {self.method}")
+    
+    # ========== RESULT CACHE ==========
+    
+    def _reduction_params(self) -> Dict:
+        """Parameters that determine the reduced features"""
+        return {
+            'pca_components': 100,
+            'umap_n_components': self.config['clustering']['umap_n_components'],
+            'umap_n_neighbors': self.config['clustering']['umap_n_neighbors'],
+            'umap_min_dist': self.config['clustering']['umap_min_dist'],
+        }
+    
+    def _clustering_params(self) -> Dict:
+        """Parameters that determine the cluster labels"""
+        params = {'method': self.method}
+        if self.method != 'grid_search':
+            params.update({
+                'use_umap': self.use_umap,
+                'reduction': self._reduction_params() if self.use_umap else None,
+                'min_cluster_size': self.min_cluster_size,
+                'min_samples': self.min_samples,
+                'cluster_selection_epsilon': self.config['clustering']['cluster_selection_epsilon'],
+                'alpha': self.config['clustering']['alpha'],
+            })
+        if self.method == 'knn_hdbscan':
+            params.update({
+                'knn_neighbors': self.knn_neighbors,
+                'knn_index_type': self.knn_index_type,
+            })
+        return params
+    
+    def _cache_key(self, features: np.ndarray, params: Dict, texts: Optional[List[str]] = None) -> str:
+        """Key from the feature matrix content (embedding-store version), inputs and parameters"""
+        digest = hashlib.sha1()
+        features = np.ascontiguousarray(features)
+        digest.update(f"{features.shape}_{features.dtype}".encode())
+        digest.update(features.data)
+        if texts is not None:
+            digest.update("\x1f".join(map(str, texts)).encode('utf-8'))
+        digest.update(json.dumps(params, sort_keys=True).encode())
+        return digest.hexdigest()
+    
+    def _load_cached_array(self, kind: str, cache_key: Optional[str]) -> Optional[np.ndarray]:
+        """Load a cached array, or None if missing or caching is disabled"""
+        if cache_key is None:
+            return None
+        cache_path = self.cache_dir / f"{kind}_{cache_key}.npy"
+        if not cache_path.exists():
+            return None
+        try:
+            return np.load(cache_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read clustering cache {cache_path}: {e}")
+            return None
+    
+    def _save_cached_array(self, kind: str, cache_key: Optional[str], array: np.ndarray):
+        """Persist an array under its cache key"""
+        if cache_key is None:
+            return
+        cache_path = self.cache_dir / f"{kind}_{cache_key}.npy"
+        tmp_path = cache_path.with_suffix(".tmp.npy")
+        np.save(tmp_path, np.asarray(array))
+        tmp_path.replace(cache_path)
+    
+    def _reduce_dimensions_cached(self, features: np.ndarray) -> np.ndarray:
+        """Reduce dimensions, reusing a persisted reduction of the same features"""
+        cache_key = self._cache_key(features, self._reduction_params()) if self.use_result_cache else None
+        reduced_features = self._load_cached_array("reduction", cache_key)
+        if reduced_features is not None:
+            logger.info(f"Loaded cached dimension reduction {reduced_features.shape}")
+            self.reduced_embeddings = reduced_features
+            return reduced_features
+        
+        reduced_features = self._reduce_dimensions(features)
+        self._save_cached_array("reduction", cache_key, reduced_features)
+        return reduced_features
+    
     def _reduce_dimensions(self, features: np.ndarray) -> np.ndarray:
         """
         Reduce dimensions using UMAP with appropriate metric
@@ -254,8 +362,8 @@ class MultiFactorClusterer:
             n_neighbors=self.config['clustering']['umap_n_neighbors'],
             min_dist=self.config['clustering']['umap_min_dist'],
             metric='euclidean',  # Use euclidean for mixed features
-            random_state=42,
-            n_jobs=1,
+            random_state=self.config['clustering'].get('umap_random_state', 42),  # None allows parallel UMAP
+            n_jobs=self.n_jobs,
             verbose=False
         )
         
@@ -284,7 +392,7 @@ class MultiFactorClusterer:
             alpha=self.config['clustering']['alpha'],
             cluster_selection_method='eom',
             prediction_data=True,
-            core_dist_n_jobs=1
+            core_dist_n_jobs=self.n_jobs
         )
         
         cluster_labels = self.clusterer.fit_predict(features)
@@ -298,6 +406,50 @@ class MultiFactorClusterer:
         
         return cluster_labels
     
+    def _perform_knn_hdbscan(self, features: np.ndarray) -> np.ndarray:
+        """
+        HDBSCAN over a precomputed sparse kNN distance graph
+        
+        Core distances and the minimum spanning tree are computed from the
+        kNN edges only, so cost grows with n * knn_neighbors instead of n^2.
+        """
+        logger.info("Performing kNN-graph HDBSCAN clustering")
+        
+        n_samples = len(features)
+        min_cluster_size = max(self.min_cluster_size, int(n_samples * 0.001))
+        min_samples = min(self.min_samples, min_cluster_size // 2)
+        
+        # Each row needs at least min_samples stored neighbours for its core distance
+        k = max(self.knn_neighbors, min_samples + 1)
+        logger.info(f"kNN HDBSCAN parameters: k={k}, min_cluster_size={min_cluster_size}, min_samples={min_samples}")
+        
+        distance_graph = build_distance_graph(
+            features,
+            k=k,
+            metric='euclidean',
+            backend=self.knn_backend,
+            index_type=self.knn_index_type,
+        )
+        
+        self.clusterer = SparseHDBSCAN(
+            min_cluster_size=min_cluster_size,
+            min_samples=max(min_samples, 1),
+            metric='precomputed',
+            cluster_selection_epsilon=self.config['clustering']['cluster_selection_epsilon'],
+            alpha=self.config['clustering']['alpha'],
+            cluster_selection_method='eom',
+        )
+        cluster_labels = self.clusterer.fit_predict(distance_graph)
+        
+        # Log clustering results
+        n_clusters = len(set(cluster_labels)) - (1 if -1 in cluster_labels else 0)
+        n_noise = int(np.sum(cluster_labels == -1))
+        
+        logger.info(f"Found {n_clusters} clusters")
+        logger.info(f"Noise points: {n_noise} ({100*n_noise/n_samples:.1f}%)")
+        
+        return cluster_labels
+    
     def _generate_enhanced_cluster_stats(self, 
                                         df: pd.DataFrame, 
                                         embeddings: np.ndarray) -> Dict:
@@ -487,13 +639,12 @@ class MultiFactorClusterer:
                 continue
             
             # Group by level ranges
-            cluster_df['level_group'] = cluster_df['level'].apply(
-                lambda x: (self._extract_level_value(x) - 1) // 2  # Group every 2 levels
-            )
+            cluster_df['level_group'] = (self._extract_level_values(cluster_df['level']) - 1) // 2  # Group every 2 levels
+            dominant_group = cluster_df['level_group'].mode()[0]
             
             # Assign new cluster IDs to each group
             for level_group in cluster_df['level_group'].unique():
-                if level_group == cluster_df['level_group'].mode()[0]:
+                if level_group == dominant_group:
                     continue  # Keep the most common group with original ID
                 
                 group_mask = cluster_df['level_group'] == level_group
@@ -554,51 +705,63 @@ class MultiFactorClusterer:
                                    n_representatives: int = 5) -> Dict:
         """
         Get representative skills for each cluster considering multiple factors
+        
+        Scores for all clusters are computed at once from centroid distances
+        (centrality), level match to the cluster level and confidence.
         """
         representatives = {}
         
-        for cluster_id in sorted(df['cluster_id'].unique()):
-            if cluster_id == -1:
-                continue
-            
-            cluster_mask = df['cluster_id'] == cluster_id
-            cluster_df = df[cluster_mask].copy()
-            cluster_embeddings = embeddings[cluster_mask]
-            
-            # Find skills that best represent the cluster
-            # Consider: centrality, level representation, context coverage
-            
-            # Calculate scores for each skill
-            scores = []
-            cluster_center = np.mean(cluster_embeddings, axis=0)
-            
-            for idx, (_, row) in enumerate(cluster_df.iterrows()):
-                # Distance to center (lower is better)
-                distance = np.linalg.norm(cluster_embeddings[idx] - cluster_center)
-                centrality_score = 1.0 / (1 + distance)
-                
-                # Level representativeness
-                if 'cluster_level' in row:
-                    level = self._extract_level_value(row['level'])
-                    cluster_level = row['cluster_level']
-                    level_score = 1.0 / (1 + abs(level - cluster_level))
-                else:
-                    level_score = 1.0
-                
-                # Confidence score
-                confidence_score = row.get('confidence', 0.5)
-                
-                # Combined score
-                total_score = centrality_score * 0.5 + level_score * 0.3 + confidence_score * 0.2
-                scores.append(total_score)
-            
-            # Get top representatives
-            cluster_df['representative_score'] = scores
-            representatives_df = cluster_df.nlargest(n_representatives, 'representative_score')
-            
-            representatives[cluster_id] = representatives_df[
-                ['name', 'description', 'level', 'context', 'keywords', 'representative_score']
-            ].to_dict('records')
+        cluster_ids = df['cluster_id'].to_numpy()
+        members = np.flatnonzero(cluster_ids != -1)
+        if len(members) == 0:
+            return representatives
+        
+        # Group codes follow sorted cluster id order
+        clusters, codes = np.unique(cluster_ids[members], return_inverse=True)
+        member_embeddings = np.asarray(embeddings)[members]
+        
+        # Cluster centers via grouped sums
+        counts = np.bincount(codes, minlength=len(clusters))
+        centers = np.zeros((len(clusters), member_embeddings.shape[1]))
+        np.add.at(centers, codes, member_embeddings)
+        centers /= counts[:, None]
+        
+        # Distance to center (lower is better)
+        distance = np.linalg.norm(member_embeddings - centers[codes], axis=1)
+        centrality_score = 1.0 / (1 + distance)
+        
+        # Level representativeness
+        if 'cluster_level' in df.columns:
+            levels = self._extract_level_values(df['level'].iloc[members])
+            cluster_levels = df['cluster_level'].to_numpy()[members]
+            level_score = 1.0 / (1 + np.abs(levels - cluster_levels))
+        else:
+            level_score = np.ones(len(members))
+        
+        # Confidence score
+        if 'confidence' in df.columns:
+            confidence_score = df['confidence'].to_numpy()[members]
+        else:
+            confidence_score = np.full(len(members), 0.5)
+        
+        # Combined score
+        scores = centrality_score * 0.5 + level_score * 0.3 + confidence_score * 0.2
+        
+        # Top representatives per cluster: order by cluster, then score descending,
+        # then original row order (matching nlargest's tie-breaking)
+        order = np.lexsort((np.arange(len(members)), -scores, codes))
+        group_starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        rank = np.arange(len(order)) - group_starts[codes[order]]
+        selected = order[rank < n_representatives]
+        
+        representatives_df = df.iloc[members[selected]][['name', 'description', 'level', 'context', 'keywords']].copy()
+        representatives_df['representative_score'] = scores[selected]
+        records = representatives_df.to_dict('records')
+        
+        # Selected rows are grouped by cluster, so each cluster is a contiguous slice
+        bounds = np.searchsorted(codes[selected], np.arange(len(clusters) + 1))
+        for group, cluster_id in enumerate(clusters):
+            representatives[cluster_id] = records[bounds[group]:bounds[group + 1]]
         
         return representatives
     
@@ -8,8 +8,14 @@ Builds lookup maps:
   - unit_code → {unit_title, qualification_codes}
   - qualification_code → {title, unit_codes, anzsco_codes}
   - anzsco_code → {title, qualification_codes}
+
+Parsed concordances can be cached as pickles keyed by a hash of the source
+file, so unchanged files skip the Excel/CSV parse on later runs.
 """
+import hashlib
 import logging
+import os
+import pickle
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
@@ -56,13 +62,20 @@ class ConcordanceData:
         return len(self.occupation_titles)
 
 
-def load_concordance(file_path: str) -> ConcordanceData:
+CACHE_VERSION = 1
+
+
+def load_concordance(file_path: str, cache_dir: Optional[str] = None) -> ConcordanceData:
     """
     Load concordance from Excel/CSV.
 
     Expected columns (flexible naming):
         code | code_name | qualification_code | qualification_title | anzsco_code | anzsco_title
 
+    Args:
+        file_path: Concordance Excel/CSV file
+        cache_dir: Directory for parsed concordance pickles; no caching if None
+
     Returns:
         ConcordanceData with all lookup maps populated.
     """
@@ -70,6 +83,15 @@ def load_concordance(file_path: str) -> ConcordanceData:
     if not path.exists():
         raise FileNotFoundError(f"Concordance file not found: {file_path}")
 
+    cache_path = None
+    if cache_dir:
+        cache_path = Path(cache_dir) / "concordance" / f"{path.stem}_{_file_hash(path)}.pkl"
+        data = _load_cached(cache_path)
+        if data is not None:
+            logger.info(f"Loaded concordance from cache: {cache_path}")
+            _log_counts(data)
+            return data
+
     logger.info(f"Loading concordance from: {file_path}")
 
     if path.suffix == ".csv":
@@ -88,57 +110,92 @@ def load_concordance(file_path: str) -> ConcordanceData:
 
     df = df.rename(columns=col_map)
 
-    # Clean
+    # Clean; missing columns behave like empty values
     for col in ["code", "code_name", "qualification_code", "qualification_title",
                  "anzsco_code", "anzsco_title"]:
         if col in df.columns:
             df[col] = df[col].fillna("").astype(str).str.strip()
+        else:
+            df[col] = ""
 
     # Drop rows with no unit code
     df = df[df["code"] != ""]
 
     data = ConcordanceData()
 
-    for _, row in df.iterrows():
-        unit_code = row.get("code", "")
-        unit_title = row.get("code_name", "")
-        qual_code = row.get("qualification_code", "")
-        qual_title = row.get("qualification_title", "")
-        anzsco_code = row.get("anzsco_code", "")
-        anzsco_title = row.get("anzsco_title", "")
-
-        # Unit → title
-        if unit_code and unit_title:
-            data.unit_titles[unit_code] = unit_title
-
-        # Unit ↔ Qualification
-        if unit_code and qual_code:
-            if qual_code not in data.unit_to_quals[unit_code]:
-                data.unit_to_quals[unit_code].append(qual_code)
-            if unit_code not in data.qual_to_units[qual_code]:
-                data.qual_to_units[qual_code].append(unit_code)
-
-        # Qualification → title
-        if qual_code and qual_title:
-            data.qual_titles[qual_code] = qual_title
-
-        # Qualification ↔ Occupation
-        if qual_code and anzsco_code:
-            if anzsco_code not in data.qual_to_occupations[qual_code]:
-                data.qual_to_occupations[qual_code].append(anzsco_code)
-            if qual_code not in data.occupation_to_quals[anzsco_code]:
-                data.occupation_to_quals[anzsco_code].append(qual_code)
-
-        # Occupation → title
-        if anzsco_code and anzsco_title:
-            data.occupation_titles[anzsco_code] = anzsco_title
+    # Titles: the last non-empty title for a code wins
+    data.unit_titles = _title_map(df, "code", "code_name")
+    data.qual_titles = _title_map(df, "qualification_code", "qualification_title")
+    data.occupation_titles = _title_map(df, "anzsco_code", "anzsco_title")
 
+    # Links: unique codes per key, in order of first appearance
+    data.unit_to_quals = _link_map(df, "code", "qualification_code")
+    data.qual_to_units = _link_map(df, "qualification_code", "code")
+    data.qual_to_occupations = _link_map(df, "qualification_code", "anzsco_code")
+    data.occupation_to_quals = _link_map(df, "anzsco_code", "qualification_code")
+
+    _log_counts(data)
+
+    if cache_path is not None:
+        _save_cached(cache_path, data)
+
+    return data
+
+
+def _title_map(df: pd.DataFrame, code_col: str, title_col: str) -> Dict[str, str]:
+    """code → title for rows where both are set"""
+    rows = df[(df[code_col] != "") & (df[title_col] != "")]
+    return dict(zip(rows[code_col], rows[title_col]))
+
+
+def _link_map(df: pd.DataFrame, key_col: str, value_col: str) -> Dict[str, List[str]]:
+    """key → unique values for rows where both are set"""
+    pairs = df.loc[(df[key_col] != "") & (df[value_col] != ""), [key_col, value_col]]
+    pairs = pairs.drop_duplicates()
+    grouped = pairs.groupby(key_col, sort=False)[value_col].agg(list)
+    return defaultdict(list, grouped.to_dict())
+
+
+def _log_counts(data: ConcordanceData):
     logger.info(f"Concordance loaded:")
     logger.info(f"  Units with titles: {data.unit_count}")
     logger.info(f"  Qualifications: {data.qualification_count}")
     logger.info(f"  Occupations (ANZSCO): {data.occupation_count}")
 
-    return data
+
+def _file_hash(path: Path) -> str:
+    """SHA-1 of the file contents"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _load_cached(cache_path: Path) -> Optional[ConcordanceData]:
+    if not cache_path.exists():
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            version, data = pickle.load(f)
+        if version == CACHE_VERSION and isinstance(data, ConcordanceData):
+            return data
+        logger.info(f"Ignoring concordance cache {cache_path} with version {version}")
+    except Exception as e:
+        logger.warning(f"Could not read concordance cache {cache_path}: {e}")
+    return None
+
+
+def _save_cached(cache_path: Path, data: ConcordanceData):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".pkl.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((CACHE_VERSION, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"Cached parsed concordance to {cache_path}")
+    except OSError as e:
+        logger.warning(f"Could not cache concordance: {e}")
 
 
 def _detect_columns(df: pd.DataFrame) -> Dict[str, str]:
@@ -8,9 +8,6 @@ from typing import List, Dict, Optional, Tuple, Union
 from pathlib import Path
 import logging
 import pickle
-import torch
-from sentence_transformers import SentenceTransformer
-import faiss
 from tqdm import tqdm
 import hashlib
 from concurrent.futures import ThreadPoolExecutor
@@ -130,6 +127,7 @@ class OptimizedEmbeddingManager:
             all_embeddings.append(batch_embeddings)
             
             if i % (self.batch_size * 10) == 0 and self.device == 'cuda':
+                import torch
                 torch.cuda.empty_cache()
         
         embeddings = np.vstack(all_embeddings).astype(np.float32)
@@ -311,6 +309,8 @@ class OptimizedEmbeddingManager:
     
     def _build_faiss_index(self, embeddings: np.ndarray, index_type: str = "IVF1024,Flat"):
         """Build FAISS index"""
+        import faiss
+
         logger.info(f"Building FAISS index for {len(embeddings)} embeddings")
         
         n_samples = len(embeddings)
@@ -0,0 +1,280 @@
+"""
+Sparse top-k similarity graph over skill embeddings
+
+Neighbours are found with FAISS (Flat or IVF) when it is installed, otherwise
+with blocked matrix products and argpartition, so memory stays O(block * n)
+during the search and O(n * k) for the result instead of a dense n x n matrix.
+The graph is a scipy CSR matrix of cosine similarities that can be shared by
+facet assignment, the visualisations and ability grouping; build_distance_graph
+gives the symmetric, connected distance form used for sparse HDBSCAN.
+"""
+import logging
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalise embeddings as contiguous float32 for inner-product search"""
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if embeddings.ndim == 1:
+        embeddings = embeddings.reshape(1, -1)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10
+    return embeddings / norms
+
+
+def _topk_blocked(data: np.ndarray, k: int, block_size: int,
+                  metric: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact top-k by blocks of rows; self matches are excluded"""
+    n = data.shape[0]
+    values = np.empty((n, k), dtype=np.float32)
+    indices = np.empty((n, k), dtype=np.int64)
+    squared_norms = np.einsum('ij,ij->i', data, data) if metric == "euclidean" else None
+
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        # Scores are "higher is closer": similarity, or negated squared distance
+        block = data[start:end] @ data.T
+        if metric == "euclidean":
+            block *= 2
+            block -= squared_norms[start:end, None]
+            block -= squared_norms[None, :]
+        block[np.arange(end - start), np.arange(start, end)] = -np.inf
+
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+
+        indices[start:end] = np.take_along_axis(top, order, axis=1)
+        values[start:end] = np.take_along_axis(top_scores, order, axis=1)
+
+    if metric == "euclidean":
+        values = np.sqrt(np.maximum(-values, 0))
+    return values, indices
+
+
+def _topk_faiss(data: np.ndarray, k: int, index_type: str, nlist: int,
+                nprobe: int, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k with a FAISS index; self matches are excluded"""
+    n, dim = data.shape
+    if metric == "euclidean":
+        flat_index, faiss_metric = faiss.IndexFlatL2, faiss.METRIC_L2
+    else:
+        flat_index, faiss_metric = faiss.IndexFlatIP, faiss.METRIC_INNER_PRODUCT
+
+    if index_type == "ivf" and n >= nlist * 39:
+        quantizer = flat_index(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss_metric)
+        index.train(data)
+        index.nprobe = min(nprobe, nlist)
+    else:
+        index = flat_index(dim)
+    index.add(data)
+
+    values, ids = index.search(data, k + 1)
+
+    # Drop each row's self match, or its last column if self was not returned
+    drop = ids == np.arange(n)[:, None]
+    no_self = ~drop.any(axis=1)
+    drop[no_self, -1] = True
+    keep = ~drop
+
+    values = values[keep].reshape(n, k)
+    if metric == "euclidean":
+        values = np.sqrt(np.maximum(values, 0))  # FAISS L2 returns squared distances
+    return values, ids[keep].reshape(n, k).astype(np.int64)
+
+
+def topk_neighbors(embeddings: np.ndarray,
+                   k: int = 20,
+                   block_size: int = 1024,
+                   backend: str = "auto",
+                   index_type: str = "flat",
+                   nlist: int = 1024,
+                   nprobe: int = 64,
+                   metric: str = "cosine") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k nearest other rows for every embedding
+
+    Args:
+        embeddings: (n, dim) embedding matrix
+        k: Neighbours per row (capped at n - 1)
+        block_size: Rows per block for the numpy backend
+        backend: 'auto' (FAISS if installed), 'faiss' or 'numpy'
+        index_type: FAISS index, 'flat' (exact) or 'ivf' (approximate)
+        nlist: IVF cell count
+        nprobe: IVF cells searched per query
+        metric: 'cosine' or 'euclidean'
+
+    Returns:
+        (values, indices), both (n, k), nearest first: cosine similarities
+        for 'cosine', distances for 'euclidean'. IVF search may pad missing
+        neighbours with index -1
+    """
+    if metric == "cosine":
+        data = normalize_embeddings(embeddings)
+    elif metric == "euclidean":
+        data = np.ascontiguousarray(embeddings, dtype=np.float32)
+    else:
+        raise ValueError(f"Unsupported kNN metric: {metric}")
+
+    n = data.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.float32), np.empty((n, 0), dtype=np.int64)
+
+    use_faiss = backend == "faiss" or (backend == "auto" and FAISS_AVAILABLE)
+    if use_faiss and not FAISS_AVAILABLE:
+        logger.warning("FAISS not installed, using blocked numpy search")
+        use_faiss = False
+
+    if use_faiss:
+        return _topk_faiss(data, k, index_type, nlist, nprobe, metric)
+    return _topk_blocked(data, k, block_size, metric)
+
+
+def build_knn_graph(embeddings: np.ndarray,
+                    k: int = 20,
+                    threshold: Optional[float] = None,
+                    **search_kwargs) -> sparse.csr_matrix:
+    """
+    Build a sparse directed kNN similarity graph
+
+    Row i holds the cosine similarities of skill i's top-k neighbours (stored
+    in descending order), dropping neighbours below threshold.
+
+    Args:
+        embeddings: (n, dim) embedding matrix
+        k: Neighbours per row
+        threshold: Minimum similarity to keep an edge
+        **search_kwargs: Passed to topk_neighbors
+
+    Returns:
+        (n, n) CSR matrix of similarities
+    """
+    n = len(embeddings)
+    similarities, indices = topk_neighbors(embeddings, k=k, **search_kwargs)
+
+    keep = indices >= 0
+    if threshold is not None:
+        keep &= similarities >= threshold
+
+    counts = keep.sum(axis=1)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    graph = sparse.csr_matrix(
+        (similarities[keep], indices[keep], indptr),
+        shape=(n, n)
+    )
+    logger.info(f"Built kNN graph: {n} nodes, {graph.nnz} edges (k={k}, threshold={threshold})")
+    return graph
+
+
+def build_distance_graph(features: np.ndarray,
+                         k: int = 30,
+                         metric: str = "euclidean",
+                         **search_kwargs) -> sparse.csr_matrix:
+    """
+    Build a symmetric, connected sparse kNN distance graph
+
+    Suitable as a precomputed sparse input for HDBSCAN: core distances come
+    from each row's stored neighbours. Disconnected components are each
+    linked to their nearest point in the largest component.
+
+    Args:
+        features: (n, dim) feature matrix
+        k: Neighbours per row before symmetrisation
+        metric: 'euclidean', or 'cosine' (distance = 1 - similarity)
+        **search_kwargs: Passed to topk_neighbors
+
+    Returns:
+        (n, n) CSR matrix of distances
+    """
+    n = len(features)
+    values, indices = topk_neighbors(features, k=k, metric=metric, **search_kwargs)
+    distances = 1.0 - values if metric == "cosine" else values
+
+    # Sparse storage drops zeros, so keep duplicate points as tiny distances
+    distances = np.maximum(distances, 1e-8)
+
+    keep = indices >= 0
+    rows = np.repeat(np.arange(n), keep.sum(axis=1))
+    graph = sparse.csr_matrix((distances[keep], (rows, indices[keep])), shape=(n, n))
+    graph = graph.maximum(graph.T).tocsr()
+
+    n_components, labels = csgraph.connected_components(graph, directed=False)
+    if n_components > 1:
+        graph = _link_components(features, graph, labels, metric)
+
+    logger.info(f"Built kNN distance graph: {n} nodes, {graph.nnz} edges "
+                f"(k={k}, {n_components} component(s) before linking)")
+    return graph
+
+
+def _link_components(features: np.ndarray, graph: sparse.csr_matrix,
+                     labels: np.ndarray, metric: str, block_size: int = 256) -> sparse.csr_matrix:
+    """Connect every component to its nearest point in the largest component"""
+    if metric == "cosine":
+        data = normalize_embeddings(features)
+    else:
+        data = np.ascontiguousarray(features, dtype=np.float32)
+
+    main = np.bincount(labels).argmax()
+    main_points = np.flatnonzero(labels == main)
+    # One representative (first member) per other component
+    _, first_members = np.unique(labels, return_index=True)
+    reps = first_members[labels[first_members] != main]
+
+    main_data = data[main_points]
+    main_sq = np.einsum('ij,ij->i', main_data, main_data)
+    targets = np.empty(len(reps), dtype=np.int64)
+    link_distances = np.empty(len(reps), dtype=np.float64)
+    for start in range(0, len(reps), block_size):
+        block = data[reps[start:start + block_size]]
+        if metric == "cosine":
+            dist = 1.0 - block @ main_data.T
+        else:
+            sq = np.einsum('ij,ij->i', block, block)
+            dist = np.sqrt(np.maximum(sq[:, None] + main_sq[None, :] - 2 * block @ main_data.T, 0))
+        nearest = dist.argmin(axis=1)
+        targets[start:start + block_size] = main_points[nearest]
+        link_distances[start:start + block_size] = np.maximum(dist[np.arange(len(block)), nearest], 1e-8)
+
+    links = sparse.csr_matrix(
+        (np.concatenate([link_distances, link_distances]),
+         (np.concatenate([reps, targets]), np.concatenate([targets, reps]))),
+        shape=graph.shape
+    )
+    logger.info(f"Linked {len(reps)} disconnected kNN components to the main component")
+    return graph.maximum(links).tocsr()
+
+
+def row_neighbors(graph: sparse.csr_matrix, row: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Neighbour indices and similarities of one row, most similar first"""
+    start, end = graph.indptr[row], graph.indptr[row + 1]
+    cols = graph.indices[start:end]
+    sims = graph.data[start:end]
+    order = np.argsort(-sims, kind='stable')
+    return cols[order], sims[order]
+
+
+def save_knn_graph(graph: sparse.csr_matrix, path: Union[str, Path]):
+    """Save a kNN graph as a compressed .npz file"""
+    sparse.save_npz(str(path), graph)
+
+
+def load_knn_graph(path: Union[str, Path]) -> sparse.csr_matrix:
+    """Load a kNN graph saved with save_knn_graph"""
+    return sparse.load_npz(str(path)).tocsr()
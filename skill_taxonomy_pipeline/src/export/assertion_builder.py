@@ -5,21 +5,23 @@ Takes deduplicated skill registry + original rows + concordance data
 and produces the full schema:
 
   - skills:          Deduplicated Skill objects (with denormalised qual/occ codes)
-  - assertions:      SkillAssertion objects (one per original row)
+  - assertions:      AssertionTable of SkillAssertions (one per original row)
   - units:           UnitOfCompetency objects (enriched from concordance)
   - qualifications:  Qualification objects (with precomputed skill_ids)
   - occupations:     Occupation objects (with precomputed skill_ids)
 
 Precomputes all traversals at build time so the search engine
-doesn't need to do graph traversal client-side.
+doesn't need to do graph traversal client-side. Assertions are built
+column-wise into an AssertionTable and the unit → qualification →
+occupation traversals are done as merges over (code, code) pair tables.
 """
 import logging
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
-from collections import defaultdict
 
 from src.models.schema import (
-    Skill, SkillAssertion, UnitOfCompetency, Qualification, Occupation,
+    Skill, SkillAssertion, AssertionTable, UnitOfCompetency, Qualification, Occupation,
 )
 from src.data_processing.concordance import ConcordanceData
 
@@ -39,51 +41,58 @@ class AssertionBuilder:
         df: pd.DataFrame,
         skill_registry: Dict,
         concordance: Optional[ConcordanceData] = None,
-    ) -> Tuple[List[Skill], List[SkillAssertion], List[UnitOfCompetency],
+    ) -> Tuple[List[Skill], AssertionTable, List[UnitOfCompetency],
                List[Qualification], List[Occupation]]:
         """
         Returns:
-            (skills, assertions, units, qualifications, occupations)
+            (skills, assertions, units, qualifications, occupations);
+            assertions is an AssertionTable (a lazy sequence of SkillAssertion)
         """
         logger.info("Building schema (5 objects)...")
         has_concordance = concordance is not None
 
+        # Skill ids are carried through the traversals as integer ranks
+        # (rank order == sort order) and only turned back into ids when grouped
+        skill_ranks, skill_labels = pd.factorize(df["skill_id"], sort=True)
+        skill_labels = np.asarray(skill_labels, dtype=object)
+
+        # (unit_code, skill rank) pairs, sorted so grouped lists come out sorted
+        unit_skills = (pd.DataFrame({"unit_code": df["code"].to_numpy(), "skill_id": skill_ranks})
+                       .drop_duplicates()
+                       .sort_values(["unit_code", "skill_id"], kind="stable"))
+
         # ── 1. Assertions (one per original row) ─────────────────
-        assertions = []
-        for idx, row in df.iterrows():
-            uc = row["code"]
-            # Resolve qual/occ codes for this assertion's unit
-            a_qual_codes = []
-            a_occ_codes = []
-            if has_concordance:
-                a_qual_codes = concordance.unit_to_quals.get(uc, [])
-                for qc in a_qual_codes:
-                    a_occ_codes.extend(concordance.qual_to_occupations.get(qc, []))
-                a_occ_codes = sorted(set(a_occ_codes))
-
-            assertions.append(SkillAssertion(
-                assertion_id=f"SA-{idx:06d}",
-                skill_id=row["skill_id"],
-                unit_code=uc,
-                teaching_context=row["context"],
-                level_of_engagement=LEVEL_NAMES.get(int(row["level"]), "APPLY"),
-                evidence=str(row.get("evidence", "")),
-                keywords=row.get("keywords_list", []) if isinstance(row.get("keywords_list"), list) else [],
-                confidence=float(row.get("confidence", 0.0)),
-                category=str(row.get("category", "")),
-                qualification_codes=a_qual_codes,
-                occupation_codes=a_occ_codes,
-            ))
+        unit_codes = df["code"].tolist()
+        distinct_units = sorted(set(unit_codes))
+        if has_concordance:
+            unit_occupations = _unit_occupations(concordance, distinct_units)
+            a_qual_codes = [concordance.unit_to_quals.get(uc, []) for uc in unit_codes]
+            a_occ_codes = [unit_occupations.get(uc, []) for uc in unit_codes]
+        else:
+            a_qual_codes = [[] for _ in range(len(df))]
+            a_occ_codes = [[] for _ in range(len(df))]
+
+        assertions = AssertionTable({
+            "assertion_id": [f"SA-{idx:06d}" for idx in df.index],
+            "skill_id": df["skill_id"].tolist(),
+            "unit_code": unit_codes,
+            "teaching_context": df["context"].tolist(),
+            "level_of_engagement": df["level"].astype(int).map(LEVEL_NAMES).fillna("APPLY").tolist(),
+            "evidence": _column(df, "evidence", "").map(str).tolist(),
+            "keywords": [v if isinstance(v, list) else [] for v in _column(df, "keywords_list", None)],
+            "confidence": _column(df, "confidence", 0.0).astype(float).tolist(),
+            "category": _column(df, "category", "").map(str).tolist(),
+            "qualification_codes": a_qual_codes,
+            "occupation_codes": a_occ_codes,
+        })
 
         # ── 2. unit_code → skill_ids index ───────────────────────
-        unit_to_skill_ids: Dict[str, set] = defaultdict(set)
-        for a in assertions:
-            unit_to_skill_ids[a.unit_code].add(a.skill_id)
+        unit_to_skill_ids = _group_lists(unit_skills, "unit_code", "skill_id", value_labels=skill_labels)
 
         # ── 3. Units ─────────────────────────────────────────────
         units = []
-        for code in sorted(df["code"].unique()):
-            sids = sorted(unit_to_skill_ids.get(code, set()))
+        for code in distinct_units:
+            sids = unit_to_skill_ids.get(code, [])
             units.append(UnitOfCompetency(
                 unit_code=code,
                 unit_title=concordance.unit_titles.get(code, "") if has_concordance else "",
@@ -93,22 +102,25 @@ class AssertionBuilder:
             ))
 
         # ── 4. Precompute traversals ─────────────────────────────
-        qual_to_skill_ids: Dict[str, set] = defaultdict(set)
-        occ_to_skill_ids: Dict[str, set] = defaultdict(set)
+        qual_skills = pd.DataFrame({"qualification_code": [], "skill_id": np.array([], dtype=np.int64)})
+        occ_skills = pd.DataFrame({"anzsco_code": [], "skill_id": np.array([], dtype=np.int64)})
 
         if has_concordance:
-            for qc, ucs in concordance.qual_to_units.items():
-                for uc in ucs:
-                    qual_to_skill_ids[qc].update(unit_to_skill_ids.get(uc, set()))
-            for ac, qcs in concordance.occupation_to_quals.items():
-                for qc in qcs:
-                    occ_to_skill_ids[ac].update(qual_to_skill_ids.get(qc, set()))
+            qual_units = _pair_frame(concordance.qual_to_units, "qualification_code", "unit_code")
+            qual_skills = _distinct_sorted(
+                qual_units.merge(unit_skills, on="unit_code"), "qualification_code")
+            occ_quals = _pair_frame(concordance.occupation_to_quals, "anzsco_code", "qualification_code")
+            occ_skills = _distinct_sorted(
+                occ_quals.merge(qual_skills, on="qualification_code"), "anzsco_code")
+
+        qual_to_skill_ids = _group_lists(qual_skills, "qualification_code", "skill_id", value_labels=skill_labels)
+        occ_to_skill_ids = _group_lists(occ_skills, "anzsco_code", "skill_id", value_labels=skill_labels)
 
         # ── 5. Qualifications ────────────────────────────────────
         qualifications = []
         if has_concordance:
             for qc, qt in sorted(concordance.qual_titles.items()):
-                sids = sorted(qual_to_skill_ids.get(qc, set()))
+                sids = qual_to_skill_ids.get(qc, [])
                 qualifications.append(Qualification(
                     qualification_code=qc,
                     qualification_title=qt,
@@ -122,7 +134,7 @@ class AssertionBuilder:
         occupations = []
         if has_concordance:
             for ac, at in sorted(concordance.occupation_titles.items()):
-                sids = sorted(occ_to_skill_ids.get(ac, set()))
+                sids = occ_to_skill_ids.get(ac, [])
                 occupations.append(Occupation(
                     anzsco_code=ac,
                     anzsco_title=at,
@@ -132,14 +144,16 @@ class AssertionBuilder:
                 ))
 
         # ── 7. Skills (denormalise qual/occ onto skill) ──────────
-        skill_qual_codes: Dict[str, set] = defaultdict(set)
-        skill_occ_codes: Dict[str, set] = defaultdict(set)
-        for q in qualifications:
-            for sid in q.skill_ids:
-                skill_qual_codes[sid].add(q.qualification_code)
-        for o in occupations:
-            for sid in o.skill_ids:
-                skill_occ_codes[sid].add(o.anzsco_code)
+        # Only titled qualifications/occupations are exported, so only they count
+        if has_concordance:
+            qual_skills = qual_skills[qual_skills["qualification_code"].isin(concordance.qual_titles.keys())]
+            occ_skills = occ_skills[occ_skills["anzsco_code"].isin(concordance.occupation_titles.keys())]
+        skill_qual_codes = _group_lists(
+            qual_skills.sort_values(["skill_id", "qualification_code"], kind="stable"),
+            "skill_id", "qualification_code", key_labels=skill_labels)
+        skill_occ_codes = _group_lists(
+            occ_skills.sort_values(["skill_id", "anzsco_code"], kind="stable"),
+            "skill_id", "anzsco_code", key_labels=skill_labels)
 
         skills = []
         for sid, info in skill_registry.items():
@@ -152,8 +166,8 @@ class AssertionBuilder:
                 assertion_count=info["assertion_count"],
                 unit_codes=info["unit_codes"],
                 facets=info.get("facets", {}),
-                qualification_codes=sorted(skill_qual_codes.get(sid, set())),
-                occupation_codes=sorted(skill_occ_codes.get(sid, set())),
+                qualification_codes=skill_qual_codes.get(sid, []),
+                occupation_codes=skill_occ_codes.get(sid, []),
             ))
 
         # ── Log ──────────────────────────────────────────────────
@@ -164,3 +178,55 @@ class AssertionBuilder:
             logger.info(f"  Skills with occupations: {sum(1 for s in skills if s.occupation_codes)}")
 
         return skills, assertions, units, qualifications, occupations
+
+
+def _column(df: pd.DataFrame, name: str, default) -> pd.Series:
+    """A column of df, or a constant Series when it is missing"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _pair_frame(mapping: Dict[str, List[str]], key_col: str, value_col: str) -> pd.DataFrame:
+    """Flatten a code → [codes] map into a two-column pair table"""
+    keys = [key for key, values in mapping.items() for _ in values]
+    values = [value for values in mapping.values() for value in values]
+    return pd.DataFrame({key_col: keys, value_col: values})
+
+
+def _distinct_sorted(pairs: pd.DataFrame, key_col: str) -> pd.DataFrame:
+    """Unique (key, skill_id) pairs sorted by key then skill_id"""
+    return (pairs[[key_col, "skill_id"]]
+            .drop_duplicates()
+            .sort_values([key_col, "skill_id"], kind="stable"))
+
+
+def _group_lists(pairs: pd.DataFrame, key_col: str, value_col: str,
+                 key_labels: Optional[np.ndarray] = None,
+                 value_labels: Optional[np.ndarray] = None) -> Dict[str, List[str]]:
+    """
+    key → list of values, for pairs already sorted by key. Integer-coded
+    key/value columns are decoded through key_labels/value_labels.
+    """
+    keys = pairs[key_col].to_numpy()
+    if len(keys) == 0:
+        return {}
+    if key_labels is not None:
+        keys = key_labels[keys.astype(np.int64)]
+    values = pairs[value_col].to_numpy()
+    values = (value_labels[values.astype(np.int64)] if value_labels is not None else values).tolist()
+    keys = keys.astype(object)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+    return {keys[start]: values[start:end] for start, end in zip(starts, ends)}
+
+
+def _unit_occupations(concordance: ConcordanceData, unit_codes) -> Dict[str, List[str]]:
+    """unit_code → sorted unique ANZSCO codes reachable through its qualifications"""
+    units = {uc: concordance.unit_to_quals[uc] for uc in unit_codes if uc in concordance.unit_to_quals}
+    unit_quals = _pair_frame(units, "unit_code", "qualification_code")
+    qual_occs = _pair_frame(concordance.qual_to_occupations, "qualification_code", "anzsco_code")
+    unit_occs = (unit_quals.merge(qual_occs, on="qualification_code")[["unit_code", "anzsco_code"]]
+                 .drop_duplicates()
+                 .sort_values(["unit_code", "anzsco_code"], kind="stable"))
+    return _group_lists(unit_occs, "unit_code", "anzsco_code")
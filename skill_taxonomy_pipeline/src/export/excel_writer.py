@@ -0,0 +1,164 @@
+"""
+Streaming Excel Writer
+
+Writes workbooks through openpyxl's write-only mode, so rows go straight
+to the worksheet stream instead of being held as cell objects.
+DataFrames are converted in fixed-size chunks, column formats are set up
+once per sheet, and a sheet that reaches Excel's row limit continues on
+numbered overflow sheets ("Assertions (2)", ...).
+"""
+import logging
+import numbers
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+logger = logging.getLogger(__name__)
+
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_SHEET_NAME = 31
+
+# Values openpyxl writes natively; anything else (lists, dicts, arrays) is written as text
+_CELL_TYPES = (str, bool, numbers.Number, datetime, date, time, timedelta)
+
+
+def _cell_value(value: Any) -> Any:
+    return value if value is None or isinstance(value, _CELL_TYPES) else str(value)
+
+
+class StreamingExcelWriter:
+    """Write-only workbook writer with chunked rows and automatic sheet splitting."""
+
+    def __init__(self, path: Union[str, Path], chunk_size: int = 10_000, max_rows: int = EXCEL_MAX_ROWS):
+        """
+        Args:
+            path: Output .xlsx path
+            chunk_size: Rows converted at a time when writing DataFrames
+            max_rows: Rows per sheet including the header (Excel's limit by default)
+        """
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+        self.sheet_names: Dict[str, List[str]] = {}
+        self._workbook = Workbook(write_only=True)
+        self._header_font = Font(bold=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    def close(self):
+        if not self._workbook.worksheets:
+            self._workbook.create_sheet("Sheet1")
+        self._workbook.save(self.path)
+
+    def write_sheet(
+        self,
+        name: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        number_formats: Optional[Dict[str, str]] = None,
+        widths: Optional[Dict[str, float]] = None,
+    ) -> int:
+        """
+        Stream rows into a sheet, splitting onto overflow sheets at the row limit.
+
+        Args:
+            name: Sheet name
+            columns: Header labels
+            rows: Row sequences with cell-compatible values (None for empty cells)
+            number_formats: Excel number format per column label
+            widths: Column width per column label
+
+        Returns:
+            Number of data rows written
+        """
+        formats = [(i, number_formats[c]) for i, c in enumerate(columns) if c in (number_formats or {})]
+        rows_per_sheet = self.max_rows - 1
+        self.sheet_names[name] = []
+
+        sheet, sheet_rows, written = None, rows_per_sheet, 0
+        for row in rows:
+            if sheet_rows == rows_per_sheet:
+                sheet = self._new_sheet(name, columns, widths)
+                sheet_rows = 0
+            if formats:
+                row = self._format_row(sheet, row, formats)
+            sheet.append(row)
+            sheet_rows += 1
+            written += 1
+
+        if sheet is None:
+            self._new_sheet(name, columns, widths)
+        if len(self.sheet_names[name]) > 1:
+            logger.info(f"Split {written:,} rows of '{name}' across {len(self.sheet_names[name])} sheets")
+        return written
+
+    def write_frame(
+        self,
+        name: str,
+        df: pd.DataFrame,
+        index: bool = False,
+        number_formats: Optional[Dict[str, str]] = None,
+        widths: Optional[Dict[str, float]] = None,
+    ) -> int:
+        """Stream a DataFrame into a sheet, converting it chunk by chunk."""
+        if index:
+            df = df.reset_index()
+        columns = [str(c) for c in df.columns]
+        return self.write_sheet(name, columns, self._frame_rows(df), number_formats, widths)
+
+    def _frame_rows(self, df: pd.DataFrame):
+        object_columns = [i for i, dtype in enumerate(df.dtypes) if dtype == object]
+        for start in range(0, len(df), self.chunk_size):
+            chunk = df.iloc[start:start + self.chunk_size]
+            values = chunk.astype(object).where(chunk.notna(), None)
+            for i in object_columns:
+                values.iloc[:, i] = values.iloc[:, i].map(_cell_value)
+            yield from values.values.tolist()
+
+    def _new_sheet(self, name: str, columns: Sequence[str], widths: Optional[Dict[str, float]]):
+        parts = self.sheet_names[name]
+        title = name
+        if parts:
+            suffix = f" ({len(parts) + 1})"
+            title = name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+        sheet = self._workbook.create_sheet(title[:EXCEL_MAX_SHEET_NAME])
+        parts.append(sheet.title)
+
+        # Column dimensions must be set before the first row is streamed
+        for i, column in enumerate(columns, 1):
+            if widths and column in widths:
+                sheet.column_dimensions[get_column_letter(i)].width = widths[column]
+
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = self._header_font
+            header.append(cell)
+        sheet.append(header)
+        return sheet
+
+    @staticmethod
+    def _format_row(sheet, row: Sequence[Any], formats) -> List[Any]:
+        row = list(row)
+        for i, number_format in formats:
+            cell = WriteOnlyCell(sheet, value=row[i])
+            cell.number_format = number_format
+            row[i] = cell
+        return row
+
+
+def write_excel(df: pd.DataFrame, path: Union[str, Path], sheet_name: str = "Sheet1", index: bool = False) -> None:
+    """Write a single DataFrame to an .xlsx file through the streaming writer."""
+    with StreamingExcelWriter(path) as writer:
+        writer.write_frame(sheet_name, df, index=index)
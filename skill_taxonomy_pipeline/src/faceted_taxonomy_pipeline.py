@@ -22,9 +22,11 @@ from src.validation.taxonomy_validator import TaxonomyValidator
 from src.data_processing.data_preprocessor import SkillDataPreprocessor
 from src.interfaces.model_factory import ModelFactory
 from src.clustering.facet_assigner import FacetAssigner
+from src.embeddings.knn_graph import save_knn_graph
 from config.settings_faceted import CONFIG, get_config_profile
 from config.facets import ALL_FACETS, FACET_PRIORITY
 from src.utils.converters import NpEncoder
+from src.export.excel_writer import write_excel
 
 # Configure logging
 logging.basicConfig(
@@ -199,7 +201,7 @@ class FacetedTaxonomyPipeline:
             )
             
             self._log_deduplication_stats(df_with_duplicates)
-            df_with_duplicates.to_excel(output_path / "df_with_duplicates.xlsx", index=False)
+            write_excel(df_with_duplicates, output_path / "df_with_duplicates.xlsx")
             
             # Merge duplicates (preserves alternative titles)
             df_unique = self.deduplicator.merge_duplicates(df_with_duplicates)
@@ -211,7 +213,7 @@ class FacetedTaxonomyPipeline:
             ).sum()
             logger.info(f"Total alternative titles preserved: {alt_titles_count}")
             
-            df_unique.to_excel(output_path / "df_unique.xlsx", index=False)
+            write_excel(df_unique, output_path / "df_unique.xlsx")
             
             # ================================================================
             # STEP 4: RE-GENERATE EMBEDDINGS FOR UNIQUE SKILLS
@@ -229,7 +231,7 @@ class FacetedTaxonomyPipeline:
                 self.facet_assigner.use_llm_reranking = False
             
             df_faceted = self.facet_assigner.assign_facets(df_unique, embeddings_unique)
-            df_faceted.to_excel(output_path / "df_faceted.xlsx", index=False)
+            write_excel(df_faceted, output_path / "df_faceted.xlsx")
             
             # ================================================================
             # STEP 6: GENERATE OUTPUTS
@@ -238,6 +240,8 @@ class FacetedTaxonomyPipeline:
             
             # Get faceted skill data for visualization
             skills_data = self.facet_assigner.get_faceted_skill_data(df_faceted, embeddings_unique)
+            if self.facet_assigner.related_skills_graph is not None:
+                save_knn_graph(self.facet_assigner.related_skills_graph, output_path / "related_skills_graph.npz")
             
             # Generate statistics
             statistics = self._generate_statistics(df_faceted, skills_data)
@@ -5,11 +5,9 @@ Interface for local embedding model integration with multi-GPU support
 import logging
 import random
 import numpy as np
-import torch
 from typing import List, Optional, Union, Dict
 import shutil
 from pathlib import Path
-from huggingface_hub import snapshot_download
 from config.settings import CONFIG as Config
 
 logger = logging.getLogger(__name__)
@@ -17,17 +15,21 @@ logger = logging.getLogger(__name__)
 # Lazy imports
 torch = None
 SentenceTransformer = None
+snapshot_download = None
 
 
 def _load_dependencies():
     """Lazy load dependencies"""
-    global torch, SentenceTransformer
+    global torch, SentenceTransformer, snapshot_download
     if torch is None:
         import torch as _torch
         torch = _torch
     if SentenceTransformer is None:
         from sentence_transformers import SentenceTransformer as _ST
         SentenceTransformer = _ST
+    if snapshot_download is None:
+        from huggingface_hub import snapshot_download as _download
+        snapshot_download = _download
 
 class EmbeddingInterface:
     """Interface for local embedding model with multi-GPU support"""
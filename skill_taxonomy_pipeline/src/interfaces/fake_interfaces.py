@@ -0,0 +1,405 @@
+"""
+Offline stand-ins for the embedding and GenAI interfaces
+
+HashingEmbeddingInterface projects hashed words and character trigrams into a
+fixed number of signed dimensions. FakeGenAIInterface answers the prompts of
+the pipeline stages (level and facet re-ranking, duplicate validation, THA
+validation, name refinement, family assignment) with JSON in the schema each
+prompt asks for, with configurable latency, failure and throughput profiles.
+Neither needs a GPU, a model download or network access, so the pipeline can
+be profiled and load-tested on a CPU.
+
+Select them with CONFIG["backed_type"] = "fake" (LLM_BACKEND=fake) and
+embedding model_name "hashing".
+
+credit-transfer-system keeps its own copy (interfaces/fake_interfaces.py): the
+projects are installed and run separately and share no package, and each
+FakeGenAIInterface follows its own project's interface and prompts. The hashing
+scheme and PROFILES are the same in both; change them together.
+"""
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+import zlib
+from typing import List, Dict, Any, Optional, Union, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class HashingEmbeddingInterface:
+    """Deterministic CPU embedding backend with the EmbeddingInterface API"""
+
+    def __init__(self,
+                 model_name: str = "hashing",
+                 embedding_dim: int = 384,
+                 batch_size: int = 256,
+                 seed: int = 0):
+        self.model_name = model_name
+        self.embedding_dim = embedding_dim
+        self.default_batch_size = batch_size
+        self.seed = seed
+        self.device_str = "cpu"
+        self.cache = {}
+        logger.info(f"Hashing embedding interface ready (dim={embedding_dim}, seed={seed})")
+
+    def _vector(self, text: str) -> np.ndarray:
+        """Signed feature hashing of words and character trigrams"""
+        vector = np.zeros(self.embedding_dim, dtype=np.float32)
+        text = text.lower()
+        features = text.split() + [text[i:i + 3] for i in range(max(0, len(text) - 2))]
+        for feature in features:
+            h = zlib.crc32(feature.encode(), self.seed)
+            vector[h % self.embedding_dim] += 1.0 if h & 0x80000000 else -1.0
+        return vector
+
+    def encode(self, texts: Union[str, List[str]],
+               batch_size: Optional[int] = None,
+               show_progress: bool = False,
+               convert_to_tensor: bool = False,
+               normalize_embeddings: bool = True) -> np.ndarray:
+        """
+        Generate embeddings for texts
+
+        Same signature as EmbeddingInterface.encode; convert_to_tensor is
+        ignored and numpy arrays are always returned.
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+
+        if not texts:
+            return np.array([])
+
+        if len(texts) == 1 and texts[0] in self.cache:
+            return self.cache[texts[0]]
+
+        embeddings = np.stack([self._vector(str(text)) for text in texts])
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10
+
+        if len(texts) == 1:
+            self.cache[texts[0]] = embeddings[0]
+
+        return embeddings
+
+    def encode_batch(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        return self.encode(texts, batch_size=batch_size)
+
+    def similarity(self, embeddings1: np.ndarray, embeddings2: np.ndarray) -> np.ndarray:
+        """Cosine similarity between embeddings"""
+        embeddings1 = np.atleast_2d(np.asarray(embeddings1))
+        embeddings2 = np.atleast_2d(np.asarray(embeddings2))
+        if embeddings1.shape[1] != embeddings2.shape[1]:
+            raise ValueError(f"Embedding dimensions don't match: {embeddings1.shape[1]} vs {embeddings2.shape[1]}")
+        norm1 = embeddings1 / (np.linalg.norm(embeddings1, axis=1, keepdims=True) + 1e-10)
+        norm2 = embeddings2 / (np.linalg.norm(embeddings2, axis=1, keepdims=True) + 1e-10)
+        return np.dot(norm1, norm2.T)
+
+    def similarity_score(self, text1: str, text2: str) -> float:
+        embeddings = self.encode([text1, text2])
+        return float(self.similarity(embeddings[0:1], embeddings[1:2])[0, 0])
+
+    def find_most_similar(self, query: str, candidates: List[str], top_k: int = 5) -> List[tuple]:
+        if not candidates:
+            return []
+        embeddings = self.encode([query] + candidates)
+        scores = self.similarity(embeddings[0:1], embeddings[1:])[0]
+        top_indices = np.argsort(scores)[-top_k:][::-1]
+        return [(candidates[idx], float(scores[idx])) for idx in top_indices]
+
+    def clear_cache(self):
+        self.cache.clear()
+
+    def is_available(self) -> bool:
+        return True
+
+
+class FakeBackendError(RuntimeError):
+    """Simulated LLM backend failure (timeouts, 429s, engine errors)"""
+
+
+# Simulated backend behaviour, selected by the "profile" key of LLM_CONFIG["fake"]
+#   mode:              "openai" (independent requests) or "vllm" (batched generate calls)
+#   latency, jitter:   fixed seconds per request/batch, plus uniform random extra
+#   tokens_per_second: decoding speed per sequence (0 = instant)
+#   max_concurrency:   requests served at once in openai mode (0 = unlimited)
+#   batch_size:        prompts decoded together in vllm mode
+#   failure_rate:      probability a request/batch raises FakeBackendError
+#   malformed_rate:    probability a response is cut off mid-JSON
+PROFILES = {
+    "instant": {},
+    "azure": {"latency": 0.6, "jitter": 0.4, "tokens_per_second": 80, "max_concurrency": 8,
+              "failure_rate": 0.005},
+    "vllm": {"mode": "vllm", "latency": 0.05, "tokens_per_second": 150, "batch_size": 64},
+    "flaky": {"latency": 0.05, "jitter": 0.1, "tokens_per_second": 200, "failure_rate": 0.1,
+              "malformed_rate": 0.1},
+}
+
+PROFILE_DEFAULTS = {
+    "mode": "openai",
+    "latency": 0.0,
+    "jitter": 0.0,
+    "tokens_per_second": 0,
+    "max_concurrency": 0,
+    "batch_size": 32,
+    "failure_rate": 0.0,
+    "malformed_rate": 0.0,
+}
+
+
+class FakeGenAIInterface:
+    """
+    Scriptable, deterministic LLM backend
+
+    Prompts are recognized by the JSON keys their instructions ask for and
+    answered in that schema; content is drawn from a random generator seeded
+    by a hash of the prompt, so the same prompt always gets the same answer.
+    Candidate choices favour the first (best embedding) candidates. Responses
+    for any prompt can be replaced with register().
+
+    In "openai" mode requests are independent (up to max_concurrency at once)
+    and callers may dispatch batches concurrently; in "vllm" mode
+    _generate_batch decodes batch_size prompts per simulated generate call.
+    """
+
+    def __init__(self,
+                 profile: str = "instant",
+                 model_name: str = "fake-llm",
+                 seed: int = 0,
+                 **settings):
+        """
+        Args:
+            profile: Key in PROFILES
+            model_name: Reported model/deployment name
+            seed: Seed for response content and simulated faults
+            **settings: Overrides for any PROFILE_DEFAULTS key
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown fake LLM profile '{profile}'. Available: {list(PROFILES)}")
+        unknown = set(settings) - set(PROFILE_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown fake LLM settings: {sorted(unknown)}")
+
+        self.profile = profile
+        self.settings = {**PROFILE_DEFAULTS, **PROFILES[profile],
+                         **{k: v for k, v in settings.items() if v is not None}}
+        self.mode = self.settings["mode"]
+        if self.mode not in ("openai", "vllm"):
+            raise ValueError(f"Unknown fake LLM mode '{self.mode}', expected 'openai' or 'vllm'")
+        self.supports_concurrent_requests = self.mode == "openai"
+        self.batch_size = self.settings["batch_size"]
+        self.model_name = model_name
+        self.deployment = model_name
+        self.seed = seed
+
+        max_concurrency = self.settings["max_concurrency"]
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._fault_rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._handlers = []
+        self.calls = 0
+
+        logger.info(f"Fake GenAI interface ready (profile={profile}, mode={self.mode})")
+
+    def is_available(self) -> bool:
+        return True
+
+    # ═══════════════════════════════════════════════════════════════
+    #  SCRIPTING
+    # ═══════════════════════════════════════════════════════════════
+
+    def register(self, marker: str, response: Union[str, Any, Callable[[str, str], Any]]):
+        """
+        Answer prompts containing marker with a fixed or computed response
+
+        Args:
+            marker: Substring of the system or user prompt
+            response: Response text, a JSON-serializable object, or a
+                callable(system_prompt, user_prompt) returning either
+
+        Later registrations take precedence over earlier ones.
+        """
+        self._handlers.insert(0, (marker, response))
+
+    # ═══════════════════════════════════════════════════════════════
+    #  GENERATION
+    # ═══════════════════════════════════════════════════════════════
+
+    def generate(self,
+                 prompt: str,
+                 system_prompt: Optional[str] = None,
+                 max_tokens: Optional[int] = None,
+                 temperature: Optional[float] = None,
+                 top_p: float = 1.0,
+                 **kwargs) -> str:
+        """Generate text completion"""
+        return self.generate_response(system_prompt or "", prompt, max_tokens=max_tokens)
+
+    def generate_response(self,
+                          system_prompt: str,
+                          user_prompt: str,
+                          max_tokens: Optional[int] = None,
+                          temperature: float = 0.0,
+                          top_p: float = 1.0) -> str:
+        """Generate a response for a single prompt"""
+        if self.mode == "vllm":
+            return self._generate_batch([user_prompt], system_prompt, max_tokens)[0]
+
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            failed, malformed, jitter = self._draw_faults()
+            response = self._respond(system_prompt, user_prompt, malformed)
+            self._wait(self.settings["latency"] + jitter + self._decode_seconds(response))
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+        if failed:
+            raise FakeBackendError("Simulated request failure")
+        return response
+
+    def _generate_batch(self,
+                        user_prompts: List[str],
+                        system_prompt: str = "",
+                        max_tokens: Optional[int] = None,
+                        temperature: float = 0.0) -> List[str]:
+        """
+        Generate responses for a batch of prompts
+
+        In openai mode failed items come back as empty strings, as with
+        GenAIInterface. In vllm mode prompts are decoded batch_size at a time,
+        each chunk taking as long as its longest response, and a failure
+        fails the whole call, as an engine error would.
+        """
+        if self.mode == "openai":
+            responses = []
+            for user_prompt in user_prompts:
+                try:
+                    responses.append(self.generate_response(system_prompt, user_prompt, max_tokens))
+                except FakeBackendError as e:
+                    logger.warning(f"Fake batch item failed: {e}")
+                    responses.append("")
+            return responses
+
+        responses = []
+        for start in range(0, len(user_prompts), self.batch_size):
+            chunk = user_prompts[start:start + self.batch_size]
+            failed, _, jitter = self._draw_faults()
+            outputs = [self._respond(system_prompt, prompt, self._draw_faults()[1]) for prompt in chunk]
+            self._wait(self.settings["latency"] + jitter + max(self._decode_seconds(o) for o in outputs))
+            if failed:
+                raise FakeBackendError("Simulated engine failure")
+            responses.extend(outputs)
+        return responses
+
+    def generate_json(self,
+                      prompt: str,
+                      system_prompt: Optional[str] = None,
+                      max_tokens: Optional[int] = None,
+                      temperature: float = 0.1,
+                      **kwargs) -> Dict:
+        """Generate JSON response"""
+        return self._parse_json_response(self.generate(prompt, system_prompt=system_prompt, max_tokens=max_tokens))
+
+    def _parse_json_response(self, response: str) -> Dict:
+        """Parse JSON from model response using the robust shared parser"""
+        if not response:
+            return {}
+        from src.utils.json_parser import robust_parse_json
+        return robust_parse_json(response)
+
+    def _draw_faults(self) -> tuple:
+        """(fail, malformed, jitter seconds) for the next request, in call order"""
+        with self._lock:
+            return (self._fault_rng.random() < self.settings["failure_rate"],
+                    self._fault_rng.random() < self.settings["malformed_rate"],
+                    self._fault_rng.random() * self.settings["jitter"])
+
+    def _decode_seconds(self, response: str) -> float:
+        tokens_per_second = self.settings["tokens_per_second"]
+        return (len(response) // 4 + 1) / tokens_per_second if tokens_per_second else 0.0
+
+    @staticmethod
+    def _wait(seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    # ═══════════════════════════════════════════════════════════════
+    #  RESPONSES
+    # ═══════════════════════════════════════════════════════════════
+
+    def _respond(self, system_prompt: str, user_prompt: str, malformed: bool = False) -> str:
+        with self._lock:
+            self.calls += 1
+        rng = np.random.default_rng([zlib.crc32(system_prompt.encode()), zlib.crc32(user_prompt.encode()), self.seed])
+
+        for marker, handler in self._handlers:
+            if marker in system_prompt or marker in user_prompt:
+                response = handler(system_prompt, user_prompt) if callable(handler) else handler
+                break
+        else:
+            response = self._default_response(system_prompt, user_prompt, rng)
+
+        if not isinstance(response, str):
+            response = json.dumps(response)
+        if malformed:
+            response = response[:len(response) // 2]
+        return response
+
+    @staticmethod
+    def _pick_candidate(n: int, rng: np.random.Generator) -> int:
+        """1-based candidate number, favouring the top-ranked ones"""
+        weights = 1.0 / np.arange(1, n + 1)
+        return int(rng.choice(n, p=weights / weights.sum())) + 1
+
+    def _default_response(self, system_prompt: str, user_prompt: str, rng: np.random.Generator) -> Any:
+        """Answer in the schema the prompt asks for; {} when it is not recognized"""
+        if '"groups"' in system_prompt:
+            # Duplicate validation: usually confirm the cluster, sometimes split off the last name
+            names = re.findall(r"^\s+\d+\. (.+)$", user_prompt, re.M)
+            if len(names) > 2 and rng.random() < 0.15:
+                return {"groups": [names[:-1], names[-1:]]}
+            return {"groups": [names]}
+
+        if '"correct"' in system_prompt:
+            codes = re.findall(r"^\s+\d+\. (\S+) —", user_prompt, re.M)
+            correct = bool(rng.random() < 0.7)
+            return {
+                "correct": correct,
+                "reasoning": "Assigned ability matches the skill" if correct else "A candidate fits the skill better",
+                "better_fit": None if correct or not codes else codes[0],
+            }
+
+        candidates = len(re.findall(r"^\s*\d+\. ", user_prompt.rsplit("CANDIDATE", 1)[-1], re.M))
+        if '"related"' in system_prompt:
+            size = int(rng.integers(0, candidates + 1)) if candidates else 0
+            return {"related": sorted(int(c) + 1 for c in rng.choice(candidates, size=size, replace=False))}
+        if '"choice"' in system_prompt:
+            return {"choice": self._pick_candidate(max(candidates, 1), rng),
+                    "confidence": round(float(rng.uniform(0.6, 0.95)), 2)}
+
+        if '"cleaned_name"' in system_prompt:
+            match = re.search(r'Skill name: "(.*)"', user_prompt)
+            return {"cleaned_name": match.group(1) if match else "", "domain_removed": False}
+
+        if '"refined_name"' in user_prompt:
+            match = re.search(r"^Skill Name: (.*)$", user_prompt, re.M)
+            name = match.group(1).strip() if match else ""
+            refined = name.title()
+            return {"original_name": name, "refined_name": refined, "changed": refined != name,
+                    "confidence": round(float(rng.uniform(0.7, 0.95)), 2), "type": str(rng.choice(["A", "B"]))}
+
+        if '"family_key"' in user_prompt:
+            families = re.findall(r"^\s+- (\w+): ", user_prompt, re.M)
+            skills = re.findall(r"^\d+\. Skill: ", user_prompt, re.M)
+            if not families:
+                return []
+            return [{"skill_number": i + 1, "family_key": str(rng.choice(families)),
+                     "confidence": round(float(rng.uniform(0.6, 0.95)), 2)} for i in range(len(skills))]
+
+        return {}
@@ -7,7 +7,6 @@ import json
 import logging
 import os
 from typing import List, Dict, Any, Optional
-from openai import AzureOpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +14,9 @@ logger = logging.getLogger(__name__)
 class GenAIInterface:
     """Interface for Azure OpenAI integration"""
 
+    # HTTP client is thread-safe, so callers may dispatch batches concurrently
+    supports_concurrent_requests = True
+
     def __init__(self,
                  endpoint: Optional[str] = None,
                  deployment: Optional[str] = None,
@@ -40,6 +42,7 @@ class GenAIInterface:
     def _initialize_client(self):
         """Initialize the Azure OpenAI client"""
         try:
+            from openai import AzureOpenAI
             self.client = AzureOpenAI(
                 azure_endpoint=self.endpoint,
                 api_key=self.api_key,
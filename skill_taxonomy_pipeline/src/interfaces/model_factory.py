@@ -1,6 +1,6 @@
 """
 Factory for creating GenAI and Embedding interfaces based on configuration
-Supports Azure OpenAI and vLLM backends
+Supports Azure OpenAI and vLLM backends, plus an offline fake backend for profiling
 """
 
 import logging
@@ -17,6 +17,7 @@ class ModelFactory:
     BACKEND_OPENAI = 'openai'
     BACKEND_AZURE_OPENAI = 'azure_openai'
     BACKEND_VLLM = 'vllm'
+    BACKEND_FAKE = 'fake'
     
     @classmethod
     def create_genai_interface(cls, config: Dict[str, Any], backend_type: Optional[str] = None):
@@ -53,6 +54,8 @@ class ModelFactory:
             return cls._create_openai_interface(backend_config)
         elif backend_type == cls.BACKEND_VLLM:
             return cls._create_vllm_interface(backend_config)
+        elif backend_type == cls.BACKEND_FAKE:
+            return cls._create_fake_interface(backend_config)
         else:
             logger.warning(f"Unknown backend type: {backend_type}")
             return None
@@ -113,6 +116,28 @@ class ModelFactory:
             logger.error(f"Failed to create vLLM interface: {e}")
             return None
     
+    @classmethod
+    def _create_fake_interface(cls, config: Dict[str, Any]):
+        """Create offline fake interface (no model, no network)"""
+        try:
+            from src.interfaces.fake_interfaces import FakeGenAIInterface
+            
+            settings = {k: config[k] for k in ('mode', 'latency', 'jitter', 'tokens_per_second', 'max_concurrency',
+                                                'batch_size', 'failure_rate', 'malformed_rate') if k in config}
+            interface = FakeGenAIInterface(
+                profile=config.get('profile', 'instant'),
+                model_name=config.get('model_name', 'fake-llm'),
+                seed=config.get('seed', 0),
+                **settings
+            )
+            
+            logger.info(f"Created fake GenAI interface: profile {interface.profile} ({interface.mode} mode)")
+            return interface
+            
+        except Exception as e:
+            logger.error(f"Failed to create fake interface: {e}")
+            return None
+    
     @classmethod
     def create_embedding_interface(cls, config: Dict[str, Any]):
         """
@@ -124,6 +149,18 @@ class ModelFactory:
         Returns:
             Embedding interface instance or None
         """
+        emb_config = config.get('embedding', {})
+        if emb_config.get('model_name') == 'hashing':
+            from src.interfaces.fake_interfaces import HashingEmbeddingInterface
+            
+            interface = HashingEmbeddingInterface(
+                embedding_dim=emb_config.get('embedding_dim', 384),
+                batch_size=emb_config.get('batch_size', 256),
+                seed=emb_config.get('seed', 0)
+            )
+            logger.info(f"Created hashing embedding interface (dim={interface.embedding_dim})")
+            return interface
+        
         try:
             from src.interfaces.embedding_interface import EmbeddingInterface
             
@@ -155,7 +192,7 @@ class ModelFactory:
     @classmethod
     def get_available_backends(cls) -> list:
         """Get list of supported backend types"""
-        return [cls.BACKEND_OPENAI, cls.BACKEND_AZURE_OPENAI, cls.BACKEND_VLLM]
+        return [cls.BACKEND_OPENAI, cls.BACKEND_AZURE_OPENAI, cls.BACKEND_VLLM, cls.BACKEND_FAKE]
     
     @classmethod
     def validate_config(cls, config: Dict[str, Any], backend_type: str) -> Dict[str, Any]:
@@ -183,6 +220,11 @@ class ModelFactory:
             if not backend_config.get('model_name'):
                 issues.append("Missing model_name")
         
+        elif backend_type == cls.BACKEND_FAKE:
+            from src.interfaces.fake_interfaces import PROFILES
+            if backend_config.get('profile', 'instant') not in PROFILES:
+                issues.append(f"Unknown fake profile: {backend_config.get('profile')}")
+        
         return {
             'valid': len(issues) == 0,
             'issues': issues
@@ -6,19 +6,35 @@ import json
 import logging
 import re
 import shutil
-import torch
 from typing import List, Dict, Any, Optional
 from pathlib import Path
-from huggingface_hub import snapshot_download
 from config.settings import CONFIG as Config
-from vllm import LLM, SamplingParams
 
 logger = logging.getLogger(__name__)
 
+# Lazy imports
+LLM = None
+SamplingParams = None
+snapshot_download = None
+
+
+def _load_dependencies():
+    """Lazy load dependencies"""
+    global LLM, SamplingParams, snapshot_download
+    if LLM is None:
+        from vllm import LLM as _LLM, SamplingParams as _SamplingParams
+        LLM, SamplingParams = _LLM, _SamplingParams
+    if snapshot_download is None:
+        from huggingface_hub import snapshot_download as _download
+        snapshot_download = _download
+
 
 class VLLMGenAIInterface:
     """Interface for local GenAI model integration using vLLM with batch processing"""
 
+    # One in-process engine: batches must be submitted from a single thread
+    supports_concurrent_requests = False
+
     def __init__(self,
                  model_name: str = "meta-llama--Llama-3.1-8B-Instruct",
                  number_gpus: int = 1,
@@ -28,6 +44,8 @@ class VLLMGenAIInterface:
                  external_model_dir: str = "/Volumes/jsa_external_prod/external_vols/scratch/Scratch/Ehsan/Models",
                  gpu_memory_utilization: float = 0.85,
                  gpu_id: int = 0):
+        _load_dependencies()
+
         self.MODELS = Config['models']['llm_models']
         self.model_name = model_name
         self.number_gpus = number_gpus
@@ -3,6 +3,7 @@ Data models for the Skill Assertion schema:
 
   Skill              — Deduplicated, portable, context-independent
   SkillAssertion     — Link: how/where/at what depth a skill is taught
+  AssertionTable     — Column-wise SkillAssertions, materialised per row on access
   UnitOfCompetency   — VET unit metadata (from TGA / concordance)
   Qualification      — VET qualification (from concordance)
   Occupation         — ANZSCO occupation (from concordance)
@@ -13,7 +14,8 @@ Traversal chain:
 Design principle:
   Deduplicate skill LABELS, not teaching/context evidence.
 """
-from dataclasses import dataclass, field
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -91,6 +93,48 @@ class SkillAssertion:
     occupation_codes: List[str] = field(default_factory=list)
 
 
+class AssertionTable(Sequence):
+    """
+    SkillAssertions stored as equal-length columns (one list per field).
+    Behaves like a list of SkillAssertion; rows are only turned into
+    dataclass objects when indexed or iterated.
+    """
+    COLUMNS = [f.name for f in fields(SkillAssertion)]
+
+    def __init__(self, columns: Dict[str, List[Any]]):
+        missing = set(self.COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"AssertionTable missing columns: {sorted(missing)}")
+        self.columns = {name: list(columns[name]) for name in self.COLUMNS}
+        self._length = len(self.columns["assertion_id"])
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("assertion index out of range")
+        return SkillAssertion(**{name: values[index] for name, values in self.columns.items()})
+
+    def __iter__(self):
+        for values in zip(*self.columns.values()):
+            yield SkillAssertion(*values)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Rows as plain dicts, without building dataclasses"""
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+    def to_frame(self):
+        """Columns as a pandas DataFrame (list fields stay list columns, as Parquet stores them)"""
+        import pandas as pd
+        return pd.DataFrame(self.columns, columns=self.COLUMNS)
+
+
 @dataclass
 class UnitOfCompetency:
     """
@@ -47,23 +47,49 @@ class SkillAssertionPipeline:
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or CONFIG
         self.preprocessor = AssertionDataPreprocessor(self.config)
-        self.embedding_interface = None
-        self.genai_interface = None
-        logger.info("\nInitialising model interfaces...")
-        self._init_embedding()
-        self._init_genai()
+        # Model interfaces are created on first use by the stage that needs them,
+        # so constructing the pipeline (or a --help / cache-only run) loads no models
+        self._embedding_interface = None
+        self._genai_interface = None
+        self._genai_initialised = False
 
     # ═══════════════════════════════════════════════════════════════
     #  INTERFACE INITIALISATION
     # ═══════════════════════════════════════════════════════════════
 
+    @property
+    def embedding_interface(self):
+        if self._embedding_interface is None:
+            self._init_embedding()
+        return self._embedding_interface
+
+    @embedding_interface.setter
+    def embedding_interface(self, interface):
+        self._embedding_interface = interface
+
+    @property
+    def genai_interface(self):
+        if not self._genai_initialised:
+            self._init_genai()
+        return self._genai_interface
+
+    @genai_interface.setter
+    def genai_interface(self, interface):
+        self._genai_interface = interface
+        self._genai_initialised = True
+
     def _init_embedding(self):
-        if self.embedding_interface is not None:
+        if self._embedding_interface is not None:
+            return
+        logger.info("Initialising embedding interface...")
+        if self.config["embedding"].get("model_name") == "hashing":
+            from src.interfaces.model_factory import ModelFactory
+            self._embedding_interface = ModelFactory.create_embedding_interface(self.config)
             return
         try:
             from src.interfaces.embedding_interface import EmbeddingInterface
             cfg = self.config["embedding"]
-            self.embedding_interface = EmbeddingInterface(
+            self._embedding_interface = EmbeddingInterface(
                 model_name=cfg["model_name"],
                 device=cfg.get("device", "cuda"),
                 batch_size=cfg.get("batch_size", 64),
@@ -76,12 +102,15 @@ class SkillAssertionPipeline:
             raise
 
     def _init_genai(self):
-        if self.genai_interface is not None:
+        if self._genai_initialised:
             return
+        # Attempted once: a backend that fails to come up is not retried per stage
+        self._genai_initialised = True
+        logger.info("Initialising GenAI interface...")
         try:
             from src.interfaces.model_factory import ModelFactory
-            self.genai_interface = ModelFactory.create_genai_interface(self.config)
-            if self.genai_interface:
+            self._genai_interface = ModelFactory.create_genai_interface(self.config)
+            if self._genai_interface:
                 logger.info("GenAI interface ready")
             else:
                 logger.warning("GenAI interface not available — will skip LLM steps")
@@ -263,7 +292,8 @@ class SkillAssertionPipeline:
             concordance = None
             if concordance_path:
                 logger.info(f"\n[2/7] Loading concordance from: {concordance_path}")
-                concordance = load_concordance(concordance_path)
+                concordance = load_concordance(
+                    concordance_path, cache_dir=self.config.get("paths", {}).get("cache_dir"))
             else:
                 logger.info("\n[2/7] No concordance file — LVL assignment will use skill names only")
 
@@ -401,9 +431,12 @@ class SkillAssertionPipeline:
 
     def _build_export(self, skills, assertions, units, qualifications, occupations,
                       concordance, groups_data=None, group_stats=None):
-        assertions_by_skill = {}
-        for a in assertions:
-            assertions_by_skill.setdefault(a.skill_id, []).append(a)
+        # Group row positions by skill and read the columns directly rather
+        # than materialising a SkillAssertion per row
+        cols = assertions.columns
+        rows_by_skill = {}
+        for i, sid in enumerate(cols["skill_id"]):
+            rows_by_skill.setdefault(sid, []).append(i)
 
         # Build skill → THA group reverse mapping
         skill_to_group = {}
@@ -426,13 +459,15 @@ class SkillAssertionPipeline:
 
         skills_export = []
         for s in skills:
-            sa = assertions_by_skill.get(s.skill_id, [])
+            sa = rows_by_skill.get(s.skill_id, [])
             ctx_dist = {}
-            for a in sa:
-                ctx_dist[a.teaching_context] = ctx_dist.get(a.teaching_context, 0) + 1
+            for i in sa:
+                ctx = cols["teaching_context"][i]
+                ctx_dist[ctx] = ctx_dist.get(ctx, 0) + 1
             lvl_dist = {}
-            for a in sa:
-                lvl_dist[a.level_of_engagement] = lvl_dist.get(a.level_of_engagement, 0) + 1
+            for i in sa:
+                lvl = cols["level_of_engagement"][i]
+                lvl_dist[lvl] = lvl_dist.get(lvl, 0) + 1
 
             qual_list = []
             if concordance:
@@ -464,15 +499,15 @@ class SkillAssertionPipeline:
                 "level_distribution": lvl_dist,
                 "assertions": [
                     {
-                        "assertion_id": a.assertion_id, "unit_code": a.unit_code,
-                        "teaching_context": a.teaching_context,
-                        "level_of_engagement": a.level_of_engagement,
-                        "evidence": a.evidence, "keywords": a.keywords,
-                        "confidence": a.confidence,
-                        "qualification_codes": a.qualification_codes,
-                        "occupation_codes": a.occupation_codes,
+                        "assertion_id": cols["assertion_id"][i], "unit_code": cols["unit_code"][i],
+                        "teaching_context": cols["teaching_context"][i],
+                        "level_of_engagement": cols["level_of_engagement"][i],
+                        "evidence": cols["evidence"][i], "keywords": cols["keywords"][i],
+                        "confidence": cols["confidence"][i],
+                        "qualification_codes": cols["qualification_codes"][i],
+                        "occupation_codes": cols["occupation_codes"][i],
                     }
-                    for a in sa
+                    for i in sa
                 ],
             })
 
@@ -515,6 +550,7 @@ class SkillAssertionPipeline:
         }
 
     def _export_excel(self, skills, assertions, units, qualifications, occupations, output_path, groups_data=None):
+        from src.export.excel_writer import StreamingExcelWriter
         try:
             skill_to_grp = {}
             if groups_data:
@@ -527,31 +563,35 @@ class SkillAssertionPipeline:
                                 "progression_type": sc.get("progression_type", ""),
                             }
 
-            skills_rows = []
-            for s in skills:
-                gi = skill_to_grp.get(s.skill_id, {})
-                row = {
-                    "skill_id": s.skill_id,
-                    "preferred_label": s.preferred_label,
-                    "alternative_labels": "; ".join(s.alternative_labels),
-                    "definition": s.definition,
-                    "category": s.category,
-                    "assertion_count": s.assertion_count,
-                    "trf_group": gi.get("trf_group", ""),
-                    "ability_group": gi.get("ability_group", ""),
-                    "progression_type": gi.get("progression_type", ""),
-                    "unit_codes": "; ".join(s.unit_codes[:20]),
-                    "qualification_codes": "; ".join(s.qualification_codes[:10]),
-                    "occupation_codes": "; ".join(s.occupation_codes[:10]),
-                }
-                for fid, fdata in s.facets.items():
-                    row[f"facet_{fid}"] = fdata.get("name", "")
-                skills_rows.append(row)
-
-            assertion_rows = [{"assertion_id": a.assertion_id, "skill_id": a.skill_id, "unit_code": a.unit_code, "teaching_context": a.teaching_context, "level_of_engagement": a.level_of_engagement, "evidence": a.evidence[:200], "keywords": "; ".join(a.keywords[:10]), "confidence": a.confidence, "qualification_codes": "; ".join(a.qualification_codes[:10]), "occupation_codes": "; ".join(a.occupation_codes[:10])} for a in assertions]
-            unit_rows = [{"unit_code": u.unit_code, "unit_title": u.unit_title, "skill_count": u.skill_count, "qualification_codes": "; ".join(u.qualification_codes[:10])} for u in units]
-            qual_rows = [{"qualification_code": q.qualification_code, "qualification_title": q.qualification_title, "unit_count": len(q.unit_codes), "skill_count": q.skill_count, "occupation_codes": "; ".join(q.occupation_codes[:10])} for q in qualifications]
-            occ_rows = [{"anzsco_code": o.anzsco_code, "anzsco_title": o.anzsco_title, "qualification_count": len(o.qualification_codes), "skill_count": o.skill_count} for o in occupations]
+            facet_columns = list(dict.fromkeys(fid for s in skills for fid in s.facets))
+            skill_columns = [
+                "skill_id", "preferred_label", "alternative_labels", "definition", "category",
+                "assertion_count", "trf_group", "ability_group", "progression_type",
+                "unit_codes", "qualification_codes", "occupation_codes",
+            ] + [f"facet_{fid}" for fid in facet_columns]
+
+            def skill_rows():
+                for s in skills:
+                    gi = skill_to_grp.get(s.skill_id, {})
+                    row = [
+                        s.skill_id, s.preferred_label, "; ".join(s.alternative_labels), s.definition,
+                        s.category, s.assertion_count, gi.get("trf_group", ""), gi.get("ability_group", ""),
+                        gi.get("progression_type", ""), "; ".join(s.unit_codes[:20]),
+                        "; ".join(s.qualification_codes[:10]), "; ".join(s.occupation_codes[:10]),
+                    ]
+                    row += [s.facets[fid].get("name", "") if fid in s.facets else None for fid in facet_columns]
+                    yield row
+
+            assertion_columns = ["assertion_id", "skill_id", "unit_code", "teaching_context", "level_of_engagement", "evidence", "keywords", "confidence", "qualification_codes", "occupation_codes"]
+            ac = assertions.columns
+            assertion_rows = ([aid, sid, uc, ctx, lvl, ev[:200], "; ".join(kw[:10]), conf, "; ".join(qcs[:10]), "; ".join(ocs[:10])]
+                              for aid, sid, uc, ctx, lvl, ev, kw, conf, qcs, ocs in zip(
+                                  ac["assertion_id"], ac["skill_id"], ac["unit_code"], ac["teaching_context"],
+                                  ac["level_of_engagement"], ac["evidence"], ac["keywords"], ac["confidence"],
+                                  ac["qualification_codes"], ac["occupation_codes"]))
+            unit_rows = ([u.unit_code, u.unit_title, u.skill_count, "; ".join(u.qualification_codes[:10])] for u in units)
+            qual_rows = ([q.qualification_code, q.qualification_title, len(q.unit_codes), q.skill_count, "; ".join(q.occupation_codes[:10])] for q in qualifications)
+            occ_rows = ([o.anzsco_code, o.anzsco_title, len(o.qualification_codes), o.skill_count] for o in occupations)
 
             # Ability groups sheet
             group_rows = []
@@ -560,28 +600,29 @@ class SkillAssertionPipeline:
                     for sc in grp.get("sub_clusters", []):
                         prog = sc.get("progression", [])
                         level_detail = " | ".join(f"L{r['level']}({r.get('skill_count',0)}): {'; '.join(r.get('skill_names',[])[:5])}" for r in prog[:7])
-                        group_rows.append({
-                            "tha_code": sc.get("cluster_id", ""),
-                            "ability_name": sc.get("label", ""),
-                            "trf_group": grp.get("label", ""),
-                            "total_skills": sc.get("total_skills", 0),
-                            "progression_type": sc.get("progression_type", ""),
-                            "level_span": f"{sc.get('level_span',[0,0])[0]}-{sc.get('level_span',[0,0])[1]}",
-                            "level_gaps": "; ".join(str(g) for g in sc.get("level_gaps", [])),
-                            "progression_detail": level_detail,
-                        })
-
-            with pd.ExcelWriter(output_path / "skill_assertion_export.xlsx", engine="openpyxl") as writer:
-                pd.DataFrame(skills_rows).to_excel(writer, sheet_name="Skills", index=False)
-                pd.DataFrame(assertion_rows).to_excel(writer, sheet_name="Assertions", index=False)
-                pd.DataFrame(unit_rows).to_excel(writer, sheet_name="Units", index=False)
-                pd.DataFrame(qual_rows).to_excel(writer, sheet_name="Qualifications", index=False)
-                pd.DataFrame(occ_rows).to_excel(writer, sheet_name="Occupations", index=False)
+                        group_rows.append([
+                            sc.get("cluster_id", ""),
+                            sc.get("label", ""),
+                            grp.get("label", ""),
+                            sc.get("total_skills", 0),
+                            sc.get("progression_type", ""),
+                            f"{sc.get('level_span',[0,0])[0]}-{sc.get('level_span',[0,0])[1]}",
+                            "; ".join(str(g) for g in sc.get("level_gaps", [])),
+                            level_detail,
+                        ])
+
+            excel_path = output_path / "skill_assertion_export.xlsx"
+            with StreamingExcelWriter(excel_path) as writer:
+                writer.write_sheet("Skills", skill_columns, skill_rows())
+                writer.write_sheet("Assertions", assertion_columns, assertion_rows, number_formats={"confidence": "0.00"})
+                writer.write_sheet("Units", ["unit_code", "unit_title", "skill_count", "qualification_codes"], unit_rows)
+                writer.write_sheet("Qualifications", ["qualification_code", "qualification_title", "unit_count", "skill_count", "occupation_codes"], qual_rows)
+                writer.write_sheet("Occupations", ["anzsco_code", "anzsco_title", "qualification_count", "skill_count"], occ_rows)
                 if group_rows:
-                    pd.DataFrame(group_rows).to_excel(writer, sheet_name="Ability Groups", index=False)
+                    writer.write_sheet("Ability Groups", ["tha_code", "ability_name", "trf_group", "total_skills", "progression_type", "level_span", "level_gaps", "progression_detail"], group_rows)
 
-            n_sheets = 5 + (1 if group_rows else 0)
-            logger.info(f"Exported Excel ({n_sheets} sheets): {output_path / 'skill_assertion_export.xlsx'}")
+            n_sheets = sum(len(parts) for parts in writer.sheet_names.values())
+            logger.info(f"Exported Excel ({n_sheets} sheets): {excel_path}")
         except Exception as e:
             logger.warning(f"Excel export failed: {e}")
 
@@ -23,6 +23,7 @@ from src.data_processing.data_preprocessor import SkillDataPreprocessor
 from src.interfaces.model_factory import ModelFactory
 from config.settings import CONFIG, get_config_profile
 from src.utils.converters import NpEncoder
+from src.export.excel_writer import write_excel
 
 # Configure logging
 logging.basicConfig(
@@ -231,7 +232,7 @@ class SkillTaxonomyPipeline:
             )
             
             self._log_deduplication_stats(df_with_duplicates)
-            df_with_duplicates.to_excel(output_path / "df_with_duplicates.xlsx", index=False)
+            write_excel(df_with_duplicates, output_path / "df_with_duplicates.xlsx")
             
             # Merge duplicates (preserves alternative titles)
             df_unique = self.deduplicator.merge_duplicates(df_with_duplicates)
@@ -243,7 +244,7 @@ class SkillTaxonomyPipeline:
             ).sum()
             logger.info(f"Total alternative titles preserved: {alt_titles_count}")
             
-            df_unique.to_excel(output_path / "df_unique.xlsx", index=False)
+            write_excel(df_unique, output_path / "df_unique.xlsx")
             
             # ================================================================
             # STEP 4: RE-GENERATE EMBEDDINGS FOR UNIQUE SKILLS
@@ -258,7 +259,7 @@ class SkillTaxonomyPipeline:
                 # Legacy clustering mode
                 logger.info("\n[Step 5/7] Clustering skills with multi-factor features...")
                 df_processed = self.clusterer.cluster_skills(df_unique, embeddings_unique)
-                df_processed.to_excel(output_path / "df_clustered.xlsx", index=False)
+                write_excel(df_processed, output_path / "df_clustered.xlsx")
                 self._log_clustering_stats(df_processed)
             else:
                 # Family assignment mode
@@ -268,7 +269,7 @@ class SkillTaxonomyPipeline:
                     self.family_assigner.use_genai = False
                 
                 df_processed = self.family_assigner.assign_families(df_unique, embeddings_unique)
-                df_processed.to_excel(output_path / "df_assigned.xlsx", index=False)
+                write_excel(df_processed, output_path / "df_assigned.xlsx")
                 self._log_family_assignment_stats(df_processed)
             
             # ================================================================
@@ -1544,8 +1544,10 @@ def export_taxonomy_to_excel(taxonomy_json_path: str, output_excel_path: str):
     
     print(f"Writing Excel file with {len(df)} skills...")
     
-    with pd.ExcelWriter(output_excel_path, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Skills Taxonomy', index=False)
+    from src.export.excel_writer import StreamingExcelWriter
+    
+    with StreamingExcelWriter(output_excel_path) as writer:
+        writer.write_frame('Skills Taxonomy', df)
         
         # Metadata sheet
         stats = taxonomy_data.get('metadata', {}).get('statistics', {})
@@ -1559,13 +1561,16 @@ def export_taxonomy_to_excel(taxonomy_json_path: str, output_excel_path: str):
             ['Total Related Codes', stats.get('total_related_codes', '')],
             ['Total Related Keywords', stats.get('total_related_keywords', '')],
         ], columns=['Property', 'Value'])
-        meta_df.to_excel(writer, sheet_name='Metadata', index=False)
+        writer.write_frame('Metadata', meta_df)
     
     print(f"✓ Excel file saved to: {output_excel_path}")
     return df
 
 
 if __name__ == '__main__':
+    # Make 'src' importable when run as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    
     taxonomy_path = "./output/taxonomy.json"
     html_output_path = './output/taxonomy_visualization.html'
     excel_output_path = './output/taxonomy_flat.xlsx'
@@ -135,40 +135,126 @@ class MultiDimensionalTaxonomyBuilder:
         return taxonomy
     
     def _calculate_cross_cutting_dimensions(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate all cross-cutting dimensions for skills"""
+        """Calculate all cross-cutting dimensions for skills (column-wise)"""
         df_enriched = df.copy()
         
         # 1. Complexity Level (map from SFIA level)
-        df_enriched['complexity_level'] = df_enriched['level'].apply(self._map_to_complexity_level)
+        df_enriched['complexity_level'] = self._map_column(df_enriched['level'], self._map_to_complexity_level)
+        
+        # Keyword dimensions all scan the same lower-cased name + description text;
+        # each distinct keyword is matched once over the whole column
+        texts = self._dimension_texts(df_enriched)
+        keyword_hits = {}
         
         # 2. Transferability Index
         if self.enable_transferability:
-            df_enriched['transferability'] = df_enriched.apply(
-                lambda row: self._calculate_transferability(row), axis=1
+            df_enriched['transferability'] = self._classify_by_keywords(
+                texts, self.transferability_types, 'sector_specific', keyword_hits
             )
         
         # 3. Digital Intensity
         if self.enable_digital_intensity:
-            df_enriched['digital_intensity'] = df_enriched.apply(
-                lambda row: self._calculate_digital_intensity(row), axis=1
-            )
+            df_enriched['digital_intensity'] = self._calculate_digital_intensity_column(texts, keyword_hits)
         
         # 4. Future-Readiness
         if self.enable_future_readiness:
-            df_enriched['future_readiness'] = df_enriched.apply(
-                lambda row: self._calculate_future_readiness(row), axis=1
+            df_enriched['future_readiness'] = self._classify_by_keywords(
+                texts, self.future_readiness, 'stable', keyword_hits
             )
         
         # 5. Skill Nature
         if self.enable_skill_nature:
-            df_enriched['skill_nature'] = df_enriched.apply(
-                lambda row: self._classify_skill_nature(row), axis=1
+            df_enriched['skill_nature'] = self._classify_by_keywords(
+                texts, self.skill_nature_types, 'process', keyword_hits
             )
         
+        # Per-skill values reused by every node's statistics
+        df_enriched['_level_value'] = self._map_column(df_enriched['level'], self._extract_level_value)
+        for col in ('alternative_titles', 'all_related_kw', 'all_related_codes'):
+            if col in df_enriched.columns:
+                df_enriched[f'_{col}_count'] = self._list_lengths(df_enriched[col])
+        
         logger.info(f"  ✓ Calculated cross-cutting dimensions for {len(df_enriched)} skills")
         
         return df_enriched
     
+    @staticmethod
+    def _map_column(values: pd.Series, func) -> np.ndarray:
+        """Apply a scalar mapping once per distinct value and gather by category code"""
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        mapped = np.array([func(v) for v in uniques], dtype=int)
+        return mapped[codes]
+    
+    @staticmethod
+    def _list_lengths(values: pd.Series) -> np.ndarray:
+        """Length of each list value (0 for anything else)"""
+        return np.fromiter((len(x) if isinstance(x, list) else 0 for x in values),
+                           dtype=np.int64, count=len(values))
+    
+    @staticmethod
+    def _dimension_texts(df: pd.DataFrame) -> pd.Series:
+        """Lower-cased 'name description' text that keyword dimensions scan"""
+        names = df['name'].map(str) if 'name' in df.columns else pd.Series('', index=df.index)
+        descriptions = df['description'].map(str) if 'description' in df.columns else pd.Series('', index=df.index)
+        return (names + ' ' + descriptions).str.lower()
+    
+    @staticmethod
+    def _keyword_present(texts: pd.Series, keyword: str, keyword_hits: Dict[str, np.ndarray]) -> np.ndarray:
+        """Substring presence of one keyword in every text, memoized across dimensions"""
+        if keyword not in keyword_hits:
+            keyword_hits[keyword] = np.fromiter((keyword in text for text in texts),
+                                                dtype=bool, count=len(texts))
+        return keyword_hits[keyword]
+    
+    def _keyword_counts(self, texts: pd.Series, keywords: List[str],
+                        keyword_hits: Dict[str, np.ndarray]) -> np.ndarray:
+        """Number of listed keywords contained in each text"""
+        counts = np.zeros(len(texts), dtype=np.int64)
+        for kw in keywords:
+            counts += self._keyword_present(texts, kw, keyword_hits)
+        return counts
+    
+    def _classify_by_keywords(self, texts: pd.Series, types: Dict, default: str,
+                              keyword_hits: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Pick the type whose keywords occur most often in each text
+        
+        Ties go to the first type in definition order; texts with no matches
+        get the default.
+        """
+        if not types:
+            return np.full(len(texts), default, dtype=object)
+        
+        type_keys = list(types.keys())
+        scores = np.column_stack([
+            self._keyword_counts(texts, info.get('keywords', []), keyword_hits)
+            for info in types.values()
+        ])
+        best = scores.argmax(axis=1)
+        labels = np.array(type_keys, dtype=object)[best]
+        labels[scores[np.arange(len(texts)), best] == 0] = default
+        return labels
+    
+    def _calculate_digital_intensity_column(self, texts: pd.Series,
+                                            keyword_hits: Dict[str, np.ndarray]) -> np.ndarray:
+        """Calculate digital intensity level (0-4) for every text"""
+        frontier_keywords = ['ai', 'artificial intelligence', 'machine learning', 'blockchain', 'quantum']
+        high_digital_keywords = ['software', 'programming', 'code', 'algorithm', 'digital', 'data', 'ai', 'machine learning']
+        medium_digital_keywords = ['computer', 'email', 'spreadsheet', 'database', 'online', 'web']
+        low_digital_keywords = ['technology', 'electronic', 'automated']
+        
+        # Rules are checked in order, first match wins
+        return np.select(
+            [
+                self._keyword_counts(texts, frontier_keywords, keyword_hits) > 0,
+                self._keyword_counts(texts, high_digital_keywords, keyword_hits) >= 2,
+                self._keyword_counts(texts, medium_digital_keywords, keyword_hits) >= 2,
+                self._keyword_counts(texts, low_digital_keywords, keyword_hits) > 0,
+            ],
+            [4, 3, 2, 1],
+            default=0
+        )
+    
     def _map_to_complexity_level(self, level) -> int:
         """Map SFIA level (1-7) to complexity level (1-5)"""
         if hasattr(level, 'value'):
@@ -190,82 +276,6 @@ class MultiDimensionalTaxonomyBuilder:
         # else:
         #     return 5  # Expert
     
-    def _calculate_transferability(self, row: pd.Series) -> str:
-        """Calculate transferability index for a skill"""
-        text = str(row.get('name', '')) + ' ' + str(row.get('description', ''))
-        text = text.lower()
-        
-        scores = {}
-        for trans_type, trans_info in self.transferability_types.items():
-            keywords = trans_info.get('keywords', [])
-            score = sum(1 for kw in keywords if kw in text)
-            scores[trans_type] = score
-        
-        if not scores:
-            return 'sector_specific'
-        
-        max_type = max(scores, key=scores.get)
-        return max_type if scores[max_type] > 0 else 'sector_specific'
-    
-    def _calculate_digital_intensity(self, row: pd.Series) -> int:
-        """Calculate digital intensity level (0-4)"""
-        text = str(row.get('name', '')) + ' ' + str(row.get('description', ''))
-        text = text.lower()
-        
-        high_digital_keywords = ['software', 'programming', 'code', 'algorithm', 'digital', 'data', 'ai', 'machine learning']
-        medium_digital_keywords = ['computer', 'email', 'spreadsheet', 'database', 'online', 'web']
-        low_digital_keywords = ['technology', 'electronic', 'automated']
-        
-        if any(kw in text for kw in ['ai', 'artificial intelligence', 'machine learning', 'blockchain', 'quantum']):
-            return 4
-        
-        high_count = sum(1 for kw in high_digital_keywords if kw in text)
-        if high_count >= 2:
-            return 3
-        
-        medium_count = sum(1 for kw in medium_digital_keywords if kw in text)
-        if medium_count >= 2:
-            return 2
-        
-        if any(kw in text for kw in low_digital_keywords):
-            return 1
-        
-        return 0
-    
-    def _calculate_future_readiness(self, row: pd.Series) -> str:
-        """Calculate future-readiness category"""
-        text = str(row.get('name', '')) + ' ' + str(row.get('description', ''))
-        text = text.lower()
-        
-        scores = {}
-        for readiness_type, readiness_info in self.future_readiness.items():
-            keywords = readiness_info.get('keywords', [])
-            score = sum(1 for kw in keywords if kw in text)
-            scores[readiness_type] = score
-        
-        if not scores:
-            return 'stable'
-        
-        max_type = max(scores, key=scores.get)
-        return max_type if scores[max_type] > 0 else 'stable'
-    
-    def _classify_skill_nature(self, row: pd.Series) -> str:
-        """Classify the nature of the skill"""
-        text = str(row.get('name', '')) + ' ' + str(row.get('description', ''))
-        text = text.lower()
-        
-        scores = {}
-        for nature_type, nature_info in self.skill_nature_types.items():
-            keywords = nature_info.get('keywords', [])
-            score = sum(1 for kw in keywords if kw in text)
-            scores[nature_type] = score
-        
-        if not scores:
-            return 'process'
-        
-        max_type = max(scores, key=scores.get)
-        return max_type if scores[max_type] > 0 else 'process'
-    
     def _build_four_level_hierarchy(self, df: pd.DataFrame) -> Dict:
         """
         Build the 4-level taxonomy hierarchy
@@ -287,12 +297,14 @@ class MultiDimensionalTaxonomyBuilder:
             "children": []
         }
         
+        # Row positions per domain, in original row order
+        domain_groups = df.groupby('assigned_domain', sort=False).indices
+        
         # Level 1: Domains
         for domain_key, domain_info in self.domains.items():
-            domain_skills = df[df['assigned_domain'] == domain_key]
-            
-            if len(domain_skills) == 0:
+            if domain_key not in domain_groups:
                 continue
+            domain_skills = df.iloc[domain_groups[domain_key]]
             
             domain_node = {
                 "name": domain_info['name'],
@@ -306,16 +318,10 @@ class MultiDimensionalTaxonomyBuilder:
             }
             
             # Level 2: Families within domain
-            domain_families = domain_skills['assigned_family'].unique()
+            family_groups = domain_skills.groupby('assigned_family', sort=False).indices
             
-            for family_key in sorted(domain_families):
-                if pd.isna(family_key):
-                    continue
-                    
-                family_skills = domain_skills[domain_skills['assigned_family'] == family_key]
-                
-                if len(family_skills) == 0:
-                    continue
+            for family_key in sorted(family_groups):
+                family_skills = domain_skills.iloc[family_groups[family_key]]
                 
                 family_info = self.families.get(family_key, {'name': family_key.replace('_', ' ').title()})
                 
@@ -355,7 +361,7 @@ class MultiDimensionalTaxonomyBuilder:
         groups = []
         
         # Get complexity levels present in this family
-        complexity_levels = sorted(family_df['complexity_level'].unique())
+        level_groups = family_df.groupby('complexity_level', sort=True).indices
         
         level_names = {
             1: "FOLLOW",
@@ -365,11 +371,8 @@ class MultiDimensionalTaxonomyBuilder:
             5: "ENSURE_ADVISE"
         }
         
-        for complexity_level in complexity_levels:
-            level_skills = family_df[family_df['complexity_level'] == complexity_level]
-            
-            if len(level_skills) == 0:
-                continue
+        for complexity_level, positions in level_groups.items():
+            level_skills = family_df.iloc[positions]
             
             # Create group name
             level_name = level_names.get(complexity_level, f"Level {complexity_level}")
@@ -428,7 +431,8 @@ class MultiDimensionalTaxonomyBuilder:
         """Create list of skill dictionaries with full metadata including alternative titles and aggregated data"""
         skills = []
         
-        for _, skill in skills_df.iterrows():
+        columns = skills_df.columns
+        for skill in skills_df.to_dict('records'):
             skill_dict = {
                 "id": skill.get('skill_id', ''),
                 "name": skill.get('name', ''),
@@ -473,11 +477,11 @@ class MultiDimensionalTaxonomyBuilder:
             }
             
             # Add merge info if present
-            if 'merge_count' in skill and pd.notna(skill.get('merge_count')):
+            if 'merge_count' in columns and pd.notna(skill.get('merge_count')):
                 skill_dict['merged_from_count'] = int(skill.get('merge_count', 1))
             
             # Add relationships if present
-            if 'relationships' in skill:
+            if 'relationships' in columns:
                 skill_dict['relationships'] = skill['relationships']
             
             skills.append(skill_dict)
@@ -519,33 +523,34 @@ class MultiDimensionalTaxonomyBuilder:
         
         # Level statistics
         if 'level' in df.columns:
-            levels = df['level'].apply(self._extract_level_value)
+            levels = self._column_values(df, '_level_value', 'level', self._map_column, self._extract_level_value)
             stats['level_range'] = [int(levels.min()), int(levels.max())]
             stats['avg_level'] = float(levels.mean())
         
         # Alternative titles count
         if 'alternative_titles' in df.columns:
-            alt_count = df['alternative_titles'].apply(
-                lambda x: len(x) if isinstance(x, list) else 0
-            ).sum()
-            stats['alternative_titles_count'] = int(alt_count)
+            stats['alternative_titles_count'] = int(self._column_values(
+                df, '_alternative_titles_count', 'alternative_titles', self._list_lengths).sum())
         
         # Aggregated keywords count
         if 'all_related_kw' in df.columns:
-            kw_count = df['all_related_kw'].apply(
-                lambda x: len(x) if isinstance(x, list) else 0
-            ).sum()
-            stats['total_related_keywords'] = int(kw_count)
+            stats['total_related_keywords'] = int(self._column_values(
+                df, '_all_related_kw_count', 'all_related_kw', self._list_lengths).sum())
         
         # Aggregated codes count
         if 'all_related_codes' in df.columns:
-            codes_count = df['all_related_codes'].apply(
-                lambda x: len(x) if isinstance(x, list) else 0
-            ).sum()
-            stats['total_related_codes'] = int(codes_count)
+            stats['total_related_codes'] = int(self._column_values(
+                df, '_all_related_codes_count', 'all_related_codes', self._list_lengths).sum())
         
         return stats
     
+    @staticmethod
+    def _column_values(df: pd.DataFrame, precomputed: str, source: str, compute, *args) -> np.ndarray:
+        """Use a per-skill column precomputed in _calculate_cross_cutting_dimensions if present"""
+        if precomputed in df.columns:
+            return df[precomputed].to_numpy()
+        return compute(df[source], *args)
+    
     def _extract_level_value(self, level) -> int:
         """Extract numeric level value"""
         if hasattr(level, 'value'):
@@ -561,45 +566,62 @@ class MultiDimensionalTaxonomyBuilder:
         logger.info("  Building skill relationships...")
         
         # Create skill index
-        skill_index = {row['skill_id']: idx for idx, row in df.iterrows()}
+        skill_index = dict(zip(df['skill_id'], df.index))
         
         similarity_threshold = self.hierarchy_config.get('relationship_similarity_threshold', 0.75)
         max_related = self.hierarchy_config.get('max_related_skills', 5)
+        block_size = self.hierarchy_config.get('relationship_block_size', 1024)
+        
+        # Collect every skill in the tree, then score them in blocks
+        tree_skills = []
         
-        def add_relationships_to_skills(node):
+        def collect_skills(node):
             if 'skills' in node and node['skills']:
                 for skill in node['skills']:
-                    skill_id = skill['id']
-                    if skill_id in skill_index:
-                        idx = skill_index[skill_id]
-                        
-                        # Find similar skills
-                        similarities = np.dot(embeddings, embeddings[idx])
-                        similar_indices = np.argsort(similarities)[::-1][1:max_related+1]
-                        
-                        related_skills = []
-                        for sim_idx in similar_indices:
-                            if similarities[sim_idx] >= similarity_threshold:
-                                related_id = df.iloc[sim_idx]['skill_id']
-                                related_skills.append({
-                                    'skill_id': related_id,
-                                    'skill_name': df.iloc[sim_idx]['name'],
-                                    'similarity': float(similarities[sim_idx]),
-                                    'relationship_type': 'related'
-                                })
-                        
-                        if related_skills:
-                            skill['relationships'] = {
-                                'related': related_skills,
-                                'prerequisites': [],
-                                'co_occurring': []
-                            }
+                    if skill['id'] in skill_index:
+                        tree_skills.append(skill)
             
             if 'children' in node:
                 for child in node['children']:
-                    add_relationships_to_skills(child)
+                    collect_skills(child)
+        
+        collect_skills(taxonomy)
+        
+        skill_ids = df['skill_id'].to_numpy()
+        skill_names = df['name'].to_numpy()
+        n_top = min(max_related + 1, len(embeddings))
+        
+        for start in range(0, len(tree_skills), block_size):
+            block_skills = tree_skills[start:start + block_size]
+            block_rows = np.array([skill_index[skill['id']] for skill in block_skills])
+            
+            # Find similar skills: top max_related + 1 by similarity, dropping the first (the skill itself)
+            similarities = embeddings[block_rows] @ embeddings.T
+            top = np.argpartition(-similarities, n_top - 1, axis=1)[:, :n_top]
+            top_sims = np.take_along_axis(similarities, top, axis=1)
+            order = np.argsort(-top_sims, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)[:, 1:]
+            top_sims = np.take_along_axis(top_sims, order, axis=1)[:, 1:]
+            
+            for skill, sim_indices, sims in zip(block_skills, top, top_sims):
+                related_skills = [
+                    {
+                        'skill_id': skill_ids[sim_idx],
+                        'skill_name': skill_names[sim_idx],
+                        'similarity': float(sim),
+                        'relationship_type': 'related'
+                    }
+                    for sim_idx, sim in zip(sim_indices, sims)
+                    if sim >= similarity_threshold
+                ]
+                
+                if related_skills:
+                    skill['relationships'] = {
+                        'related': related_skills,
+                        'prerequisites': [],
+                        'co_occurring': []
+                    }
         
-        add_relationships_to_skills(taxonomy)
         logger.info(f"  ✓ Added skill relationships")
         
         return taxonomy
@@ -608,13 +630,13 @@ class MultiDimensionalTaxonomyBuilder:
         """Add comprehensive metadata to taxonomy"""
         
         # Count alternative titles
-        total_alt_titles = df['alternative_titles'].apply(
-            lambda x: len(x) if isinstance(x, list) else 0
+        total_alt_titles = self._column_values(
+            df, '_alternative_titles_count', 'alternative_titles', self._list_lengths
         ).sum() if 'alternative_titles' in df.columns else 0
         
         # Count aggregated keywords and codes
-        total_related_kw = df['all_related_kw'].apply(
-            lambda x: len(x) if isinstance(x, list) else 0
+        total_related_kw = self._column_values(
+            df, '_all_related_kw_count', 'all_related_kw', self._list_lengths
         ).sum() if 'all_related_kw' in df.columns else 0
         
         # Count unique unit codes across all skills
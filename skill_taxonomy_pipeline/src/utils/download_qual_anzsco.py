@@ -20,8 +20,12 @@ import json
 import time
 import re
 import os
+import hashlib
 import logging
+import threading
 import requests
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from multiprocessing import Pool, Manager, cpu_count
 from functools import partial
@@ -97,6 +101,7 @@ class ANZSCOLookup:
     def __init__(self, cache_dir=None):
         self.anzsco_data = {}
         self._loaded = False
+        self._search_index = None
         self.cache_dir = cache_dir or os.path.dirname(os.path.abspath(__file__))
     
     def _get_cache_path(self):
@@ -115,6 +120,7 @@ class ANZSCOLookup:
                     if (datetime.now() - cache_date).days < 30:
                         self.anzsco_data = cached.get('data', {})
                         self._loaded = True
+                        self._search_index = None
                         logger.info(f"Loaded {len(self.anzsco_data)} ANZSCO codes from cache")
                         return True
             except Exception as e:
@@ -191,6 +197,7 @@ class ANZSCOLookup:
                             self.anzsco_data[code] = f"{title} (retired {effective_to})"
             
             self._loaded = True
+            self._search_index = None
             logger.info(f"Loaded {len(self.anzsco_data)} ANZSCO codes from NCVER")
             
             # Save to cache
@@ -236,6 +243,7 @@ class ANZSCOLookup:
                             self.anzsco_data[code] = f"{title} (retired {effective_to})"
             
             self._loaded = True
+            self._search_index = None
             logger.info(f"Loaded {len(self.anzsco_data)} ANZSCO codes from file")
             return True
             
@@ -286,21 +294,47 @@ class ANZSCOLookup:
         
         return hierarchy
     
+    def _build_search_index(self):
+        """
+        Build the title search index: every suffix of every lower-cased title,
+        sorted, with the position of the code it came from. A substring of a
+        title is a prefix of one of its suffixes, so a query is a bisect range.
+        """
+        codes = list(self.anzsco_data)
+        entries = sorted(
+            (title[start:], position)
+            for position, title in enumerate(self.anzsco_data[code].lower() for code in codes)
+            for start in range(len(title))
+        )
+        self._search_index = (codes, [suffix for suffix, _ in entries], [position for _, position in entries])
+        logger.debug(f"Built ANZSCO search index: {len(entries)} title suffixes")
+    
     def search_by_title(self, keyword, limit=20):
-        """Search ANZSCO codes by title keyword"""
+        """
+        Search ANZSCO codes by title keyword
+        
+        Matches titles containing the keyword (case-insensitive), like a
+        substring scan, but from the suffix index. Results keep the
+        reference file order.
+        """
         if not self._loaded:
             self.load_from_ncver()
+        if self._search_index is None:
+            self._build_search_index()
         
+        codes, suffixes, suffix_positions = self._search_index
         keyword = keyword.lower()
-        results = []
-        
-        for code, title in self.anzsco_data.items():
-            if keyword in title.lower():
-                results.append({'code': code, 'title': title})
-                if len(results) >= limit:
+        if not keyword:
+            positions = range(min(limit, len(codes)))
+        else:
+            matches = set()
+            for i in range(bisect_left(suffixes, keyword), len(suffixes)):
+                if not suffixes[i].startswith(keyword):
                     break
+                matches.add(suffix_positions[i])
+            positions = sorted(matches)[:limit]
         
-        return results
+        return [{'code': codes[p], 'title': self.anzsco_data[codes[p]]} for p in positions]
 
 
 # Global lookup instance
@@ -428,13 +462,37 @@ class TGAANZSCOExtractor:
     Extract ANZSCO codes from TGA API using the Classifications field
     """
     
-    def __init__(self, username, password, use_sandbox=True):
+    def __init__(self, username, password, use_sandbox=True, service_url=None,
+                 max_retries=3, backoff_seconds=1.0, request_interval=0.0, search_workers=4):
+        """
+        Args:
+            username: TGA API username
+            password: TGA API password
+            use_sandbox: Use sandbox environment
+            service_url: WSDL URL overriding the TGA endpoint (e.g. a local SOAP stub)
+            max_retries: Retries per request after the first failure
+            backoff_seconds: Initial retry delay, doubled on each retry
+            request_interval: Minimum seconds between requests from this client
+            search_workers: Search result pages fetched at once
+        """
         self.username = username
         self.password = password
         self.wsse = UsernameToken(username, password)
         
-        base_url = "https://ws.sandbox.training.gov.au" if use_sandbox else "https://ws.training.gov.au"
-        self.service_url = f"{base_url}/Deewr.Tga.WebServices/TrainingComponentServiceV2.svc?wsdl"
+        if service_url:
+            self.service_url = service_url
+        else:
+            base_url = "https://ws.sandbox.training.gov.au" if use_sandbox else "https://ws.training.gov.au"
+            self.service_url = f"{base_url}/Deewr.Tga.WebServices/TrainingComponentServiceV2.svc?wsdl"
+        
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.request_interval = request_interval
+        self.search_workers = search_workers
+        self._last_request = 0.0
+        self._throttle_lock = threading.Lock()
+        self._local = threading.local()
+        self._owner_thread = threading.get_ident()
         
         self.client = None
         self._init_client()
@@ -448,11 +506,43 @@ class TGAANZSCOExtractor:
             logger.error(f"Failed to initialize client: {e}")
             raise
     
+    def _thread_client(self):
+        """SOAP client for the calling thread; threads other than the creator get their own"""
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self.client if threading.get_ident() == self._owner_thread \
+                else Client(self.service_url, wsse=self.wsse)
+            self._local.client = client
+        return client
+    
+    def _throttle(self, interval):
+        """Wait for this client's next request slot, `interval` seconds after the previous one"""
+        with self._throttle_lock:
+            slot = max(time.monotonic(), self._last_request + interval)
+            self._last_request = slot
+        wait = slot - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _call(self, operation, request, interval=None):
+        """Call a service operation, throttled and retried with exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            self._throttle(self.request_interval if interval is None else interval)
+            
+            try:
+                return getattr(self._thread_client().service, operation)(request)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_seconds * 2 ** attempt
+                logger.warning(f"{operation} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
     def get_qualification_details(self, code):
         """Get full details for a qualification including classifications"""
         try:
             request = {'Code': code, 'IncludeLegacyData': False}
-            response = self.client.service.GetDetails(request)
+            response = self._call('GetDetails', request)
             
             if response:
                 return serialize_object(response)
@@ -498,72 +588,127 @@ class TGAANZSCOExtractor:
         return result
     
     def search_all_qualifications(self):
-        """Search for all qualifications"""
+        """
+        Search for all qualifications
+        
+        The first page gives the total result count; the remaining pages are
+        then fetched search_workers at a time. Without a request rate limit,
+        page requests are still spaced 0.2s apart.
+        """
         logger.info("Searching for all qualifications...")
         
-        all_qualifications = []
-        page_number = 0
         page_size = 100
+        interval = self.request_interval or 0.2
         
         try:
-            while True:
-                request = {
-                    'SearchCode': True,
-                    'SearchTitle': True,
-                    'PageNumber': page_number,
-                    'PageSize': page_size,
-                    'TrainingComponentTypes': {
-                        'IncludeQualification': True,
-                    }
-                }
-                
-                response = self.client.service.Search(request)
-                
-                if not hasattr(response, 'Results') or not response.Results:
-                    break
-                
-                if hasattr(response.Results, 'TrainingComponentSummary'):
-                    summaries = response.Results.TrainingComponentSummary
-                    if not isinstance(summaries, list):
-                        summaries = [summaries]
-                    
-                    for summary in summaries:
-                        if hasattr(summary, 'ComponentType'):
-                            comp_types = summary.ComponentType
-                            if not isinstance(comp_types, list):
-                                comp_types = [comp_types]
-                            
-                            if 'Qualification' in comp_types:
-                                all_qualifications.append({
-                                    'code': summary.Code,
-                                    'title': summary.Title if hasattr(summary, 'Title') else ''
-                                })
-                    
-                    logger.info(f"Page {page_number + 1}: {len(all_qualifications)} qualifications found")
-                    
-                    if len(summaries) < page_size:
-                        break
-                else:
-                    break
-                
-                page_number += 1
-                time.sleep(0.2)
+            response = self._search_page(0, page_size, interval)
+            pages = [self._page_qualifications(response)]
+            total = getattr(response, 'Count', None)
+            
+            if total:
+                # Pages are independent once the count is known
+                page_numbers = range(1, -(-int(total) // page_size))
+                with ThreadPoolExecutor(max_workers=max(1, self.search_workers)) as executor:
+                    responses = executor.map(lambda n: self._search_page(n, page_size, interval), page_numbers)
+                    for page_number, response in zip(page_numbers, responses):
+                        pages.append(self._page_qualifications(response))
+                        logger.info(f"Page {page_number + 1}: {sum(len(p) for p in pages)} qualifications found")
+            else:
+                # No count reported: page until a short page
+                page_number = 0
+                while self._page_size(response) == page_size:
+                    page_number += 1
+                    response = self._search_page(page_number, page_size, interval)
+                    pages.append(self._page_qualifications(response))
+                    logger.info(f"Page {page_number + 1}: {sum(len(p) for p in pages)} qualifications found")
             
+            all_qualifications = [q for page in pages for q in page]
             logger.info(f"Total qualifications found: {len(all_qualifications)}")
             return all_qualifications
             
         except Exception as e:
             logger.error(f"Error searching qualifications: {e}")
-            return all_qualifications
+            return []
+    
+    def _search_page(self, page_number, page_size, interval):
+        request = {
+            'SearchCode': True,
+            'SearchTitle': True,
+            'PageNumber': page_number,
+            'PageSize': page_size,
+            'TrainingComponentTypes': {
+                'IncludeQualification': True,
+            }
+        }
+        return self._call('Search', request, interval=interval)
+    
+    @staticmethod
+    def _page_summaries(response):
+        results = getattr(response, 'Results', None)
+        summaries = getattr(results, 'TrainingComponentSummary', None) if results else None
+        if summaries is None:
+            return []
+        return summaries if isinstance(summaries, list) else [summaries]
+    
+    @classmethod
+    def _page_size(cls, response):
+        return len(cls._page_summaries(response))
+    
+    @classmethod
+    def _page_qualifications(cls, response):
+        """Qualifications among one search page's results"""
+        qualifications = []
+        for summary in cls._page_summaries(response):
+            if hasattr(summary, 'ComponentType'):
+                comp_types = summary.ComponentType
+                if not isinstance(comp_types, list):
+                    comp_types = [comp_types]
+                
+                if 'Qualification' in comp_types:
+                    qualifications.append({
+                        'code': summary.Code,
+                        'title': summary.Title if hasattr(summary, 'Title') else '',
+                        'release': _summary_release(summary)
+                    })
+        return qualifications
 
 
-def process_single_qualification(qual_info, username, password, use_sandbox):
+def _summary_release(summary):
+    """
+    Marker that changes when a search result gets a new release
+    
+    Built from the release fields; a summary without them is marked with a
+    hash of everything the search returned for it.
+    """
+    parts = [str(getattr(summary, name, None)) for name in ('ReleaseNumber', 'UpdatedDate', 'CurrencyStatus')
+             if getattr(summary, name, None) is not None]
+    if parts:
+        return '|'.join(parts)
+    content = json.dumps(serialize_object(summary), sort_keys=True, default=str)
+    return 'content:' + hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+# Per-process extractor, so each worker initialises one SOAP client
+_worker_extractor = None
+_worker_key = None
+
+def _get_worker_extractor(username, password, use_sandbox, **client_kwargs):
+    """Get this process's extractor, creating it on first use"""
+    global _worker_extractor, _worker_key
+    key = (username, password, use_sandbox, tuple(sorted(client_kwargs.items())))
+    if _worker_extractor is None or _worker_key != key:
+        _worker_extractor = TGAANZSCOExtractor(username, password, use_sandbox, **client_kwargs)
+        _worker_key = key
+    return _worker_extractor
+
+
+def process_single_qualification(qual_info, username, password, use_sandbox, **client_kwargs):
     """
     Process a single qualification - used for multiprocessing.
-    Creates a new client connection for each process.
+    Reuses one client connection per worker process.
     """
     try:
-        extractor = TGAANZSCOExtractor(username, password, use_sandbox)
+        extractor = _get_worker_extractor(username, password, use_sandbox, **client_kwargs)
         result = extractor.get_qualification_anzsco(qual_info['code'])
         
         if result.get('anzsco_code'):
@@ -582,11 +727,39 @@ def process_single_qualification(qual_info, username, password, use_sandbox):
         }
 
 
+PROGRESS_FILE = 'anzsco_progress.jsonl'
+
+
+def _load_progress(progress_file):
+    """Read the progress journal: qualification code -> latest entry"""
+    progress = {}
+    if not os.path.exists(progress_file):
+        return progress
+    with open(progress_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                progress[entry['code']] = entry
+            except (ValueError, KeyError):
+                # A run killed mid-write can leave a partial last line
+                continue
+    return progress
+
+
 def download_all_anzsco(username, password, use_sandbox=True, output_dir='anzsco_output', 
-                        num_processes=None, anzsco_file=None):
+                        num_processes=None, anzsco_file=None, resume=True,
+                        max_requests_per_second=None, max_retries=3, service_url=None,
+                        max_attempts=3):
     """
     Download ANZSCO classifications for all qualifications.
     
+    Each finished qualification is appended to a progress journal in
+    output_dir, so an interrupted run picks up where it stopped. A rerun
+    only fetches qualifications that are new, whose release marker from the
+    search results has changed, or that failed on fewer than max_attempts
+    runs for their current release. Failures are journaled with their
+    attempt count.
+    
     Args:
         username: TGA API username
         password: TGA API password
@@ -595,6 +768,11 @@ def download_all_anzsco(username, password, use_sandbox=True, output_dir='anzsco
         num_processes: Number of parallel processes (default: CPU count - 1)
         anzsco_file: Path to local ANZSCO reference file (optional)
                      Download from: https://www.ncver.edu.au/__data/assets/file/0025/9664/ANZSCO-2022-revised-April-2023.txt
+        resume: Reuse journaled results from earlier runs (default True)
+        max_requests_per_second: Request rate cap shared across all processes
+        max_retries: Retries with exponential backoff per failed request
+        service_url: WSDL URL overriding the TGA endpoint (e.g. a local SOAP stub)
+        max_attempts: Runs that may fail to fetch a qualification before it is no longer retried
     """
     os.makedirs(output_dir, exist_ok=True)
     setup_logging(output_dir)
@@ -622,32 +800,77 @@ def download_all_anzsco(username, password, use_sandbox=True, output_dir='anzsco
             logger.warning("  https://www.ncver.edu.au/__data/assets/file/0025/9664/ANZSCO-2022-revised-April-2023.txt")
             logger.warning("Then pass the path using anzsco_file parameter")
     
+    if num_processes is None:
+        num_processes = max(1, cpu_count() - 1)
+    
+    # Each worker process gets an equal share of the overall request rate
+    request_interval = 1.0 / max_requests_per_second if max_requests_per_second else 0.0
+    client_kwargs = {
+        'service_url': service_url,
+        'max_retries': max_retries,
+        'request_interval': request_interval * num_processes
+    }
+    
     # Get list of qualifications
-    extractor = TGAANZSCOExtractor(username, password, use_sandbox)
+    extractor = TGAANZSCOExtractor(username, password, use_sandbox, service_url=service_url,
+                                   max_retries=max_retries, request_interval=request_interval)
     qualifications = extractor.search_all_qualifications()
     
     if not qualifications:
         logger.error("No qualifications found!")
         return None
     
-    # Set up multiprocessing
-    if num_processes is None:
-        num_processes = max(1, cpu_count() - 1)
+    # Work out what still needs fetching
+    progress_file = os.path.join(output_dir, PROGRESS_FILE)
+    progress = _load_progress(progress_file) if resume else {}
+    if not resume and os.path.exists(progress_file):
+        os.remove(progress_file)
+    
+    def needs_fetch(qual):
+        entry = progress.get(qual['code'])
+        if entry is None or entry.get('release') != qual.get('release'):
+            return True
+        return 'error' in entry['result'] and entry.get('attempts', 1) < max_attempts
     
-    logger.info(f"Processing {len(qualifications)} qualifications with {num_processes} processes...")
+    pending = [q for q in qualifications if needs_fetch(q)]
+    given_up = sum(1 for q in qualifications
+                   if q['code'] in progress and 'error' in progress[q['code']]['result'] and not needs_fetch(q))
+    logger.info(f"{len(qualifications) - len(pending)} qualifications up to date in {progress_file}")
+    if given_up:
+        logger.warning(f"Not retrying {given_up} qualifications that failed {max_attempts} times "
+                       f"(use resume=False to retry them)")
+    logger.info(f"Processing {len(pending)} qualifications with {num_processes} processes...")
     
-    # Process qualifications
+    # Process qualifications, journaling each result as it arrives
     start_time = time.time()
     
     process_func = partial(
         process_single_qualification,
         username=username,
         password=password,
-        use_sandbox=use_sandbox
+        use_sandbox=use_sandbox,
+        **client_kwargs
     )
     
-    with Pool(processes=num_processes) as pool:
-        results = pool.map(process_func, qualifications)
+    if pending:
+        releases = {q['code']: q.get('release') for q in pending}
+        with open(progress_file, 'a', encoding='utf-8') as journal, Pool(processes=num_processes) as pool:
+            for done, result in enumerate(pool.imap_unordered(process_func, pending), 1):
+                code = result['qualification_code']
+                entry = {'code': code, 'release': releases.get(code), 'result': result}
+                if result.get('error'):
+                    # Journaled with its attempt count; retried until max_attempts
+                    previous = progress.get(code)
+                    same_release = previous is not None and previous.get('release') == entry['release'] \
+                        and 'error' in previous['result']
+                    entry['attempts'] = previous.get('attempts', 1) + 1 if same_release else 1
+                journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                journal.flush()
+                progress[code] = entry
+                if done % 100 == 0:
+                    logger.info(f"Progress: {done}/{len(pending)} qualifications")
+    
+    results = [progress[q['code']]['result'] for q in qualifications]
     
     elapsed_time = time.time() - start_time
     
@@ -865,8 +1088,8 @@ def main():
         num_procs = input(f"Number of processes [{max(1, cpu_count()-1)}]: ").strip()
         num_processes = int(num_procs) if num_procs else None
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_dir = f'anzsco_output_{timestamp}'
+        # Fixed folder so an interrupted extraction resumes on the next run
+        output_dir = 'anzsco_output'
         
         download_all_anzsco(
             username, password, use_sandbox,
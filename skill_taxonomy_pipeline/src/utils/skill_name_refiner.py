@@ -10,11 +10,17 @@ Example:
     Refined: "Canine Body Language Reading"
 
 Uses vLLM batch processing with one prompt per skill for efficient large-scale refinement.
+Identical skills are refined once, results are cached by original skill and
+prompt version, and refinement and domain validation batches run as one
+bounded-concurrency pipeline.
 """
 
+import hashlib
 import logging
 import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -254,6 +260,19 @@ class SkillNameRefiner:
         # Processing settings
         self.batch_size = self.config.get('batch_size', 20)
         self.max_retries = self.config.get('max_retries', 3)
+        # Interfaces that are not thread-safe (vLLM) get all prompts of a stage in one batch call
+        self.concurrent_requests = getattr(genai_interface, 'supports_concurrent_requests', False)
+        self.max_concurrent_batches = self.config.get('max_concurrent_batches', 4) \
+            if self.concurrent_requests else 1
+        # 'context' refines each distinct (name, description, unit title) once;
+        # 'name' refines each distinct name once using its first occurrence
+        self.dedupe_by = self.config.get('refinement_dedupe_by', 'context')
+        
+        # Refinement cache: in memory, plus an append-only JSONL file if configured
+        self.prompt_version = self._prompt_version()
+        self.model_id = self._model_id()
+        self.cache_path = self._get_cache_path()
+        self._cache = None
         
         # Statistics
         self.stats = {
@@ -261,11 +280,88 @@ class SkillNameRefiner:
             'successfully_refined': 0,
             'unchanged': 0,
             'failed': 0,
+            'duplicates_skipped': 0,
+            'cache_hits': 0,
+            'domain_stripped': 0,
+            'llm_batches': 0,
             'errors': []
         }
+        self._stats_lock = threading.Lock()
         
         logger.info(f"Initialized SkillNameRefiner with batch_size={self.batch_size}")
     
+    def _count(self, stat: str, n: int = 1):
+        """Increment a statistic (batches run on several threads)"""
+        with self._stats_lock:
+            self.stats[stat] += n
+    
+    # ═══════════════════════════════════════════════════════════════
+    #  CACHE
+    # ═══════════════════════════════════════════════════════════════
+    
+    def _prompt_version(self) -> str:
+        """Hash of the prompts, so cached refinements expire when they change"""
+        template = self._get_single_skill_prompt({'name': '{name}', 'description': '{description}',
+                                                  'unit_title': '{unit_title}'})
+        content = '\n'.join([REFINEMENT_SYSTEM_PROMPT, template, self.DOMAIN_VALIDATION_SYSTEM_PROMPT])
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]
+    
+    def _model_id(self) -> str:
+        """Backend and model answering the prompts, so each model keeps its own cached refinements"""
+        if self.genai_interface is None:
+            return ''
+        model = getattr(self.genai_interface, 'model_name', None) or getattr(self.genai_interface, 'deployment', '')
+        return f"{type(self.genai_interface).__name__}:{model}"
+    
+    def _get_cache_path(self) -> Optional[Path]:
+        """JSONL cache file from 'refinement_cache_file' or the pipeline cache dir"""
+        if not self.config.get('use_refinement_cache', True):
+            return None
+        if self.config.get('refinement_cache_file'):
+            return Path(self.config['refinement_cache_file'])
+        cache_dir = self.config.get('paths', {}).get('cache_dir')
+        if cache_dir:
+            return Path(cache_dir) / "skill_name_refinement.jsonl"
+        return None
+    
+    def _skill_key(self, skill: Dict) -> str:
+        """Deduplication and cache key of a skill for the current prompt version and model"""
+        if self.dedupe_by == 'name':
+            parts = [skill.get('name', '')]
+        else:
+            parts = [skill.get('name', ''), skill.get('description', ''), skill.get('unit_title', '')]
+        content = json.dumps([self.prompt_version, self.model_id] + parts, ensure_ascii=False)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+    
+    def _load_cache(self) -> Dict[str, Dict]:
+        """Load cached refinements once; later lines override earlier ones"""
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path is not None and self.cache_path.exists():
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            self._cache[entry['key']] = entry['result']
+                        except (json.JSONDecodeError, KeyError):
+                            continue
+                logger.info(f"Loaded {len(self._cache)} cached refinements from {self.cache_path}")
+        return self._cache
+    
+    def _save_cache_entries(self, entries: Dict[str, Dict]):
+        """Add refinements to the cache and append them to the cache file"""
+        cache = self._load_cache()
+        cache.update(entries)
+        if self.cache_path is None or not entries:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'a', encoding='utf-8') as f:
+                for key, result in entries.items():
+                    f.write(json.dumps({'key': key, 'result': result}, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.warning(f"Failed to write refinement cache: {e}")
+    
     # ═══════════════════════════════════════════════════════════════
     #  POST-PROCESSING: Strip domain from generic transferable skills
     # ═══════════════════════════════════════════════════════════════
@@ -347,6 +443,16 @@ class SkillNameRefiner:
         'abattoir', 'stockyard',
     ]
 
+    # Longest match first, sorted once
+    _SUFFIXES_BY_LENGTH = tuple(sorted(GENERIC_TRANSFERABLE_SUFFIXES, key=len, reverse=True))
+    _DOMAINS_BY_LENGTH = tuple(d.lower() for d in sorted(DOMAIN_PREFIXES_TO_STRIP, key=len, reverse=True))
+    _CONTEXT_WORDS = frozenset([
+        'training', 'work', 'operations', 'service', 'services',
+        'facility', 'site', 'area', 'room', 'shed', 'field',
+        'workplace', 'worksite', 'industry', 'sector', 'program',
+        'project', 'production', 'processing', 'practice'
+    ])
+
     def _strip_unnecessary_domain(self, refined_name: str) -> str:
         """
         Strip domain qualifiers from generic transferable skills.
@@ -365,7 +471,7 @@ class SkillNameRefiner:
         
         # Check if the name ends with any generic transferable suffix
         matched_suffix = None
-        for suffix in sorted(self.GENERIC_TRANSFERABLE_SUFFIXES, key=len, reverse=True):
+        for suffix in self._SUFFIXES_BY_LENGTH:
             if name_lower.endswith(suffix):
                 matched_suffix = suffix
                 break
@@ -389,8 +495,7 @@ class SkillNameRefiner:
         max_iterations = 5  # Safety limit
         for _ in range(max_iterations):
             found = False
-            for domain in sorted(self.DOMAIN_PREFIXES_TO_STRIP, key=len, reverse=True):
-                domain_lower = domain.lower()
+            for domain_lower in self._DOMAINS_BY_LENGTH:
                 if remaining_prefix.endswith(domain_lower):
                     remaining_prefix = remaining_prefix[:remaining_prefix.rfind(domain_lower)].strip()
                     stripped_any = True
@@ -399,12 +504,8 @@ class SkillNameRefiner:
             
             if not found:
                 # Check if remaining prefix is a generic context word that should also be stripped
-                context_words = ['training', 'work', 'operations', 'service', 'services',
-                                'facility', 'site', 'area', 'room', 'shed', 'field',
-                                'workplace', 'worksite', 'industry', 'sector', 'program',
-                                'project', 'production', 'processing', 'practice']
                 remaining_words = remaining_prefix.split()
-                if remaining_words and remaining_words[-1] in context_words:
+                if remaining_words and remaining_words[-1] in self._CONTEXT_WORDS:
                     remaining_prefix = ' '.join(remaining_words[:-1]).strip()
                     stripped_any = True
                 else:
@@ -453,92 +554,79 @@ DOES NOT TRANSFER (keep domain):
 Output ONLY valid JSON: {"cleaned_name": "...", "domain_removed": true/false}
 No explanations."""
 
-    def _validate_domain_batch(self, skills_to_validate: List[Dict]) -> List[Dict]:
-        """
-        Stage 2: Use LLM to check if domain qualifiers should be stripped
-        from skills that the deterministic list didn't catch.
-        
-        Args:
-            skills_to_validate: List of dicts with 'index', 'refined_name', 'description'
-            
-        Returns:
-            List of dicts with 'index' and 'cleaned_name'
-        """
-        if not self.genai_interface or not skills_to_validate:
-            return skills_to_validate
-        
-        logger.info(f"Stage 2: LLM domain validation for {len(skills_to_validate)} skills")
+    def _validate_domain_items(self, batch: List[Dict]) -> List[Dict]:
+        """Validate domain qualifiers for one batch with a single LLM call"""
+        prompts = []
+        for item in batch:
+            prompt = (
+                f"Skill name: \"{item['refined_name']}\"\n"
+                f"Description: {item.get('description', '')[:200]}\n\n"
+                f"Does the domain qualifier transfer or should it be removed?\n"
+                f"{{\"cleaned_name\":"
+            )
+            prompts.append(prompt)
         
         results = []
-        
-        # Process in batches
-        for batch_start in range(0, len(skills_to_validate), self.batch_size):
-            batch = skills_to_validate[batch_start:batch_start + self.batch_size]
-            
-            prompts = []
-            for item in batch:
-                prompt = (
-                    f"Skill name: \"{item['refined_name']}\"\n"
-                    f"Description: {item.get('description', '')[:200]}\n\n"
-                    f"Does the domain qualifier transfer or should it be removed?\n"
-                    f"{{\"cleaned_name\":"
-                )
-                prompts.append(prompt)
+        try:
+            responses = self.genai_interface._generate_batch(
+                user_prompts=prompts,
+                system_prompt=self.DOMAIN_VALIDATION_SYSTEM_PROMPT
+            )
+            self._count('llm_batches')
             
-            try:
-                responses = self.genai_interface._generate_batch(
-                    user_prompts=prompts,
-                    system_prompt=self.DOMAIN_VALIDATION_SYSTEM_PROMPT
-                )
+            for item, response in zip(batch, responses or []):
+                results.append({
+                    'index': item['index'],
+                    'cleaned_name': self._parse_domain_response(response, item['refined_name']),
+                    'original_refined': item['refined_name'],
+                })
                 
-                for item, response in zip(batch, responses or []):
-                    cleaned = item['refined_name']  # default: keep as-is
-                    
-                    if response:
-                        text = response.strip()
-                        # Prepend the partial JSON we sent
-                        text = '{"cleaned_name":' + text
-                        
-                        # Clean up markdown
-                        text = text.replace('```json', '').replace('```', '').strip()
-                        
-                        try:
-                            parsed = json.loads(text)
-                            if isinstance(parsed, dict) and 'cleaned_name' in parsed:
-                                candidate = parsed['cleaned_name'].strip()
-                                if candidate and len(candidate) >= 3:
-                                    if parsed.get('domain_removed', False) or candidate != item['refined_name']:
-                                        logger.debug(
-                                            f"LLM domain strip: '{item['refined_name']}' → '{candidate}'"
-                                        )
-                                    cleaned = candidate
-                        except (json.JSONDecodeError, KeyError):
-                            # Try regex extraction
-                            match = re.search(r'"cleaned_name"\s*:\s*"([^"]+)"', text)
-                            if match:
-                                candidate = match.group(1).strip()
-                                if candidate and len(candidate) >= 3:
-                                    cleaned = candidate
-                    
-                    results.append({
-                        'index': item['index'],
-                        'cleaned_name': cleaned,
-                        'original_refined': item['refined_name'],
-                    })
-                    
-            except Exception as e:
-                logger.warning(f"LLM domain validation batch failed: {e}")
-                for item in batch:
-                    results.append({
-                        'index': item['index'],
-                        'cleaned_name': item['refined_name'],
-                        'original_refined': item['refined_name'],
-                    })
+        except Exception as e:
+            logger.warning(f"LLM domain validation batch failed: {e}")
         
-        stripped_count = sum(1 for r in results if r['cleaned_name'] != r['original_refined'])
-        logger.info(f"Stage 2: LLM stripped domain from {stripped_count}/{len(results)} skills")
+        # Keep names as-is for anything without a response
+        answered = len(results)
+        for item in batch[answered:]:
+            results.append({
+                'index': item['index'],
+                'cleaned_name': item['refined_name'],
+                'original_refined': item['refined_name'],
+            })
         
         return results
+    
+    def _parse_domain_response(self, response: str, refined_name: str) -> str:
+        """Cleaned name from a domain validation response (defaults to the refined name)"""
+        cleaned = refined_name  # default: keep as-is
+        if not response:
+            return cleaned
+        
+        text = response.strip()
+        # Prepend the partial JSON we sent
+        text = '{"cleaned_name":' + text
+        
+        # Clean up markdown
+        text = text.replace('```json', '').replace('```', '').strip()
+        
+        try:
+            parsed = json.loads(text)
+            if isinstance(parsed, dict) and 'cleaned_name' in parsed:
+                candidate = parsed['cleaned_name'].strip()
+                if candidate and len(candidate) >= 3:
+                    if parsed.get('domain_removed', False) or candidate != refined_name:
+                        logger.debug(
+                            f"LLM domain strip: '{refined_name}' → '{candidate}'"
+                        )
+                    cleaned = candidate
+        except (json.JSONDecodeError, KeyError):
+            # Try regex extraction
+            match = re.search(r'"cleaned_name"\s*:\s*"([^"]+)"', text)
+            if match:
+                candidate = match.group(1).strip()
+                if candidate and len(candidate) >= 3:
+                    cleaned = candidate
+        
+        return cleaned
 
     def _needs_llm_domain_check(self, refined_name: str) -> bool:
         """
@@ -555,7 +643,7 @@ No explanations."""
         # has a prefix, it means Stage 1 didn't strip it, so the prefix might
         # be a domain word we missed
         name_lower = refined_name.lower()
-        for suffix in self.GENERIC_TRANSFERABLE_SUFFIXES:
+        for suffix in self._SUFFIXES_BY_LENGTH:
             if name_lower.endswith(suffix):
                 prefix_part = name_lower[:name_lower.rfind(suffix)].strip()
                 if prefix_part:
@@ -659,6 +747,9 @@ Output (JSON only):
         """
         Refine skill names for a batch of skills using one prompt per skill.
         
+        Responses that cannot be parsed are re-sent together as one batch,
+        up to max_retries times.
+        
         Args:
             skills: List of dictionaries with 'name', 'description', and optionally 'category'
             
@@ -669,75 +760,54 @@ Output (JSON only):
             logger.error("No GenAI interface available for skill name refinement")
             return [{**s, 'org_name': s['name'], 'name_changed': False} for s in skills]
         
-        # Generate one prompt per skill
-        user_prompts = [self._get_single_skill_prompt(skill) for skill in skills]
+        unrefined = {
+            'original_name': None,
+            'refined_name': None,
+            'confidence': 0.0,
+            'changed': False
+        }
+        refinements = [None] * len(skills)
+        pending = list(range(len(skills)))
         
         try:
-            responses = self.genai_interface._generate_batch(
-                user_prompts=user_prompts,
-                system_prompt=REFINEMENT_SYSTEM_PROMPT
-            )
+            for attempt in range(1 + self.max_retries):
+                if not pending:
+                    break
+                if attempt:
+                    logger.warning(f"Failed to parse {len(pending)} refinement responses, retry {attempt}/{self.max_retries}")
+                
+                # Generate one prompt per skill
+                responses = self.genai_interface._generate_batch(
+                    user_prompts=[self._get_single_skill_prompt(skills[i]) for i in pending],
+                    system_prompt=REFINEMENT_SYSTEM_PROMPT
+                )
+                self._count('llm_batches')
+                
+                responses = list(responses or [])
+                if len(responses) != len(pending):
+                    logger.warning(f"Unexpected response count: got {len(responses)}, expected {len(pending)}")
+                    responses.extend([''] * (len(pending) - len(responses)))
+                
+                still_pending = []
+                for i, response in zip(pending, responses):
+                    try:
+                        refinements[i] = self._parse_single_response(response, skills[i]['name'])
+                    except Exception as e:
+                        logger.debug(f"Error parsing refinement for '{skills[i]['name']}': {e}")
+                    if refinements[i] is None:
+                        still_pending.append(i)
+                pending = still_pending
             
-            if not responses or len(responses) != len(skills):
-                logger.warning(f"Unexpected response count: got {len(responses) if responses else 0}, expected {len(skills)}")
-                if responses is None:
-                    responses = [''] * len(skills)
-                while len(responses) < len(skills):
-                    responses.append('')
+            if pending:
+                logger.warning(f"All retries exhausted for {len(pending)} skills")
             
             results = []
-            for i, (skill, response) in enumerate(zip(skills, responses)):
+            for skill, refinement in zip(skills, refinements):
                 skill_copy = skill.copy()
-                retry_count = 5
-                loop = True
+                if refinement is None:
+                    refinement = {**unrefined, 'original_name': skill['name'], 'refined_name': skill['name']}
+                    skill_copy['refinement_failed'] = True
                 
-                while loop:
-                    try:
-                        loop = False
-                        refinement = self._parse_single_response(response, skill['name'])
-                        if refinement is None and retry_count > 0:
-                            retry_count -= 1
-                            logger.warning(f"Failed to parse refinement response for '{skill['name']}', {retry_count} retries left")
-                            response = self.genai_interface._generate_batch(
-                                user_prompts=[self._get_single_skill_prompt(skill)],
-                                system_prompt=REFINEMENT_SYSTEM_PROMPT
-                            )[0]
-                            loop = True
-                        elif refinement is None and retry_count == 0:
-                            logger.warning(f"All retries exhausted for skill {skill['name']}")
-                            refinement = {
-                                'original_name': skill['name'],
-                                'refined_name': skill['name'],
-                                'confidence': 0.0,
-                                'changed': False
-                            }
-                    except Exception as e:
-                        if retry_count > 0:
-                            retry_count -= 1
-                            logger.warning(f"Error for '{skill['name']}', {retry_count} retries left: {e}")
-                            try:
-                                response = self.genai_interface._generate_batch(
-                                    user_prompts=[self._get_single_skill_prompt(skill)],
-                                    system_prompt=REFINEMENT_SYSTEM_PROMPT
-                                )[0]
-                                loop = True
-                            except Exception:
-                                loop = False
-                                refinement = {
-                                    'original_name': skill['name'],
-                                    'refined_name': skill['name'],
-                                    'confidence': 0.0,
-                                    'changed': False
-                                }
-                        else:
-                            loop = False
-                            refinement = {
-                                'original_name': skill['name'],
-                                'refined_name': skill['name'],
-                                'confidence': 0.0,
-                                'changed': False
-                            }
-
                 # Apply refinement
                 refined_name = refinement.get('refined_name', skill['name'])
                 changed = refinement.get('changed', False)
@@ -756,27 +826,111 @@ Output (JSON only):
                     skill_copy['name_changed'] = changed and refined_name.lower() != skill['name'].lower()
                     
                     if skill_copy['name_changed']:
-                        self.stats['successfully_refined'] += 1
+                        self._count('successfully_refined')
                     else:
-                        self.stats['unchanged'] += 1
+                        self._count('unchanged')
                 else:
                     skill_copy['org_name'] = skill['name']
                     skill_copy['name_changed'] = False
                     skill_copy['refinement_confidence'] = 0.0
-                    self.stats['unchanged'] += 1
+                    self._count('unchanged')
                 
                 results.append(skill_copy)
-                self.stats['total_processed'] += 1
+                self._count('total_processed')
             
             return results
             
         except Exception as e:
             logger.error(f"Error in batch refinement: {e}")
-            self.stats['failed'] += len(skills)
-            self.stats['errors'].append(str(e))
+            with self._stats_lock:
+                self.stats['failed'] += len(skills)
+                self.stats['errors'].append(str(e))
             
             return [{**s, 'org_name': s['name'], 'name_changed': False, 
-                    'refinement_confidence': 0.0} for s in skills]
+                    'refinement_confidence': 0.0, 'refinement_failed': True} for s in skills]
+    
+    def _run_refinement_pipeline(self, skills: List[Dict]) -> Tuple[Dict[str, Dict], set]:
+        """
+        Refine unique skills and validate their domains as one pipeline
+        
+        Refinement batches run on a bounded thread pool; as each one finishes,
+        its names that need domain validation are queued and sent in
+        validation batches on the same pool, so both stages overlap. Interfaces
+        that do not support concurrent requests (vLLM) instead get every
+        refinement prompt in one batch call, then every validation prompt in one.
+        
+        Args:
+            skills: Unique skills, each with a 'key'
+            
+        Returns:
+            Tuple of (results, failed_keys): refinement result per skill key,
+            and the keys whose refinement failed (not to be cached)
+        """
+        results = {}
+        failed_keys = set()
+        validation_queue = []
+        
+        def collect_refined(refined_skills):
+            for refined in refined_skills:
+                results[refined['key']] = {
+                    'name': refined['name'],
+                    'org_name': refined['org_name'],
+                    'name_changed': bool(refined.get('name_changed', False)),
+                    'refinement_confidence': refined.get('refinement_confidence', 0.0),
+                }
+                if refined.get('refinement_failed'):
+                    failed_keys.add(refined['key'])
+                
+                # STAGE 2: names the deterministic strip may have missed
+                if self._needs_llm_domain_check(str(refined['name'])):
+                    validation_queue.append({
+                        'index': refined['key'],
+                        'refined_name': str(refined['name']),
+                        'description': refined.get('description', ''),
+                    })
+        
+        def collect_validated(validated_skills):
+            for validated in validated_skills:
+                if validated['cleaned_name'] != validated['original_refined']:
+                    results[validated['index']]['name'] = validated['cleaned_name']
+                    self._count('domain_stripped')
+        
+        if not self.concurrent_requests:
+            # One engine (vLLM): a single batch call per stage lets it schedule every prompt at once
+            logger.info(f"Refining {len(skills)} skill names in one batch call")
+            collect_refined(self.refine_skill_names_batch(skills))
+            if validation_queue:
+                collect_validated(self._validate_domain_items(validation_queue))
+            return results, failed_keys
+        
+        def submit_validation(executor, futures, force=False):
+            while validation_queue and (force or len(validation_queue) >= self.batch_size):
+                batch = validation_queue[:self.batch_size]
+                del validation_queue[:self.batch_size]
+                futures[executor.submit(self._validate_domain_items, batch)] = 'validate'
+        
+        batches = [skills[start:start + self.batch_size] for start in range(0, len(skills), self.batch_size)]
+        progress = tqdm(total=len(skills), desc="Refining skill names")
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_batches) as executor:
+            futures = {executor.submit(self.refine_skill_names_batch, batch): 'refine' for batch in batches}
+            refine_pending = len(batches)
+            
+            while futures:
+                done = next(as_completed(futures))
+                stage = futures.pop(done)
+                
+                if stage == 'refine':
+                    refine_pending -= 1
+                    refined_skills = done.result()
+                    collect_refined(refined_skills)
+                    progress.update(len(refined_skills))
+                    submit_validation(executor, futures, force=refine_pending == 0)
+                else:
+                    collect_validated(done.result())
+        
+        progress.close()
+        return results, failed_keys
     
     def refine_skills_dataframe(self, 
                                  df: pd.DataFrame,
@@ -787,6 +941,9 @@ Output (JSON only):
         """
         Refine skill names for an entire DataFrame.
         
+        Identical skills are sent to the LLM once and earlier results are
+        reused from the refinement cache.
+        
         Args:
             df: DataFrame containing skills
             name_column: Column name for skill names
@@ -798,7 +955,9 @@ Output (JSON only):
             DataFrame with refined names and original names preserved
         """
         logger.info(f"Starting skill name refinement for {len(df)} skills")
-        logger.info(f"Batch size: {self.batch_size} (one prompt per skill)")
+        stripped_before = self.stats['domain_stripped']
+        logger.info(f"Batch size: {self.batch_size} (one prompt per skill), "
+                    f"concurrent batches: {self.max_concurrent_batches}")
         
         has_unit_title = unit_title_column in df.columns
         if has_unit_title:
@@ -806,86 +965,64 @@ Output (JSON only):
         else:
             logger.warning(f"No unit title column '{unit_title_column}' found")
         
+        def column_values(column: str, present: bool) -> List[str]:
+            return df[column].map(str).tolist() if present else [''] * len(df)
+        
         # Prepare skills for processing
-        all_skills = []
-        for idx in df.index:
+        names = column_values(name_column, name_column in df.columns)
+        descriptions = column_values(description_column, description_column in df.columns)
+        unit_titles = column_values(unit_title_column, has_unit_title)
+        categories = column_values(category_column, category_column in df.columns)
+        
+        row_keys = []
+        unique_skills = {}
+        for idx, name, description, unit_title, category in zip(df.index, names, descriptions, unit_titles, categories):
             skill = {
                 'index': idx,
-                'name': str(df.loc[idx, name_column]) if name_column in df.columns else '',
-                'description': str(df.loc[idx, description_column]) if description_column in df.columns else '',
-                'unit_title': str(df.loc[idx, unit_title_column]) if has_unit_title else '',
-                'category': str(df.loc[idx, category_column]) if category_column in df.columns else ''
+                'name': name,
+                'description': description,
+                'unit_title': unit_title,
+                'category': category
             }
-            all_skills.append(skill)
+            key = self._skill_key(skill)
+            row_keys.append(key)
+            if key not in unique_skills:
+                unique_skills[key] = {**skill, 'key': key}
         
-        # Process in batches
-        refined_skills = []
+        self.stats['duplicates_skipped'] += len(df) - len(unique_skills)
         
-        for batch_start in tqdm(range(0, len(all_skills), self.batch_size), 
-                                desc="Refining skill names"):
-            batch_end = min(batch_start + self.batch_size, len(all_skills))
-            batch = all_skills[batch_start:batch_end]
-            
-            refined_batch = None
-            for attempt in range(self.max_retries):
-                try:
-                    refined_batch = self.refine_skill_names_batch(batch)
-                    break
-                except Exception as e:
-                    logger.warning(f"Batch refinement attempt {attempt + 1} failed: {e}")
-                    if attempt == self.max_retries - 1:
-                        refined_batch = [{**s, 'org_name': s['name'], 'name_changed': False,
-                                         'refinement_confidence': 0.0} for s in batch]
-            
-            refined_skills.extend(refined_batch)
+        # Reuse cached refinements
+        cache = self._load_cache()
+        results = {key: cache[key] for key in unique_skills if key in cache}
+        self.stats['cache_hits'] += len(results)
+        to_refine = [skill for key, skill in unique_skills.items() if key not in results]
+        
+        logger.info(f"{len(unique_skills)} unique skills: {len(results)} cached, {len(to_refine)} to refine")
+        
+        if to_refine:
+            if self.genai_interface:
+                new_results, failed_keys = self._run_refinement_pipeline(to_refine)
+                # Failed refinements are retried on the next run
+                self._save_cache_entries({k: v for k, v in new_results.items() if k not in failed_keys})
+            else:
+                logger.error("No GenAI interface available for skill name refinement")
+                new_results = {
+                    skill['key']: {'name': skill['name'], 'org_name': skill['name'],
+                                   'name_changed': False, 'refinement_confidence': 0.0}
+                    for skill in to_refine
+                }
+            results.update(new_results)
         
         # Create result DataFrame
         df_result = df.copy()
-        df_result['org_name'] = df_result[name_column]
-        df_result['name_changed'] = False
-        df_result['refinement_confidence'] = 0.0
-        
-        for refined_skill in refined_skills:
-            idx = refined_skill['index']
-            if idx in df_result.index:
-                df_result.loc[idx, name_column] = refined_skill.get('name', df_result.loc[idx, name_column])
-                df_result.loc[idx, 'org_name'] = refined_skill.get('org_name', df_result.loc[idx, 'org_name'])
-                df_result.loc[idx, 'name_changed'] = refined_skill.get('name_changed', False)
-                df_result.loc[idx, 'refinement_confidence'] = refined_skill.get('refinement_confidence', 0.0)
-        
-        # ═══════════════════════════════════════════════════════════
-        #  STAGE 2: LLM domain validation
-        #  For skills that Stage 1 (deterministic strip) didn't catch,
-        #  ask the LLM if the domain qualifier is necessary.
-        # ═══════════════════════════════════════════════════════════
-        if self.genai_interface:
-            skills_for_llm_check = []
-            for idx in df_result.index:
-                current_name = str(df_result.loc[idx, name_column])
-                if self._needs_llm_domain_check(current_name):
-                    skills_for_llm_check.append({
-                        'index': idx,
-                        'refined_name': current_name,
-                        'description': str(df_result.loc[idx, description_column]) if description_column in df_result.columns else '',
-                    })
-            
-            if skills_for_llm_check:
-                logger.info(f"Stage 2: {len(skills_for_llm_check)} skills need LLM domain validation")
-                llm_results = self._validate_domain_batch(skills_for_llm_check)
-                
-                llm_stripped = 0
-                for result in llm_results:
-                    idx = result['index']
-                    cleaned = result['cleaned_name']
-                    original_refined = result['original_refined']
-                    
-                    if cleaned != original_refined and idx in df_result.index:
-                        df_result.loc[idx, name_column] = cleaned
-                        llm_stripped += 1
-                
-                logger.info(f"Stage 2: LLM stripped domain from {llm_stripped} additional skills")
-            else:
-                logger.info("Stage 2: No skills need LLM domain validation")
+        row_results = [results[key] for key in row_keys]
+        df_result[name_column] = [r['name'] for r in row_results]
+        df_result['org_name'] = [r['org_name'] for r in row_results]
+        df_result['name_changed'] = [bool(r['name_changed']) for r in row_results]
+        df_result['refinement_confidence'] = [r['refinement_confidence'] for r in row_results]
+        
+        logger.info(f"Stage 2: LLM stripped domain from "
+                    f"{self.stats['domain_stripped'] - stripped_before} newly refined unique skills")
         
         self._log_refinement_statistics(df_result)
         return df_result
@@ -978,7 +1115,8 @@ def run_skill_name_refinement(
     if output_path.suffix.lower() == '.csv':
         df_refined.to_csv(output_file, index=False)
     else:
-        df_refined.to_excel(output_file, index=False)
+        from src.export.excel_writer import write_excel
+        write_excel(df_refined, output_file)
     
     logger.info(f"Saved refined skills to: {output_file}")
     return df_refined
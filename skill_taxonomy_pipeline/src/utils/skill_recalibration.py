@@ -340,9 +340,12 @@ class SkillRecalibrationTool:
                                  study_level: Optional[str]):
         """Recalibrate levels for a batch of skills using ensemble if configured"""
         
-        # if self.config.get("ensemble_level_recalibration", True):
-        # Use ensemble approach for consistency
-        num_runs = self.config.get("level_recalibration_runs", 3)
+        # Ensemble runs only differ when sampled: the first run is greedy and the
+        # rest use level_ensemble_temperature. vLLM batches decode greedily, so
+        # they get a single run.
+        num_runs = 1
+        if self.config.get("ensemble_level_recalibration", True) and self.backend_type == "openai":
+            num_runs = max(1, self.config.get("level_recalibration_runs", 3))
         level_votes = {skill.name: [] for skill in skills}
         
         for run in range(num_runs):
@@ -355,9 +358,9 @@ class SkillRecalibrationTool:
                 backend_type=self.backend_type
             )
             
-            # Add slight variation for ensemble
+            # Runs after the first are sampled so the ensemble can disagree
             if self.backend_type == "openai":
-                temperature = 0.0
+                temperature = 0.0 if run == 0 else self.config.get("level_ensemble_temperature", 0.7)
                 response = self.genai.generate_response(
                     system_prompt, user_prompt, 
                     temperature=temperature, top_p=1.0
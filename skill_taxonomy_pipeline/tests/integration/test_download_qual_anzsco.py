@@ -0,0 +1,152 @@
+"""
+TGA ANZSCO extraction against the local SOAP stub: request retries with
+backoff, and resuming a download from its progress journal
+"""
+import json
+import os
+
+import pytest
+
+pytest.importorskip('zeep')
+
+from src.utils import download_qual_anzsco as tga
+from tests.integration.tga_soap_stub import TGASoapStub
+
+ANZSCO_REFERENCE = '500000\tClerical and Administrative Workers\t\n511111\tContract Administrator\t\n'
+
+
+def make_qualifications():
+    return {
+        'BSB50120': {'title': 'Diploma of Business', 'anzsco': '511111', 'release': '2'},
+        'BSB40120': {'title': 'Certificate IV in Business', 'anzsco': '511111', 'release': '1'},
+        'ICT40120': {'title': 'Certificate IV in Information Technology', 'release': '3'},
+    }
+
+
+@pytest.fixture
+def stub():
+    with TGASoapStub(make_qualifications()) as server:
+        yield server
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Record backoff sleeps instead of waiting"""
+    slept = []
+    monkeypatch.setattr(tga.time, 'sleep', slept.append)
+    return slept
+
+
+def download(stub, output_dir, **kwargs):
+    reference = os.path.join(output_dir, 'anzsco.txt')
+    if not os.path.exists(reference):
+        os.makedirs(output_dir, exist_ok=True)
+        with open(reference, 'w', encoding='utf-8') as f:
+            f.write(ANZSCO_REFERENCE)
+    kwargs.setdefault('num_processes', 1)
+    return tga.download_all_anzsco('user', 'secret', output_dir=output_dir, anzsco_file=reference,
+                                   service_url=stub.wsdl_url, **kwargs)
+
+
+def read_journal(output_dir):
+    with open(os.path.join(output_dir, tga.PROGRESS_FILE), encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_call_retries_with_exponential_backoff(stub, delays):
+    extractor = tga.TGAANZSCOExtractor('user', 'secret', service_url=stub.wsdl_url,
+                                       max_retries=3, backoff_seconds=0.5)
+    stub.fail('BSB50120', 2)
+
+    details = extractor.get_qualification_details('BSB50120')
+
+    assert details['Title'] == 'Diploma of Business'
+    assert stub.detail_requests['BSB50120'] == 3
+    assert delays == [0.5, 1.0]
+
+
+def test_call_gives_up_after_max_retries(stub, delays):
+    extractor = tga.TGAANZSCOExtractor('user', 'secret', service_url=stub.wsdl_url,
+                                       max_retries=1, backoff_seconds=0.5)
+    stub.fail('BSB50120', 5)
+
+    result = extractor.get_qualification_anzsco('BSB50120')
+
+    assert result['error'] == 'No response from API'
+    assert stub.detail_requests['BSB50120'] == 2
+    assert delays == [0.5]
+
+
+def test_download_resumes_from_progress_journal(stub, tmp_path):
+    output_dir = str(tmp_path / 'anzsco')
+
+    # First run: one qualification fails and is journaled as a failed attempt
+    stub.fail('ICT40120', 1)
+    first = download(stub, output_dir, max_retries=0)
+    assert [r['qualification_code'] for r in first if r.get('error')] == ['ICT40120']
+
+    journal = read_journal(output_dir)
+    assert sorted(entry['code'] for entry in journal) == ['BSB40120', 'BSB50120', 'ICT40120']
+    assert [entry['attempts'] for entry in journal if entry['code'] == 'ICT40120'] == [1]
+
+    # Second run only fetches what failed
+    stub.detail_requests.clear()
+    second = download(stub, output_dir, max_retries=0)
+    assert dict(stub.detail_requests) == {'ICT40120': 1}
+    assert not any(r.get('error') for r in second)
+    assert {r['qualification_code']: r['anzsco_code'] for r in second} == {
+        'BSB40120': '511111', 'BSB50120': '511111', 'ICT40120': None,
+    }
+
+    # A new release is refreshed; unchanged qualifications are not fetched again
+    stub.detail_requests.clear()
+    stub.qualifications['BSB50120']['release'] = '3'
+    stub.qualifications['BSB50120']['title'] = 'Diploma of Business (revised)'
+    third = download(stub, output_dir, max_retries=0)
+    assert dict(stub.detail_requests) == {'BSB50120': 1}
+    titles = {r['qualification_code']: r['qualification_title'] for r in third}
+    assert titles['BSB50120'] == 'Diploma of Business (revised)'
+
+    # resume=False discards the journal and fetches everything
+    stub.detail_requests.clear()
+    download(stub, output_dir, max_retries=0, resume=False)
+    assert sorted(stub.detail_requests) == ['BSB40120', 'BSB50120', 'ICT40120']
+
+
+def test_failed_qualification_is_retried_up_to_max_attempts(stub, tmp_path):
+    output_dir = str(tmp_path / 'anzsco')
+    stub.fail('ICT40120', 100)
+
+    for _ in range(4):
+        results = download(stub, output_dir, max_retries=0, max_attempts=3)
+
+    assert stub.detail_requests['ICT40120'] == 3
+    assert stub.detail_requests['BSB50120'] == 1
+    assert [r['qualification_code'] for r in results if r.get('error')] == ['ICT40120']
+    attempts = [entry['attempts'] for entry in read_journal(output_dir) if entry['code'] == 'ICT40120']
+    assert attempts == [1, 2, 3]
+
+
+def test_qualification_without_release_is_refreshed_when_its_summary_changes(stub, tmp_path):
+    output_dir = str(tmp_path / 'anzsco')
+    stub.qualifications['ICT40120']['release'] = None
+    download(stub, output_dir, max_retries=0)
+
+    stub.detail_requests.clear()
+    download(stub, output_dir, max_retries=0)
+    assert not stub.detail_requests
+
+    stub.qualifications['ICT40120']['title'] = 'Certificate IV in Information Technology (revised)'
+    download(stub, output_dir, max_retries=0)
+    assert dict(stub.detail_requests) == {'ICT40120': 1}
+
+
+def test_search_fetches_every_page():
+    qualifications = {f'QUAL{i:04d}': {'title': f'Qualification {i}'} for i in range(250)}
+    with TGASoapStub(qualifications) as server:
+        extractor = tga.TGAANZSCOExtractor('user', 'secret', service_url=server.wsdl_url, request_interval=0.01)
+
+        found = extractor.search_all_qualifications()
+
+    assert [q['code'] for q in found] == sorted(qualifications)
+    assert server.search_requests == 3
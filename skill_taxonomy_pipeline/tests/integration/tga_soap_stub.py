@@ -0,0 +1,276 @@
+"""
+Local SOAP stub of the TGA training component service
+
+Serves a minimal WSDL with the two operations TGAANZSCOExtractor uses
+(Search and GetDetails) from an in-memory set of qualifications, counts
+requests per qualification and can fail a number of calls on purpose, so
+the extractor's retries and resumable downloads can be exercised offline.
+
+Usage:
+    with TGASoapStub({'BSB50120': {...}}) as stub:
+        extractor = TGAANZSCOExtractor('user', 'pass', service_url=stub.wsdl_url)
+"""
+import threading
+import xml.etree.ElementTree as ET
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+TNS = 'http://training.gov.au/services/'
+SOAP_ENV = 'http://schemas.xmlsoap.org/soap/envelope/'
+
+WSDL = '''<?xml version="1.0" encoding="utf-8"?>
+<wsdl:definitions xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+                  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+                  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+                  xmlns:tns="{tns}" targetNamespace="{tns}">
+  <wsdl:types>
+    <xs:schema targetNamespace="{tns}" elementFormDefault="qualified">
+      <xs:complexType name="DetailsRequest">
+        <xs:sequence>
+          <xs:element name="Code" type="xs:string" minOccurs="0"/>
+          <xs:element name="IncludeLegacyData" type="xs:boolean" minOccurs="0"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="ComponentTypeFilter">
+        <xs:sequence>
+          <xs:element name="IncludeQualification" type="xs:boolean" minOccurs="0"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="SearchRequest">
+        <xs:sequence>
+          <xs:element name="SearchCode" type="xs:boolean" minOccurs="0"/>
+          <xs:element name="SearchTitle" type="xs:boolean" minOccurs="0"/>
+          <xs:element name="PageNumber" type="xs:int" minOccurs="0"/>
+          <xs:element name="PageSize" type="xs:int" minOccurs="0"/>
+          <xs:element name="TrainingComponentTypes" type="tns:ComponentTypeFilter" minOccurs="0"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="Classification">
+        <xs:sequence>
+          <xs:element name="SchemeCode" type="xs:string" minOccurs="0"/>
+          <xs:element name="ValueCode" type="xs:string" minOccurs="0"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="ClassificationList">
+        <xs:sequence>
+          <xs:element name="Classification" type="tns:Classification" minOccurs="0" maxOccurs="unbounded"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="TrainingComponentDetails">
+        <xs:sequence>
+          <xs:element name="Code" type="xs:string" minOccurs="0"/>
+          <xs:element name="Title" type="xs:string" minOccurs="0"/>
+          <xs:element name="ParentCode" type="xs:string" minOccurs="0"/>
+          <xs:element name="Classifications" type="tns:ClassificationList" minOccurs="0"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="TrainingComponentSummary">
+        <xs:sequence>
+          <xs:element name="Code" type="xs:string" minOccurs="0"/>
+          <xs:element name="Title" type="xs:string" minOccurs="0"/>
+          <xs:element name="ComponentType" type="xs:string" minOccurs="0" maxOccurs="unbounded"/>
+          <xs:element name="ReleaseNumber" type="xs:string" minOccurs="0"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="SummaryList">
+        <xs:sequence>
+          <xs:element name="TrainingComponentSummary" type="tns:TrainingComponentSummary"
+                      minOccurs="0" maxOccurs="unbounded"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="SearchResult">
+        <xs:sequence>
+          <xs:element name="Count" type="xs:int" minOccurs="0"/>
+          <xs:element name="Results" type="tns:SummaryList" minOccurs="0"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:element name="GetDetails">
+        <xs:complexType><xs:sequence>
+          <xs:element name="request" type="tns:DetailsRequest" minOccurs="0"/>
+        </xs:sequence></xs:complexType>
+      </xs:element>
+      <xs:element name="GetDetailsResponse">
+        <xs:complexType><xs:sequence>
+          <xs:element name="GetDetailsResult" type="tns:TrainingComponentDetails" minOccurs="0"/>
+        </xs:sequence></xs:complexType>
+      </xs:element>
+      <xs:element name="Search">
+        <xs:complexType><xs:sequence>
+          <xs:element name="request" type="tns:SearchRequest" minOccurs="0"/>
+        </xs:sequence></xs:complexType>
+      </xs:element>
+      <xs:element name="SearchResponse">
+        <xs:complexType><xs:sequence>
+          <xs:element name="SearchResult" type="tns:SearchResult" minOccurs="0"/>
+        </xs:sequence></xs:complexType>
+      </xs:element>
+    </xs:schema>
+  </wsdl:types>
+  <wsdl:message name="GetDetailsIn"><wsdl:part name="parameters" element="tns:GetDetails"/></wsdl:message>
+  <wsdl:message name="GetDetailsOut"><wsdl:part name="parameters" element="tns:GetDetailsResponse"/></wsdl:message>
+  <wsdl:message name="SearchIn"><wsdl:part name="parameters" element="tns:Search"/></wsdl:message>
+  <wsdl:message name="SearchOut"><wsdl:part name="parameters" element="tns:SearchResponse"/></wsdl:message>
+  <wsdl:portType name="ITrainingComponentService">
+    <wsdl:operation name="GetDetails">
+      <wsdl:input message="tns:GetDetailsIn"/><wsdl:output message="tns:GetDetailsOut"/>
+    </wsdl:operation>
+    <wsdl:operation name="Search">
+      <wsdl:input message="tns:SearchIn"/><wsdl:output message="tns:SearchOut"/>
+    </wsdl:operation>
+  </wsdl:portType>
+  <wsdl:binding name="TrainingComponentBinding" type="tns:ITrainingComponentService">
+    <soap:binding transport="http://schemas.xmlsoap.org/soap/http" style="document"/>
+    <wsdl:operation name="GetDetails">
+      <soap:operation soapAction="{tns}GetDetails" style="document"/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input><wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+    <wsdl:operation name="Search">
+      <soap:operation soapAction="{tns}Search" style="document"/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input><wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+  </wsdl:binding>
+  <wsdl:service name="TrainingComponentServiceV2">
+    <wsdl:port name="TrainingComponentPort" binding="tns:TrainingComponentBinding">
+      <soap:address location="{address}"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>
+'''
+
+ENVELOPE = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<s:Envelope xmlns:s="{env}"><s:Body>{body}</s:Body></s:Envelope>'
+)
+
+FAULT = '<s:Fault><faultcode>s:Server</faultcode><faultstring>{message}</faultstring></s:Fault>'
+
+
+def _element(name, value):
+    return f'<{name}>{escape(str(value))}</{name}>'
+
+
+class TGASoapStub:
+    """In-process SOAP server standing in for the TGA web service"""
+
+    def __init__(self, qualifications):
+        """
+        Args:
+            qualifications: code -> {'title', 'release', 'anzsco', 'parent'}; a
+                qualification without 'anzsco' has no ANZSCO classification, and
+                one with release None is listed without a ReleaseNumber
+        """
+        self.qualifications = qualifications
+        self.detail_requests = Counter()
+        self.search_requests = 0
+        self._failures = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def wsdl_url(self):
+        return f'{self.address}?wsdl'
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/TrainingComponentServiceV2.svc'
+
+    def fail(self, code, times):
+        """Answer the next `times` GetDetails calls for `code` with a SOAP fault"""
+        with self._lock:
+            self._failures[code] += times
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self._send(200, WSDL.format(tns=TNS, address=stub.address))
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                status, payload = stub._dispatch(ET.fromstring(body))
+                self._send(status, ENVELOPE.format(env=SOAP_ENV, body=payload))
+
+            def _send(self, status, text):
+                data = text.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _dispatch(self, envelope):
+        """(HTTP status, SOAP body XML) for a request envelope"""
+        operation = envelope.find(f'{{{SOAP_ENV}}}Body')[0]
+        name = operation.tag.split('}')[-1]
+        request = operation.find(f'{{{TNS}}}request')
+        fields = {child.tag.split('}')[-1]: child.text for child in (request if request is not None else [])}
+
+        if name == 'Search':
+            with self._lock:
+                self.search_requests += 1
+            return 200, self._search(int(fields.get('PageNumber') or 0), int(fields.get('PageSize') or 100))
+        if name == 'GetDetails':
+            code = fields.get('Code')
+            with self._lock:
+                self.detail_requests[code] += 1
+                if self._failures[code] > 0:
+                    self._failures[code] -= 1
+                    return 500, FAULT.format(message=f'Service unavailable for {escape(code)}')
+            return 200, self._details(code)
+        return 500, FAULT.format(message=f'Unknown operation {escape(name)}')
+
+    def _search(self, page_number, page_size):
+        codes = sorted(self.qualifications)[page_number * page_size:(page_number + 1) * page_size]
+        summaries = ''.join(
+            '<TrainingComponentSummary>'
+            + _element('Code', code)
+            + _element('Title', self.qualifications[code].get('title', ''))
+            + _element('ComponentType', 'Qualification')
+            + (_element('ReleaseNumber', self.qualifications[code].get('release', '1'))
+               if self.qualifications[code].get('release', '1') is not None else '')
+            + '</TrainingComponentSummary>'
+            for code in codes
+        )
+        return (f'<SearchResponse xmlns="{TNS}"><SearchResult>'
+                f'{_element("Count", len(self.qualifications))}<Results>{summaries}</Results>'
+                f'</SearchResult></SearchResponse>')
+
+    def _details(self, code):
+        qual = self.qualifications.get(code)
+        if qual is None:
+            return f'<GetDetailsResponse xmlns="{TNS}"/>'
+        classifications = ''
+        if qual.get('anzsco'):
+            classifications = ('<Classifications><Classification>'
+                               + _element('SchemeCode', '01') + _element('ValueCode', qual['anzsco'])
+                               + '</Classification></Classifications>')
+        return (f'<GetDetailsResponse xmlns="{TNS}"><GetDetailsResult>'
+                + _element('Code', code)
+                + _element('Title', qual.get('title', ''))
+                + _element('ParentCode', qual.get('parent', code[:3]))
+                + classifications
+                + '</GetDetailsResult></GetDetailsResponse>')